@@ -3,38 +3,20 @@
 import asyncio
 from typing import List, Dict, Optional
 
-import firebase_admin
-from firebase_admin import credentials, firestore
-from firebase_admin.firestore import WriteBatch
-from google.api_core.exceptions import DeadlineExceeded
-from google.cloud.firestore_v1 import Client as FirestoreClient
-
 from dotenv import load_dotenv
 import os
 import time
 
 from utils.logger import setup_logger
+from Firebase.storage import get_storage, auto_id, SERVER_TIMESTAMP, StorageTimeout
 
 # 환경 변수 로드
 load_dotenv()
 
-# 환경 변수에서 설정 가져오기
-FIRESTORE_SERVICE_ACCOUNT_FILE = os.getenv('SERVICE_ACCOUNT_FILE', 'Firebase/firebase.json')
-
 # 로깅 설정
 logger = setup_logger(__name__)
 
-# Firestore 클라이언트 초기화
-if not firebase_admin._apps:
-    try:
-        cred = credentials.Certificate(FIRESTORE_SERVICE_ACCOUNT_FILE)
-        firebase_admin.initialize_app(cred)
-        logger.info("Firebase Admin SDK initialized successfully.")
-    except Exception as e:
-        logger.error(f"Failed to initialize Firebase Admin SDK: {e}")
-        raise
-
-db: FirestoreClient = firestore.client()
+# 저장소(Firestore/memory/sqlite)는 STORAGE_BACKEND 설정에 따라 처음 사용할 때 생성됨 (Firebase/storage.py)
 
 def load_songs() -> List[Dict]:
     return _load_data('songs')
@@ -68,20 +50,19 @@ def _save_data(collection_name: str, data: List[Dict]) -> None:
             delay = 1
             for attempt in range(retries):
                 try:
-                    batch = db.batch()
+                    writes = []
                     for record in batch_data:
-                        record['timestamp'] = firestore.SERVER_TIMESTAMP
+                        record['timestamp'] = SERVER_TIMESTAMP
                         # Use the 'id' field as the document ID if available
-                        doc_id = record.pop('id', None)
-                        doc_ref = db.collection(collection_name).document(doc_id) if doc_id else db.collection(collection_name).document()
+                        doc_id = record.pop('id', None) or auto_id()
                         sanitized_record = {k: (v if v != '' else None) for k, v in record.items()}
-                        batch.set(doc_ref, sanitized_record)
+                        writes.append((f'{collection_name}/{doc_id}', sanitized_record))
                     # Commit the batch with a timeout
-                    batch.commit(timeout=30)  # Set a timeout of 30 seconds for the commit
+                    get_storage().batch_set(writes, timeout=30)  # Set a timeout of 30 seconds for the commit
                     logger.info(f"Committed batch {batch_num}/{len(batches)} with {len(batch_data)} records to Firestore")
                     success = True
                     break  # Exit the retry loop if successful
-                except DeadlineExceeded as e:
+                except StorageTimeout as e:
                     logger.warning(f"Batch commit {batch_num} attempt {attempt+1} failed due to Deadline Exceeded. Retrying after {delay} seconds...")
                     time.sleep(delay)
                     delay *= 2  # Exponential backoff
@@ -97,12 +78,11 @@ def _save_data(collection_name: str, data: List[Dict]) -> None:
 
 def _save_single_record(collection_name: str, data: Dict) -> None:
     try:
-        data['timestamp'] = firestore.SERVER_TIMESTAMP
+        data['timestamp'] = SERVER_TIMESTAMP
         # Use the 'id' field as the document ID if available
-        doc_id = data.pop('id', None)
-        doc_ref = db.collection(collection_name).document(doc_id) if doc_id else db.collection(collection_name).document()
+        doc_id = data.pop('id', None) or auto_id()
         sanitized_record = {k: (v if v != '' else None) for k, v in data.items()}
-        doc_ref.set(sanitized_record)
+        get_storage().set(f'{collection_name}/{doc_id}', sanitized_record)
         logger.info("Successfully saved single record to Firestore.")
     except Exception as e:
         logger.error(f"Error saving single record to Firestore: {e}")
@@ -117,22 +97,15 @@ def _load_data(collection_name: str, filters: Optional[List[tuple]] = None) -> L
     :return: 문서의 리스트
     """
     try:
-        collection_ref = db.collection(collection_name)
-        
+        docs = get_storage().stream(collection_name, filters)
         if filters:
-            query = collection_ref
-            for field, op, value in filters:
-                query = query.where(field, op, value)
-            docs = query.stream()
             logger.info(f"Loaded filtered records from Firestore collection '{collection_name}' with filters: {filters}")
         else:
-            docs = collection_ref.stream()
             logger.info(f"Loaded all records from Firestore collection '{collection_name}'.")
         
         data = []
-        for doc in docs:
-            record = doc.to_dict()
-            record['id'] = doc.id  # 문서 ID를 포함
+        for doc_id, record in docs:
+            record['id'] = doc_id  # 문서 ID를 포함
             data.append(record)
         logger.info(f"Total records loaded: {len(data)}")
         return data
@@ -145,11 +118,9 @@ def _load_single_record(collection_name: str, doc_id: str) -> Optional[Dict]:
     지정된 컬렉션에서 특정 문서를 로드합니다.
     """
     try:
-        doc_ref = db.collection(collection_name).document(doc_id)
-        doc = doc_ref.get()
-        if doc.exists:
-            record = doc.to_dict()
-            record['id'] = doc.id
+        record = get_storage().get(f'{collection_name}/{doc_id}')
+        if record is not None:
+            record['id'] = doc_id
             logger.info(f"Loaded record with ID '{doc_id}' from Firestore collection '{collection_name}'.")
             return record
         else:
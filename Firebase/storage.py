@@ -0,0 +1,610 @@
+# Firebase/storage.py
+'''
+storage.py는 Firestore 핸들러들이 사용하는 문서 저장소 인터페이스와 구현을 제공함
+STORAGE_BACKEND 환경변수로 구현을 선택함: firestore(기본값), memory, sqlite
+- FirestoreStorage: 기존과 같이 Firestore에 읽고 씀. Firebase Admin SDK는 처음 사용할 때 초기화하므로 import만으로는 자격 증명이 필요하지 않음
+- MemoryStorage: 프로세스 메모리에만 저장함 (프로파일링, 벤치마크, 테스트용)
+- SQLiteStorage: STORAGE_SQLITE_PATH 파일에 문서를 JSON으로 저장함 (로컬 배치 백필용)
+STORAGE_CACHE_PATH를 지정하면 Firestore 앞에 영구 읽기 캐시(CachedStorage)를 둠
+- 문서 경로별로 데이터와 update_time을 SQLite 파일에 보관하고, 읽을 때는 update_time만 조회하여 바뀐 문서만 내려받음
+- 새 프로세스(CLI 재실행, 노트북 세션)도 캐시된 valuation 문서와 albums/songs/performance/broadcast 컬렉션으로 바로 시작함
+- STORAGE_CACHE_MAX_AGE(초, 기본값 0) 이내에 확인한 항목은 update_time 조회도 생략함
+문서 경로는 Firestore와 같은 'collection/doc_id/sub_collection/sub_doc_id' 형식의 문자열임
+set의 merge는 Firestore와 같이 True(전체 병합) 또는 필드 경로 목록('timestamps.SV')을 받고, get의 field_paths는 지정한 필드만 반환함
+SERVER_TIMESTAMP는 Firestore에서는 서버 시각으로, 로컬 저장소에서는 저장 시점의 UTC 시각으로 바뀜
+sync_storage 함수(또는 python -m Firebase.storage sync)는 로컬 저장소의 문서를 Firestore로 일괄 업로드함
+'''
+
+import copy
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from dotenv import load_dotenv
+
+from utils.logger import setup_logger
+from Firebase.usage import document_size, record_usage
+
+# 환경 변수 로드
+load_dotenv()
+
+# 환경 변수에서 설정 가져오기
+FIRESTORE_SERVICE_ACCOUNT_FILE = os.getenv('SERVICE_ACCOUNT_FILE', 'Firebase/firebase.json')
+STORAGE_BACKEND = os.getenv('STORAGE_BACKEND', 'firestore')
+STORAGE_SQLITE_PATH = os.getenv('STORAGE_SQLITE_PATH', 'storage.sqlite3')
+STORAGE_CACHE_PATH = os.getenv('STORAGE_CACHE_PATH', '')
+STORAGE_CACHE_MAX_AGE = float(os.getenv('STORAGE_CACHE_MAX_AGE', '0'))
+
+# Firestore 배치 쓰기 한도(500)보다 작게 유지
+SYNC_BATCH_SIZE = 400
+
+# 로깅 설정
+logger = setup_logger(__name__)
+
+class _ServerTimestamp:
+    def __repr__(self):
+        return 'SERVER_TIMESTAMP'
+
+SERVER_TIMESTAMP = _ServerTimestamp()
+
+class StorageTimeout(Exception):
+    """
+    배치 커밋이 시간 제한을 넘긴 경우. 호출부에서 재시도할 수 있다.
+    """
+
+def auto_id() -> str:
+    return uuid.uuid4().hex[:20]
+
+def _split(path: str) -> Tuple[str, str]:
+    parent, _, doc_id = path.rpartition('/')
+    return parent, doc_id
+
+def _get_path(data: Dict, field_path: str):
+    value = data
+    for key in field_path.split('.'):
+        if not isinstance(value, dict) or key not in value:
+            raise KeyError(field_path)
+        value = value[key]
+    return value
+
+def _set_path(data: Dict, field_path: str, value) -> None:
+    *parents, last = field_path.split('.')
+    for key in parents:
+        if not isinstance(data.get(key), dict):
+            data[key] = {}
+        data = data[key]
+    data[last] = value
+
+def _mask(data: Optional[Dict], field_paths: Optional[List[str]]) -> Optional[Dict]:
+    if data is None or not field_paths:
+        return data
+    masked = {}
+    for field_path in field_paths:
+        try:
+            _set_path(masked, field_path, _get_path(data, field_path))
+        except KeyError:
+            continue
+    return masked
+
+def _deep_merge(base: Dict, update: Dict) -> Dict:
+    for key, value in update.items():
+        if isinstance(value, dict) and isinstance(base.get(key), dict):
+            _deep_merge(base[key], value)
+        else:
+            base[key] = value
+    return base
+
+def _resolve_timestamps(value, now: datetime):
+    if value is SERVER_TIMESTAMP:
+        return now
+    if isinstance(value, dict):
+        return {k: _resolve_timestamps(v, now) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_resolve_timestamps(v, now) for v in value]
+    return value
+
+_OPERATORS = {
+    '==': lambda a, b: a == b,
+    '!=': lambda a, b: a != b,
+    '<': lambda a, b: a < b,
+    '<=': lambda a, b: a <= b,
+    '>': lambda a, b: a > b,
+    '>=': lambda a, b: a >= b,
+    'in': lambda a, b: a in b,
+    'not-in': lambda a, b: a not in b,
+    'array-contains': lambda a, b: isinstance(a, list) and b in a,
+    'array-contains-any': lambda a, b: isinstance(a, list) and any(v in a for v in b),
+}
+
+def _matches(data: Dict, filters: Optional[List[tuple]]) -> bool:
+    for field, op, value in filters or []:
+        try:
+            if not _OPERATORS[op](_get_path(data, field), value):
+                return False
+        except KeyError:
+            # Firestore와 같이 필드가 없는 문서는 조건에 맞지 않는 것으로 처리
+            return False
+        except TypeError:
+            return False
+    return True
+
+class Storage:
+    """
+    문서 저장소 인터페이스. 경로는 'collection/doc_id' 형식이다.
+    """
+    def get(self, path: str, field_paths: Optional[List[str]] = None) -> Optional[Dict]:
+        raise NotImplementedError
+
+    def set(self, path: str, data: Dict, merge: Union[bool, List[str]] = False) -> None:
+        raise NotImplementedError
+
+    def batch_set(self, writes: Iterable[Tuple[str, Dict]], timeout: Optional[float] = None) -> None:
+        """
+        writes의 (경로, 데이터)를 한 번에 커밋한다.
+        """
+        raise NotImplementedError
+
+    def stream(self, collection_path: str, filters: Optional[List[tuple]] = None) -> Iterator[Tuple[str, Dict]]:
+        """
+        컬렉션의 (문서 ID, 데이터)를 순회한다. filters는 [('field', '==', 'value'), ...] 형식이다.
+        """
+        raise NotImplementedError
+
+class FirestoreStorage(Storage):
+    def __init__(self, service_account_file: str = FIRESTORE_SERVICE_ACCOUNT_FILE):
+        self.service_account_file = service_account_file
+        self._db = None
+        self._lock = threading.Lock()
+
+    @property
+    def db(self):
+        if self._db is None:
+            with self._lock:
+                if self._db is None:
+                    import firebase_admin
+                    from firebase_admin import credentials, firestore
+
+                    # Firestore 클라이언트 초기화
+                    if not firebase_admin._apps:
+                        try:
+                            cred = credentials.Certificate(self.service_account_file)
+                            firebase_admin.initialize_app(cred)
+                            logger.info("Firebase Admin SDK initialized successfully.")
+                        except Exception as e:
+                            logger.error(f"Failed to initialize Firebase Admin SDK: {e}")
+                            raise
+                    self._db = firestore.client()
+        return self._db
+
+    def _prepare(self, value):
+        if value is SERVER_TIMESTAMP:
+            from firebase_admin import firestore
+            return firestore.SERVER_TIMESTAMP
+        if isinstance(value, dict):
+            return {k: self._prepare(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self._prepare(v) for v in value]
+        return value
+
+    def get(self, path, field_paths=None):
+        doc_ref = self.db.document(path)
+        doc = doc_ref.get(field_paths=field_paths) if field_paths else doc_ref.get()
+        data = doc.to_dict() if doc.exists else None
+        record_usage('reads', path, size=document_size(data))
+        return data
+
+    def set(self, path, data, merge=False):
+        self.db.document(path).set(self._prepare(data), merge=merge)
+        record_usage('writes', path, size=document_size(data))
+
+    def batch_set(self, writes, timeout=None):
+        from google.api_core.exceptions import DeadlineExceeded
+
+        batch = self.db.batch()
+        writes = list(writes)
+        for path, data in writes:
+            batch.set(self.db.document(path), self._prepare(data))
+        try:
+            batch.commit(timeout=timeout)
+        except DeadlineExceeded as e:
+            raise StorageTimeout(str(e)) from e
+        for path, data in writes:
+            record_usage('writes', path, size=document_size(data))
+
+    def stream(self, collection_path, filters=None):
+        empty = True
+        for doc in self._query(collection_path, filters).stream():
+            empty = False
+            data = doc.to_dict()
+            record_usage('reads', collection_path, size=document_size(data))
+            yield doc.id, data
+        if empty:
+            # 결과가 없는 조회도 읽기 1회로 과금됨
+            record_usage('reads', collection_path)
+
+    def _query(self, collection_path, filters):
+        query = self.db.collection(collection_path)
+        for field, op, value in filters or []:
+            query = query.where(field, op, value)
+        return query
+
+    # 아래 메서드는 CachedStorage가 문서 내용 없이 update_time만 비교하기 위해 사용함
+
+    def get_with_version(self, path: str) -> Tuple[Optional[Dict], Optional[str]]:
+        doc = self.db.document(path).get()
+        data = doc.to_dict() if doc.exists else None
+        record_usage('reads', path, size=document_size(data))
+        if data is None:
+            return None, None
+        return data, _version(doc.update_time)
+
+    def get_version(self, path: str) -> Optional[str]:
+        # 빈 field_paths는 필드 없이 문서 메타데이터(update_time)만 반환함
+        doc = self.db.document(path).get(field_paths=[])
+        record_usage('reads', path)
+        return _version(doc.update_time) if doc.exists else None
+
+    def versions(self, collection_path: str, filters: Optional[List[tuple]] = None) -> Dict[str, str]:
+        docs = self._query(collection_path, filters).select([]).stream()
+        versions = {doc.id: _version(doc.update_time) for doc in docs}
+        record_usage('reads', collection_path, max(len(versions), 1))
+        return versions
+
+    def get_many(self, paths: List[str]) -> Dict[str, Tuple[Dict, str]]:
+        if not paths:
+            return {}
+        fetched = {}
+        for doc in self.db.get_all([self.db.document(path) for path in paths]):
+            data = doc.to_dict() if doc.exists else None
+            record_usage('reads', doc.reference.path, size=document_size(data))
+            if data is not None:
+                fetched[doc.reference.path] = (data, _version(doc.update_time))
+        return fetched
+
+def _version(update_time) -> str:
+    # DatetimeWithNanoseconds.rfc3339()는 나노초까지 표현하므로 같은 초 안의 갱신도 구분됨
+    return update_time.rfc3339() if hasattr(update_time, 'rfc3339') else update_time.isoformat()
+
+class LocalStorage(Storage):
+    """
+    MemoryStorage와 SQLiteStorage의 공통 구현. merge, field_paths, 필터, SERVER_TIMESTAMP를 Firestore와 같은 의미로 처리한다.
+    하위 클래스는 _read, _write, _list, _paths만 구현한다.
+    """
+    def __init__(self):
+        self._lock = threading.RLock()
+
+    def _read(self, path: str) -> Optional[Dict]:
+        raise NotImplementedError
+
+    def _write(self, docs: List[Tuple[str, Dict]]) -> None:
+        raise NotImplementedError
+
+    def _list(self, collection_path: str) -> Iterator[Tuple[str, Dict]]:
+        raise NotImplementedError
+
+    def _paths(self) -> List[str]:
+        raise NotImplementedError
+
+    def get(self, path, field_paths=None):
+        with self._lock:
+            data = self._read(path)
+        return _mask(data, field_paths)
+
+    def _merged(self, path: str, data: Dict, merge: Union[bool, List[str]], now: datetime) -> Dict:
+        data = _resolve_timestamps(data, now)
+        if not merge:
+            return data
+        current = self._read(path) or {}
+        if merge is True:
+            return _deep_merge(current, data)
+        for field_path in merge:
+            _set_path(current, field_path, _get_path(data, field_path))
+        return current
+
+    def set(self, path, data, merge=False):
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            self._write([(path, self._merged(path, data, merge, now))])
+
+    def batch_set(self, writes, timeout=None):
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            self._write([(path, _resolve_timestamps(data, now)) for path, data in writes])
+
+    def stream(self, collection_path, filters=None):
+        with self._lock:
+            docs = list(self._list(collection_path))
+        for doc_id, data in docs:
+            if _matches(data, filters):
+                yield doc_id, data
+
+    def documents(self, prefix: str = '') -> Iterator[Tuple[str, Dict]]:
+        """
+        prefix로 시작하는 모든 문서(서브컬렉션 포함)의 (경로, 데이터)를 순회한다.
+        """
+        with self._lock:
+            paths = [path for path in self._paths() if path.startswith(prefix)]
+        for path in paths:
+            data = self.get(path)
+            if data is not None:
+                yield path, data
+
+class MemoryStorage(LocalStorage):
+    def __init__(self):
+        super().__init__()
+        self._docs: Dict[str, Dict] = {}
+
+    def _read(self, path):
+        data = self._docs.get(path)
+        return copy.deepcopy(data) if data is not None else None
+
+    def _write(self, docs):
+        for path, data in docs:
+            self._docs[path] = copy.deepcopy(data)
+
+    def _list(self, collection_path):
+        for path, data in self._docs.items():
+            parent, doc_id = _split(path)
+            if parent == collection_path:
+                yield doc_id, copy.deepcopy(data)
+
+    def _paths(self):
+        return list(self._docs)
+
+def _encode(value):
+    if isinstance(value, datetime):
+        return {'__datetime__': value.isoformat()}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def _decode(obj: Dict):
+    if len(obj) == 1 and '__datetime__' in obj:
+        return datetime.fromisoformat(obj['__datetime__'])
+    return obj
+
+class SQLiteStorage(LocalStorage):
+    def __init__(self, path: str = STORAGE_SQLITE_PATH):
+        super().__init__()
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS documents ('
+            'path TEXT PRIMARY KEY, parent TEXT NOT NULL, doc_id TEXT NOT NULL, data TEXT NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS documents_parent ON documents (parent)')
+        self._conn.commit()
+
+    def _read(self, path):
+        row = self._conn.execute('SELECT data FROM documents WHERE path = ?', (path,)).fetchone()
+        return json.loads(row[0], object_hook=_decode) if row else None
+
+    def _write(self, docs):
+        rows = [(path, *_split(path), json.dumps(data, default=_encode, ensure_ascii=False)) for path, data in docs]
+        with self._conn:
+            self._conn.executemany('INSERT OR REPLACE INTO documents (path, parent, doc_id, data) VALUES (?, ?, ?, ?)', rows)
+
+    def _list(self, collection_path):
+        rows = self._conn.execute('SELECT doc_id, data FROM documents WHERE parent = ? ORDER BY doc_id', (collection_path,)).fetchall()
+        for doc_id, data in rows:
+            yield doc_id, json.loads(data, object_hook=_decode)
+
+    def _paths(self):
+        return [row[0] for row in self._conn.execute('SELECT path FROM documents ORDER BY path')]
+
+    def close(self):
+        self._conn.close()
+
+class DocumentCache:
+    """
+    Firestore 문서를 경로별로 (데이터, update_time, 가져온 시각)과 함께 보관하는 SQLite 파일 캐시.
+    listings 테이블은 컬렉션 조회(컬렉션 경로 + 필터)별로 마지막으로 확인한 문서 ID 목록을 보관한다.
+    """
+    def __init__(self, path: str = STORAGE_CACHE_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS documents ('
+            'path TEXT PRIMARY KEY, parent TEXT NOT NULL, doc_id TEXT NOT NULL, data TEXT NOT NULL, '
+            'version TEXT NOT NULL, fetched_at REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS documents_parent ON documents (parent)')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS listings (key TEXT PRIMARY KEY, parent TEXT NOT NULL, doc_ids TEXT NOT NULL, fetched_at REAL NOT NULL)')
+        self._conn.commit()
+
+    def get(self, path: str) -> Optional[Tuple[Dict, str, float]]:
+        with self._lock:
+            row = self._conn.execute('SELECT data, version, fetched_at FROM documents WHERE path = ?', (path,)).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0], object_hook=_decode), row[1], row[2]
+
+    def list(self, collection_path: str) -> Dict[str, Tuple[Dict, str]]:
+        with self._lock:
+            rows = self._conn.execute('SELECT doc_id, data, version FROM documents WHERE parent = ?', (collection_path,)).fetchall()
+        return {doc_id: (json.loads(data, object_hook=_decode), version) for doc_id, data, version in rows}
+
+    def put_many(self, docs: Dict[str, Tuple[Dict, str]]) -> None:
+        now = time.time()
+        rows = [
+            (path, *_split(path), json.dumps(data, default=_encode, ensure_ascii=False), version, now)
+            for path, (data, version) in docs.items()
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany('INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?, ?, ?)', rows)
+
+    def touch(self, paths: List[str]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany('UPDATE documents SET fetched_at = ? WHERE path = ?', [(time.time(), path) for path in paths])
+
+    def delete(self, paths: List[str]) -> None:
+        parents = {_split(path)[0] for path in paths}
+        with self._lock, self._conn:
+            self._conn.executemany('DELETE FROM documents WHERE path = ?', [(path,) for path in paths])
+            self._conn.executemany('DELETE FROM listings WHERE parent = ?', [(parent,) for parent in parents])
+
+    def get_listing(self, key: str) -> Optional[Tuple[List[str], float]]:
+        with self._lock:
+            row = self._conn.execute('SELECT doc_ids, fetched_at FROM listings WHERE key = ?', (key,)).fetchone()
+        return (json.loads(row[0]), row[1]) if row else None
+
+    def put_listing(self, key: str, collection_path: str, doc_ids: List[str]) -> None:
+        with self._lock, self._conn:
+            self._conn.execute('INSERT OR REPLACE INTO listings VALUES (?, ?, ?, ?)', (key, collection_path, json.dumps(doc_ids), time.time()))
+
+class CachedStorage(Storage):
+    """
+    FirestoreStorage 앞에 두는 영구 읽기 캐시(read-through).
+    읽을 때는 update_time만 조회하여 캐시된 버전과 다른 문서만 내려받는다.
+    STORAGE_CACHE_MAX_AGE(초) 이내에 확인한 문서와 컬렉션 조회는 재검증 없이 캐시에서 반환한다.
+    쓰기는 Firestore에 바로 반영하고 해당 문서의 캐시와 부모 컬렉션의 조회 목록을 무효화한다.
+    """
+    def __init__(self, backend: FirestoreStorage, cache: DocumentCache, max_age: float = STORAGE_CACHE_MAX_AGE):
+        self.backend = backend
+        self.cache = cache
+        self.max_age = max_age
+        self.stats = Counter()
+
+    def _fresh(self, fetched_at: float) -> bool:
+        return self.max_age > 0 and time.time() - fetched_at < self.max_age
+
+    def get(self, path, field_paths=None):
+        cached = self.cache.get(path)
+        if cached is not None:
+            data, version, fetched_at = cached
+            if self._fresh(fetched_at):
+                self.stats['hits'] += 1
+                return _mask(data, field_paths)
+            if self.backend.get_version(path) == version:
+                self.stats['revalidated'] += 1
+                self.cache.touch([path])
+                return _mask(data, field_paths)
+
+        # 마스크 조회라도 문서 전체를 받아 캐시하여 이후 다른 필드 조회도 캐시에서 처리
+        self.stats['misses'] += 1
+        data, version = self.backend.get_with_version(path)
+        if data is None:
+            self.cache.delete([path])
+            return None
+        self.cache.put_many({path: (data, version)})
+        return _mask(data, field_paths)
+
+    def stream(self, collection_path, filters=None):
+        key = json.dumps([collection_path, filters or []], default=str, ensure_ascii=False)
+        cached = self.cache.list(collection_path)
+
+        listing = self.cache.get_listing(key)
+        if listing is not None and self._fresh(listing[1]) and all(doc_id in cached for doc_id in listing[0]):
+            self.stats['hits'] += len(listing[0])
+            for doc_id in listing[0]:
+                yield doc_id, cached[doc_id][0]
+            return
+
+        remote = self.backend.versions(collection_path, filters)
+        stale = [f'{collection_path}/{doc_id}' for doc_id, version in remote.items() if doc_id not in cached or cached[doc_id][1] != version]
+        fetched = self.backend.get_many(stale)
+        self.cache.put_many(fetched)
+        self.cache.touch([f'{collection_path}/{doc_id}' for doc_id in remote if f'{collection_path}/{doc_id}' not in fetched])
+        if not filters:
+            # 필터 없는 전체 조회에서 빠진 문서는 Firestore에서 삭제된 문서임
+            self.cache.delete([f'{collection_path}/{doc_id}' for doc_id in cached if doc_id not in remote])
+        self.stats['revalidated'] += len(remote) - len(fetched)
+        self.stats['misses'] += len(fetched)
+
+        doc_ids = []
+        for doc_id in remote:
+            path = f'{collection_path}/{doc_id}'
+            if path in fetched:
+                data = fetched[path][0]
+            elif doc_id in cached:
+                data = cached[doc_id][0]
+            else:
+                continue
+            doc_ids.append(doc_id)
+            yield doc_id, data
+        self.cache.put_listing(key, collection_path, doc_ids)
+
+    def set(self, path, data, merge=False):
+        try:
+            self.backend.set(path, data, merge=merge)
+        finally:
+            self.cache.delete([path])
+
+    def batch_set(self, writes, timeout=None):
+        writes = list(writes)
+        try:
+            self.backend.batch_set(writes, timeout=timeout)
+        finally:
+            self.cache.delete([path for path, _ in writes])
+
+def create_storage(backend: str = STORAGE_BACKEND) -> Storage:
+    if backend == 'firestore':
+        if STORAGE_CACHE_PATH:
+            return CachedStorage(FirestoreStorage(), DocumentCache(STORAGE_CACHE_PATH))
+        return FirestoreStorage()
+    if backend == 'memory':
+        return MemoryStorage()
+    if backend == 'sqlite':
+        return SQLiteStorage()
+    raise ValueError(f"Unknown STORAGE_BACKEND '{backend}' (firestore, memory, sqlite)")
+
+_storage: Optional[Storage] = None
+_storage_lock = threading.Lock()
+
+def get_storage() -> Storage:
+    """
+    STORAGE_BACKEND 설정에 따른 프로세스 공용 저장소를 반환한다.
+    """
+    global _storage
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                _storage = create_storage()
+                logger.info(f"Storage backend: {type(_storage).__name__}")
+    return _storage
+
+def set_storage(storage: Storage) -> Storage:
+    """
+    프로세스 공용 저장소를 교체한다. 이전 저장소를 반환한다.
+    """
+    global _storage
+    with _storage_lock:
+        previous, _storage = _storage, storage
+    return previous
+
+def sync_storage(source: LocalStorage, target: Optional[Storage] = None, prefix: str = '', batch_size: int = SYNC_BATCH_SIZE) -> int:
+    """
+    로컬 저장소(source)의 문서를 target(기본값: Firestore)에 그대로 덮어쓴다. 업로드한 문서 수를 반환한다.
+    """
+    target = target or FirestoreStorage()
+    pending = []
+    synced = 0
+    for path, data in source.documents(prefix):
+        pending.append((path, data))
+        if len(pending) >= batch_size:
+            target.batch_set(pending)
+            synced += len(pending)
+            pending = []
+    if pending:
+        target.batch_set(pending)
+        synced += len(pending)
+    logger.info(f"Synced {synced} documents from {type(source).__name__} to {type(target).__name__}")
+    return synced
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1] != 'sync':
+        print('Usage: python -m Firebase.storage sync [prefix]  (STORAGE_SQLITE_PATH의 문서를 Firestore로 업로드)')
+        sys.exit(1)
+
+    sync_storage(SQLiteStorage(), prefix=sys.argv[2] if len(sys.argv) > 2 else '')
@@ -0,0 +1,171 @@
+# Firebase/usage.py
+'''
+usage.py는 Firestore 문서 읽기/쓰기/삭제와 전송 바이트를 집계하고 비용을 추정함
+FirestoreStorage(storage.py)가 호출할 때마다 record_usage로 컬렉션과 호출한 스테이지별로 기록함
+- 컬렉션은 문서 ID를 뺀 경로(예: 'artists/valuation')로 묶음
+- 스테이지는 현재 trace의 가장 안쪽 'stage' 구간 이름이며, 실행 범위 밖의 호출은 '-'로 기록함
+- 바이트는 문서를 JSON으로 직렬화한 크기로 근사함
+호출은 전역 FIRESTORE_USAGE와 tracking()으로 지정한 현재 컨텍스트의 FirestoreUsage(실행 단위)에 함께 기록됨
+가격(100,000회당 USD)과 일일 무료 한도는 FIRESTORE_PRICE_*, FIRESTORE_FREE_* 환경변수로 바꿀 수 있음
+VALUATION_SCHEDULE(hourly, daily, weekly, monthly 또는 '3/day', '2/week' 형식, 기본값 daily)로 월간 예상 비용을 계산함
+'''
+
+import json
+import os
+import re
+import threading
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from utils.tracing import count, current_span
+
+load_dotenv()
+
+OPERATIONS = ('reads', 'writes', 'deletes')
+# 100,000회당 가격(USD). 기본값은 multi-region(nam5/eur3) 기준
+PRICES = {
+    'reads': float(os.getenv('FIRESTORE_PRICE_READS', '0.06')),
+    'writes': float(os.getenv('FIRESTORE_PRICE_WRITES', '0.18')),
+    'deletes': float(os.getenv('FIRESTORE_PRICE_DELETES', '0.02')),
+}
+# 프로젝트 전체 일일 무료 한도
+FREE_PER_DAY = {
+    'reads': int(os.getenv('FIRESTORE_FREE_READS', '50000')),
+    'writes': int(os.getenv('FIRESTORE_FREE_WRITES', '20000')),
+    'deletes': int(os.getenv('FIRESTORE_FREE_DELETES', '20000')),
+}
+# 인터넷 송신(다운로드) GB당 가격과 월 무료 용량(GB)
+EGRESS_PRICE_GB = float(os.getenv('FIRESTORE_PRICE_EGRESS_GB', '0.12'))
+EGRESS_FREE_GB = float(os.getenv('FIRESTORE_FREE_EGRESS_GB', '10'))
+SCHEDULE = os.getenv('VALUATION_SCHEDULE', 'daily')
+
+DAYS_PER_MONTH = 30
+_PERIODS = {'hour': 24 * DAYS_PER_MONTH, 'day': DAYS_PER_MONTH, 'week': DAYS_PER_MONTH / 7, 'month': 1}
+_NAMED_SCHEDULES = {'hourly': '1/hour', 'daily': '1/day', 'weekly': '1/week', 'monthly': '1/month'}
+
+def runs_per_month(schedule: str = SCHEDULE) -> float:
+    """
+    'daily', '3/day', '2/week' 형식의 실행 주기를 월간 실행 횟수로 바꾼다.
+    """
+    spec = _NAMED_SCHEDULES.get(schedule.strip().lower(), schedule.strip().lower())
+    match = re.fullmatch(r'(\d+(?:\.\d+)?)\s*/\s*(hour|day|week|month)', spec)
+    if match is None:
+        raise ValueError(f"Invalid schedule: {schedule!r} (expected hourly, daily, weekly, monthly or '<n>/<hour|day|week|month>')")
+    return float(match.group(1)) * _PERIODS[match.group(2)]
+
+def collection_of(path: str) -> str:
+    """
+    문서 또는 컬렉션 경로에서 문서 ID를 뺀 컬렉션 경로.
+    """
+    parts = path.strip('/').split('/')
+    return '/'.join(parts[::2])
+
+def document_size(data) -> int:
+    if not data:
+        return 0
+    return len(json.dumps(data, ensure_ascii=False, default=str).encode('utf-8'))
+
+class FirestoreUsage:
+    """
+    (컬렉션, 스테이지)별 Firestore 사용량. 각 항목은 reads, writes, deletes, bytes_read, bytes_written 카운터.
+    """
+    def __init__(self):
+        self.entries: Dict[Tuple[str, str], Counter] = defaultdict(Counter)
+        self._lock = threading.Lock()
+
+    def record(self, collection: str, stage: str, op: str, n: int = 1, size: int = 0) -> None:
+        with self._lock:
+            entry = self.entries[(collection, stage)]
+            entry[op] += n
+            entry['bytes_read' if op == 'reads' else 'bytes_written'] += size
+
+    def __bool__(self) -> bool:
+        return bool(self.entries)
+
+    def totals(self, by: Optional[str] = None) -> Dict:
+        """
+        by='collection' 또는 'stage'이면 해당 기준별 합계를, None이면 전체 합계 Counter를 반환한다.
+        """
+        with self._lock:
+            entries = {key: Counter(value) for key, value in self.entries.items()}
+        if by is None:
+            return sum(entries.values(), Counter())
+        index = 0 if by == 'collection' else 1
+        grouped = defaultdict(Counter)
+        for key, value in entries.items():
+            grouped[key[index]].update(value)
+        return dict(grouped)
+
+    def projection(self, schedule: str = SCHEDULE) -> Dict:
+        """
+        이번 사용량으로 schedule마다 실행할 때의 월간 사용량과 비용(무료 한도 차감 후).
+        """
+        per_month = runs_per_month(schedule)
+        total = self.totals()
+        monthly = {op: total[op] * per_month for op in OPERATIONS}
+        billable = {op: max(0.0, monthly[op] - FREE_PER_DAY[op] * DAYS_PER_MONTH) for op in OPERATIONS}
+        egress_gb = total['bytes_read'] * per_month / 1024 ** 3
+        cost = {op: billable[op] / 100000 * PRICES[op] for op in OPERATIONS}
+        cost['egress'] = max(0.0, egress_gb - EGRESS_FREE_GB) * EGRESS_PRICE_GB
+        return {
+            'schedule': schedule,
+            'runs_per_month': per_month,
+            'operations': monthly,
+            'egress_gb': egress_gb,
+            'cost': cost,
+            'total_cost': sum(cost.values()),
+        }
+
+    def report(self, schedule: str = SCHEDULE) -> str:
+        lines = [f"{'collection':<32} {'reads':>7} {'writes':>7} {'deletes':>7} {'read_kb':>9} {'write_kb':>9}"]
+        for name, c in sorted(self.totals('collection').items(), key=lambda item: -item[1]['reads'] - item[1]['writes']):
+            lines.append(f"{name[:32]:<32} {c['reads']:>7} {c['writes']:>7} {c['deletes']:>7} {c['bytes_read'] / 1024:>9.1f} {c['bytes_written'] / 1024:>9.1f}")
+        lines.append(f"{'stage':<32} {'reads':>7} {'writes':>7} {'deletes':>7} {'read_kb':>9} {'write_kb':>9}")
+        for name, c in sorted(self.totals('stage').items(), key=lambda item: -item[1]['reads'] - item[1]['writes']):
+            lines.append(f"{name[:32]:<32} {c['reads']:>7} {c['writes']:>7} {c['deletes']:>7} {c['bytes_read'] / 1024:>9.1f} {c['bytes_written'] / 1024:>9.1f}")
+
+        total = self.totals()
+        p = self.projection(schedule)
+        ops = p['operations']
+        lines.append(f"Total: {total['reads']} reads / {total['writes']} writes / {total['deletes']} deletes, {total['bytes_read'] / 1024:.1f} KB read")
+        lines.append(
+            f"Projected monthly ({schedule}, {p['runs_per_month']:g} runs): "
+            f"{ops['reads']:,.0f} reads / {ops['writes']:,.0f} writes / {ops['deletes']:,.0f} deletes, "
+            f"{p['egress_gb']:.2f} GB egress → ${p['total_cost']:.2f} after free tier"
+        )
+        return '\n'.join(lines)
+
+# 프로세스 전체 누적 사용량
+FIRESTORE_USAGE = FirestoreUsage()
+_usage: ContextVar[Optional[FirestoreUsage]] = ContextVar('firestore_usage', default=None)
+
+@contextmanager
+def tracking(usage: Optional[FirestoreUsage] = None):
+    """
+    usage(기본값: 새 FirestoreUsage)를 현재 컨텍스트에 지정하여 이 범위의 Firestore 사용량을 따로 집계한다.
+    """
+    usage = usage if usage is not None else FirestoreUsage()
+    token = _usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _usage.reset(token)
+
+def record_usage(op: str, path: str, n: int = 1, size: int = 0) -> None:
+    """
+    path(문서 또는 컬렉션 경로)에 대한 Firestore 작업 n회와 전송 바이트를 기록한다. op는 reads, writes, deletes 중 하나.
+    """
+    if not n:
+        return
+    stage_span = current_span('stage')
+    stage = stage_span.name if stage_span is not None else '-'
+    collection = collection_of(path)
+    FIRESTORE_USAGE.record(collection, stage, op, n, size)
+    usage = _usage.get()
+    if usage is not None:
+        usage.record(collection, stage, op, n, size)
+    count(f'firestore_{op}', n)
@@ -1,13 +1,14 @@
 import os
-import gspread
-from google.oauth2.service_account import Credentials
-from googleapiclient.discovery import build
 from dotenv import load_dotenv
 
 from utils.logger import setup_logger
 logger = setup_logger(__name__)
 
 def get_or_create_spreadsheet(folder_id, title):
+    import gspread
+    from google.oauth2.service_account import Credentials
+    from googleapiclient.discovery import build
+
     SCOPES = [
         'https://www.googleapis.com/auth/spreadsheets',
         'https://www.googleapis.com/auth/drive'
@@ -61,6 +62,7 @@ def write_data(worksheet, data, start_row=2):
         logger.error(f"데이터를 스프레드시트에 쓰는 중 오류 발생: {e}")
 
 def read_data(worksheet, start_row=2, end_row=None, start_col=1, end_col=None):
+    import gspread
     try:
         if end_row and end_col:
             cell_range = f"{gspread.utils.rowcol_to_a1(start_row, start_col)}:{gspread.utils.rowcol_to_a1(end_row, end_col)}"
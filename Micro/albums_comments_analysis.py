@@ -6,17 +6,11 @@ from collections import defaultdict, Counter
 from typing import List, Dict, Any
 
 from dotenv import load_dotenv
-from konlpy.tag import Okt
 from Firebase.firestore_handler import _load_data, save_to_firestore
 
 from utils.logger import setup_logger
-import openai
 
-
-from transformers import BertTokenizer, BertModel
-from sklearn.neighbors import KNeighborsClassifier
 import numpy as np
-import torch
 
 import sys
 sys.path.append(os.path.dirname(os.path.abspath(__file__)) + '/..')
@@ -42,8 +36,15 @@ if not OPENAI_API_KEY:
     logger.error("환경 변수 'OPENAI_API_KEY'가 설정되지 않았습니다.")
     raise ValueError("환경 변수 'OPENAI_API_KEY'가 설정되지 않았습니다.")
 
-tokenizer = BertTokenizer.from_pretrained('monologg/kobert', use_fast=True)
-bert_model = BertModel.from_pretrained('monologg/kobert')
+# KoBERT 모델은 다운로드와 로딩 비용이 크므로 import 시가 아니라 처음 분류할 때 불러옴
+_bert = None
+
+def load_bert():
+    global _bert
+    if _bert is None:
+        from transformers import BertTokenizer, BertModel
+        _bert = (BertTokenizer.from_pretrained('monologg/kobert', use_fast=True), BertModel.from_pretrained('monologg/kobert'))
+    return _bert
 
 # 분류기 초기화
 knn_model = None
@@ -61,6 +62,9 @@ category_keywords = {
 
 def train_classifier():
     global knn_model
+    import torch
+    from sklearn.neighbors import KNeighborsClassifier
+    tokenizer, bert_model = load_bert()
     X = []
     y = []
 
@@ -84,8 +88,10 @@ def classify_keywords_bert(keywords: List[str]) -> Dict[str, str]:
     :param keywords: 분류할 키워드 리스트
     :return: 키워드별 카테고리 매핑
     """
+    import torch
     if knn_model is None:
         train_classifier()
+    tokenizer, bert_model = load_bert()
 
     keyword_category_map = {}
     for keyword in keywords:
@@ -121,6 +127,8 @@ def analyze_album_comments():
 
         logger.info(f"총 {len(albums)}개의 앨범을 분석합니다.")
 
+        from konlpy.tag import Okt
+
         # 형태소 분석기 초기화
         okt = Okt()
 
@@ -3,6 +3,8 @@ import requests
 import time
 
 from utils.logger import setup_logger
+from Valuation.utils.quota import QuotaExceeded, allows
+from Valuation.utils.hooks import install_hooks
 logger = setup_logger(__name__)
 
 from dotenv import load_dotenv
@@ -128,10 +130,14 @@ def get_comments_for_video(video_id):
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching comments for video {video_id}: {e}")
             break
+        except QuotaExceeded as e:
+            logger.warning(f"Stopped fetching comments for video {video_id}: {e}")
+            break
     return comments
 
 def get_youtube_videos():
-    """Collect YouTube videos and comments."""
+    """Collect YouTube videos and comments. Comment threads are skipped once the YouTube quota budget runs out."""
+    install_hooks()
     playlist_id = get_channel_uploads_playlist(YOUTUBE_CHANNEL_ID)
     if not playlist_id:
         logger.error("업로드 플레이리스트를 가져오지 못했습니다.")
@@ -157,6 +163,11 @@ def get_youtube_videos():
         logger.info(f"업로드 날짜: {publish_date}")
         logger.info(f"조회수: {view_count}, 좋아요: {like_count}")
         
+        # 댓글은 쿼터 예산이 남아 있을 때만 수집 (영상 통계는 이미 수집됨)
+        if not allows('youtube'):
+            logger.warning("YouTube quota budget exhausted, skipping comment threads for the remaining videos")
+            break
+
         # Fetch and display comments for each video
         video_comments = get_comments_for_video(video_id)
         logger.info(f"{video_id}에서 총 {len(video_comments)}개의 댓글을 가져왔습니다.")
@@ -3,19 +3,16 @@ import sys
 sys.path.append(os.path.dirname(os.path.abspath(__file__)) + '/..')
 import re
 import logging
+from contextlib import nullcontext
 import joblib
 import numpy as np
 import pandas as pd
 from typing import Tuple, List
 from Firebase.firestore_handler import _load_data
+from utils.profiling import profile_enabled, profiled
 from google.cloud.firestore_v1._helpers import DatetimeWithNanoseconds
 import pytz
 
-from konlpy.tag import Okt
-import nltk
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
-
 from sklearn.model_selection import train_test_split, cross_val_score
 from sklearn.preprocessing import StandardScaler
 from sklearn.compose import ColumnTransformer
@@ -24,36 +21,37 @@ from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
 from sklearn.metrics import mean_absolute_error, r2_score
 from sklearn.feature_extraction.text import TfidfVectorizer
 
-# XGBoost와 LightGBM 임포트
-from xgboost import XGBRegressor
-
-# TensorFlow 임포트
-import tensorflow as tf
-from keras import layers, models
-
-# PyTorch 임포트
-import torch
-import torch.nn as nn
-import torch.optim as optim
-from torch.utils.data import Dataset, DataLoader
+# XGBoost, TensorFlow(keras), PyTorch, KoNLPy, NLTK는 import 비용이 크므로 사용하는 함수 안에서 불러옴
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# NLTK 데이터 다운로드 설정
-import ssl
-try:
-    _create_unverified_https_context = ssl._create_unverified_context
-except AttributeError:
-    pass
-else:
-    ssl._create_default_https_context = _create_unverified_https_context
+_english_stopwords = None
+
+def english_stopwords():
+    """
+    NLTK 영어 불용어. 데이터 다운로드는 import 시가 아니라 처음 텍스트 피처를 만들 때 한 번만 수행한다.
+    """
+    global _english_stopwords
+    if _english_stopwords is None:
+        import nltk
+        from nltk.corpus import stopwords
 
-nltk.download('punkt')
-nltk.download('stopwords')
+        # NLTK 데이터 다운로드 설정
+        import ssl
+        try:
+            _create_unverified_https_context = ssl._create_unverified_context
+        except AttributeError:
+            pass
+        else:
+            ssl._create_default_https_context = _create_unverified_https_context
 
-english_stopwords = set(stopwords.words('english'))
+        nltk.download('punkt')
+        nltk.download('stopwords')
+
+        _english_stopwords = set(stopwords.words('english'))
+    return _english_stopwords
 
 def load_data():
     """
@@ -303,8 +301,12 @@ def extract_text_features(performance_df):
     """
     title과 location에서 키워드를 추출하여 텍스트 피처를 생성하는 함수
     """
+    from konlpy.tag import Okt
+    from nltk.tokenize import word_tokenize
+
     # 형태소 분석기 초기화
     okt = Okt()
+    stopwords_en = english_stopwords()
 
     def tokenize_text(text):
         try:
@@ -315,7 +317,7 @@ def extract_text_features(performance_df):
             korean_tokens = okt.nouns(text)
             english_tokens = [
                 word for word in word_tokenize(text)
-                if word.isalpha() and word not in english_stopwords
+                if word.isalpha() and word not in stopwords_en
             ]
 
             all_tokens = korean_tokens + english_tokens
@@ -334,8 +336,10 @@ def extract_text_features(performance_df):
     performance_df.drop(['title_tokens', 'location_tokens'], axis=1, inplace=True)
     return performance_df
 
-class PerformanceDataset(Dataset):
+# DataLoader는 __len__과 __getitem__만 사용하므로 torch.utils.data.Dataset을 상속하지 않아 import 시 torch가 필요 없음
+class PerformanceDataset:
     def __init__(self, X_numeric, X_text, y=None):
+        import torch
         self.X_numeric = torch.tensor(X_numeric, dtype=torch.float32)
         self.X_text = torch.tensor(X_text, dtype=torch.float32)
         if y is not None:
@@ -358,6 +362,8 @@ class PerformanceDataset(Dataset):
             return self.X_numeric[idx], self.X_text[idx]
         
 def train_tensorflow_model(X_train, y_train, X_val, y_val, numeric_features, text_feature):
+    from keras import layers, models
+
     # 수치형 데이터 스케일링
     scaler = StandardScaler()
     X_train_numeric = scaler.fit_transform(X_train[numeric_features])
@@ -396,6 +402,11 @@ def train_tensorflow_model(X_train, y_train, X_val, y_val, numeric_features, tex
     return model, scaler, vectorizer, history
 
 def train_pytorch_model(X_train, y_train, X_val, y_val, numeric_features, text_feature):
+    import torch
+    import torch.nn as nn
+    import torch.optim as optim
+    from torch.utils.data import DataLoader
+
     # 수치형 데이터 스케일링
     scaler = StandardScaler()
     X_train_numeric = scaler.fit_transform(X_train[numeric_features])
@@ -464,6 +475,8 @@ def train_and_evaluate_models(performance_df):
     """
     다양한 모델을 훈련하고 평가하여 가장 성능이 좋은 모델을 선택합니다.
     """
+    from xgboost import XGBRegressor
+
     # 예측에 사용할 피처 선택
     features = [
         'performance_duration', 'followers', 'comments_count', 'album_likes',
@@ -604,6 +617,7 @@ def train_and_evaluate_models(performance_df):
         logger.info(f"최고의 TensorFlow 모델을 'best_model_tf.h5'로 저장했습니다.")
         logger.info(f"TensorFlow 전처리 도구를 'tf_preprocessing.pkl'로 저장했습니다.")
     elif best_model_name == 'PyTorch':
+        import torch
         torch.save(best_model_info['model'].state_dict(), 'best_model_pt.pth')
         joblib.dump((best_model_info['scaler'], best_model_info['vectorizer']), 'pt_preprocessing.pkl')
         logger.info(f"최고의 PyTorch 모델을 'best_model_pt.pth'로 저장했습니다.")
@@ -612,6 +626,8 @@ def train_and_evaluate_models(performance_df):
     return best_model_info['model'], features + [text_feature], best_model_name, model_performance
 
 def train_tensorflow_model(X_train, y_train, X_val, y_val, numeric_features, text_feature):
+    from keras import layers, models
+
     # 수치형 데이터 스케일링
     scaler = StandardScaler()
     X_train_numeric = scaler.fit_transform(X_train[numeric_features])
@@ -650,6 +666,11 @@ def train_tensorflow_model(X_train, y_train, X_val, y_val, numeric_features, tex
     return model, scaler, vectorizer, history
 
 def train_pytorch_model(X_train, y_train, X_val, y_val, numeric_features, text_feature):
+    import torch
+    import torch.nn as nn
+    import torch.optim as optim
+    from torch.utils.data import DataLoader
+
     # 수치형 데이터 스케일링
     scaler = StandardScaler()
     X_train_numeric = scaler.fit_transform(X_train[numeric_features])
@@ -750,6 +771,7 @@ def predict_revenue(
                 X_unknown_text = pt_vectorizer.transform(X_unknown[text_feature]).toarray()
 
                 # 텐서 변환
+                import torch
                 X_numeric_tensor = torch.tensor(X_unknown_numeric, dtype=torch.float32)
                 X_text_tensor = torch.tensor(X_unknown_text, dtype=torch.float32)
 
@@ -782,7 +804,10 @@ def save_results(performance_df: pd.DataFrame):
 def predict_performance_revenue():
     try:
         performance_df, albums_df, songs_df, artists_df, youtube_df = load_data()
-        performance_df = preprocess_data(performance_df, albums_df, songs_df, artists_df, youtube_df)
+        # VALUATION_PROFILE=preprocess_data(또는 all)이면 특성 생성 구간을 프로파일링
+        profile = profiled('preprocess_data', 'performance') if profile_enabled('preprocess_data') else nullcontext()
+        with profile:
+            performance_df = preprocess_data(performance_df, albums_df, songs_df, artists_df, youtube_df)
         best_model, features, best_model_name, model_performance = train_and_evaluate_models(performance_df)
         performance_df = predict_revenue(best_model, performance_df, features, best_model_name, model_performance)
         save_results(performance_df)
@@ -790,4 +815,5 @@ def predict_performance_revenue():
         logger.error(f"예측 과정 중 오류 발생: {e}")
         raise
 
-predict_performance_revenue()
\ No newline at end of file
+if __name__ == '__main__':
+    predict_performance_revenue()
\ No newline at end of file
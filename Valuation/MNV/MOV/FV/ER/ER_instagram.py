@@ -1,7 +1,7 @@
 ##### Valuation/MNV/MOV/FV/ER/ER_instagram.py #####
 '''
 Instagram 대상 계정의 게시물 및 상호작용 데이터를 안정적으로 수집함
-dotenv 라이브러리로 환경변수에서 로그인 정보와 타깃 계정 정보를 로드함
+dotenv 라이브러리로 환경변수에서 로그인 정보를, current_artist로 타깃 계정 정보를 로드함
 instaloader 모듈을 활용하여 인스타그램에 로그인 및 프로필 객체를 생성함
 fetch_posts_with_backoff 함수는 profile.get_posts() 호출 시 예외 발생에 대비해 백오프 전략을 구현함
 요청 실패 시 재시도 로직과 지수적 대기 시간을 적용하여 데이터 요청의 안정성을 확보함
@@ -11,7 +11,6 @@ Firebase 캐시 검증 및 저장 로직으로 중복 데이터 수집을 방지
 수집된 결과는 소셜 미디어 영향력 평가 및 데이터 분석에 활용 가능함
 '''
 
-import instaloader
 import os
 import sys
 import time
@@ -19,21 +18,19 @@ import time
 from dotenv import load_dotenv
 load_dotenv()
 
-ARTIST_ID = os.getenv("ARTIST_ID")
-ARTIST_NAME_KOR = os.getenv("ARTIST_NAME_KOR")
-ARTIST_NAME_ENG = os.getenv("ARTIST_NAME_ENG")
-MELON_ID = os.getenv("MELON_ID")
+from Valuation.utils.artist import current_artist
 
 INSTAGRAM_ACCOUNT_USERNAME=os.getenv("INSTAGRAM_ACCOUNT_USERNAME")
 INSTAGRAM_ACCOUNT_PASSWORD=os.getenv("INSTAGRAM_ACCOUNT_PASSWORD")
 
-TARGET_INSTAGRAM_ACCOUNT=os.getenv("INSTAGRAM_ACCOUNT")
 
 def fetch_posts_with_backoff(profile, max_posts=50, max_retries=3):
     """ 
     profile.get_posts()를 사용하여 게시물 데이터를 가져오는 함수.
     요청 실패 시 백오프 전략으로 재시도한다.
     """
+    import instaloader
+
     backoff_delay = 1  # 첫 실패 시 1초 대기
     retries = 0
 
@@ -78,9 +75,12 @@ def fetch_posts_with_backoff(profile, max_posts=50, max_retries=3):
                 backoff_delay *= 2  # 실패할 때마다 대기 시간 2배
 
 from Valuation.firebase.firebase_handler import save_record, check_record
+from Valuation.utils.stage_graph import stage
 DATA_TARGET = 'ER_instagram'
 
+@stage(DATA_TARGET)
 def er_instagram():
+    TARGET_INSTAGRAM_ACCOUNT = current_artist().instagram_account
     load_data = check_record(DATA_TARGET, DATA_TARGET, 'posts')
     if load_data:
         print(f'{DATA_TARGET} Loaded')
@@ -96,7 +96,8 @@ def er_instagram():
     }
     
     if TARGET_INSTAGRAM_ACCOUNT:
-        
+        import instaloader
+
         L = instaloader.Instaloader()
         L.login(user=INSTAGRAM_ACCOUNT_USERNAME, passwd=INSTAGRAM_ACCOUNT_PASSWORD)
 
@@ -2,7 +2,7 @@
 '''
 ER_main.py는 아티스트의 소셜 미디어 참여 지표(Engagement Ratio)를 산출하는 모듈임함
 openpyxl을 이용하여 Statista 엑셀 파일에서 플랫폼별 사용자 수를 추출함
-dotenv를 통해 환경변수에서 ARTIST_ID, ARTIST_NAME_KOR, ARTIST_NAME_ENG, MELON_ID를 로드함
+current_artist로 실행 대상 아티스트의 ARTIST_ID, ARTIST_NAME_KOR, ARTIST_NAME_ENG, MELON_ID를 로드함
 er_youtube, er_twitter, er_instagram 함수를 호출하여 YouTube, Twitter, Instagram의 콘텐츠 및 통계 데이터를 수집함
 fb_youtube, fb_twitter, fb_instagram 함수를 통해 각 플랫폼의 팔로워 수를 별도 획득함
 플랫폼별 사용자 수를 기반으로 영향력 계수를 산출하여 각 플랫폼 참여율에 적용함
@@ -12,17 +12,13 @@ fb_youtube, fb_twitter, fb_instagram 함수를 통해 각 플랫폼의 팔로워
 최종 결과는 아티스트 정보와 상세 플랫폼 통계로 구성되어 Firebase에 저장됨
 '''
 
-import openpyxl
 import os
 import sys
 
 from dotenv import load_dotenv
 load_dotenv()
 
-ARTIST_ID = os.getenv("ARTIST_ID")
-ARTIST_NAME_KOR = os.getenv("ARTIST_NAME_KOR")
-ARTIST_NAME_ENG = os.getenv("ARTIST_NAME_ENG")
-MELON_ID = os.getenv("MELON_ID")
+from Valuation.utils.artist import current_artist
 
 from Valuation.MNV.MOV.FV.ER.ER_twitter import er_twitter
 from Valuation.MNV.MOV.FV.ER.ER_youtube import er_youtube
@@ -32,6 +28,7 @@ from Valuation.MNV.MOV.FV.FB.FB_youtube import fb_youtube
 from Valuation.MNV.MOV.FV.FB.FB_instagram import fb_instagram
 
 def load_platform_users(target_spreadsheet, target_worksheet):
+    import openpyxl
     spreadsheet = openpyxl.load_workbook(target_spreadsheet)
     worksheet = spreadsheet[target_worksheet]
 
@@ -43,15 +40,23 @@ def load_platform_users(target_spreadsheet, target_worksheet):
     return platform_data
 
 from Valuation.firebase.firebase_handler import save_record, check_record
+from Valuation.utils.stage_graph import stage, shared
 DATA_TARGET='ER'
+@stage(DATA_TARGET)
 def er():
+    artist = current_artist()
+    ARTIST_ID = artist.artist_id
+    ARTIST_NAME_KOR = artist.name_kor
+    ARTIST_NAME_ENG = artist.name_eng
+    MELON_ID = artist.melon_id
     load_data = check_record(DATA_TARGET, DATA_TARGET, 'sub_data')
     if load_data:
         print(f'{DATA_TARGET} Loaded')
         return load_data.get(DATA_TARGET)
     
     print('DATA UNLOADED')
-    platform_users = load_platform_users('Valuation/MNV/MOV/FV/FB/statista.xlsx', 'Data')
+    # 플랫폼 사용자 수는 아티스트와 무관하므로 배치 실행 시 한 번만 읽음
+    platform_users = shared(('statista', 'Data'), lambda: load_platform_users('Valuation/MNV/MOV/FV/FB/statista.xlsx', 'Data'))
     
     youtube_user_count = platform_users.get('YouTube', 0.000001)
     twitter_user_count = platform_users.get('X/Twitter', 0.000001)
@@ -1,7 +1,7 @@
 ##### Valuation/MNV/MOV/FV/ER/ER_twitter.py #####
 '''
 트위터 API를 활용하여 지정된 계정의 트윗 데이터를 수집함
-환경변수에서 API 키, 토큰, 계정 정보 등을 불러와 설정함
+환경변수에서 API 키, 토큰 등을, current_artist로 계정 정보를 불러와 설정함
 get_user_id() 함수는 Twitter 계정의 사용자 ID를 요청 API를 통해 획득함
 er_twitter() 함수는 캐시된 데이터를 check_record로 확인 후, 최신 트윗을 최대 100개 조회함
 각 트윗의 공공 통계(public_metrics)에서 좋아요 수를 추출하여 누적함
@@ -18,12 +18,7 @@ import sys
 from dotenv import load_dotenv
 load_dotenv()
 
-ARTIST_ID = os.getenv("ARTIST_ID")
-ARTIST_NAME_KOR = os.getenv("ARTIST_NAME_KOR")
-ARTIST_NAME_ENG = os.getenv("ARTIST_NAME_ENG")
-MELON_ID = os.getenv("MELON_ID")
-
-TWITTER_ACCOUNT = os.getenv("TWITTER_ACCOUNT")
+from Valuation.utils.artist import current_artist
 
 TWITTER_API_KEY = os.getenv("TWITTER_API_KEY")
 TWITTER_API_KEY_SECRET = os.getenv("TWITTER_API_KEY_SECRET")
@@ -34,6 +29,7 @@ TWITTER_CLIENT_ID = os.getenv("TWITTER_CLIENT_ID")
 TWITTER_CLIENT_SECRET = os.getenv("TWITTER_CLIENT_SECRET")
 
 def get_user_id():
+    TWITTER_ACCOUNT = current_artist().twitter_account
     url = f"https://api.twitter.com/2/users/by/username/{TWITTER_ACCOUNT}"
     headers = {"Authorization": f"Bearer {TWITTER_BEARER_TOKEN}"}
     response = requests.get(url, headers=headers)
@@ -44,8 +40,11 @@ def get_user_id():
         return None
 
 from Valuation.firebase.firebase_handler import save_record, check_record
+from Valuation.utils.stage_graph import stage
 DATA_TARGET='ER_twitter'
+@stage(DATA_TARGET)
 def er_twitter(max_results=100):
+    TWITTER_ACCOUNT = current_artist().twitter_account
     load_data = check_record(DATA_TARGET, DATA_TARGET, 'tweets')
     if load_data:
         print(f'{DATA_TARGET} Loaded')
@@ -2,7 +2,7 @@
 
 '''
 ER_youtube.py는 YouTube API를 통해 지정된 채널의 최신 동영상 데이터를 수집함
-dotenv를 사용하여 환경변수에서 API 키 및 채널 ID를 로드함
+dotenv를 사용하여 환경변수에서 API 키를, current_artist로 채널 ID를 로드함
 firebase_handler의 check_record로 캐시된 데이터를 확인하여 중복 호출을 방지함
 캐시가 없으면 YouTube 검색 API를 호출하여 최신 동영상 ID 목록을 확보함
 수집된 동영상 ID를 기반으로 영상 API를 호출하여 조회수와 좋아요 통계를 집계함
@@ -19,17 +19,16 @@ import sys
 from dotenv import load_dotenv
 load_dotenv()
 
-ARTIST_ID = os.getenv("ARTIST_ID")
-ARTIST_NAME_KOR = os.getenv("ARTIST_NAME_KOR")
-ARTIST_NAME_ENG = os.getenv("ARTIST_NAME_ENG")
-MELON_ID = os.getenv("MELON_ID")
+from Valuation.utils.artist import current_artist
 
-YOUTUBE_CHANNEL_ID = os.getenv("YOUTUBE_CHANNEL_ID")
 YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
 
 from Valuation.firebase.firebase_handler import save_record, check_record
+from Valuation.utils.stage_graph import stage
 DATA_TARGET='ER_youtube'
+@stage(DATA_TARGET)
 def er_youtube(max_results=50):
+    YOUTUBE_CHANNEL_ID = current_artist().youtube_channel_id
     load_data = check_record(DATA_TARGET, DATA_TARGET, 'videos')
     if load_data:
         print(f'{DATA_TARGET} Loaded')
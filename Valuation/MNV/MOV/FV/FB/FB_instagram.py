@@ -1,28 +1,28 @@
-import instaloader
 import os
 import sys
 
 from dotenv import load_dotenv
 load_dotenv()
 
-ARTIST_ID = os.getenv("ARTIST_ID")
-ARTIST_NAME_KOR = os.getenv("ARTIST_NAME_KOR")
-ARTIST_NAME_ENG = os.getenv("ARTIST_NAME_ENG")
-MELON_ID = os.getenv("MELON_ID")
+from Valuation.utils.artist import current_artist
 
 INSTAGRAM_ACCOUNT_USERNAME=os.getenv("INSTAGRAM_ACCOUNT_USERNAME")
 INSTAGRAM_ACCOUNT_PASSWORD=os.getenv("INSTAGRAM_ACCOUNT_PASSWORD")
 
-TARGET_INSTAGRAM_ACCOUNT=os.getenv("INSTAGRAM_ACCOUNT")
 
 from Valuation.firebase.firebase_handler import save_record, check_record
+from Valuation.utils.stage_graph import stage
 DATA_TARGET = 'FB_instagram'
+@stage(DATA_TARGET)
 def fb_instagram():
+    TARGET_INSTAGRAM_ACCOUNT = current_artist().instagram_account
     load_data = check_record(DATA_TARGET)
     if load_data:
         print(f'{DATA_TARGET} Loaded')
         return load_data.get(DATA_TARGET)
     
+    import instaloader
+
     # 인스턴스 생성
     L = instaloader.Instaloader()
     L.login(user=INSTAGRAM_ACCOUNT_USERNAME, passwd=INSTAGRAM_ACCOUNT_PASSWORD)
@@ -1,7 +1,7 @@
 ##### Valuation/MNV/MOV/FV/FB/FB_main.py #####
 '''
 아티스트 소셜 미디어 데이터 수집 및 팬 베이스 산출 기능을 수행함
-환경변수를 통해 ARTIST_ID, ARTIST_NAME_KOR, ARTIST_NAME_ENG, MELON_ID를 로드함
+current_artist로 실행 대상 아티스트의 ARTIST_ID, ARTIST_NAME_KOR, ARTIST_NAME_ENG, MELON_ID를 로드함
 openpyxl로 Statista 엑셀 파일에서 플랫폼 이름과 사용자 수를 추출함
 추출된 데이터를 딕셔너리 형태로 매핑하여 플랫폼별 사용자 수를 구성함
 fb_youtube, fb_instagram, fb_twitter 모듈을 통해 각 플랫폼의 팔로워 수를 수집함
@@ -12,17 +12,13 @@ Firebase 캐시를 확인하여 중복 연산을 방지함
 최종 결과는 아티스트 정보, 플랫폼별 데이터 및 총 팬 베이스를 포함하여 Firebase에 저장됨
 '''
 
-import openpyxl
 import os
 import sys
 
 from dotenv import load_dotenv
 load_dotenv()
 
-ARTIST_ID = os.getenv("ARTIST_ID")
-ARTIST_NAME_KOR = os.getenv("ARTIST_NAME_KOR")
-ARTIST_NAME_ENG = os.getenv("ARTIST_NAME_ENG")
-MELON_ID = os.getenv("MELON_ID")
+from Valuation.utils.artist import current_artist
 
 from Valuation.firebase.firebase_handler import save_record, load_record
 from Valuation.MNV.MOV.FV.FB.FB_twitter import fb_twitter
@@ -30,6 +26,7 @@ from Valuation.MNV.MOV.FV.FB.FB_youtube import fb_youtube
 from Valuation.MNV.MOV.FV.FB.FB_instagram import fb_instagram
 
 def load_platform_users(target_spreadsheet, target_worksheet):
+    import openpyxl
     spreadsheet = openpyxl.load_workbook(target_spreadsheet)
     worksheet = spreadsheet[target_worksheet]
 
@@ -41,14 +38,22 @@ def load_platform_users(target_spreadsheet, target_worksheet):
     return platform_data
 
 from Valuation.firebase.firebase_handler import save_record, check_record
+from Valuation.utils.stage_graph import stage, shared
 DATA_TARGET='FB'
+@stage(DATA_TARGET)
 def fb():
+    artist = current_artist()
+    ARTIST_ID = artist.artist_id
+    ARTIST_NAME_KOR = artist.name_kor
+    ARTIST_NAME_ENG = artist.name_eng
+    MELON_ID = artist.melon_id
     load_data = check_record(DATA_TARGET, DATA_TARGET, 'sub_data')
     if load_data:
         print(f'{DATA_TARGET} Loaded')
         return load_data.get(DATA_TARGET)
     
-    platform_users = load_platform_users('Valuation/MNV/MOV/FV/FB/statista.xlsx', 'Data')
+    # 플랫폼 사용자 수는 아티스트와 무관하므로 배치 실행 시 한 번만 읽음
+    platform_users = shared(('statista', 'Data'), lambda: load_platform_users('Valuation/MNV/MOV/FV/FB/statista.xlsx', 'Data'))
     
     youtube_user_count = platform_users.get('YouTube', 0.000001)
     twitter_user_count = platform_users.get('X/Twitter', 0.000001)
@@ -121,5 +126,3 @@ def fb():
         })
     save_record(DATA_TARGET, result, DATA_TARGET, 'sub_data')
     return result
-
-fb()
\ No newline at end of file
@@ -6,12 +6,7 @@ import sys
 from dotenv import load_dotenv
 load_dotenv()
 
-ARTIST_ID = os.getenv("ARTIST_ID")
-ARTIST_NAME_KOR = os.getenv("ARTIST_NAME_KOR")
-ARTIST_NAME_ENG = os.getenv("ARTIST_NAME_ENG")
-MELON_ID = os.getenv("MELON_ID")
-
-TWITTER_ACCOUNT = os.getenv("TWITTER_ACCOUNT")
+from Valuation.utils.artist import current_artist
 
 TWITTER_API_KEY = os.getenv("TWITTER_API_KEY")
 TWITTER_API_KEY_SECRET = os.getenv("TWITTER_API_KEY_SECRET")
@@ -22,8 +17,11 @@ TWITTER_CLIENT_ID = os.getenv("TWITTER_CLIENT_ID")
 TWITTER_CLIENT_SECRET = os.getenv("TWITTER_CLIENT_SECRET")
 
 from Valuation.firebase.firebase_handler import save_record, check_record
+from Valuation.utils.stage_graph import stage
 DATA_TARGET = 'FB_twitter'
+@stage(DATA_TARGET)
 def fb_twitter():
+    TWITTER_ACCOUNT = current_artist().twitter_account
     load_data = check_record(DATA_TARGET)
     if load_data:
         print(f'{DATA_TARGET} Loaded')
@@ -6,17 +6,16 @@ import sys
 from dotenv import load_dotenv
 load_dotenv()
 
-ARTIST_ID = os.getenv("ARTIST_ID")
-ARTIST_NAME_KOR = os.getenv("ARTIST_NAME_KOR")
-ARTIST_NAME_ENG = os.getenv("ARTIST_NAME_ENG")
-MELON_ID = os.getenv("MELON_ID")
+from Valuation.utils.artist import current_artist
 
-YOUTUBE_CHANNEL_ID = os.getenv("YOUTUBE_CHANNEL_ID")
 YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
 
 from Valuation.firebase.firebase_handler import save_record, check_record
+from Valuation.utils.stage_graph import stage
 DATA_TARGET='FB_youtube'
+@stage(DATA_TARGET)
 def fb_youtube():
+    YOUTUBE_CHANNEL_ID = current_artist().youtube_channel_id
     load_data = check_record(DATA_TARGET)
     if load_data:
         print(f'{DATA_TARGET} Loaded')
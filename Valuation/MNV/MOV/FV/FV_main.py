@@ -1,6 +1,6 @@
 ##### Valuation/MNV/MOV/FV/FV_main.py #####
 '''
-아티스트 식별자와 정보를 환경변수로부터 로드하여 기본 설정을 수행함
+아티스트 식별자와 정보는 실행 대상 아티스트(current_artist)를 따름
 Weights 모듈에서 FB, ER, G, FV의 가중치 값을 불러와 연산에 적용함
 fb, er, g 모듈을 호출하여 각각 팬 베이스, 소셜 참여율, 팬덤 경제력을 산출함
 Firebase 캐시 확인 후, 기존 데이터가 존재하면 이를 반환하여 중복 연산을 방지함
@@ -12,18 +12,12 @@ Firebase에 save_record 함수를 통해 결과를 저장하여 데이터 일관
 모듈화된 구조로 확장성과 재사용성을 보장하며 후속 분석에 응용 가능함
 '''
 
-import openpyxl
 import os
 import sys
 
 from dotenv import load_dotenv
 load_dotenv()
 
-ARTIST_ID = os.getenv("ARTIST_ID")
-ARTIST_NAME_KOR = os.getenv("ARTIST_NAME_KOR")
-ARTIST_NAME_ENG = os.getenv("ARTIST_NAME_ENG")
-MELON_ID = os.getenv("MELON_ID")
-
 from Valuation.utils.weights import Weights
 FB_WEIGHT = float(Weights.FV.FB_WEIGHT)
 ER_WEIGHT = float(Weights.FV.ER_WEIGHT)
@@ -35,7 +29,9 @@ from Valuation.MNV.MOV.FV.ER.ER_main import er
 from Valuation.MNV.MOV.FV.G.G_main import g
 
 from Valuation.firebase.firebase_handler import save_record, check_record
+from Valuation.utils.stage_graph import stage
 DATA_TARGET='FV'
+@stage(DATA_TARGET)
 def fv():
     load_data = check_record(DATA_TARGET)
     if load_data:
@@ -10,23 +10,19 @@ calculate_fv_t 함수는 팬 베이스(FB), 참여율(ER), 팬덤 경제력(G) 
 fb, er, g 함수 호출로 각각 소셜 미디어, 참여율, 경제력 데이터를 획득하고 fv_trends 함수를 통해 웹 및 유튜브 관심도 데이터를 수집함
 웹과 유튜브 트렌드 DataFrame은 날짜 기준 외부 조인을 통해 통합되어 각 날짜별 트렌드 비율을 산출함
 계산된 FV_t 값은 일정 단위(억 단위)로 출력되며, Firebase에 저장되어 후속 분석에 활용됨
-모듈은 pandas, numpy, scipy, re, dotenv 등 다양한 라이브러리를 활용하여 데이터 전처리, 정규화, 수치 연산 및 API 통합 처리를 수행함
+모듈은 pandas, numpy, re, dotenv 등 다양한 라이브러리를 활용하여 데이터 전처리, 정규화, 수치 연산 및 API 통합 처리를 수행함
 '''
 
 import pandas as pd
 import numpy as np
 from datetime import datetime
-from scipy import stats
-from scipy.optimize import fsolve
 import os
 import re
 from dotenv import load_dotenv
 load_dotenv()
 
-ARTIST_ID = os.getenv("ARTIST_ID")
-ARTIST_NAME_KOR = os.getenv("ARTIST_NAME_KOR")
-ARTIST_NAME_ENG = os.getenv("ARTIST_NAME_ENG")
-MELON_ID = os.getenv("MELON_ID")
+from Valuation.utils.artist import current_artist
+
 SERPAPI_API_KEY= os.getenv("SERPAPI_API_KEY")
 
 def parse_trend_data(timeline):
@@ -49,6 +45,9 @@ def parse_trend_data(timeline):
     return df
 
 def clean_trend_df(df):
+    artist = current_artist()
+    ARTIST_NAME_KOR = artist.name_kor
+    ARTIST_NAME_ENG = artist.name_eng
     desired_queries = [ARTIST_NAME_KOR, ARTIST_NAME_ENG]
     df_clean = df[df['query'].isin(desired_queries)].copy()
     df_clean['extracted_value'] = df_clean['extracted_value'].apply(lambda x: 0 if isinstance(x, str) and ('<' in x or '>' in x) else x)
@@ -150,7 +149,9 @@ FV_TREND_WEIGHT = Weights.FV.FV_TREND_WEIGHT
 FV_T_WEIGHT = Weights.FV.FV_T_WEIGHT
 
 from Valuation.firebase.firebase_handler import save_record, check_record
+from Valuation.utils.stage_graph import stage
 DATA_TARGET='FV_t'
+@stage(DATA_TARGET)
 def fv_t():
     load_data = check_record(DATA_TARGET, DATA_TARGET, "sub_data")
     if load_data:
@@ -15,7 +15,7 @@ sv() 함수를 호출하여 앨범 메트릭 데이터를 가져오고 가장 
 get_interest_over_time() 함수를 통해 웹과 유튜브의 관심도 데이터를 각각 조회함
 GoogleSearch 객체를 사용하여 SERPAPI로부터 타임시리즈 데이터를 요청함
 조회된 데이터는 ‘timeline_data’ 키를 통해 Firebase 캐시로 저장 및 불러옴
-환경변수를 통해 API 키 및 아티스트 관련 정보를 동적으로 로드함
+환경변수에서 API 키를, current_artist로 아티스트 관련 정보를 로드함
 수집된 웹과 유튜브 트렌드 데이터는 이후 PFV와 MRV 계산에 적용됨
 시계열 데이터는 FV 트렌드 분석에 활용 가능한 형태로 가공됨
 모듈화된 구조로 다양한 플랫폼의 시계열 데이터 수집 및 응용이 가능함
@@ -37,10 +37,8 @@ import os
 from dotenv import load_dotenv
 load_dotenv()
 
-ARTIST_ID = os.getenv("ARTIST_ID")
-ARTIST_NAME_KOR = os.getenv("ARTIST_NAME_KOR")
-ARTIST_NAME_ENG = os.getenv("ARTIST_NAME_ENG")
-MELON_ID = os.getenv("MELON_ID")
+from Valuation.utils.artist import current_artist
+
 SERPAPI_API_KEY= os.getenv("SERPAPI_API_KEY")
 CUSTOM_NAME_KOR = '루셈블'
 CUSTOM_NAME_ENG = 'Loossemble'
@@ -91,6 +89,9 @@ def get_interest_over_time(start_period, target = "WEB"):
 
 def get_serpapi_data(start_period, target = 'WEB'):
 
+    artist = current_artist()
+    ARTIST_NAME_KOR = artist.name_kor
+    ARTIST_NAME_ENG = artist.name_eng
     today = datetime.today().strftime('%Y-%m-%d')
 
     query = f"{ARTIST_NAME_KOR}, {ARTIST_NAME_ENG}"
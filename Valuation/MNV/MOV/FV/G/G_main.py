@@ -26,10 +26,7 @@ import sys
 from dotenv import load_dotenv
 load_dotenv()
 
-ARTIST_ID = os.getenv("ARTIST_ID")
-ARTIST_NAME_KOR = os.getenv("ARTIST_NAME_KOR")
-ARTIST_NAME_ENG = os.getenv("ARTIST_NAME_ENG")
-MELON_ID = os.getenv("MELON_ID")
+from Valuation.utils.artist import current_artist
 
 #접속 : https://songstats.com/artist/ji2rm1hs/knk/audience
 #데이터 : https://data.songstats.com/api/v1/audience/map_stats?idUnique=rlm7ou49&source=spotify&
@@ -136,6 +133,7 @@ def get_country_gdp(country_name: str, max_retries: int = 3, retry_delay: int =
 
 
 def calculate_fandom_economic_power() -> pd.DataFrame:
+    ARTIST_ID = current_artist().artist_id
     csv_path = f'Valuation/MNV/MOV/FV/G/G_data_{ARTIST_ID}.csv'
     make_csv(csv_path)
     df = pd.read_csv(csv_path)
@@ -148,7 +146,8 @@ def calculate_fandom_economic_power() -> pd.DataFrame:
 
     df_grouped['리스너비율'] = df_grouped['Current Monthly Listeners'] / total_listeners
 
-    df_grouped['GDP'] = df_grouped['Country'].apply(get_country_gdp)
+    # 국가별 GDP와 환율은 아티스트와 무관하므로 배치 실행 시 국가당 한 번만 조회함
+    df_grouped['GDP'] = df_grouped['Country'].apply(lambda country: shared(('gdp', country), lambda: get_country_gdp(country)))
 
     df_grouped['GDP'] = df_grouped['GDP'].fillna(0)
 
@@ -174,8 +173,10 @@ def get_usd_to_krw():
         return None
 
 from Valuation.firebase.firebase_handler import save_record, check_record
+from Valuation.utils.stage_graph import stage, shared
 DATA_TARGET='G'
 
+@stage(DATA_TARGET)
 def g():
     load_data = check_record(DATA_TARGET, DATA_TARGET, 'fandom_economic_power')
     if load_data:
@@ -183,7 +184,7 @@ def g():
         return load_data.get(DATA_TARGET)
     
     df = calculate_fandom_economic_power()
-    won = get_usd_to_krw()
+    won = shared(('usd_to_krw',), get_usd_to_krw)
 
     g_result = df['팬덤경제력'].sum() * won
     data = df.to_dict(orient='records')
@@ -0,0 +1,106 @@
+##### Valuation/MNV/MOV/MOV_graph.py #####
+'''
+MOV_graph.py는 MOV 파이프라인의 스테이지 의존성 그래프를 선언함
+SV/RV/APV → UDI → AV → PFV, FB/ER/G → FV, CEV/MCV/MDS → PCV, MRV, FV_t → MOV 순서의 흐름을 노드와 선행 목록으로 표현함
+플랫폼 수집 스테이지(FB_youtube, ER_twitter, MCV_instagram 등)도 개별 노드로 선언하여 서로 독립적으로 병렬 실행됨
+스테이지 이름은 각 모듈의 DATA_TARGET과 동일하며, 실행 시에만 해당 모듈을 불러옴
+run_stage 함수로 단일 스테이지를 이름으로 요청하면 필요한 선행 스테이지만 실행됨
+STAGE_COSTS는 스테이지를 다시 계산할 때의 예상 외부 요청 수, API 쿼터, 소요 시간으로 plan 모드(Valuation/utils/planner.py)가 사용함
+params는 각 스테이지가 사용하는 Weights/Variables 값으로 입력 지문에 포함되어, 값이 바뀌면 해당 스테이지와 하위 스테이지만 재계산됨
+external은 외부 API/스크래핑 수집 또는 현재 시각 기준 할인을 사용하는 스테이지로, 지문과 함께 저장 시각 기준 TTL을 적용함
+ttl(시간)은 수집 비용이 큰 스테이지(Selenium 크롤링, CircleChart 연도별 조회, YouTube 페이지 순회, SerpAPI 등)에 기본값(24시간)보다 길게 지정함
+'''
+
+from datetime import datetime
+
+from Valuation.utils.stage_graph import StageGraph
+
+MOV = 'Valuation.MNV.MOV'
+
+STAGE_GRAPH = StageGraph({
+    # PFV
+    'SV': (f'{MOV}.PFV.AV.SV.SV_main:sv', [], {'params': ['Variables.REVENUE_PER_STREAM'], 'external': True}),
+    'RV': (f'{MOV}.PFV.AV.RV.RV_main:rv', [], {'params': ['Variables.LAP', 'Variables.DISCOUNT_RATE'], 'external': True, 'ttl': 168}),
+    'APV': (f'{MOV}.PFV.AV.APV.APV_main:apv', [], {'external': True}),
+    'UDI': (f'{MOV}.PFV.AV.UDI.UDI_main:udi', ['SV', 'RV', 'APV']),
+    'AV': (f'{MOV}.PFV.AV.AV_main:av', ['UDI'], {'params': ['Weights.PFV.SV_WEIGHT', 'Weights.PFV.RV_WEIGHT', 'Weights.PFV.APV_WEIGHT', 'Weights.PFV.UDI_ALPHA', 'Variables.REVENUE_PER_STREAM']}),
+    'PFV': (f'{MOV}.PFV.PFV_main:pfv', ['AV'], {'params': ['Weights.PFV.AV_WEIGHT', 'Weights.PFV.PFV_WEIGHT']}),
+
+    # FV
+    'FB_youtube': (f'{MOV}.FV.FB.FB_youtube:fb_youtube', [], {'external': True}),
+    'FB_twitter': (f'{MOV}.FV.FB.FB_twitter:fb_twitter', [], {'external': True}),
+    'FB_instagram': (f'{MOV}.FV.FB.FB_instagram:fb_instagram', [], {'external': True, 'ttl': 48}),
+    'ER_youtube': (f'{MOV}.FV.ER.ER_youtube:er_youtube', [], {'external': True, 'ttl': 48}),
+    'ER_twitter': (f'{MOV}.FV.ER.ER_twitter:er_twitter', [], {'external': True}),
+    'ER_instagram': (f'{MOV}.FV.ER.ER_instagram:er_instagram', [], {'external': True, 'ttl': 48}),
+    'FB': (f'{MOV}.FV.FB.FB_main:fb', ['FB_youtube', 'FB_twitter', 'FB_instagram']),
+    'ER': (f'{MOV}.FV.ER.ER_main:er', ['ER_youtube', 'ER_twitter', 'ER_instagram', 'FB_youtube', 'FB_twitter', 'FB_instagram']),
+    'G': (f'{MOV}.FV.G.G_main:g', [], {'external': True, 'ttl': 168}),
+    'FV': (f'{MOV}.FV.FV_main:fv', ['FB', 'ER', 'G'], {'params': ['Weights.FV.FB_WEIGHT', 'Weights.FV.ER_WEIGHT', 'Weights.FV.G_WEIGHT', 'Weights.FV.FV_WEIGHT']}),
+    'FV_t': (f'{MOV}.FV.FV_t:fv_t', ['FB', 'ER', 'G', 'SV'], {'params': ['Weights.FV.FB_WEIGHT', 'Weights.FV.ER_WEIGHT', 'Weights.FV.G_WEIGHT', 'Weights.FV.FV_TREND_WEIGHT', 'Weights.FV.FV_T_WEIGHT'], 'external': True, 'ttl': 72}),
+
+    # PCV
+    'CEV_collector': (f'{MOV}.PCV.CEV.CEV_collector:cev_collector', [], {'external': True, 'ttl': 168}),
+    'CEV': (f'{MOV}.PCV.CEV.CEV_main:cev', ['CEV_collector', 'AV', 'ER', 'FV_t'], {'params': ['Weights.PCV.CEV_ALPHA_AV_DEPENDENCY', 'Weights.PCV.CEV_ALPHA_AV_PROPORTION', 'Weights.PCV.CEV_BETA_PER_EVENTS', 'Weights.PCV.CEV_FV_T_WEIGHT', 'Variables.DISCOUNT_RATE'], 'external': True}),
+    'MCV_youtube': (f'{MOV}.PCV.MCV.MCV_youtube:mcv_youtube', [], {'params': ['Variables.DISCOUNT_RATE', 'Variables.REVENUE_PER_STREAM'], 'external': True, 'ttl': 72}),
+    'MCV_twitter': (f'{MOV}.PCV.MCV.MCV_twitter:mcv_twitter', [], {'params': ['Weights.PCV.MCV_EV_WEIGHT', 'Weights.PCV.MCV_TWITTER_LIKES', 'Weights.PCV.MCV_TWITTER_COMMENTS', 'Weights.PCV.MCV_TWITTER_RETWEET', 'Weights.PCV.MCV_TWITTER_QUOTE', 'Variables.DISCOUNT_RATE'], 'external': True}),
+    'MCV_instagram': (f'{MOV}.PCV.MCV.MCV_instagram:mcv_instagram', ['ER_instagram'], {'params': ['Weights.PCV.MCV_EV_WEIGHT', 'Weights.PCV.MCV_INSTAGRAM_LIKES', 'Weights.PCV.MCV_INSTAGRAM_COMMENTS', 'Variables.DISCOUNT_RATE'], 'external': True}),
+    'MCV': (f'{MOV}.PCV.MCV.MCV_main:mcv', ['MCV_youtube', 'MCV_twitter', 'MCV_instagram'], {'params': ['Weights.PCV.MCV_YOUTUBE', 'Weights.PCV.MCV_TWITTER', 'Weights.PCV.MCV_INSTAGRAM']}),
+    'MDS': (f'{MOV}.PCV.MDS.MDS_main:mds', ['FV_t', 'ER', 'AV'], {'params': ['Weights.PCV.MDS_AIF_WEIGHT', 'Weights.PCV.MDS_AV_WEIGHT', 'Variables.DISCOUNT_RATE'], 'external': True}),
+    'PCV': (f'{MOV}.PCV.PCV_main:pcv', ['CEV', 'MCV', 'MDS'], {'params': ['Weights.PCV.CEV_WEIGHT', 'Weights.PCV.MCV_WEIGHT', 'Weights.PCV.MDS_WEIGHT']}),
+
+    # MRV
+    'MRV_collector': (f'{MOV}.MRV.MRV_collector:mrv_collector', [], {'external': True, 'ttl': 168}),
+    'MRV': (f'{MOV}.MRV.MRV_main:mrv', ['MRV_collector', 'FV_t', 'ER', 'AV'], {'params': ['Weights.MRV.BV_AV_WEIGHT', 'Weights.MRV.BV_AV_RATIO', 'Weights.MRV.BV_FV_WEIGHT', 'Weights.MRV.BV_CATEGORY_WEIGHT', 'Variables.DISCOUNT_RATE'], 'external': True}),
+
+    # MOV
+    'MOV': (f'{MOV}.MOV_main:mov', ['FV_t', 'PFV', 'PCV', 'CEV', 'MDS', 'MCV_youtube', 'MCV_twitter', 'MCV_instagram', 'MRV']),
+})
+
+def _circlechart_years(artist):
+    start_years = [int(year) for year in (artist.circlechart_search_start_year or '').split('||') if year]
+    return sum(datetime.now().year - year + 1 for year in start_years)
+
+# 스테이지를 다시 계산할 때의 예상 비용 (plan 모드에서 사용, 실측 기반 대략값)
+# http: 외부 요청 수, quota: API별 쿼터 단위, seconds: 소요 시간(초)
+# items가 있으면 per_item 비용을 항목 수만큼 더함. items는 정수 또는 Artist를 받는 함수
+STAGE_COSTS = {
+    'SV': {'http': 1, 'seconds': 2, 'items': lambda artist: 30 * len(artist.melon_id_list), 'per_item': {'http': 2, 'seconds': 0.5}},
+    'RV': {'seconds': 1, 'items': _circlechart_years, 'per_item': {'http': 4, 'seconds': 1}},
+    'APV': {'http': 2, 'quota': {'spotify': 2}, 'seconds': 2, 'items': 5, 'per_item': {'http': 2, 'quota': {'spotify': 2}, 'seconds': 0.5}},
+    'UDI': {'seconds': 0.5},
+    'AV': {'seconds': 0.5},
+    'PFV': {'seconds': 0.5},
+
+    'FB_youtube': {'http': 1, 'quota': {'youtube': 1}, 'seconds': 1},
+    'FB_twitter': {'http': 1, 'quota': {'twitter': 1}, 'seconds': 1},
+    'FB_instagram': {'http': 3, 'quota': {'instagram': 3}, 'seconds': 10},
+    'ER_youtube': {'http': 2, 'quota': {'youtube': 101}, 'seconds': 2},
+    'ER_twitter': {'http': 2, 'quota': {'twitter': 2}, 'seconds': 2},
+    'ER_instagram': {'http': 5, 'quota': {'instagram': 5}, 'seconds': 60},
+    'FB': {'http': 1, 'seconds': 2},
+    'ER': {'http': 1, 'seconds': 2},
+    'G': {'http': 12, 'seconds': 15},
+    'FV': {'seconds': 0.5},
+    'FV_t': {'http': 2, 'quota': {'serpapi': 2}, 'seconds': 10},
+
+    'CEV_collector': {'http': 5, 'seconds': 60, 'items': 40, 'per_item': {'http': 1, 'seconds': 5}},
+    'CEV': {'seconds': 1},
+    'MCV_youtube': {'http': 1, 'quota': {'youtube': 1}, 'seconds': 3, 'items': 10, 'per_item': {'http': 2, 'quota': {'youtube': 2}, 'seconds': 0.5}},
+    'MCV_twitter': {'http': 1, 'quota': {'twitter': 1}, 'seconds': 2, 'items': 10, 'per_item': {'http': 1, 'quota': {'twitter': 1}, 'seconds': 1}},
+    'MCV_instagram': {'seconds': 1},
+    'MCV': {'seconds': 0.5},
+    'MDS': {'seconds': 1},
+    'PCV': {'seconds': 0.5},
+
+    'MRV_collector': {'seconds': 30, 'items': lambda artist: 20 * len(artist.broadcast_tabs), 'per_item': {'http': 2, 'seconds': 7}},
+    'MRV': {'seconds': 1},
+
+    'MOV': {'seconds': 1},
+}
+
+def run_stage(name, max_workers=None):
+    """
+    name 스테이지를 선행 스테이지와 함께 실행하고 결과를 반환한다.
+    """
+    return STAGE_GRAPH.run_stage(name, max_workers)
@@ -8,6 +8,9 @@ mcv_twitter는 트윗의 참여 지표(좋아요, 리트윗, 답글, 인용 등)
 mcv_instagram은 인스타그램 게시물의 좋아요와 댓글 데이터를 활용하여 미디어 가치를 평가함
 각 모듈의 결과에 가중치를 적용하여 PFV, PCV, MRV 값이 보정됨
 PFVFunc와 PCVFunc 클래스를 통해 음반 및 공연 관련 데이터를 시간에 따라 분산 보정함
+앨범별 SV/APV/RV 배분은 PFVFunc.build_pfv_matrix가 공통 월 축 위의 (앨범 x 월) 행렬로 한 번에 계산하여 합산함 (breakdown=True면 앨범별 배분도 반환)
+MCV 이벤트(트윗, 게시물, 영상)는 월별로 합산한 뒤 감쇠 가중치 행렬과 한 번에 곱하여 이벤트 수와 무관하게 빠르게 분산함
+CEV(공연)와 MRV(방송) 이벤트는 날짜를 한 번에 변환하고 공통 감쇠 커널로 만든 기여를 scatter-add로 누적함
 MRV, FV_t 데이터와 결합하여 MOV_t(총 가치)를 산출함
 산출된 타임라인 데이터는 visualizer 모듈로 시각화되어 분석에 활용됨
 전체 파이프라인은 다양한 플랫폼 데이터를 통합, 정규화 및 시계열 분석으로 산업 가치를 평가함
@@ -37,7 +40,6 @@ from Valuation.MNV.MOV.MOV_visualization import visualizer
 import calendar
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 
 WEIGHT = {
     "저작권": 8.9,
@@ -52,6 +54,12 @@ WEIGHT = {
     "매니지먼트": 0.2,
 }
 
+# CEV(공연), MRV(방송) 이벤트 영향의 월 감쇠율
+EVENT_DECAY_RATE = 0.1
+
+# PFV (앨범 x 월) 행렬을 한 번에 계산하는 앨범 수. 메모리 사용량은 PFV_CHUNK_ALBUMS x 개월 수로 제한됨
+PFV_CHUNK_ALBUMS = 256
+
 def convert_to_utc(timestamp):
     timestamp = pd.to_datetime(timestamp)
     if timestamp.tzinfo is None:
@@ -59,14 +67,67 @@ def convert_to_utc(timestamp):
     else:
         return timestamp.tz_convert("UTC")
 
+def convert_series_to_utc(series):
+    if not pd.api.types.is_datetime64_any_dtype(series):
+        return series.apply(convert_to_utc)
+    if series.dt.tz is None:
+        return series.dt.tz_localize("UTC")
+    return series.dt.tz_convert("UTC")
+
+def parse_dates(values):
+    """
+    날짜 목록을 한 번에 파싱. 파싱할 수 없는 날짜는 NaT.
+    """
+    values = pd.Series(values, dtype=object)
+    try:
+        dates = pd.to_datetime(values, errors='coerce', format='mixed')
+        if not (dates.isna() & values.notna()).any():
+            return dates
+    except ValueError:
+        pass
+    # 시간대가 섞여 있으면 일괄 파싱이 실패하거나 NaT가 되므로, 각 날짜를 원래 시간대 그대로 하나씩 파싱함 (월 말일 등을 원래 시간대 기준으로 구하기 위함)
+    return values.map(lambda value: pd.to_datetime(value, errors='coerce'))
+
+def to_event_months(periods):
+    """
+    이벤트 날짜 목록을 한 번에 파싱하여 해당 월 말일(UTC)로 변환. 파싱할 수 없는 날짜는 NaT.
+    """
+    return convert_series_to_utc(parse_dates(periods) + pd.offsets.MonthEnd(0))
+
+def accumulate_decaying_events(timeline_index, event_months, values, max_value, weight, decay_rate, base_influence_months, max_influence_months, min_influence_months):
+    """
+    각 이벤트 값을 이벤트 월 이후 첫 타임라인 월부터 영향 개월 수 동안 exp(-decay_rate * k)로 감쇠시켜 더한 합계 배열.
+    영향 개월 수는 max_value 대비 이벤트 값의 비율로 base_influence_months~max_influence_months 사이에서 정해짐.
+    모든 이벤트의 기여를 (이벤트 x 개월) 배열로 만든 뒤 np.add.at 한 번으로 이벤트 순서대로 누적한다.
+    """
+    totals = np.zeros(len(timeline_index))
+    if max_value == 0:
+        # 영향 개월 수를 계산할 수 없어 모든 이벤트를 건너뜀 (이벤트별 ZeroDivisionError)
+        return totals
+    values = np.asarray(values, dtype=float)
+    influence = np.trunc(base_influence_months + (values / max_value * (max_influence_months - base_influence_months)))
+    valid = event_months.notna().to_numpy() & np.isfinite(influence)
+    if not valid.any():
+        return totals
+    try:
+        positions = timeline_index.searchsorted(pd.DatetimeIndex(event_months[valid]), side='left')
+    except TypeError:
+        # 타임라인과 이벤트의 시간대가 다르면 이벤트를 타임라인에 놓을 수 없어 건너뜀
+        return totals
+    influence = np.maximum(np.minimum(influence[valid], max_influence_months), min_influence_months).astype(int)
+
+    months_since_event = np.arange(max(influence.max(), 0))
+    kernel = np.exp(-decay_rate * months_since_event)
+    targets = positions[:, None] + months_since_event[None, :]
+    inside = (months_since_event[None, :] < influence[:, None]) & (targets < len(timeline_index))
+    contributions = values[valid][:, None] * kernel[None, :] * weight
+    np.add.at(totals, targets[inside], contributions[inside])
+    return totals
+
 class PFVFunc:
     @staticmethod
-    def distribute_rv_over_time(rv, start_date, end_date):
-        start_date = convert_to_utc(start_date)
-        end_date = convert_to_utc(end_date)
-        date_range = pd.date_range(start=start_date, end=end_date, freq='ME')
-        num_months = len(date_range)
-
+    def rv_decay_rates(num_months):
+        # 발매 후 num_months개월 동안의 음반 판매 가치 배분율 (이력이 12개월 이하이면 기간에 맞춰 줄임)
         if num_months > 12:
             initial_decay_rates = np.linspace(0.6, 0.4, 3)
             mid_decay_rates = np.linspace(0.4, 0.3, 6)  
@@ -76,8 +137,16 @@ class PFVFunc:
             initial_decay_rates = np.linspace(0.6, 0.4, min(3, num_months))
             mid_decay_rates = np.linspace(0.4, 0.3, num_months - 2)
             decay_rates = np.concatenate([initial_decay_rates, mid_decay_rates])
+        return decay_rates[:num_months]
+
+    @staticmethod
+    def distribute_rv_over_time(rv, start_date, end_date):
+        start_date = convert_to_utc(start_date)
+        end_date = convert_to_utc(end_date)
+        date_range = pd.date_range(start=start_date, end=end_date, freq='ME')
+        num_months = len(date_range)
 
-        rv_values = rv * decay_rates[:num_months] * WEIGHT['음반']
+        rv_values = rv * PFVFunc.rv_decay_rates(num_months) * WEIGHT['음반']
         df = pd.DataFrame({'date': date_range, 'rv_t': rv_values})
         return df
     
@@ -100,65 +169,96 @@ class PFVFunc:
         return df
     
     @staticmethod
-    def integrate_pfv_data(timeline_df, pfv_data, end_date, decay_rate=None, residual_rate=0.001):
-        albums_data = pfv_data['av_a']
-        sv_value_t_dfs = []
-        apv_value_t_dfs = []
-        rv_value_t_dfs = []
-
-        for item in albums_data:
-            sv = item.get('sv', 0)
-            apv = item.get('apv', 0)
-            rv = item.get('rv', 0)
-            release_date = pd.to_datetime(item['release_date'])
-
-            if sv > 0:
-                sv_df = PFVFunc.distribute_value_over_time(
-                    sv, release_date, end_date, decay_rate=decay_rate, residual_rate=residual_rate, key_str='sv_t'
-                )
-                sv_df.set_index('date', inplace=True)
-                sv_value_t_dfs.append(sv_df['sv_t'])
-
-            if apv > 0:
-                apv_df = PFVFunc.distribute_value_over_time(
-                    apv, release_date, end_date, decay_rate=decay_rate, residual_rate=residual_rate, key_str='apv_t'
-                )
-                apv_df.set_index('date', inplace=True)
-                apv_value_t_dfs.append(apv_df['apv_t'])
-
-            if rv > 0:
-                rv_t_df = PFVFunc.distribute_rv_over_time(rv, release_date, end_date)
-                rv_t_df.set_index('date', inplace=True)
-                rv_value_t_dfs.append(rv_t_df['rv_t'])
-
-        if sv_value_t_dfs:
-            total_sv_t = pd.concat(sv_value_t_dfs, axis=1).sum(axis=1)
-            timeline_df = timeline_df.join(total_sv_t.rename('sv_t'), how='left')
-            timeline_df['sv_t'] = timeline_df['sv_t'] * WEIGHT['스트리밍']
-            timeline_df['sv_t'] = timeline_df['sv_t'].fillna(0)
-        else:
-            timeline_df['sv_t'] = 0.0
-
-        if apv_value_t_dfs:
-            total_apv_t = pd.concat(apv_value_t_dfs, axis=1).sum(axis=1)
-            timeline_df = timeline_df.join(total_apv_t.rename('apv_t'), how='left')
-            timeline_df['apv_t'] = timeline_df['apv_t'] * WEIGHT['인기도']
-            timeline_df['apv_t'] = timeline_df['apv_t'].fillna(0)
-        else:
-            timeline_df['apv_t'] = 0.0
+    def build_pfv_matrix(albums_data, end_date, decay_rate=None, residual_rate=0.001, chunk_size=PFV_CHUNK_ALBUMS, breakdown=False):
+        """
+        모든 앨범의 월별 SV/APV/RV 배분을 공통 월 축 위의 (앨범 x 월) 행렬로 계산하여 월별 합계를 반환한다.
+        앨범별 값은 distribute_value_over_time, distribute_rv_over_time과 같으며 (RV만 음반 가중치 적용), 앨범은 chunk_size개씩 계산한다.
+        반환: {'sv_t', 'apv_t', 'rv_t': 월말 날짜(UTC) 인덱스의 합계 Series, 'albums': breakdown=True면 {'sv_t', 'apv_t', 'rv_t': 앨범(albums_data 순서) x 월 DataFrame}}
+        """
+        total_periods = 70 * 12
+        if decay_rate is None:
+            decay_rate = -np.log(residual_rate) / total_periods
+        keys = {'sv_t': 'sv', 'apv_t': 'apv', 'rv_t': 'rv'}
+        columns = list(keys)
+        values = {column: np.array([item.get(key, 0) for item in albums_data], dtype=float) for column, key in keys.items()}
 
-        if rv_value_t_dfs:
-            total_rv_t = pd.concat(rv_value_t_dfs, axis=1).sum(axis=1)
-            timeline_df = timeline_df.join(total_rv_t.rename('rv_t'), how='left')
-            timeline_df['rv_t'] = timeline_df['rv_t'].fillna(0)
-        else:
-            timeline_df['rv_t'] = 0.0
+        release_dates = convert_series_to_utc(parse_dates([item['release_date'] for item in albums_data]))
+        end_date = convert_to_utc(end_date)
+        # 발매 시각이 자정이 아니면 월말 날짜도 같은 시각이 되므로 (distribute_*와 동일) 시각별로 월 축을 따로 만듦
+        time_of_day = release_dates - release_dates.dt.normalize()
+
+        totals = {column: [] for column in columns}
+        albums = {column: [] for column in columns}
+        for offset in time_of_day.dropna().unique():
+            rows = np.flatnonzero((time_of_day == offset).to_numpy())
+            starts = release_dates.iloc[rows]
+            month_axis = pd.date_range(start=starts.min(), end=end_date, freq='ME')
+            month_numbers = np.asarray(starts.dt.year * 12 + starts.dt.month)
+            first_month = month_numbers.min()
+            num_months = np.maximum(first_month + len(month_axis) - month_numbers, 0)
+
+            rv_lengths = np.unique(num_months[values['rv_t'][rows] > 0])
+            rv_rates = np.zeros((len(rv_lengths), max(len(month_axis), 1)))
+            for i, length in enumerate(rv_lengths):
+                rv_rates[i, :length] = PFVFunc.rv_decay_rates(length)
+
+            group_totals = {column: np.zeros(len(month_axis)) for column in columns}
+            for chunk in range(0, len(rows), chunk_size):
+                chunk_rows = rows[chunk:chunk + chunk_size]
+                # t: 앨범별 발매 월부터 경과한 개월 수 (공통 월 축 기준)
+                t = np.arange(len(month_axis))[None, :] - (month_numbers[chunk:chunk + chunk_size] - first_month)[:, None]
+                active = (t >= 0) & (t < num_months[chunk:chunk + chunk_size, None])
+                t = np.where(active, t, 0)
+                allocations = {}
+
+                for column in ['sv_t', 'apv_t']:
+                    value = values[column][chunk_rows]
+                    value = np.where(value > 0, value, 0.0)[:, None]
+                    allocation = np.where(active, value * np.exp(-decay_rate * t), 0.0)
+                    total_value_t = allocation.sum(axis=1, keepdims=True)
+                    allocations[column] = allocation * np.divide(value, total_value_t, out=np.zeros_like(value), where=total_value_t > 0)
+
+                rv = values['rv_t'][chunk_rows]
+                rv_rows_in_chunk = rv > 0
+                rates = np.zeros(t.shape)
+                if rv_rows_in_chunk.any():
+                    rate_rows = np.searchsorted(rv_lengths, num_months[chunk:chunk + chunk_size][rv_rows_in_chunk])
+                    rates[rv_rows_in_chunk] = rv_rates[rate_rows[:, None], t[rv_rows_in_chunk]]
+                allocations['rv_t'] = np.where(active & rv_rows_in_chunk[:, None], rv[:, None] * rates * WEIGHT['음반'], 0.0)
+
+                for column in columns:
+                    group_totals[column] += allocations[column].sum(axis=0)
+                    if breakdown:
+                        albums[column].append(pd.DataFrame(allocations[column], index=chunk_rows, columns=month_axis))
+
+            for column in columns:
+                totals[column].append(pd.Series(group_totals[column], index=month_axis, name=column))
+
+        result = {
+            column: pd.concat(totals[column]).sort_index() if totals[column] else pd.Series(dtype=float, name=column)
+            for column in columns
+        }
+        if breakdown:
+            result['albums'] = {
+                column: pd.concat(albums[column], sort=True).fillna(0.0).sort_index().sort_index(axis=1) if albums[column] else pd.DataFrame()
+                for column in columns
+            }
+        return result
 
+    @staticmethod
+    def integrate_pfv_data(timeline_df, pfv_data, end_date, decay_rate=None, residual_rate=0.001):
+        pfv_matrix = PFVFunc.build_pfv_matrix(pfv_data['av_a'], end_date, decay_rate=decay_rate, residual_rate=residual_rate)
+        timeline_df = timeline_df.join(pfv_matrix['sv_t'], how='left')
+        timeline_df['sv_t'] = (timeline_df['sv_t'] * WEIGHT['스트리밍']).fillna(0)
+        timeline_df = timeline_df.join(pfv_matrix['apv_t'], how='left')
+        timeline_df['apv_t'] = (timeline_df['apv_t'] * WEIGHT['인기도']).fillna(0)
+        timeline_df = timeline_df.join(pfv_matrix['rv_t'], how='left')
+        timeline_df['rv_t'] = timeline_df['rv_t'].fillna(0)
         return timeline_df
     
 class PCVFunc:
     @staticmethod
-    def integrate_cev_events(timeline_df, cev_events, decay_rate=0.1, base_influence_months=2, max_influence_months=12, min_influence_months=1):
+    def integrate_cev_events(timeline_df, cev_events, decay_rate=EVENT_DECAY_RATE, base_influence_months=2, max_influence_months=12, min_influence_months=1):
         timeline_df['cev_t'] = 0.0
 
         if not cev_events:
@@ -166,138 +266,68 @@ class PCVFunc:
         
         max_cer = max(event.get('cer', 0) for event in cev_events)
 
-        for event in cev_events:
-            cer = event.get('cer', 0)
-            start_period = event.get('start_period', None)
-            if start_period is None:
-                continue
-            try:
-                event_date = pd.to_datetime(start_period)
-                last_day = calendar.monthrange(event_date.year, event_date.month)[1]
-                event_month = event_date.replace(day=last_day)
-                event_month = convert_to_utc(event_month)
-
-                influence_months = int(base_influence_months + (cer / max_cer * (max_influence_months - base_influence_months)))
-                influence_months = min(influence_months, max_influence_months)
-                influence_months = max(influence_months, min_influence_months)
-
-                relevant_dates = timeline_df.loc[event_month:].index[:influence_months]
-                months_since_event = np.arange(len(relevant_dates))
-
-                decay_values = cer * np.exp(-decay_rate * months_since_event)
-
-                timeline_df.loc[relevant_dates, 'cev_t'] += decay_values * WEIGHT['공연']
-
-            except Exception:
-                continue
+        events = [event for event in cev_events if event.get('start_period', None) is not None]
+        if events:
+            timeline_df['cev_t'] = accumulate_decaying_events(
+                timeline_df.index,
+                to_event_months([event['start_period'] for event in events]),
+                [event.get('cer', 0) for event in events],
+                max_cer, WEIGHT['공연'], decay_rate, base_influence_months, max_influence_months, min_influence_months,
+            )
         return timeline_df
     
+    @staticmethod
+    def fraction_decay_factors(t, peak_month=6, initial_decay_rate=0.001, decay_increment=0.0005, max_decay_rate=0.1, max_factor=0.01):
+        # 경과 개월 수 t(배열)의 MCV 가중치. peak_month까지 선형 증가 후 감쇠율이 커지며 0으로 줄어듦
+        t = np.asarray(t, dtype=float)
+        current_decay_rate = np.minimum(initial_decay_rate + (t - peak_month) * decay_increment, max_decay_rate)
+        decay = np.maximum(max_factor - (t - peak_month) * current_decay_rate, 0.0)
+        return np.where(t <= peak_month, (t / peak_month) * max_factor, decay)
+
+    @staticmethod
+    def accumulate_month_events(timeline_index, event_dates, values, kernel):
+        """
+        이벤트 값을 이벤트 날짜 이후 첫 타임라인 월에 모은 뒤, 그 월부터 경과 개월 수 t의 kernel(t) 가중치로 이후 모든 월에 분산한 합계 배열.
+        타임라인은 연속한 월이므로 월별 합계와 kernel(0..)의 합성곱으로 계산하며, kernel은 0이 아닌 구간(MCV 가중치는 약 10개월)까지만 사용한다.
+        """
+        totals = np.zeros(len(timeline_index))
+        try:
+            positions = timeline_index.searchsorted(event_dates, side='left')
+        except TypeError:
+            # 타임라인과 이벤트의 시간대가 다르면 이벤트를 타임라인에 놓을 수 없어 건너뜀
+            return totals
+        inside = positions < len(timeline_index)
+        if not inside.any():
+            return totals
+        monthly_values = np.bincount(positions[inside], weights=np.asarray(values, dtype=float)[inside], minlength=len(timeline_index))
+        weights = kernel(np.arange(len(timeline_index)))
+        support = np.flatnonzero(weights)
+        if not len(support):
+            return totals
+        return np.convolve(monthly_values, weights[:support[-1] + 1])[:len(timeline_index)]
+
     @staticmethod
     def integrate_mcv_events(timeline_df, mcv_twitter, mcv_youtube, mcv_instagram):
-        def compute_fraction_decay_factor(t, peak_month=6, initial_decay_rate=0.001, decay_increment=0.0005, max_decay_rate=0.1, max_factor=0.01):
-            if t <= peak_month:
-                return (t / peak_month) * max_factor
-            else:
-                current_decay_rate = initial_decay_rate + (t - peak_month) * decay_increment
-                current_decay_rate = min(current_decay_rate, max_decay_rate)
-                decay = max_factor - (t - peak_month) * current_decay_rate
-                return max(decay, 0.0)
-
-        timeline_df['mcv_twitter'] = 0.0
-        timeline_df['mcv_youtube'] = 0.0 
-        timeline_df['mcv_instagram'] = 0.0   
-        
-        twitter_events = mcv_twitter.get('tweets', [])
-        tweets_df = pd.DataFrame(twitter_events)
-        if not tweets_df.empty:
-            tweets_df['created_at'] = pd.to_datetime(tweets_df['created_at'], errors='coerce')
-            tweets_df = tweets_df.dropna(subset=['created_at'])
-            
-            tweets_df['release_date'] = tweets_df['created_at'] + pd.offsets.MonthEnd(0)
-            tweets_df['release_date'] = tweets_df['release_date'].apply(convert_to_utc)
-            tweets_df['mcv'] = pd.to_numeric(tweets_df['mcv'], errors='coerce').fillna(0.0)
-
-            for _, row in tweets_df.iterrows():
-                release_date = row['release_date']
-                mcv_value = row['mcv'] * WEIGHT['트위터']
-
-                if release_date not in timeline_df.index:
-                    release_date = timeline_df.index[timeline_df.index >= release_date]
-                    if not release_date.empty:
-                        release_date = release_date[0]
-                    else:
-                        continue
-
-                relevant_dates = timeline_df.loc[release_date:].index
-                months_since_release = (relevant_dates.year - release_date.year) * 12 + (relevant_dates.month - release_date.month)
-
-                decay_factors = months_since_release.map(
-                    lambda t: compute_fraction_decay_factor(t)
-                )
-                
-                contributions = mcv_value * decay_factors
-                timeline_df.loc[relevant_dates, 'mcv_twitter'] += contributions
-
-        instagram_events = mcv_instagram.get('posts', [])
-        instagram_df = pd.DataFrame(instagram_events)
-        if not instagram_df.empty:
-            instagram_df['date'] = pd.to_datetime(instagram_df['date'], errors='coerce')
-            instagram_df = instagram_df.dropna(subset=['date'])
-            
-            instagram_df['release_date'] = instagram_df['date'] + pd.offsets.MonthEnd(0)
-            instagram_df['release_date'] = instagram_df['release_date'].apply(convert_to_utc)
-            instagram_df['mcv'] = pd.to_numeric(instagram_df['mcv'], errors='coerce').fillna(0.0)
-
-            for _, row in instagram_df.iterrows():
-                release_date = row['release_date']
-                mcv_value = row['mcv'] * WEIGHT['인스타그램']
-
-                if release_date not in timeline_df.index:
-                    release_date = timeline_df.index[timeline_df.index >= release_date]
-                    if not release_date.empty:
-                        release_date = release_date[0]
-                    else:
-                        continue
-
-                relevant_dates = timeline_df.loc[release_date:].index
-                months_since_release = (relevant_dates.year - release_date.year) * 12 + (relevant_dates.month - release_date.month)
-
-                decay_factors = months_since_release.map(
-                    lambda t: compute_fraction_decay_factor(t)
-                )
-                
-                contributions = mcv_value * decay_factors
-                timeline_df.loc[relevant_dates, 'mcv_instagram'] += contributions
-
-        youtube_events = mcv_youtube.get('details', [])
-        youtube_df = pd.DataFrame(youtube_events)
-        if not youtube_df.empty:
-            youtube_df['publishedAt'] = pd.to_datetime(youtube_df['publishedAt'], errors='coerce')
-            youtube_df = youtube_df.dropna(subset=['publishedAt'])
-            
-            youtube_df['release_date'] = youtube_df['publishedAt'] + pd.offsets.MonthEnd(0)
-            youtube_df['release_date'] = youtube_df['release_date'].apply(convert_to_utc)
-            youtube_df['MCV'] = pd.to_numeric(youtube_df['MCV'], errors='coerce').fillna(0.0)
-            
-            for _, row in youtube_df.iterrows():
-                release_date = row['release_date']
-                mcv_value = row['MCV'] * WEIGHT['유튜브']
-                
-                if release_date not in timeline_df.index:
-                    release_date = timeline_df.index[timeline_df.index >= release_date]
-                    if not release_date.empty:
-                        release_date = release_date[0]
-                    else:
-                        continue
-                
-                relevant_dates = timeline_df.loc[release_date:].index
-                months_since_release = (relevant_dates.year - release_date.year) * 12 + (relevant_dates.month - release_date.month)
-                
-                decay_factors = months_since_release.map(
-                    lambda t: compute_fraction_decay_factor(t)
-                )
-                contributions = mcv_value * decay_factors
-                timeline_df.loc[relevant_dates, 'mcv_youtube'] += contributions
+        platforms = [
+            ('mcv_twitter', mcv_twitter.get('tweets', []), 'created_at', 'mcv', WEIGHT['트위터']),
+            ('mcv_youtube', mcv_youtube.get('details', []), 'publishedAt', 'MCV', WEIGHT['유튜브']),
+            ('mcv_instagram', mcv_instagram.get('posts', []), 'date', 'mcv', WEIGHT['인스타그램']),
+        ]
+        for column, *_ in platforms:
+            timeline_df[column] = 0.0
+
+        for column, events, date_key, value_key, weight in platforms:
+            if not events:
+                continue
+            # 수만 건의 이벤트에서 DataFrame 전체를 만들지 않고 필요한 두 필드만 꺼냄
+            event_dates = pd.to_datetime(pd.Series([event.get(date_key) for event in events]), errors='coerce')
+            valid = event_dates.notna()
+            release_dates = convert_series_to_utc(event_dates[valid] + pd.offsets.MonthEnd(0))
+            mcv_values = pd.to_numeric(pd.Series([event.get(value_key) for event in events])[valid], errors='coerce').fillna(0.0) * weight
+
+            timeline_df[column] = PCVFunc.accumulate_month_events(
+                timeline_df.index, pd.DatetimeIndex(release_dates), mcv_values.to_numpy(), PCVFunc.fraction_decay_factors
+            )
 
         timeline_df['mcv_t'] = timeline_df['mcv_twitter'] + timeline_df['mcv_youtube']
         return timeline_df
@@ -324,7 +354,7 @@ class PCVFunc:
     
 class MRVFunc:
     @staticmethod
-    def integrate_mrv_events(timeline_df, mrv_events, decay_rate=0.1, base_influence_months=2, max_influence_months=12, min_influence_months=1):
+    def integrate_mrv_events(timeline_df, mrv_events, decay_rate=EVENT_DECAY_RATE, base_influence_months=2, max_influence_months=12, min_influence_months=1):
         timeline_df['mrv_t'] = 0.0
         # mrv_events가 비어있는지 확인
         if not mrv_events:
@@ -332,36 +362,32 @@ class MRVFunc:
         
         max_cer = max(event.get('BF_event', 0) for event in mrv_events)
 
-        for event in mrv_events:
-            mrv = event.get('BF_event', 0)
-            start_period = event.get('start_period', None)
-            if start_period is None:
-                continue
-            try:
-                event_date = pd.to_datetime(start_period)
-                last_day = calendar.monthrange(event_date.year, event_date.month)[1]
-                event_month = event_date.replace(day=last_day)
-                event_month = convert_to_utc(event_month)
-
-                influence_months = int(base_influence_months + (mrv / max_cer * (max_influence_months - base_influence_months)))
-                influence_months = min(influence_months, max_influence_months)
-                influence_months = max(influence_months, min_influence_months)
-
-                relevant_dates = timeline_df.loc[event_month:].index[:influence_months]
-                months_since_event = np.arange(len(relevant_dates))
-
-                decay_values = mrv * np.exp(-decay_rate * months_since_event)
-
-                timeline_df.loc[relevant_dates, 'mrv_t'] += decay_values * WEIGHT['매니지먼트']
-            except Exception:
-                continue
+        events = [event for event in mrv_events if event.get('start_period', None) is not None]
+        if events:
+            timeline_df['mrv_t'] = accumulate_decaying_events(
+                timeline_df.index,
+                to_event_months([event['start_period'] for event in events]),
+                [event.get('BF_event', 0) for event in events],
+                max_cer, WEIGHT['매니지먼트'], decay_rate, base_influence_months, max_influence_months, min_influence_months,
+            )
         return timeline_df
 
-def set_timeline(fv_t_data, pfv_data, pcv_data, cev_events, mds_records, mcv_youtube_data, mcv_twitter_data, mcv_instagram_data, mrv_data, decay_rate=None, residual_rate=0.001):
+def copyright_decay_rate(copyright_weight=None, residual_rate=0.001):
+    # 70년 후 가치가 초기의 residual_rate로 감소하는 월 감쇠율에 저작권 가중치를 곱한 값
+    total_periods = 70 * 12  # 70년을 월 단위로 환산
+    if copyright_weight is None:
+        copyright_weight = WEIGHT['저작권']
+    return -np.log(residual_rate) / total_periods * copyright_weight
+
+def build_timeline(fv_t_data, pfv_data, pcv_data, cev_events, mds_records, mcv_youtube_data, mcv_twitter_data, mcv_instagram_data, mrv_data, decay_rate=None, residual_rate=0.001):
+    """
+    FV_t 기간의 월말(UTC) 날짜를 인덱스로 하는 컴포넌트별 타임라인 DataFrame.
+    """
     timeline_dates = [item['date'] for item in fv_t_data['sub_data']]
     start_date = min(timeline_dates)
     end_date = max(timeline_dates)
-    timeline_df = pd.DataFrame({'date': pd.date_range(start=start_date, end=end_date, freq='ME')})
+    # 각 컴포넌트의 월말 날짜가 UTC이므로 타임라인도 UTC로 만들어야 join과 날짜 비교가 가능함
+    timeline_df = pd.DataFrame({'date': pd.date_range(start=start_date, end=end_date, freq='ME', tz='UTC')})
     timeline_df.set_index('date', inplace=True)
 
     # PFV 데이터 통합
@@ -380,7 +406,7 @@ def set_timeline(fv_t_data, pfv_data, pcv_data, cev_events, mds_records, mcv_you
 
     # FV_t 데이터 통합
     fv_t_df = pd.DataFrame(fv_t_data['sub_data'])
-    fv_t_df['date'] = pd.to_datetime(fv_t_df['date'])
+    fv_t_df['date'] = convert_series_to_utc(pd.to_datetime(fv_t_df['date']))
     fv_t_df.set_index('date', inplace=True)
     timeline_df = timeline_df.join(fv_t_df[['FV_t']], how='left')
     timeline_df['FV_t'] = timeline_df['FV_t'].fillna(0)
@@ -392,11 +418,19 @@ def set_timeline(fv_t_data, pfv_data, pcv_data, cev_events, mds_records, mcv_you
         timeline_df['pcv_t'] +
         timeline_df['mrv_t']
     )
+    return timeline_df
 
+def set_timeline(fv_t_data, pfv_data, pcv_data, cev_events, mds_records, mcv_youtube_data, mcv_twitter_data, mcv_instagram_data, mrv_data, decay_rate=None, residual_rate=0.001):
+    timeline_df = build_timeline(
+        fv_t_data, pfv_data, pcv_data, cev_events, mds_records, mcv_youtube_data, mcv_twitter_data, mcv_instagram_data, mrv_data,
+        decay_rate=decay_rate, residual_rate=residual_rate,
+    )
     timeline_df.reset_index(inplace=True)
     return timeline_df.to_dict('records')
 
 def plot_timeline(distribution_result):
+    import matplotlib.pyplot as plt
+
     df = pd.DataFrame(distribution_result)
     df['date'] = pd.to_datetime(df['date'])
     df.set_index('date', inplace=True)
@@ -444,11 +478,16 @@ def plot_timeline(distribution_result):
     plt.show()
 
 from Valuation.firebase.firebase_handler import save_record
+from Valuation.utils.stage_graph import stage
+from Valuation.MNV.MOV.MOV_graph import STAGE_GRAPH
 DATA_TARGET='WEIGHT'
+@stage('MOV')
 def mov():
-    total_periods = 70 * 12  # 70년을 월 단위로 환산
     residual_rate = 0.001    # 70년 후 가치가 초기의 0.1%로 감소
-    decay_rate = -np.log(residual_rate) / total_periods * WEIGHT['저작권']
+    decay_rate = copyright_decay_rate(residual_rate=residual_rate)
+
+    # 선행 스테이지를 그래프 순서대로 병렬 실행, 아래 호출은 실행 범위에 메모된 결과를 사용함
+    STAGE_GRAPH.run(STAGE_GRAPH.deps('MOV'))
 
     fv_t_data = fv_t()
     pfv_data = pfv()
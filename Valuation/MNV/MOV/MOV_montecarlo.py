@@ -0,0 +1,133 @@
+##### Valuation/MNV/MOV/MOV_montecarlo.py #####
+'''
+MOV_montecarlo.py는 불확실한 입력(할인율, 감쇠율, LAP, 플랫폼 가중치 등)을 분포에서 추출하여 추출마다 MOV 타임라인을 평가하고 월별 백분위 구간을 반환함
+추출한 값은 MOV_scenario 시나리오 표가 되어 ScenarioEngine이 미리 계산한 컴포넌트 타임라인 위에서 (추출 x 월) 행렬로 한 번에 평가함
+분포는 {시나리오 가중치 이름: {'dist': numpy Generator 메서드 이름, 인자...}} 형식이며, 'min'/'max'를 지정하면 추출값을 그 범위로 자름
+- 예: {'Variables.DISCOUNT_RATE': {'dist': 'triangular', 'left': 0.04, 'mode': 0.06, 'right': 0.08}, 'WEIGHT.유튜브': {'dist': 'lognormal', 'mean': 3.69, 'sigma': 0.25}}
+- default_distributions는 할인율, LAP, 저작권/이벤트 감쇠율, 플랫폼(트위터, 유튜브) 가중치의 현재 값 주변 분포임
+- WEIGHT.인스타그램은 MCV 스테이지 합계에만 반영되고 타임라인(mcv_t는 트위터 + 유튜브)에는 들어가지 않아 월별 구간을 바꾸지 못하므로 기본 분포에서 제외함
+값마다 컴포넌트를 다시 계산하는 비선형 가중치(WEIGHT.저작권, DECAY.*, Variables.DISCOUNT_RATE)는 추출값을 levels개의 분위수 값으로 맞춰 재계산 횟수를 levels회로 제한함
+결과 표는 (date, component)마다 한 행이며 mean과 p5, p25, p50, p75, p95 등 백분위 열로 구성됨
+명령행 실행: python -m Valuation.MNV.MOV.MOV_montecarlo [--draws 10000] [--seed 0] [--levels 32] [--distributions distributions.json] [--percentiles 5,25,50,75,95] [--out bands.csv]
+'''
+
+import argparse
+import json
+import os
+import time
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.logger import setup_logger
+from Valuation.MNV.MOV.MOV_scenario import (
+    NONLINEAR_WEIGHTS, TIMELINE_TOTALS, ScenarioEngine, default_weights, scenario_engine, to_scenarios,
+)
+logger = setup_logger(__name__)
+
+MONTE_CARLO_DRAWS = int(os.getenv('VALUATION_MC_DRAWS', '10000'))
+MONTE_CARLO_LEVELS = 32
+PERCENTILES = [5, 25, 50, 75, 95]
+DISTRIBUTIONS = {'normal', 'lognormal', 'uniform', 'triangular', 'beta', 'gamma'}
+
+def default_distributions() -> Dict[str, Dict]:
+    """
+    현재 가중치 주변의 기본 분포. 비율은 현재 값 기준임.
+    """
+    base = default_weights()
+    triangular = lambda name, low, high: {'dist': 'triangular', 'left': base[name] * low, 'mode': base[name], 'right': base[name] * high}
+    lognormal = lambda name, sigma: {'dist': 'lognormal', 'mean': float(np.log(base[name])), 'sigma': sigma}
+    return {
+        'Variables.DISCOUNT_RATE': triangular('Variables.DISCOUNT_RATE', 0.5, 1.5),
+        'Variables.LAP': triangular('Variables.LAP', 0.8, 1.2),
+        'WEIGHT.저작권': triangular('WEIGHT.저작권', 0.8, 1.2),
+        'DECAY.공연': triangular('DECAY.공연', 0.5, 1.5),
+        'DECAY.매니지먼트': triangular('DECAY.매니지먼트', 0.5, 1.5),
+        'WEIGHT.트위터': lognormal('WEIGHT.트위터', 0.25),
+        'WEIGHT.유튜브': lognormal('WEIGHT.유튜브', 0.25),
+    }
+
+def snap_to_levels(values: np.ndarray, levels: int) -> np.ndarray:
+    """
+    values를 levels개의 분위수 값 중 가장 가까운 값으로 바꾼다.
+    """
+    grid = np.unique(np.quantile(values, (np.arange(levels) + 0.5) / levels))
+    edges = (grid[1:] + grid[:-1]) / 2
+    return grid[np.searchsorted(edges, values)]
+
+def sample_scenarios(distributions: Optional[Dict[str, Dict]] = None, draws: int = MONTE_CARLO_DRAWS, seed: Optional[int] = None, levels: Optional[int] = MONTE_CARLO_LEVELS) -> pd.DataFrame:
+    """
+    분포에서 추출한 시나리오 표 (행: 추출, 열: 가중치 이름). 같은 seed면 같은 표를 반환한다.
+    """
+    distributions = default_distributions() if distributions is None else distributions
+    rng = np.random.default_rng(seed)
+    samples = {}
+    for name, spec in distributions.items():
+        spec = dict(spec)
+        dist = spec.pop('dist', None)
+        if dist not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown distribution '{dist}' for {name}; expected one of {sorted(DISTRIBUTIONS)}")
+        low, high = spec.pop('min', None), spec.pop('max', None)
+        values = getattr(rng, dist)(size=draws, **spec)
+        if low is not None or high is not None:
+            values = np.clip(values, low, high)
+        if name in NONLINEAR_WEIGHTS and levels:
+            values = snap_to_levels(values, levels)
+        samples[name] = values
+    return to_scenarios(samples)
+
+def percentile_bands(arrays: Dict[str, np.ndarray], dates: Iterable, percentiles: Iterable[float] = PERCENTILES) -> pd.DataFrame:
+    """
+    {컬럼: 추출 x 월 배열}의 월별 평균과 백분위 표.
+    """
+    percentiles = list(percentiles)
+    dates = pd.Index(dates)
+    frames = []
+    for column, values in arrays.items():
+        bands = np.percentile(values, percentiles, axis=0)
+        frame = pd.DataFrame({'date': dates, 'component': column, 'mean': values.mean(axis=0)})
+        for q, band in zip(percentiles, bands):
+            frame[f'p{q:g}'] = band
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+def monte_carlo(engine: ScenarioEngine, distributions: Optional[Dict[str, Dict]] = None, draws: int = MONTE_CARLO_DRAWS, percentiles: Iterable[float] = PERCENTILES,
+                columns: Iterable[str] = TIMELINE_TOTALS, seed: Optional[int] = None, levels: Optional[int] = MONTE_CARLO_LEVELS) -> pd.DataFrame:
+    """
+    분포에서 draws회 추출하여 평가한 타임라인의 월별 백분위 구간 표.
+    """
+    scenarios = sample_scenarios(distributions, draws, seed, levels)
+    arrays = engine.evaluate_timelines(scenarios, columns)
+    return percentile_bands(arrays, engine.timeline.index, percentiles)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Monte Carlo percentile bands for MOV timelines')
+    parser.add_argument('--draws', type=int, default=MONTE_CARLO_DRAWS, help='number of parameter draws')
+    parser.add_argument('--seed', type=int, default=None, help='random seed')
+    parser.add_argument('--levels', type=int, default=MONTE_CARLO_LEVELS, help='distinct values for weights that recompute components (0 keeps every draw)')
+    parser.add_argument('--distributions', help='JSON file {name: {"dist": ..., ...}} overriding the defaults (null removes a default)')
+    parser.add_argument('--percentiles', default=','.join(str(q) for q in PERCENTILES), help='comma-separated percentiles')
+    parser.add_argument('--out', help='write the bands to this CSV file')
+    args = parser.parse_args()
+
+    distributions = default_distributions()
+    if args.distributions:
+        with open(args.distributions, 'r', encoding='utf-8') as f:
+            for name, spec in json.load(f).items():
+                if spec is None:
+                    distributions.pop(name, None)
+                else:
+                    distributions[name] = spec
+    percentiles = [float(q) for q in args.percentiles.split(',') if q.strip()]
+
+    engine = scenario_engine()
+    started = time.perf_counter()
+    bands = monte_carlo(engine, distributions, args.draws, percentiles, seed=args.seed, levels=args.levels or None)
+    logger.info(f"Evaluated {args.draws} draws in {time.perf_counter() - started:.2f}s")
+
+    if args.out:
+        bands.to_csv(args.out, index=False)
+        print(f"Bands saved to {args.out}")
+    else:
+        print(bands[bands['component'] == 'MOV_t'].to_string(index=False))
@@ -0,0 +1,440 @@
+##### Valuation/MNV/MOV/MOV_scenario.py #####
+'''
+MOV_scenario.py는 가중치 시나리오(시나리오마다 가중치 벡터 하나인 행렬)를 한 번에 평가하여 시나리오별 MOV, PFV, PCV, FV, MRV 합계와 타임라인을 표로 반환함
+선행 스테이지 결과로 컴포넌트 타임라인(sv_t, cev_t, mcv_youtube 등)을 한 번 만든 뒤, 시나리오별 가중치 비율을 곱하는 행렬 연산으로 모든 시나리오를 계산함
+시나리오로 바꿀 수 있는 가중치(SCENARIO_WEIGHTS)는 선행 스테이지를 다시 실행하지 않고 스테이지 결과에서 컴포넌트를 다시 만들 수 있는 값임
+- WEIGHT.<키>: MOV_main.WEIGHT의 타임라인 가중치. WEIGHT.저작권은 SV/APV 감쇠율을 바꾸므로 서로 다른 값마다 PFV 행렬을 한 번씩 다시 계산함
+- DECAY.공연, DECAY.매니지먼트: CEV/MRV 이벤트 영향의 월 감쇠율(MOV_main.EVENT_DECAY_RATE). 서로 다른 값마다 cev_t, mrv_t를 한 번씩 다시 계산함
+- Variables.LAP: 음반 가격. RV가 LAP에 비례하므로 rv_t에 비율을 곱함
+- Variables.DISCOUNT_RATE: 할인율. 이벤트 값을 각 스테이지의 할인식으로 다시 할인한 뒤 서로 다른 값마다 rv_t, cev_t, mcv_*, mds_t, mrv_t를 한 번씩 다시 계산함
+  (CEV, MRV, MDS: 1/(1+r)^연, MCV: (1-r)^t (유튜브는 연, 트위터/인스타그램은 30일 단위), RV: 판매 연도 기준 (1-r)^(2 x 연). 경과 시간은 reference_date 기준)
+- Weights.FV.FV_WEIGHT, Weights.PFV.AV_WEIGHT, Weights.PCV.MCV_YOUTUBE 등: FV/PFV/PCV/MCV 스테이지 합계의 가중치
+- 그 외 Weights/Variables 값은 스테이지 내부 계산에 쓰이므로 시나리오로 평가할 수 없으며, 값을 바꾸면 MOV_graph params 지문으로 해당 스테이지가 다시 계산됨
+결과 표는 시나리오마다 한 행이며, 입력한 가중치 열과 다음 열로 구성됨
+- FV, PFV, MCV, PCV, MRV: 합계 가중치로 계산한 스테이지 합계 (FV, PCV, MCV 스테이지 결과가 없으면 NaN). DECAY.*, Variables.*는 타임라인에만 반영됨
+- FV_t, pfv_t, pcv_t, mrv_t, MOV_t: 타임라인 월별 값의 합계
+timelines=True면 (scenario, date)마다 한 행인 월별 타임라인 표를 함께 반환함
+명령행 실행: python -m Valuation.MNV.MOV.MOV_scenario --set Weights.PCV.MCV_YOUTUBE=0.5,1,1.5 --set WEIGHT.공연=1,2 [--scenarios scenarios.csv] [--out results.csv] [--timelines timelines.csv]
+'''
+
+import argparse
+import itertools
+import json
+import os
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.logger import setup_logger
+from Valuation.utils.weights import Weights, Variables
+from Valuation.MNV.MOV.MOV_main import (
+    WEIGHT, EVENT_DECAY_RATE, PFVFunc, PCVFunc, MRVFunc, build_timeline, convert_series_to_utc, copyright_decay_rate, parse_dates,
+)
+from Valuation.MNV.MOV.MOV_graph import STAGE_GRAPH
+logger = setup_logger(__name__)
+
+# 한 번에 (시나리오 x 월) 행렬로 계산하는 시나리오 수. 메모리 사용량은 SCENARIO_CHUNK x 개월 수로 제한됨
+SCENARIO_CHUNK = int(os.getenv('VALUATION_SCENARIO_CHUNK', '1000'))
+
+# 타임라인 가중치 → 가중치가 곱해진 타임라인 컬럼
+TIMELINE_WEIGHTS = {
+    'WEIGHT.음반': 'rv_t',
+    'WEIGHT.스트리밍': 'sv_t',
+    'WEIGHT.인기도': 'apv_t',
+    'WEIGHT.공연': 'cev_t',
+    'WEIGHT.트위터': 'mcv_twitter',
+    'WEIGHT.인스타그램': 'mcv_instagram',
+    'WEIGHT.유튜브': 'mcv_youtube',
+    'WEIGHT.MD판매': 'mds_t',
+    'WEIGHT.매니지먼트': 'mrv_t',
+}
+COPYRIGHT_WEIGHT = 'WEIGHT.저작권'
+DISCOUNT_WEIGHT = 'Variables.DISCOUNT_RATE'
+DECAY_WEIGHTS = ['DECAY.공연', 'DECAY.매니지먼트']
+VARIABLE_WEIGHTS = ['Variables.LAP', DISCOUNT_WEIGHT]
+# 값마다 컴포넌트를 다시 계산하는 (비선형) 가중치
+NONLINEAR_WEIGHTS = [COPYRIGHT_WEIGHT, *DECAY_WEIGHTS, DISCOUNT_WEIGHT]
+# 다시 계산하는 컴포넌트 묶음 → 묶음의 값을 결정하는 비선형 가중치
+COMPONENT_GROUPS = {
+    ('sv_t', 'apv_t'): (COPYRIGHT_WEIGHT,),
+    ('cev_t',): ('DECAY.공연', DISCOUNT_WEIGHT),
+    ('mrv_t',): ('DECAY.매니지먼트', DISCOUNT_WEIGHT),
+    ('rv_t', 'mcv_twitter', 'mcv_youtube', 'mcv_instagram', 'mds_t'): (DISCOUNT_WEIGHT,),
+}
+# 할인된 이벤트가 있는 스테이지 → (결과의 이벤트 목록 키, 날짜 키, 값 키, 할인 형태, 경과 시간 단위(일))
+# 할인 형태 growth는 1/(1+r)^t (CEV_main, MRV_main, MDS_main), decline은 (1-r)^t (MCV_youtube, MCV_twitter, MCV_instagram)
+DISCOUNTED_EVENTS = {
+    'CEV': ('events', 'start_period', 'cer', 'growth', 365.25),
+    'MRV': ('record', 'start_period', 'BF_event', 'growth', 365.25),
+    'MDS': ('records', 'date', 'MDS_t', 'growth', 365.25),
+    'MCV_twitter': ('tweets', 'created_at', 'mcv', 'decline', 30),
+    'MCV_youtube': ('details', 'publishedAt', 'MCV', 'decline', 365.25),
+    'MCV_instagram': ('posts', 'date', 'mcv', 'decline', 30),
+}
+TOTAL_WEIGHTS = [
+    'Weights.FV.FV_WEIGHT',
+    'Weights.PFV.AV_WEIGHT',
+    'Weights.PFV.PFV_WEIGHT',
+    'Weights.PCV.CEV_WEIGHT',
+    'Weights.PCV.MCV_WEIGHT',
+    'Weights.PCV.MDS_WEIGHT',
+    'Weights.PCV.MCV_YOUTUBE',
+    'Weights.PCV.MCV_TWITTER',
+    'Weights.PCV.MCV_INSTAGRAM',
+]
+SCENARIO_WEIGHTS = [*TIMELINE_WEIGHTS, COPYRIGHT_WEIGHT, *DECAY_WEIGHTS, *VARIABLE_WEIGHTS, *TOTAL_WEIGHTS]
+TIMELINE_TOTALS = ['FV_t', 'pfv_t', 'pcv_t', 'mrv_t', 'MOV_t']
+
+def default_weights() -> Dict[str, float]:
+    """
+    시나리오 가중치의 현재 값 (MOV_main.WEIGHT, EVENT_DECAY_RATE와 Valuation/utils/weights.py).
+    """
+    weights = {f'WEIGHT.{key}': float(value) for key, value in WEIGHT.items()}
+    weights.update({name: float(EVENT_DECAY_RATE) for name in DECAY_WEIGHTS})
+    for name in VARIABLE_WEIGHTS:
+        weights[name] = float(getattr(Variables, name.split('.')[1]))
+    for name in TOTAL_WEIGHTS:
+        _, group, attr = name.split('.')
+        weights[name] = float(getattr(getattr(Weights, group), attr))
+    return {name: weights[name] for name in SCENARIO_WEIGHTS}
+
+def scenario_grid(grid: Dict[str, Iterable[float]]) -> pd.DataFrame:
+    """
+    {가중치 이름: 값 목록}의 모든 조합을 시나리오 표로 만든다.
+    """
+    names = list(grid)
+    return to_scenarios(pd.DataFrame(list(itertools.product(*(list(grid[name]) for name in names))), columns=names))
+
+def to_scenarios(scenarios) -> pd.DataFrame:
+    """
+    DataFrame, 사전 목록, {이름: 값 목록}을 시나리오 표(행: 시나리오, 열: 가중치 이름)로 변환한다. 지정하지 않은 가중치는 현재 값을 사용한다.
+    """
+    table = scenarios.copy() if isinstance(scenarios, pd.DataFrame) else pd.DataFrame(scenarios)
+    unknown = [name for name in table.columns if name not in SCENARIO_WEIGHTS]
+    if unknown:
+        raise ValueError(
+            f"Weights {unknown} cannot be evaluated as scenarios; expected some of {SCENARIO_WEIGHTS} "
+            f"(other Weights/Variables change stage inputs and need a stage rerun)"
+        )
+    table = table.apply(pd.to_numeric, errors='raise').astype(float).reset_index(drop=True)
+    table.index.name = 'scenario'
+    return table
+
+def rv_sold_years(albums: List[Dict], sales_data: List[Dict]) -> np.ndarray:
+    """
+    앨범별 판매 연도. UDI combine_metrics와 같이 판매 월 말일이 발매 후 110일 안인 가장 가까운 앨범에 판매 기록을 연결하며, 연결된 기록이 없으면 발매 연도를 사용한다.
+    """
+    release_dates = pd.to_datetime(convert_series_to_utc(parse_dates([album.get('release_date') for album in albums])), utc=True).dt.tz_localize(None)
+    years = release_dates.dt.year.to_numpy(dtype=float)
+    for entry in sales_data:
+        year, month = entry.get('total_sales_year'), entry.get('total_sales_month')
+        if not year or not month:
+            continue
+        sales_date = pd.Timestamp(int(year), int(month), 1) + pd.offsets.MonthEnd(0)
+        days = (sales_date - release_dates).dt.days
+        candidates = (days > 0) & (days <= 110)
+        if candidates.any():
+            years[days.where(candidates).idxmin()] = int(year)
+    return years
+
+class ScenarioEngine:
+    """
+    선행 스테이지 결과({스테이지 이름: 결과}, STAGE_GRAPH.run의 반환값 형식)로 만든 컴포넌트 타임라인 위에서 시나리오를 평가한다.
+    """
+    def __init__(self, stage_results: Dict[str, object], residual_rate: float = 0.001, reference_date: Optional[datetime] = None):
+        """
+        reference_date: 스테이지가 할인에 사용한 현재 시각. 기본값은 엔진을 만든 시각이다.
+        """
+        self.stage_results = stage_results
+        self.residual_rate = residual_rate
+        self.reference_date = pd.Timestamp(reference_date or datetime.now(timezone.utc))
+        if self.reference_date.tzinfo is None:
+            self.reference_date = self.reference_date.tz_localize('UTC')
+        self.base = default_weights()
+
+        fv_t_data = stage_results['FV_t']
+        self.end_date = max(item['date'] for item in fv_t_data['sub_data'])
+        self.events = {source: (stage_results.get(source) or {}).get(spec[0]) or [] for source, spec in DISCOUNTED_EVENTS.items()}
+        self.timeline = build_timeline(
+            fv_t_data,
+            stage_results['PFV'],
+            stage_results.get('PCV'),
+            (stage_results.get('CEV') or {}).get('events'),
+            self.events['MDS'],
+            stage_results.get('MCV_youtube') or {},
+            stage_results.get('MCV_twitter') or {},
+            stage_results.get('MCV_instagram') or {},
+            stage_results.get('MRV') or {},
+            decay_rate=copyright_decay_rate(self.base[COPYRIGHT_WEIGHT], residual_rate),
+            residual_rate=residual_rate,
+        )
+        # 묶음별 {비선형 가중치 값 튜플: 컴포넌트 배열}. 현재 값은 위 타임라인을 그대로 사용함
+        self._components = {
+            columns: {tuple(self.base[name] for name in names): self.timeline[list(columns)].to_numpy().T}
+            for columns, names in COMPONENT_GROUPS.items()
+        }
+        self._exponents = None
+        self._rv_allocations = None
+        self._event_values = {}
+        self._rediscounted = {}
+
+        pfv, pcv, mcv, fv, mrv = (stage_results.get(name) or {} for name in ['PFV', 'PCV', 'MCV', 'FV', 'MRV'])
+        self.stage_totals = {
+            'av': pfv.get('av', np.nan),
+            'cev': pcv.get('cev_a', np.nan),
+            'mds': pcv.get('mds_a', np.nan),
+            'mcv_youtube': mcv.get('mcv_youtube_raw', np.nan),
+            'mcv_twitter': mcv.get('mcv_twitter_raw', np.nan),
+            'mcv_instagram': mcv.get('mcv_instagram_raw', np.nan),
+            'fv': fv.get('fv', np.nan),
+            'mrv': mrv.get('mrv', np.nan),
+        }
+
+    def _elapsed_days(self, dates) -> np.ndarray:
+        parsed = pd.to_datetime(convert_series_to_utc(parse_dates(dates)), utc=True)
+        return np.nan_to_num((self.reference_date - parsed).dt.days.to_numpy(dtype=float), nan=0.0)
+
+    def discount_exponents(self) -> Dict[str, np.ndarray]:
+        """
+        스테이지별 이벤트 할인 지수 (DISCOUNTED_EVENTS의 단위로 센 reference_date까지의 경과 시간). 날짜가 없으면 0(할인 없음)이다.
+        """
+        if self._exponents is None:
+            self._exponents = {
+                source: self._elapsed_days([item.get(date_key) for item in self.events[source]]) / unit
+                for source, (_, date_key, _, _, unit) in DISCOUNTED_EVENTS.items()
+            }
+            # MCV_instagram은 경과 시간이 0 이하면 할인하지 않음
+            self._exponents['MCV_instagram'] = np.maximum(self._exponents['MCV_instagram'], 0)
+            # RV_main은 LAP와 매출에 각각 (1-r)^(현재 연도 - 판매 연도)를 곱함
+            sold_years = rv_sold_years(self.stage_results['PFV'].get('av_a', []), (self.stage_results.get('RV') or {}).get('sales_data', []))
+            self._exponents['RV'] = 2 * np.nan_to_num(self.reference_date.year - sold_years, nan=0.0)
+        return self._exponents
+
+    def discount_factors(self, source: str, discount_rate: float) -> np.ndarray:
+        """
+        source 스테이지의 이벤트 값을 현재 할인율 대신 discount_rate로 할인하는 이벤트별 배율.
+        """
+        kind = 'decline' if source == 'RV' else DISCOUNTED_EVENTS[source][3]
+        base_rate = self.base[DISCOUNT_WEIGHT]
+        ratio = (1 + base_rate) / (1 + discount_rate) if kind == 'growth' else (1 - discount_rate) / (1 - base_rate)
+        return ratio ** self.discount_exponents()[source]
+
+    def event_values(self, source: str) -> tuple:
+        """
+        source 스테이지 이벤트의 (날짜 목록, 값 배열). 값이 없거나 숫자가 아니면 0이며, MOV_main 통합 함수도 이 이벤트에 0을 더한다.
+        """
+        if source not in self._event_values:
+            _, date_key, value_key, _, _ = DISCOUNTED_EVENTS[source]
+            items = self.events[source]
+            values = pd.to_numeric(pd.Series([item.get(value_key) for item in items], dtype=object), errors='coerce').fillna(0.0)
+            self._event_values[source] = ([item.get(date_key) for item in items], values.to_numpy(dtype=float))
+        return self._event_values[source]
+
+    def rediscounted(self, source: str, discount_rate: float) -> List[Dict]:
+        """
+        source 스테이지 이벤트를 discount_rate로 다시 할인한 {날짜 키, 값 키} 목록 (MOV_main 통합 함수가 읽는 필드만 남김).
+        감쇠율 조합마다 재사용하도록 할인율별로 보관한다.
+        """
+        if (source, discount_rate) not in self._rediscounted:
+            _, date_key, value_key, _, _ = DISCOUNTED_EVENTS[source]
+            dates, values = self.event_values(source)
+            scaled = (values * self.discount_factors(source, discount_rate)).tolist()
+            self._rediscounted[source, discount_rate] = [{date_key: date, value_key: value} for date, value in zip(dates, scaled)]
+        return self._rediscounted[source, discount_rate]
+
+    def rv_allocations(self) -> np.ndarray:
+        """
+        앨범별 rv_t 배분 (앨범 x 개월 수). rv_t는 앨범별 RV 값에 비례하므로 할인율 배율을 앨범별로 곱해 다시 합산한다.
+        """
+        if self._rv_allocations is None:
+            albums = self.stage_results['PFV'].get('av_a', [])
+            matrix = PFVFunc.build_pfv_matrix(albums, self.end_date, residual_rate=self.residual_rate, breakdown=True)['albums']['rv_t']
+            self._rv_allocations = matrix.reindex(index=range(len(albums)), columns=self.timeline.index).fillna(0.0).to_numpy()
+        return self._rv_allocations
+
+    def nonlinear_components(self, columns: tuple, key: tuple) -> np.ndarray:
+        """
+        COMPONENT_GROUPS 묶음(columns)을 비선형 가중치 값 key로 다시 계산한 배열 (len(columns) x 개월 수).
+        """
+        cache = self._components[columns]
+        if key not in cache:
+            frame = self.timeline[[]].copy()
+            if columns == ('sv_t', 'apv_t'):
+                (copyright_weight,) = key
+                frame = PFVFunc.integrate_pfv_data(
+                    frame, self.stage_results['PFV'], self.end_date,
+                    decay_rate=copyright_decay_rate(copyright_weight, self.residual_rate), residual_rate=self.residual_rate,
+                )
+            elif columns == ('cev_t',):
+                decay_rate, discount_rate = key
+                frame = PCVFunc.integrate_cev_events(frame, self.rediscounted('CEV', discount_rate), decay_rate=decay_rate)
+            elif columns == ('mrv_t',):
+                decay_rate, discount_rate = key
+                frame = MRVFunc.integrate_mrv_events(frame, self.rediscounted('MRV', discount_rate), decay_rate=decay_rate)
+            else:
+                (discount_rate,) = key
+                mcv = {source: {DISCOUNTED_EVENTS[source][0]: self.rediscounted(source, discount_rate)} for source in ['MCV_twitter', 'MCV_youtube', 'MCV_instagram']}
+                frame = PCVFunc.integrate_mcv_events(frame, mcv['MCV_twitter'], mcv['MCV_youtube'], mcv['MCV_instagram'])
+                frame = PCVFunc.integrate_mds_events(frame, self.rediscounted('MDS', discount_rate))
+                # 현재 rv_t에 앨범별 배율 변화분만 더하여 다시 합산함
+                frame['rv_t'] = self.timeline['rv_t'].to_numpy() + (self.discount_factors('RV', discount_rate) - 1) @ self.rv_allocations()
+            cache[key] = frame[list(columns)].to_numpy().T
+        return cache[key]
+
+    def _weights(self, scenarios: pd.DataFrame) -> Dict[str, np.ndarray]:
+        count = len(scenarios)
+        return {
+            name: scenarios[name].fillna(self.base[name]).to_numpy() if name in scenarios else np.full(count, self.base[name])
+            for name in SCENARIO_WEIGHTS
+        }
+
+    def _timeline_chunks(self, weights: Dict[str, np.ndarray], chunk_size: int = SCENARIO_CHUNK):
+        """
+        (시나리오 구간, {컬럼: 시나리오 x 월 배열})을 chunk_size 시나리오씩 생성한다.
+        """
+        count = len(weights[COPYRIGHT_WEIGHT])
+        if not count:
+            return
+        ratio = {name: weights[name] / self.base[name] for name in [*TIMELINE_WEIGHTS, 'Variables.LAP']}
+        fv_t = self.timeline['FV_t'].to_numpy()
+
+        # 컴포넌트 묶음마다 서로 다른 비선형 가중치 값 조합별로 한 번씩 계산한 배열을 시나리오 행으로 모음
+        groups = []
+        for columns, names in COMPONENT_GROUPS.items():
+            keys, key_rows = np.unique(np.column_stack([weights[name] for name in names]), axis=0, return_inverse=True)
+            stacked = np.stack([self.nonlinear_components(columns, tuple(float(value) for value in key)) for key in keys])
+            groups.append((columns, stacked, key_rows.ravel()))
+
+        for start in range(0, count, chunk_size):
+            rows = slice(start, min(start + chunk_size, count))
+            selected = {}
+            for columns, stacked, key_rows in groups:
+                block = stacked[key_rows[rows]]
+                for i, column in enumerate(columns):
+                    selected[column] = block[:, i]
+            scaled = {column: ratio[name][rows, None] * selected[column] for name, column in TIMELINE_WEIGHTS.items()}
+            scaled['rv_t'] = ratio['Variables.LAP'][rows, None] * scaled['rv_t']
+
+            # MOV_main.build_timeline과 같은 순서로 합산함
+            series = {'FV_t': np.broadcast_to(fv_t, scaled['sv_t'].shape)}
+            series['pfv_t'] = scaled['sv_t'] + scaled['apv_t'] + scaled['rv_t']
+            series['pcv_t'] = scaled['cev_t'] + (scaled['mcv_twitter'] + scaled['mcv_youtube']) + scaled['mds_t']
+            series['mrv_t'] = scaled['mrv_t']
+            series['MOV_t'] = series['FV_t'] + series['pfv_t'] + series['pcv_t'] + series['mrv_t']
+            yield rows, series
+
+    def evaluate_timelines(self, scenarios, columns: Iterable[str] = TIMELINE_TOTALS, chunk_size: int = SCENARIO_CHUNK) -> Dict[str, np.ndarray]:
+        """
+        시나리오별 월별 타임라인 {컬럼: 시나리오 x 월 배열}. 열 순서는 self.timeline.index와 같다.
+        """
+        weights = self._weights(to_scenarios(scenarios))
+        count, months = len(weights[COPYRIGHT_WEIGHT]), len(self.timeline)
+        arrays = {column: np.empty((count, months)) for column in columns}
+        for rows, series in self._timeline_chunks(weights, chunk_size):
+            for column in arrays:
+                arrays[column][rows] = series[column]
+        return arrays
+
+    def evaluate(self, scenarios, timelines: bool = False, chunk_size: int = SCENARIO_CHUNK):
+        """
+        시나리오 표의 결과 표를 반환한다. timelines=True면 (결과 표, 월별 타임라인 표)를 반환한다.
+        """
+        scenarios = to_scenarios(scenarios)
+        count = len(scenarios)
+        weights = self._weights(scenarios)
+        table = scenarios.copy()
+
+        # 스테이지 합계 (PFV_main, MCV_main, PCV_main, FV_main과 같은 식)
+        totals = self.stage_totals
+        mcv = (
+            totals['mcv_youtube'] * weights['Weights.PCV.MCV_YOUTUBE']
+            + totals['mcv_twitter'] * weights['Weights.PCV.MCV_TWITTER']
+            + totals['mcv_instagram'] * weights['Weights.PCV.MCV_INSTAGRAM']
+        )
+        table['FV'] = totals['fv'] * (weights['Weights.FV.FV_WEIGHT'] / self.base['Weights.FV.FV_WEIGHT'])
+        table['PFV'] = totals['av'] * weights['Weights.PFV.AV_WEIGHT'] * weights['Weights.PFV.PFV_WEIGHT']
+        table['MCV'] = mcv
+        table['PCV'] = (
+            totals['cev'] * weights['Weights.PCV.CEV_WEIGHT']
+            + mcv * weights['Weights.PCV.MCV_WEIGHT']
+            + totals['mds'] * weights['Weights.PCV.MDS_WEIGHT']
+        )
+        table['MRV'] = totals['mrv']
+
+        # 타임라인: (시나리오 x 월) = 시나리오별 가중치 비율 x 컴포넌트 타임라인
+        sums = {column: np.zeros(count) for column in TIMELINE_TOTALS}
+        frames = []
+        for rows, series in self._timeline_chunks(weights, chunk_size):
+            for column in TIMELINE_TOTALS:
+                sums[column][rows] = series[column].sum(axis=1)
+            if timelines:
+                frames.append(pd.DataFrame({
+                    'scenario': np.repeat(np.arange(count)[rows], len(self.timeline)),
+                    'date': np.tile(self.timeline.index, len(range(count)[rows])),
+                    **{column: series[column].ravel() for column in TIMELINE_TOTALS},
+                }))
+
+        for column in TIMELINE_TOTALS:
+            table[column] = sums[column]
+        if not timelines:
+            return table
+        columns = ['scenario', 'date', *TIMELINE_TOTALS]
+        return table, pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+
+def scenario_engine(max_workers: Optional[int] = None, residual_rate: float = 0.001) -> ScenarioEngine:
+    """
+    MOV 선행 스테이지와 합계에 쓰이는 FV, MCV 스테이지, RV 판매 기록(할인율 시나리오)을 실행하여 (저장된 결과가 있으면 불러옴) 엔진을 만든다.
+    """
+    results = STAGE_GRAPH.run([*STAGE_GRAPH.deps('MOV'), 'FV', 'MCV', 'RV'], max_workers)
+    return ScenarioEngine(results, residual_rate)
+
+def _parse_grid(items) -> Dict[str, list]:
+    grid = {}
+    for item in items:
+        name, _, values = item.partition('=')
+        if not values:
+            raise ValueError(f"Expected NAME=value[,value...], got '{item}'")
+        grid[name.strip()] = [float(value) for value in values.split(',') if value.strip()]
+    return grid
+
+def _load_scenarios(path: str) -> pd.DataFrame:
+    if path.endswith('.json'):
+        with open(path, 'r', encoding='utf-8') as f:
+            return to_scenarios(json.load(f))
+    return to_scenarios(pd.read_csv(path))
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Evaluate MOV weight scenarios')
+    parser.add_argument('--set', dest='grid', action='append', default=[], help='NAME=v1,v2,... (repeat to build a grid of every combination)')
+    parser.add_argument('--scenarios', help='CSV or JSON file with one scenario per row (crossed with --set)')
+    parser.add_argument('--out', help='write the results table to this CSV file')
+    parser.add_argument('--timelines', help='write the monthly timelines of every scenario to this CSV file')
+    parser.add_argument('--list', action='store_true', help='list the weights that can be evaluated and their current values')
+    args = parser.parse_args()
+
+    if args.list:
+        for name, value in default_weights().items():
+            print(f'{name:<30} {value:g}')
+        raise SystemExit(0)
+
+    scenarios = _load_scenarios(args.scenarios) if args.scenarios else to_scenarios([{}])
+    if args.grid:
+        scenarios = to_scenarios(scenarios.merge(scenario_grid(_parse_grid(args.grid)), how='cross'))
+
+    engine = scenario_engine()
+    started = time.perf_counter()
+    results = engine.evaluate(scenarios, timelines=bool(args.timelines))
+    table, timeline_table = results if args.timelines else (results, None)
+    logger.info(f"Evaluated {len(table)} scenarios in {time.perf_counter() - started:.2f}s")
+
+    if args.timelines:
+        timeline_table.to_csv(args.timelines, index=False)
+        print(f"Timelines saved to {args.timelines}")
+    if args.out:
+        table.to_csv(args.out)
+        print(f"Results saved to {args.out}")
+    else:
+        print(table.to_string())
@@ -1,8 +1,9 @@
 import pandas as pd
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 
 def visualizer(distribution_result):
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
     df = pd.DataFrame(distribution_result)
     df['date'] = pd.to_datetime(df['date'])
     df.set_index('date', inplace=True)
@@ -4,27 +4,21 @@ import os
 import time
 import csv
 import json
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from dotenv import load_dotenv
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 
 # 환경 변수 로드
 load_dotenv()
-env_names = os.getenv("NAVER_BROADCAST_TAB_NAMES", "").split("|")
-env_urls = os.getenv("NAVER_BROADCAST_TAB_URLS", "").split("|")
-envdata = [{"name": name, "url": url} for name, url in zip(env_names, env_urls)]
+from Valuation.utils.artist import current_artist
+from Valuation.utils.journal import checkpointed
 
 # 로깅 설정
 from utils.logger import setup_logger
 logger = setup_logger(__name__)
 
 def scrape_event_details(driver, wait, event_url):
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+
     details = {}
     try:
         driver.get(event_url)
@@ -70,11 +64,21 @@ def scrape_event_details(driver, wait, event_url):
         return details
 
 def get_naver_broadcast_data():
-
-    ARTIST_ID = os.getenv('ARTIST_ID')
-    ARTIST_NAME_KOR = os.getenv('ARTIST_NAME_KOR')
-    ARTIST_NAME_ENG = os.getenv('ARTIST_NAME_ENG')
-    MELON_ARTIST_ID = os.getenv('MELON_ID')
+    from selenium import webdriver
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.common.action_chains import ActionChains
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.chrome.options import Options
+    from webdriver_manager.chrome import ChromeDriverManager
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
+    artist = current_artist()
+    ARTIST_ID = artist.artist_id
+    ARTIST_NAME_KOR = artist.name_kor
+    ARTIST_NAME_ENG = artist.name_eng
+    MELON_ARTIST_ID = artist.melon_id
+    envdata = artist.broadcast_tabs
     
     # Selenium WebDriver 설정
     options = Options()
@@ -275,14 +279,17 @@ def get_naver_broadcast_data():
             logger.error(f"스크립트 실행 중 오류 발생: {e}")
 
         finally:
-            for event in broadcast:
-                try:
-                    additional_details = scrape_event_details(driver, wait, event["event_url"])
-                    event.update(additional_details)
-                except Exception as e:
-                    logger.error(f"상세 정보 수집 중 오류 발생: {e}")
-                    continue
-                
+            # 상세 페이지 수집 결과를 이벤트 URL별로 저널에 기록하여 중단 후 재실행 시 이미 방문한 페이지는 건너뜀
+            # 빈 결과(페이지 로드 실패)는 기록하지 않고 다음 실행에서 다시 방문함
+            details_list = checkpointed(
+                'MRV_broadcast_details',
+                [event["event_url"] for event in broadcast],
+                lambda event_url: scrape_event_details(driver, wait, event_url) or None,
+                item_key=str,
+            )
+            for event, additional_details in zip(broadcast, details_list):
+                event.update(additional_details or {})
+
                 print(f"아티스트명: {event['artists']}")
                 print(f"카테고리: {event['category']}")
                 print(f"아티스트명: {event['artist_name_kor']} ({event['artist_name_eng']})")
@@ -322,6 +329,7 @@ def get_naver_broadcast_data_and_save_to_googlesheet():
     else:
         logger.info("헤더가 이미 존재합니다.")
 
+    env_urls = (current_artist().naver_broadcast_tab_urls or '').split("|")
     if env_urls and len(env_urls) > 0:
         data = get_naver_broadcast_data()
     else:
@@ -350,13 +358,19 @@ def load_broadcast_data_from_sheet_and_save_to_firestore():
 
 import asyncio
 from Valuation.firebase.firebase_handler import save_record, check_record
+from Valuation.utils.stage_graph import stage
 DATA_TARGET='MRV_collector'
+@stage(DATA_TARGET)
 def mrv_collector():
     load_data = check_record(DATA_TARGET, DATA_TARGET, 'events')
     if load_data:
         print(f'{DATA_TARGET} Loaded')
         return load_data.get(DATA_TARGET)
     
+    # 방송 탭 URL이 없는 아티스트는 수집할 데이터가 없음 (MRV도 이 경우 0으로 처리함)
+    if not current_artist().naver_broadcast_tab_urls:
+        return {"events": []}
+
     data = load_broadcast_data_from_sheet_and_save_to_firestore()
     asyncio.run(load_data_from_sheets_and_save_to_firestore(spreadsheet_title = "방송 데이터", collection_name = "broadcast"))
     result = {
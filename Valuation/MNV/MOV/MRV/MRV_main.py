@@ -18,6 +18,7 @@ fv_t 데이터로부터 날짜별 이동 평균(FV_t_rolling)을 계산하여 
 이벤트별로 해당 시점의 FV_t_rolling과 최신 앨범의 AV 값을 결합하여 개별 방송 가치를 산출함
 할인 요인을 적용하여 이벤트 발생 시점까지의 시간 가치를 보정함
 최종적으로 모든 방송 이벤트의 가치를 누적하여 총 MRV를 계산
+calculate_mrv 함수는 수집 단계와 분리되어 이벤트, FV 트렌드, 앨범 메트릭만으로 MRV를 산출함
 '''
 import pandas as pd
 from datetime import datetime
@@ -26,11 +27,7 @@ from dotenv import load_dotenv
 import re
 load_dotenv()
 
-ARTIST_ID = os.getenv("ARTIST_ID")
-ARTIST_NAME_KOR = os.getenv("ARTIST_NAME_KOR")
-ARTIST_NAME_ENG = os.getenv("ARTIST_NAME_ENG")
-MELON_ID = os.getenv("MELON_ID")
-env_urls = os.getenv("NAVER_BROADCAST_TAB_URLS", "").split("|")
+from Valuation.utils.artist import current_artist
 
 def parse_revenue(revenue_str):
     if revenue_str is None:
@@ -82,7 +79,7 @@ def find_latest_album(av_data, event_start_period):
 
 from Valuation.firebase.firebase_handler import load_with_filter
 def get_exist_events():
-    filters = [('artist_id', '==', ARTIST_ID)]
+    filters = [('artist_id', '==', current_artist().artist_id)]
     events_data = load_with_filter('broadcast', filters)
     return events_data
 
@@ -110,10 +107,61 @@ def calculate_discount_factor(event_date, current_date=datetime.now()):
     discount_factor = 1 / ((1 + DISCOUNT_RATE) ** time_difference)
     return discount_factor
 
+def calculate_mrv(events_data, fv_t_data, av_metrics, engagement):
+    df_fv = pd.DataFrame(fv_t_data['sub_data'])
+    df_fv['date'] = pd.to_datetime(df_fv['date'])
+    df_fv = df_fv.sort_values('date').reset_index(drop=True)
+
+    df_fv['FV_t_rolling'] = df_fv['FV_t'].rolling(window=3, min_periods=1).mean()
+
+    total_broadcast_value = 0
+
+    if events_data and len(events_data) > 0 :
+        for event in events_data:
+            print(f"Event : {event}")
+            category = event.get('category')
+            w_category = CATEGORY_WEIGHT.get(category, 1.0)
+
+            start_period_str = event.get('start_period')
+            start_period = clean_start_period(start_period_str)
+            print(f"Start Period : {start_period}")
+
+            if not start_period:
+                print(f"Invalid start period for event: {event.get('title')}")
+                continue
+
+            df_fv['date'] = df_fv['date'].dt.tz_localize(None)
+            start_period = start_period.replace(tzinfo=None)
+            relevant_fv_row = df_fv[df_fv['date'] <= start_period].iloc[-1] if not df_fv[df_fv['date'] <= start_period].empty else None
+            FV_t_rolling = relevant_fv_row['FV_t_rolling'] * engagement
+
+            latest_album = find_latest_album(av_metrics, start_period)
+            AV_a = latest_album['av'] * engagement
+
+            N = event.get('frequency', 1)
+
+            discount_factor = calculate_discount_factor(start_period)
+
+            BF_event = (AV_a + FV_t_rolling) * N * w_category * discount_factor
+            print(f'w_category : {w_category}')
+            print(f'N : {N}')
+            print(f'FV_t_rolling : {FV_t_rolling}')
+            print(f'AV_a : {AV_a}')
+            print(f'추정 가치 : {BF_event}')
+            event['BF_event'] = BF_event
+            total_broadcast_value += BF_event
+
+            program_name = event.get('title', 'Unknown Program')
+            bf_value_eok = BF_event / 100000000  # 억 단위로 변환
+            print(f'{program_name} : {bf_value_eok:.4f}억')
+    return total_broadcast_value
+
 from Valuation.MNV.MOV.MRV.MRV_collector import mrv_collector
 from Valuation.firebase.firebase_handler import save_record, check_record
+from Valuation.utils.stage_graph import stage
 DATA_TARGET='MRV'
 
+@stage(DATA_TARGET)
 def mrv():
     load_data = check_record(DATA_TARGET)
     if load_data:
@@ -124,6 +172,7 @@ def mrv():
         'mrv': 0
     }
 
+    env_urls = (current_artist().naver_broadcast_tab_urls or '').split("|")
     if env_urls and len(env_urls) > 0 and env_urls[0] != '':
         print(f"env_urls : {env_urls}")
         fv_t_data = fv_t()
@@ -133,54 +182,7 @@ def mrv():
         mrv_data = mrv_collector()
         events_data = mrv_data['events']
 
-        df_fv = pd.DataFrame(fv_t_data['sub_data'])
-        df_fv['date'] = pd.to_datetime(df_fv['date'])
-        df_fv = df_fv.sort_values('date').reset_index(drop=True)
-
-        df_fv['FV_t_rolling'] = df_fv['FV_t'].rolling(window=3, min_periods=1).mean()
-
-        total_broadcast_value = 0
-
-        if events_data and len(events_data) > 0 :
-            for event in events_data:
-                print(f"Event : {event}")
-                category = event.get('category')
-                w_category = CATEGORY_WEIGHT.get(category, 1.0)
-
-                start_period_str = event.get('start_period')
-                start_period = clean_start_period(start_period_str)
-                print(f"Start Period : {start_period}")
-
-                if not start_period:
-                    print(f"Invalid start period for event: {event.get('title')}")
-                    continue
-                
-                df_fv['date'] = df_fv['date'].dt.tz_localize(None)
-                start_period = start_period.replace(tzinfo=None)
-                relevant_fv_row = df_fv[df_fv['date'] <= start_period].iloc[-1] if not df_fv[df_fv['date'] <= start_period].empty else None
-                FV_t_rolling = relevant_fv_row['FV_t_rolling'] * engagement
-                
-                latest_album = find_latest_album(av_data['metrics'], start_period)
-                AV_a = latest_album['av'] * engagement
-
-                N = event.get('frequency', 1)
-                
-                discount_factor = calculate_discount_factor(start_period)
-
-                BF_event = (AV_a + FV_t_rolling) * N * w_category * discount_factor
-                print(f'w_category : {w_category}')
-                print(f'N : {N}')
-                print(f'FV_t_rolling : {FV_t_rolling}')
-                print(f'AV_a : {AV_a}')
-                print(f'추정 가치 : {BF_event}')
-                event['BF_event'] = BF_event
-                total_broadcast_value += BF_event
-
-                program_name = event.get('title', 'Unknown Program')
-                bf_value_eok = BF_event / 100000000  # 억 단위로 변환
-                print(f'{program_name} : {bf_value_eok:.4f}억')
-        else :
-            total_broadcast_value = 0
+        total_broadcast_value = calculate_mrv(events_data, fv_t_data, av_data['metrics'], engagement)
 
         results = {
             'mrv': total_broadcast_value
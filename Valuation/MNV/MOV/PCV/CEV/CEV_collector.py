@@ -1,7 +1,7 @@
 ##### Valuation/MNV/MOV/PCV/CEV/CEV_collector.py #####
 '''
 CEV_collector.py는 NAVER 콘서트 탭에서 아티스트 공연 데이터를 Selenium을 통해 자동 수집함
-dotenv와 환경변수로 기본 URL 및 아티스트 정보를 동적 로드함
+current_artist로 실행 대상 아티스트의 NAVER_CONCERT_TAB URL 및 아티스트 정보를 로드함
 ChromeDriverManager와 headless 옵션을 사용하여 Selenium WebDriver를 구성함
 WebDriverWait, Expected Conditions, ActionChains를 활용해 공연 탭 클릭 및 페이지 네비게이션을 수행함
 각 공연 아이템에서 제목, 링크, 이미지, 장소, 공연 기간 등의 정보를 추출함
@@ -15,30 +15,32 @@ import os
 import time
 from datetime import datetime
 import csv
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException
 from dotenv import load_dotenv
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 
 # 로깅 설정
 from utils.logger import setup_logger
 logger = setup_logger(__name__)
 
+from Valuation.utils.artist import current_artist
 
 def get_naver_concert_data():
-    # 환경 변수 로드
-    load_dotenv()
-    base_url = os.getenv('NAVER_CONCERT_TAB')
-    ARTIST_ID = os.getenv('ARTIST_ID')
-    ARTIST_NAME_KOR = os.getenv('ARTIST_NAME_KOR')
-    ARTIST_NAME_ENG = os.getenv('ARTIST_NAME_ENG')
-    MELON_ARTIST_ID = os.getenv('MELON_ID')
+    from selenium import webdriver
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.common.action_chains import ActionChains
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.chrome.options import Options
+    from selenium.common.exceptions import TimeoutException
+    from webdriver_manager.chrome import ChromeDriverManager
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
+    # 실행 대상 아티스트 정보
+    artist = current_artist()
+    base_url = artist.naver_concert_tab
+    ARTIST_ID = artist.artist_id
+    ARTIST_NAME_KOR = artist.name_kor
+    ARTIST_NAME_ENG = artist.name_eng
+    MELON_ARTIST_ID = artist.melon_id
 
     if not base_url:
         logger.error("환경 변수 'NAVER_CONCERT_TAB'가 설정되지 않았습니다.")
@@ -300,13 +302,19 @@ def load_performance_data_from_sheet_and_save_to_firestore():
 
 import asyncio
 from Valuation.firebase.firebase_handler import save_record, check_record
+from Valuation.utils.stage_graph import stage
 DATA_TARGET='CEV_collector'
+@stage(DATA_TARGET)
 def cev_collector():
     load_data = check_record(DATA_TARGET, DATA_TARGET, 'events')
     if load_data:
         print(f'{DATA_TARGET} Loaded')
         return load_data.get(DATA_TARGET)
     
+    # 공연 탭 URL이 없는 아티스트는 수집할 데이터가 없음 (CEV도 이 경우 0으로 처리함)
+    if not current_artist().naver_concert_tab:
+        return {"events": []}
+
     data = load_performance_data_from_sheet_and_save_to_firestore()
     asyncio.run(load_data_from_sheets_and_save_to_firestore(spreadsheet_title = "공연 데이터", collection_name = "performance"))
     result = {
@@ -9,12 +9,12 @@
 ===========
 
 아티스트 공연 수익 데이터와 앨범 평가, 팬 밸류 트렌드 데이터를 활용하여 CEV(Concert Economic Value)를 산출함
-환경변수를 통해 아티스트 정보와 NAVER_CONCERT_TAB URL 등을 동적으로 로드함
+current_artist로 실행 대상 아티스트 정보와 NAVER_CONCERT_TAB URL 등을 로드함
 av(), er(), fv_t() 모듈을 호출하여 앨범 메트릭, 소셜 참여율, 팬 밸류 트렌드 데이터를 각각 수집함
 parse_revenue, clean_start_period, calculate_discount_factor 함수로 데이터 전처리 및 할인율을 계산함
 find_latest_album과 find_latest_fv 함수로 이벤트 발생 시점 이전의 최신 앨범 및 팬 밸류 데이터를 추출함
 Firebase Firestore의 performance 컬렉션에서 실제 수익 데이터를 필터링하여 이벤트 정보를 획득함
-수익 데이터가 있는 이벤트와 누락된 이벤트를 분리하여 각각 할인 적용 후 누적 수익을 산출함
+calculate_cev 함수는 수익 데이터가 있는 이벤트와 누락된 이벤트를 분리하여 각각 할인 적용 후 누적 수익을 산출함
 이벤트별 AV dependency와 CEV 알파 계수를 계산하여 최종 CEV 값을 보정함
 계산된 CEV 값과 관련 이벤트 데이터를 Firebase에 저장하고 결과를 반환함
 모듈화된 구조로 재사용성과 확장성이 뛰어나 향후 경제 가치 평가에 응용 가능함
@@ -25,17 +25,12 @@ import os
 import sys
 from datetime import datetime
 import pandas as pd
-import statsmodels.api as sm
 import asyncio
 
 from dotenv import load_dotenv
 load_dotenv()
 
-ARTIST_ID = os.getenv("ARTIST_ID")
-ARTIST_NAME_KOR = os.getenv("ARTIST_NAME_KOR")
-ARTIST_NAME_ENG = os.getenv("ARTIST_NAME_ENG")
-MELON_ID = os.getenv("MELON_ID")
-env_urls = os.getenv("NAVER_CONCERT_TAB", "").split("|")
+from Valuation.utils.artist import current_artist
 
 from Valuation.firebase.firebase_handler import load_with_filter
 
@@ -112,12 +107,14 @@ def find_latest_fv(fv_data, event_start_period):
     return latest_fv.get('FV_t_rolling_mean', 0)
     
 def get_exist_events():
-    filters = [('artist_id', '==', ARTIST_ID)]
+    filters = [('artist_id', '==', current_artist().artist_id)]
     events_data = load_with_filter('performance', filters)
     return events_data
 
 def load_av():
-    portfolio = av()
+    return prepare_av(av())
+
+def prepare_av(portfolio):
     metrics_data = portfolio.get('metrics')
     metrics_df = pd.DataFrame(metrics_data)
     metrics_df['release_date'] = pd.to_datetime(metrics_df['release_date'], format='%Y.%m.%d')
@@ -126,7 +123,9 @@ def load_av():
     return metrics
 
 def load_fv():
-    fv_t_data = fv_t()
+    return prepare_fv(fv_t())
+
+def prepare_fv(fv_t_data):
     fanbase = fv_t_data['sub_data']
     df = pd.DataFrame(fanbase)
     df['date'] = pd.to_datetime(df['date'])
@@ -179,16 +178,111 @@ def calculate_alpha(events_with_cer, av_data, fv_data):
     alpha = sum_cer / (sum_av_factor * latest_fv_value)
     return min(alpha, 0.5)
 
+def calculate_cev(events_data, fan_values, av_data, engagement):
+    events = []
+    total_events = len(events_data)
+    missing_revenue_events = []
+    events_with_cer = []
+    for event in events_data:
+        rev = event.get('revenue', 0)
+        if int(rev) <= 0:
+            missing_revenue_events.append(event)
+        else :
+            events_with_cer.append(event)
+
+    num_missing_revenue = len(missing_revenue_events)
+
+    av_dependency = num_missing_revenue / total_events if total_events > 0 else 0
+    cev_alpha = calculate_alpha(events_with_cer, av_data, fan_values)
+
+    sum_cer = 0
+    sum_cer_without_discount = 0
+    for event in events_with_cer:
+        revenue = parse_revenue(event.get('revenue'))
+        start_period_str = event.get('start_period')
+        start_period = clean_start_period(start_period_str)
+
+        latest_fv_value = find_latest_fv(fan_values, start_period)
+        latest_album = find_latest_album(av_data, start_period)
+
+        av_a = latest_album.get('av', 0)
+        if start_period:
+            discount_factor = calculate_discount_factor(start_period)
+            if not discount_factor or discount_factor <= 0 :
+                discount_factor = 1.0
+            revenue_cer = 0
+            if not revenue_cer or revenue_cer <= 0 or math.isnan(revenue_cer):
+                revenue_cer = 0.0
+            revenue_with_cer = revenue + revenue_cer
+            discounted_revenue = revenue_with_cer * discount_factor
+            sum_cer += discounted_revenue 
+            sum_cer_without_discount += revenue
+
+        rc_eok = revenue_cer / 100000000
+        value_eok = discounted_revenue / 100000000  # 억 단위로 변환
+        print(f"{event.get('title', 'Unknown')}의 가치 (할인 적용됨): {value_eok:.4f}억 (CER: {rc_eok:.4f}억)")
+        event_data = {
+            'cer': discounted_revenue,
+            **event
+        }
+        events.append(event_data)
+
+    print(f"수익 데이터가 있는 이벤트의 총 수익 (할인 적용됨): {sum_cer}")
+
+    sum_estimated_cer = 0
+    sum_estimated_cer_without_discount = 0
+
+    for event in missing_revenue_events:
+        print(f'Event Data : {event}')
+        start_period_str = event.get('start_period')
+        start_period = clean_start_period(start_period_str)
+        if start_period : 
+            latest_fv_value = find_latest_fv(fan_values, start_period)
+            latest_album = find_latest_album(av_data, start_period)
+
+            av_a = latest_album.get('av', 0)
+            discount_factor = calculate_discount_factor(start_period)
+            estimated_cer_without_discount = (av_a * engagement) + ((latest_fv_value * engagement)) * (1 + cev_alpha)
+            estimated_cer = estimated_cer_without_discount * discount_factor
+            sum_estimated_cer += estimated_cer
+            sum_estimated_cer_without_discount += estimated_cer_without_discount
+
+            value_eok = estimated_cer / 100000000  # 억 단위로 변환
+            print(f"{event.get('title', 'Unknown')}의 추정 수익 및 가치 (할인 적용됨): {value_eok:.4f}억")
+
+            event_data = {
+                'cer': estimated_cer,
+                **event
+            }
+            events.append(event_data)
+
+    cev_value = sum_cer + sum_estimated_cer
+    cev_value_without_discount = sum_estimated_cer_without_discount + sum_cer_without_discount
+    print(f"추정 수익 합산 (할인 적용): {sum_estimated_cer}")
+    print(f"추정 수익 합산 (할인 미적용): {sum_estimated_cer_without_discount}")
+    print(f"최종 CEV (할인 적용): {cev_value}")
+    print(f"최종 CEV (할인 미적용): {cev_value_without_discount}")
+    return {
+        'events': events,
+        'av_dependency': av_dependency,
+        'cev_alpha': cev_alpha,
+        'cev': cev_value,
+        'cev_value_without_discount': cev_value_without_discount
+    }
+
 from Valuation.MNV.MOV.PCV.CEV.CEV_collector import cev_collector, load_performance_data_from_sheet_and_save_to_firestore
 from Valuation.firebase.firebase_handler import save_record, check_record
+from Valuation.utils.stage_graph import stage
 DATA_TARGET='CEV'
 
+@stage(DATA_TARGET)
 def cev():
     load_data = check_record(DATA_TARGET, DATA_TARGET, 'events')
     if load_data:
         print(f'{DATA_TARGET} Loaded')
         return load_data.get(DATA_TARGET)
     
+    env_urls = (current_artist().naver_concert_tab or '').split("|")
     if env_urls and len(env_urls) > 0 and env_urls[0] != '':
             
         
@@ -210,90 +304,12 @@ def cev():
             fan_values = load_fv()
             av_data = load_av()
             er_data = er()
-            engagement = er_data['er']
-
-            total_events = len(events_data)
-            missing_revenue_events = []
-            events_with_cer = []
-            for event in events_data:
-                rev = event.get('revenue', 0)
-                if int(rev) <= 0:
-                    missing_revenue_events.append(event)
-                else :
-                    events_with_cer.append(event)
-
-            num_missing_revenue = len(missing_revenue_events)
-
-            av_dependency = num_missing_revenue / total_events if total_events > 0 else 0
-            cev_alpha = calculate_alpha(events_with_cer, av_data, fan_values)
-
-            sum_cer = 0
-            sum_cer_without_discount = 0
-            for event in events_with_cer:
-                revenue = parse_revenue(event.get('revenue'))
-                start_period_str = event.get('start_period')
-                start_period = clean_start_period(start_period_str)
-
-                latest_fv_value = find_latest_fv(fan_values, start_period)
-                latest_album = find_latest_album(av_data, start_period)
-
-                av_a = latest_album.get('av', 0)
-                if start_period:
-                    discount_factor = calculate_discount_factor(start_period)
-                    if not discount_factor or discount_factor <= 0 :
-                        discount_factor = 1.0
-                    revenue_cer = 0
-                    if not revenue_cer or revenue_cer <= 0 or math.isnan(revenue_cer):
-                        revenue_cer = 0.0
-                    revenue_with_cer = revenue + revenue_cer
-                    discounted_revenue = revenue_with_cer * discount_factor
-                    sum_cer += discounted_revenue 
-                    sum_cer_without_discount += revenue
-
-                rc_eok = revenue_cer / 100000000
-                value_eok = discounted_revenue / 100000000  # 억 단위로 변환
-                print(f"{event.get('title', 'Unknown')}의 가치 (할인 적용됨): {value_eok:.4f}억 (CER: {rc_eok:.4f}억)")
-                event_data = {
-                    'cer': discounted_revenue,
-                    **event
-                }
-                events.append(event_data)
-            
-            print(f"수익 데이터가 있는 이벤트의 총 수익 (할인 적용됨): {sum_cer}")
-
-            sum_estimated_cer = 0
-            sum_estimated_cer_without_discount = 0
-
-            for event in missing_revenue_events:
-                print(f'Event Data : {event}')
-                start_period_str = event.get('start_period')
-                start_period = clean_start_period(start_period_str)
-                if start_period : 
-                    latest_fv_value = find_latest_fv(fan_values, start_period)
-                    latest_album = find_latest_album(av_data, start_period)
-
-                    av_a = latest_album.get('av', 0)
-                    discount_factor = calculate_discount_factor(start_period)
-                    estimated_cer_without_discount = (av_a * engagement) + ((latest_fv_value * engagement)) * (1 + cev_alpha)
-                    estimated_cer = estimated_cer_without_discount * discount_factor
-                    sum_estimated_cer += estimated_cer
-                    sum_estimated_cer_without_discount += estimated_cer_without_discount
-
-                    value_eok = estimated_cer / 100000000  # 억 단위로 변환
-                    print(f"{event.get('title', 'Unknown')}의 추정 수익 및 가치 (할인 적용됨): {value_eok:.4f}억")
-
-                    event_data = {
-                        'cer': estimated_cer,
-                        **event
-                    }
-                    events.append(event_data)
-
-            cev_value = sum_cer + sum_estimated_cer
-            cev_value_without_discount = sum_estimated_cer_without_discount + sum_cer_without_discount
-            print(f"추정 수익 합산 (할인 적용): {sum_estimated_cer}")
-            print(f"추정 수익 합산 (할인 미적용): {sum_estimated_cer_without_discount}")
-            print(f"최종 CEV (할인 적용): {cev_value}")
-            print(f"최종 CEV (할인 미적용): {cev_value_without_discount}")
+            calculated = calculate_cev(events_data, fan_values, av_data, er_data['er'])
+            events = calculated['events']
+            av_dependency = calculated['av_dependency']
+            cev_alpha = calculated['cev_alpha']
+            cev_value = calculated['cev']
+            cev_value_without_discount = calculated['cev_value_without_discount']
 
     else:
         av_dependency = 1
@@ -10,14 +10,10 @@ import sys
 from dotenv import load_dotenv
 load_dotenv()
 
-ARTIST_ID = os.getenv("ARTIST_ID")
-ARTIST_NAME_KOR = os.getenv("ARTIST_NAME_KOR")
-ARTIST_NAME_ENG = os.getenv("ARTIST_NAME_ENG")
-MELON_ID = os.getenv("MELON_ID")
+from Valuation.utils.artist import current_artist
 
 INSTAGRAM_ACCOUNT_USERNAME=os.getenv("INSTAGRAM_ACCOUNT_USERNAME")
 INSTAGRAM_ACCOUNT_PASSWORD=os.getenv("INSTAGRAM_ACCOUNT_PASSWORD")
-TARGET_INSTAGRAM_ACCOUNT=os.getenv("INSTAGRAM_ACCOUNT")
 
 # 인스타그램 MCV 관련 가중치 (예시)
 W_LIKES = Weights.PCV.MCV_INSTAGRAM_LIKES
@@ -29,8 +25,11 @@ CURRENT_DATE = datetime.now(timezone.utc)
 
 from Valuation.MNV.MOV.FV.ER.ER_instagram import er_instagram
 from Valuation.firebase.firebase_handler import save_record, check_record
+from Valuation.utils.stage_graph import stage
 DATA_TARGET='MCV_instagram'
+@stage(DATA_TARGET)
 def mcv_instagram():
+    TARGET_INSTAGRAM_ACCOUNT = current_artist().instagram_account
     load_data = check_record(DATA_TARGET, DATA_TARGET, 'details')
     if load_data:
         print(f'{DATA_TARGET} Loaded')
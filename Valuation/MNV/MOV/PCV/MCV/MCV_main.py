@@ -14,16 +14,10 @@ import os
 import sys
 from datetime import datetime
 import pandas as pd
-import statsmodels.api as sm
 
 from dotenv import load_dotenv
 load_dotenv()
 
-ARTIST_ID = os.getenv("ARTIST_ID")
-ARTIST_NAME_KOR = os.getenv("ARTIST_NAME_KOR")
-ARTIST_NAME_ENG = os.getenv("ARTIST_NAME_ENG")
-MELON_ID = os.getenv("MELON_ID")
-
 from Valuation.MNV.MOV.PCV.MCV.MCV_youtube import mcv_youtube
 from Valuation.MNV.MOV.PCV.MCV.MCV_twitter import mcv_twitter
 from Valuation.MNV.MOV.PCV.MCV.MCV_instagram import mcv_instagram
@@ -33,8 +27,10 @@ TWITTER_WEIGHT = Weights.PCV.MCV_TWITTER
 INSTAGRAM_WEIGHT = Weights.PCV.MCV_INSTAGRAM
 
 from Valuation.firebase.firebase_handler import save_record, check_record
+from Valuation.utils.stage_graph import stage
 DATA_TARGET='MCV'
 
+@stage(DATA_TARGET)
 def mcv():
     load_data = check_record(DATA_TARGET)
     if load_data:
@@ -1,11 +1,10 @@
 ##### Valuation/MNV/MOV/PCV/MCV/MCV_twitter.py #####
 
-import tweepy
 import json
 from datetime import datetime, timezone
 import os
 
-TWITTER_ACCOUNT = os.getenv("TWITTER_ACCOUNT")
+from Valuation.utils.artist import current_artist
 
 TWITTER_API_KEY = os.getenv("TWITTER_API_KEY")
 TWITTER_API_KEY_SECRET = os.getenv("TWITTER_API_KEY_SECRET")
@@ -15,12 +14,22 @@ TWITTER_ACCESS_TOKEN_SECRET = os.getenv("TWITTER_ACCESS_TOKEN_SECRET")
 TWITTER_CLIENT_ID = os.getenv("TWITTER_CLIENT_ID")
 TWITTER_CLIENT_SECRET = os.getenv("TWITTER_CLIENT_SECRET")
 
-client = tweepy.Client(bearer_token=TWITTER_BEARER_TOKEN,
-                       consumer_key=TWITTER_API_KEY,
-                       consumer_secret=TWITTER_API_KEY_SECRET,
-                       access_token=TWITTER_ACCESS_TOKEN,
-                       access_token_secret=TWITTER_ACCESS_TOKEN_SECRET,
-                       wait_on_rate_limit=True)
+_client = None
+
+def twitter_client():
+    """
+    Twitter API 클라이언트. 모듈 import 시가 아니라 처음 사용할 때 만든다.
+    """
+    global _client
+    if _client is None:
+        import tweepy
+        _client = tweepy.Client(bearer_token=TWITTER_BEARER_TOKEN,
+                                consumer_key=TWITTER_API_KEY,
+                                consumer_secret=TWITTER_API_KEY_SECRET,
+                                access_token=TWITTER_ACCESS_TOKEN,
+                                access_token_secret=TWITTER_ACCESS_TOKEN_SECRET,
+                                wait_on_rate_limit=True)
+    return _client
 
 from Valuation.utils.weights import Weights, Variables
 W_LIKES=Weights.PCV.MCV_TWITTER_LIKES
@@ -37,19 +46,22 @@ WEIGHTS = {
 DISCOUNT_RATE=Variables.DISCOUNT_RATE
 
 def get_user_id(username):
-    user = client.get_user(username=username)
+    user = twitter_client().get_user(username=username)
     if user and user.data:
         return user.data.id
     else:
         raise Exception(f"사용자 @{username}를 찾을 수 없습니다.")
     
 def get_all_tweets():
+    TWITTER_ACCOUNT = current_artist().twitter_account
     max_tweets=999
     user_id = get_user_id(TWITTER_ACCOUNT)
 
+    import tweepy
+
     tweets = []
     paginator = tweepy.Paginator(
-        client.get_users_tweets,
+        twitter_client().get_users_tweets,
         id=user_id,
         max_results=100,
         tweet_fields=['created_at', 'public_metrics', 'text'],
@@ -109,9 +121,12 @@ def tweet_to_dict(tweet):
     }
 
 from Valuation.firebase.firebase_handler import save_record, check_record
+from Valuation.utils.stage_graph import stage
 DATA_TARGET='MCV_twitter'
 
+@stage(DATA_TARGET)
 def mcv_twitter():
+    TWITTER_ACCOUNT = current_artist().twitter_account
     load_data = check_record(DATA_TARGET, DATA_TARGET, 'tweets')
     if load_data:
         print(f'{DATA_TARGET} Loaded')
@@ -5,22 +5,16 @@ import sys
 from datetime import datetime, timezone
 import pandas as pd
 import numpy as np
-import statsmodels.api as sm
 import os
 import requests
 import time
-from sklearn.preprocessing import StandardScaler
-from scipy.optimize import minimize
 
 from dotenv import load_dotenv
 load_dotenv()
 
-ARTIST_ID = os.getenv("ARTIST_ID")
-ARTIST_NAME_KOR = os.getenv("ARTIST_NAME_KOR")
-ARTIST_NAME_ENG = os.getenv("ARTIST_NAME_ENG")
-MELON_ID = os.getenv("MELON_ID")
+from Valuation.utils.artist import current_artist
+from Valuation.utils.journal import checkpointed
 
-YOUTUBE_CHANNEL_ID = os.getenv("YOUTUBE_CHANNEL_ID")
 YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
 
 BASE_URL = "https://www.googleapis.com/youtube/v3/"
@@ -77,9 +71,13 @@ def get_videos_from_playlist(playlist_id):
     return video_ids
 
 def get_video_details(video_ids):
-    videos_data = []
-    for i in range(0, len(video_ids), 50):
-        batch_ids = video_ids[i:i+50]
+    artist = current_artist()
+    YOUTUBE_CHANNEL_ID = artist.youtube_channel_id
+    ARTIST_ID = artist.artist_id
+    ARTIST_NAME_KOR = artist.name_kor
+    ARTIST_NAME_ENG = artist.name_eng
+    MELON_ID = artist.melon_id
+    def fetch_batch(batch_ids):
         url = f"{BASE_URL}videos"
         params = {
             "part": "snippet,statistics,contentDetails",
@@ -90,6 +88,7 @@ def get_video_details(video_ids):
             response = requests.get(url, params=params)
             response.raise_for_status()
             data = response.json()
+            batch_data = []
             for video in data.get("items", []):
                 # 추가할 아티스트 정보
                 video['artist_id'] = ARTIST_ID
@@ -97,13 +96,22 @@ def get_video_details(video_ids):
                 video['artist_name_eng'] = ARTIST_NAME_ENG
                 video['melon_artist_id'] = MELON_ID
                 video['youtube_channel_id'] = YOUTUBE_CHANNEL_ID
-                videos_data.append(video)
+                batch_data.append(video)
             time.sleep(0.1)  # Small delay to respect rate limits
+            return batch_data
         except requests.exceptions.RequestException as e:
-            continue
+            # 실패한 배치는 저널에 기록하지 않아 다음 실행에서 다시 요청함
+            return None
+
+    # 50개 단위 요청 결과를 저널에 기록하여 중단 후 재실행 시 API 쿼터를 다시 쓰지 않음
+    batches = [video_ids[i:i+50] for i in range(0, len(video_ids), 50)]
+    videos_data = []
+    for batch_data in checkpointed('MCV_youtube_videos', batches, fetch_batch):
+        videos_data.extend(batch_data or [])
     return videos_data
 
 def get_youtube_videos():
+    YOUTUBE_CHANNEL_ID = current_artist().youtube_channel_id
     playlist_id = get_channel_uploads_playlist(YOUTUBE_CHANNEL_ID)
     if not playlist_id:
         return []
@@ -176,6 +184,7 @@ def preprocess_data(videos):
         'MCV': 2
     })
 
+    from sklearn.preprocessing import StandardScaler
     scaler = StandardScaler()
     df[['viewCount_norm', 'engagement_ratio_norm', 'efficiency_ratio_norm']] = scaler.fit_transform(
         df[['viewCount', 'engagement_ratio', 'efficiency_ratio']]
@@ -208,6 +217,8 @@ def calculate_mcv(df, weights):
     return df
 
 def optimize_weights(df):
+    import statsmodels.api as sm
+    from sklearn.preprocessing import StandardScaler
     scaler = StandardScaler()
     X = df[['viewCount', 'engagement_ratio', 'efficiency_ratio']]
     X_scaled = scaler.fit_transform(X)
@@ -226,6 +237,8 @@ def optimize_weights(df):
     return weights
 
 def optimize_weights_nonlinear(df):
+    from scipy.optimize import minimize
+
     def cost_function(weights, df):
         w_EG, w_eta = weights
         predicted_mcv = (
@@ -255,8 +268,10 @@ def optimize_weights_nonlinear(df):
 
 
 from Valuation.firebase.firebase_handler import save_record, check_record
+from Valuation.utils.stage_graph import stage
 DATA_TARGET='MCV_youtube'
 
+@stage(DATA_TARGET)
 def mcv_youtube():
     load_data = check_record(DATA_TARGET, DATA_TARGET, 'details')
     if load_data:
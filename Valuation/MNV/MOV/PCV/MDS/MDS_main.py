@@ -6,8 +6,8 @@ decay_factor 함수는 앨범 출시 후 경과 일수에 따른 지수 감쇠
 calculate_discount_factor 함수는 이벤트 발생일과 현재일 사이의 할인율을 연 단위로 산출함
 fv_t, er, av 모듈을 호출하여 각각 팬 밸류 트렌드, 소셜 참여율, 앨범 평가 데이터를 불러옴
 fv_t 데이터를 DataFrame으로 변환하고 날짜별 이동 평균(FV_t_rolling)을 계산함
-앨범 데이터에서 최대 AV 값을 기준으로 각 앨범의 상대적 가치와 감쇠 효과를 적용하여 AIF_t를 산출함
-각 날짜별로 최신 앨범의 AV 값과 해당 시점까지 출시된 앨범의 AIF_t, 그리고 er 값을 결합하여 MDS_t를 계산함
+calculate_aif_t 함수는 앨범 데이터에서 최대 AV 값을 기준으로 각 앨범의 상대적 가치와 감쇠 효과를 적용하여 AIF_t를 산출함
+calculate_mds 함수는 각 날짜별로 최신 앨범의 AV 값과 해당 시점까지 출시된 앨범의 AIF_t, 그리고 er 값을 결합하여 MDS_t를 계산함
 계산된 MDS_t 값은 할인 요인을 적용하여 억 단위로 변환 후 출력 및 누적 합산됨
 최종 결과는 날짜별 MDS_t 기록과 총 MDS 값으로 구성되어 Firebase에 저장되어 후속 분석에 활용됨
 '''
@@ -42,7 +42,9 @@ def calculate_discount_factor(event_date, current_date=datetime.now()):
     return discount_factor
 
 from Valuation.firebase.firebase_handler import save_record, check_record
+from Valuation.utils.stage_graph import stage
 DATA_TARGET='MDS'
+@stage(DATA_TARGET)
 def mds():
     load_data = check_record(DATA_TARGET, DATA_TARGET, 'records')
     if load_data:
@@ -53,6 +55,20 @@ def mds():
     er_value = er().get('er')
     av_data = av()
 
+    result = calculate_mds(fv_t_data, er_value, av_data)
+
+    save_record(DATA_TARGET, result, DATA_TARGET, 'records')
+    return result
+
+def calculate_aif_t(released_albums, current_date, max_album_value):
+    AIF_t = 0.000001
+    for album in released_albums:
+        normalized_av = album['av'] / max_album_value if max_album_value > 0 else 1
+        decay = decay_factor(album['release_date'], current_date)
+        AIF_t += normalized_av * decay
+    return AIF_t
+
+def calculate_mds(fv_t_data, er_value, av_data):
     df_fv = pd.DataFrame(fv_t_data['sub_data'])
     df_fv['date'] = pd.to_datetime(df_fv['date'])
     df_fv = df_fv.sort_values('date').reset_index(drop=True)
@@ -84,11 +100,7 @@ def mds():
         if latest_album:
             av_value = latest_album.get('av')
 
-        AIF_t = 0.000001
-        for album in released_albums:
-            normalized_av = album['av'] / max_album_value if max_album_value > 0 else 1
-            decay = decay_factor(album['release_date'], current_date)
-            AIF_t += normalized_av * decay
+        AIF_t = calculate_aif_t(released_albums, current_date, max_album_value)
 
         discount_factor = calculate_discount_factor(current_date)
 
@@ -100,10 +112,7 @@ def mds():
 
     df_fv['MDS_t'] = mds_values
     df_fv_result = df_fv.to_dict(orient='records')
-    result = {
+    return {
         'records': df_fv_result,
         'mds': total_mds
-    }
-    
-    save_record(DATA_TARGET, result, DATA_TARGET, 'records')
-    return result
\ No newline at end of file
+    }
\ No newline at end of file
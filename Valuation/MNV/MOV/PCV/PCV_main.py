@@ -14,16 +14,10 @@ import os
 import sys
 from datetime import datetime
 import pandas as pd
-import statsmodels.api as sm
 
 from dotenv import load_dotenv
 load_dotenv()
 
-ARTIST_ID = os.getenv("ARTIST_ID")
-ARTIST_NAME_KOR = os.getenv("ARTIST_NAME_KOR")
-ARTIST_NAME_ENG = os.getenv("ARTIST_NAME_ENG")
-MELON_ID = os.getenv("MELON_ID")
-
 from Valuation.MNV.MOV.PCV.CEV.CEV_main import cev
 from Valuation.MNV.MOV.PCV.MCV.MCV_main import mcv
 from Valuation.MNV.MOV.PCV.MDS.MDS_main import mds
@@ -33,7 +27,9 @@ MCV_WEIGHT = Weights.PCV.MCV_WEIGHT
 MDS_WEIGHT = Weights.PCV.MDS_WEIGHT
 
 from Valuation.firebase.firebase_handler import save_record, check_record
+from Valuation.utils.stage_graph import stage
 DATA_TARGET='PCV'
+@stage(DATA_TARGET)
 def pcv():
     load_data = check_record(DATA_TARGET)
     if load_data:
@@ -1,30 +1,35 @@
 ##### Valuation/MNV/MOV/PFV/AV/APV/APV_spotify.py #####
 
 import os
-import spotipy
 import pandas as pd
 from dotenv import load_dotenv
 load_dotenv()
 
-ARTIST_ID = os.getenv("ARTIST_ID")
-ARTIST_NAME_KOR = os.getenv("ARTIST_NAME_KOR")
-ARTIST_NAME_ENG = os.getenv("ARTIST_NAME_ENG")
-MELON_ID = os.getenv("MELON_ID")
+from Valuation.utils.artist import current_artist
 
 SPOTIFY_CLIENT_ID=os.getenv("SPOTIFY_CLIENT_ID")
 SPOTIFY_CLIENT_SECRET=os.getenv("SPOTIFY_CLIENT_SECRET")
-SPOTIFY_ID=os.getenv("SPOTIFY_ID")
 
-from spotipy.oauth2 import SpotifyClientCredentials
-auth_manager = SpotifyClientCredentials(client_id=SPOTIFY_CLIENT_ID, client_secret=SPOTIFY_CLIENT_SECRET)
-sp = spotipy.Spotify(auth_manager=auth_manager)
+_spotify = None
+
+def spotify():
+    """
+    Spotify 클라이언트. 모듈 import 시가 아니라 처음 사용할 때 만든다.
+    """
+    global _spotify
+    if _spotify is None:
+        import spotipy
+        from spotipy.oauth2 import SpotifyClientCredentials
+        auth_manager = SpotifyClientCredentials(client_id=SPOTIFY_CLIENT_ID, client_secret=SPOTIFY_CLIENT_SECRET)
+        _spotify = spotipy.Spotify(auth_manager=auth_manager)
+    return _spotify
 
 def get_artist_data():
-    result = sp.artist(SPOTIFY_ID)
+    result = spotify().artist(current_artist().spotify_id)
     return result
 
 def get_album_ids():
-    albums_data = sp.artist_albums(SPOTIFY_ID)
+    albums_data = spotify().artist_albums(current_artist().spotify_id)
     albums = albums_data.get('items')
     results = []
     for album in albums:
@@ -34,7 +39,7 @@ def get_album_ids():
     return results
 
 def get_albums_data(album_ids):
-    album_data = sp.albums(album_ids)
+    album_data = spotify().albums(album_ids)
     albums = album_data.get('albums')
     results = []
     all_track_ids = []
@@ -68,7 +73,7 @@ def get_albums_data(album_ids):
     return results, all_track_ids
 
 def get_tracks_data(track_ids):
-    tracks_data_raw = sp.tracks(track_ids)
+    tracks_data_raw = spotify().tracks(track_ids)
     tracks_data = tracks_data_raw.get('tracks')
     results = []
     for track_data in tracks_data:
@@ -4,7 +4,7 @@ AV_main.py는 Spotify와 Melon 플랫폼의 앨범 메트릭 데이터를 통합
 Weights와 Variables 모듈을 통해 RV, SV, APV 가중치 및 REVENUE_PER_STREAM 값을 설정함
 parse_date_any_format 함수는 다양한 날짜 포맷을 지원하여 문자열을 datetime 객체로 파싱함
 av() 함수는 Firebase 캐시를 확인 후, UDI_main 모듈을 호출하여 UDI와 결합된 메트릭 데이터를 획득함
-각 앨범에 대해 할인된 수익(RV_a), 스트림 기반 수익(SV_a), 인기도 기반 값(APV_a)을 산출함
+calculate_av 함수는 각 앨범에 대해 할인된 수익(RV_a), 스트림 기반 수익(SV_a), 인기도 기반 값(APV_a)을 산출함
 UDI 값을 기본값 또는 계산값으로 적용하여 최종 AV 값(AV_a)을 가중치와 결합하여 계산함
 각 앨범의 메트릭 데이터는 spotify_album_id, melon_album_id, 제목, 발매일 등으로 구성됨
 정렬된 앨범 리스트와 총 AV 값은 Firebase에 저장되어 후속 분석에 활용됨
@@ -24,6 +24,7 @@ REVENUE_PER_STREAM = float(Variables.REVENUE_PER_STREAM)
 
 from Valuation.MNV.MOV.PFV.AV.UDI.UDI_main import udi
 from Valuation.firebase.firebase_handler import save_record, check_record
+from Valuation.utils.stage_graph import stage
 DATA_TARGET='AV'
 
 def parse_date_any_format(date_str):
@@ -37,6 +38,7 @@ def parse_date_any_format(date_str):
             continue
     return None
 
+@stage(DATA_TARGET)
 def av():
     load_data = check_record(DATA_TARGET, DATA_TARGET, 'metrics')
     if load_data:
@@ -47,6 +49,12 @@ def av():
     combined_metrics = udi_calculated_data.get('combined_metrics', {})
     udi_data = udi_calculated_data.get('udi', {})
 
+    result = calculate_av(combined_metrics, udi_data)
+
+    save_record(DATA_TARGET, result, DATA_TARGET, 'metrics')
+    return result
+
+def calculate_av(combined_metrics, udi_data):
     total_AV = 0
     album_AV = []
     for album in combined_metrics:
@@ -92,10 +100,7 @@ def av():
     # release_date가 None인 경우 datetime.min으로 치환하여 정렬
     sorted_album_AV = sorted(album_AV, key=lambda x: x['release_date'] if x['release_date'] else datetime.min)
 
-    result = {
+    return {
         'metrics': sorted_album_AV,
         'av': total_AV,
-    }
-
-    save_record(DATA_TARGET, result, DATA_TARGET, 'metrics')
-    return result
\ No newline at end of file
+    }
\ No newline at end of file
@@ -2,7 +2,7 @@
 
 '''
 RV_main.py는 CircleChart 웹사이트에서 앨범 판매 데이터를 수집함
-환경변수로 ARTIST_ID, ARTIST_NAME_KOR, ARTIST_NAME_ENG, MELON_ID 및 검색 기준을 불러옴
+current_artist로 실행 대상 아티스트의 식별 정보 및 CircleChart 검색 기준을 불러옴
 get_sales_record_data 함수는 연도별 페이지를 요청하여 스크립트 내 res_list 데이터를 파싱함
 정규표현식을 이용하여 앨범 정보와 아티스트명을 추출 및 구조화함
 get_sales_from_list 함수는 추가 API 호출을 통해 상세 판매 정보를 획득함
@@ -13,7 +13,6 @@ Variables 모듈의 LAP와 DISCOUNT_RATE를 활용하여 할인된 판매 가격
 Firebase의 save_record 함수를 통해 분석 결과를 저장함
 '''
 
-import openpyxl
 import os
 import sys
 from datetime import datetime
@@ -25,70 +24,71 @@ import time
 from dotenv import load_dotenv
 load_dotenv()
 
-ARTIST_ID = os.getenv("ARTIST_ID")
-ARTIST_NAME_KOR = os.getenv("ARTIST_NAME_KOR")
-ARTIST_NAME_ENG = os.getenv("ARTIST_NAME_ENG")
-MELON_ID = os.getenv("MELON_ID")
+from Valuation.utils.artist import current_artist
+from Valuation.utils.journal import checkpointed
 
-CIRCLECHART_SEARCH_START_YEAR=os.getenv("CIRCLECHART_SEARCH_START_YEAR")
-CIRCLECHART_SEARCH_ARTIST_NAME=os.getenv("CIRCLECHART_SEARCH_ARTIST_NAME")
-
-def get_sales_record_data(start_year, artist_name):
+def get_sales_record_year(year, artist_name):
     all_formatted_data = []
 
-    current_year = datetime.now().year
-    for year in range(start_year, current_year + 1):
-        url = f'https://circlechart.kr/page_chart/search.circle?chartType=Album&serviceGbn=&searchGbn=2&termGbn=month&hitYear={year}&searchStr={artist_name}'
-        
-        response = requests.get(url)
-
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            script_tags = soup.find_all('script')
-
-            for script in script_tags:
-                if 'res_list' in script.text:
-                    script_text = script.string
-
-                    if script_text:
-                        pattern = r'res_list\[(\d+)\]\["(\w+)"\]\s*=\s*\'(.*?)\';'
-                        matches = re.findall(pattern, script_text)
-
-                        if matches:
-                            res_list = {}
-                            for match in matches:
-                                index, key, value = match
-                                index = int(index)
-                                if index not in res_list:
-                                    res_list[index] = {}
-                                res_list[index][key] = value
-
-                            formatted_data = [res_list[i] for i in sorted(res_list.keys())]
-
-                            for obj in formatted_data:
-                                artist_name_cleaned = re.sub(r'<.*?>', '', obj.get('ARTIST_NAME', ''))
-                                album_object = {
-                                    'service_ranking': obj.get('SERVICE_RANKING'),
-                                    'hit_year': obj.get('HIT_YEAR'),
-                                    'period_num': obj.get('PERIODNUM'),
-                                    'title_name': obj.get('TITLE_NAME'),
-                                    'album_name': obj.get('ALBUM_NAME'),
-                                    'artist_name': artist_name_cleaned
-                                }
-                                all_formatted_data.append(album_object)
-                        else:
-                            print(f"No valid res_list found for year {year}.")
+    url = f'https://circlechart.kr/page_chart/search.circle?chartType=Album&serviceGbn=&searchGbn=2&termGbn=month&hitYear={year}&searchStr={artist_name}'
+    
+    response = requests.get(url)
+
+    if response.status_code == 200:
+        soup = BeautifulSoup(response.text, 'html.parser')
+        script_tags = soup.find_all('script')
+
+        for script in script_tags:
+            if 'res_list' in script.text:
+                script_text = script.string
+
+                if script_text:
+                    pattern = r'res_list\[(\d+)\]\["(\w+)"\]\s*=\s*\'(.*?)\';'
+                    matches = re.findall(pattern, script_text)
+
+                    if matches:
+                        res_list = {}
+                        for match in matches:
+                            index, key, value = match
+                            index = int(index)
+                            if index not in res_list:
+                                res_list[index] = {}
+                            res_list[index][key] = value
+
+                        formatted_data = [res_list[i] for i in sorted(res_list.keys())]
+
+                        for obj in formatted_data:
+                            artist_name_cleaned = re.sub(r'<.*?>', '', obj.get('ARTIST_NAME', ''))
+                            album_object = {
+                                'service_ranking': obj.get('SERVICE_RANKING'),
+                                'hit_year': obj.get('HIT_YEAR'),
+                                'period_num': obj.get('PERIODNUM'),
+                                'title_name': obj.get('TITLE_NAME'),
+                                'album_name': obj.get('ALBUM_NAME'),
+                                'artist_name': artist_name_cleaned
+                            }
+                            all_formatted_data.append(album_object)
                     else:
-                        print(f"No script content found for year {year}.")
-                    
-                    break
-        else:
-            print(f'Error fetching data for {year}: {response.status_code}')
+                        print(f"No valid res_list found for year {year}.")
+                else:
+                    print(f"No script content found for year {year}.")
+                
+                break
+    else:
+        print(f'Error fetching data for {year}: {response.status_code}')
+        # 요청 실패는 저널에 기록되지 않도록 None을 반환
+        all_formatted_data = None
 
-        time.sleep(0.1)
+    time.sleep(0.1)
 
     return all_formatted_data
 
+def get_sales_record_data(start_year, artist_name):
+    current_year = datetime.now().year
+    # 연도별 조회 결과를 저널에 기록하여 중단 후 재실행 시 조회한 연도는 다시 요청하지 않음
+    yearly_data = checkpointed(f'RV_circlechart_{artist_name}', range(start_year, current_year + 1), lambda year: get_sales_record_year(year, artist_name), item_key=str)
+    return [album for data in yearly_data for album in data or []]
+
 def get_sales_from_list(year,month,index):
     details_url = 'https://circlechart.kr/data/api/chart/album'
 
@@ -126,8 +126,9 @@ def get_sales_from_list(year,month,index):
         return {}
 
 def fetch_sales():
-    start_years = CIRCLECHART_SEARCH_START_YEAR.split('||')
-    artist_names = CIRCLECHART_SEARCH_ARTIST_NAME.split('||')
+    artist = current_artist()
+    start_years = artist.circlechart_search_start_year.split('||')
+    artist_names = artist.circlechart_search_artist_name.split('||')
 
     results = []
     seen_titles = set()
@@ -149,14 +150,21 @@ def fetch_sales():
                 seen_titles.add(title)
         
         
-        for data in unique_data:
-            additional_data = get_sales_from_list(data['hit_year'], data['period_num'], data['service_ranking'])
-            
+        # 빈 응답(요청 실패)은 기록하지 않고 다음 실행에서 다시 요청함
+        sales_data = checkpointed(
+            'RV_sales',
+            unique_data,
+            lambda data: get_sales_from_list(data['hit_year'], data['period_num'], data['service_ranking']) or None,
+            item_key=lambda data: f"{data['hit_year']}-{data['period_num']}-{data['service_ranking']}",
+        )
+        for data, additional_data in zip(unique_data, sales_data):
+            additional_data = additional_data or {}
+
             result = {}
-            result['artist_id'] = ARTIST_ID
-            result['melon_artist_id'] = MELON_ID
-            result['artist_name'] = ARTIST_NAME_KOR
-            result['artist_name_eng'] = ARTIST_NAME_ENG
+            result['artist_id'] = artist.artist_id
+            result['melon_artist_id'] = artist.melon_id
+            result['artist_name'] = artist.name_kor
+            result['artist_name_eng'] = artist.name_eng
             result['album_name'] = data['album_name']
             result['total_sales'] = int(additional_data['Total_CNT'])
             result['total_sales_year'] = data['hit_year']
@@ -171,15 +179,18 @@ LAP=Variables.LAP
 DISCOUNT_RATE=Variables.DISCOUNT_RATE
 
 from Valuation.firebase.firebase_handler import save_record, check_record
+from Valuation.utils.stage_graph import stage
 DATA_TARGET='RV'
 
+@stage(DATA_TARGET)
 def rv():
     load_data = check_record(DATA_TARGET, DATA_TARGET, 'sales_data')
     if load_data:
         print(f'{DATA_TARGET} Loaded')
         return load_data.get(DATA_TARGET)
 
-    if CIRCLECHART_SEARCH_START_YEAR and CIRCLECHART_SEARCH_ARTIST_NAME:
+    artist = current_artist()
+    if artist.circlechart_search_start_year and artist.circlechart_search_artist_name:
         data = fetch_sales()
         current_year = datetime.now().year
         total_sales = 0
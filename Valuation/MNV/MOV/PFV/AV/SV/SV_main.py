@@ -1,7 +1,7 @@
 ##### Valuation/MNV/MOV/PFV/AV/SV/SV_main.py #####
 '''
 SV_main.py는 Melon 웹사이트에서 아티스트 앨범 및 곡 데이터를 수집, 집계하여 수익 지표를 산출함
-환경변수를 통해 ARTIST_ID, MELON_ID, MELON_IDS를 동적으로 불러옴
+current_artist로 실행 대상 아티스트의 MELON_ID, MELON_IDS를 불러옴
 get_albums_data와 get_songs_data 함수를 호출하여 앨범 및 곡 세부 정보를 획득함
 앨범별로 각 곡의 멜론 수익, 스트림, 좋아요, 청취자 수를 합산함
 앨범에 대응하는 곡 데이터를 트랙 리스트에 할당함
@@ -12,21 +12,15 @@ Firebase의 save_record 함수를 사용하여 데이터를 저장함
 모듈화 및 캐싱 전략으로 효율적 데이터 수집 및 응용 가능함
 '''
 
-import os
-from dotenv import load_dotenv
-load_dotenv()
-ARTIST_ID = os.getenv("ARTIST_ID")
-ARTIST_NAME_KOR = os.getenv("ARTIST_NAME_KOR")
-ARTIST_NAME_ENG = os.getenv("ARTIST_NAME_ENG")
-MELON_IDS = os.getenv("MELON_IDS")
-MELON_ID = os.getenv("MELON_ID")
-
 from collections import defaultdict
 
 from Valuation.MNV.MOV.PFV.AV.SV.SV_melon import get_albums_data, get_songs_data
 from Valuation.firebase.firebase_handler import save_record, check_record
+from Valuation.utils.stage_graph import stage
+from Valuation.utils.artist import current_artist
 DATA_TARGET='SV'
 
+@stage(DATA_TARGET)
 def sv():
     load_data = check_record(DATA_TARGET, DATA_TARGET, 'albums')
     if load_data:
@@ -36,12 +30,8 @@ def sv():
     total_albums = []
     melon_total_revenue = 0
 
-    ids = []
-    if MELON_IDS:
-        ids = MELON_IDS.split('||')
-    else:
-        ids.append(MELON_ID)
-        
+    ids = current_artist().melon_id_list
+
     for id in ids:
         albums = get_albums_data(id)
         songs = get_songs_data(id)
@@ -2,7 +2,7 @@
 
 '''
 SV_main.py는 먼저 Firebase에서 캐시된 SV 데이터를 확인하여, 이미 저장된 결과가 있으면 이를 즉시 반환합니다.
-캐시가 없으면, 환경변수에 지정된 MELON_ID 또는 MELON_IDS를 기반으로 Melon에서 앨범과 곡 데이터를 수집합니다.
+캐시가 없으면, 실행 대상 아티스트의 MELON_ID 또는 MELON_IDS를 기반으로 Melon에서 앨범과 곡 데이터를 수집합니다.
 각 앨범에 대해 해당 앨범의 곡들을 찾아 곡별 수익, 스트림, 리스너, 좋아요 수를 누적하여 앨범 단위의 통계를 산출합니다.
 중복되지 않는 앨범 목록을 구성한 후, 전체 Melon 수익을 계산하여 Firebase에 저장하고 최종 결과를 반환합니다.
 '''
@@ -19,10 +19,6 @@ from datetime import datetime
 from dotenv import load_dotenv
 load_dotenv()
 
-ARTIST_ID = os.getenv("ARTIST_ID")
-ARTIST_NAME_KOR = os.getenv("ARTIST_NAME_KOR")
-ARTIST_NAME_ENG = os.getenv("ARTIST_NAME_ENG")
-
 melon_headers = {
     'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/130.0.0.0 Safari/537.36',
 }
@@ -5,10 +5,10 @@ rv, sv, apv 모듈을 통해 판매, 스트리밍, 인기도 데이터를 개별
 normalize_release_date_spotify와 normalize_release_date_melon 함수로 각 플랫폼의 발매일을 표준화함
 match_albums_by_release_date 함수로 발매일을 기준으로 Spotify와 Melon 앨범을 매핑함
 is_valid_track 함수로 불필요한 인스트루멘탈, 인터루드 등 트랙을 필터링함
-combine_metrics 함수에서 각 앨범의 스트림, 청취, 좋아요, 인기도 데이터를 정규화 및 통합함
+combine_metrics 함수에서 각 앨범의 스트림, 청취, 좋아요, 인기도 데이터를 정규화 및 통합함 (sv, apv, rv 결과를 인자로 받음)
 normalize_values 함수를 활용해 메트릭 데이터의 상대적 크기를 산출함
 entropy_ratio와 calculate_normalized_entropy 함수로 각 메트릭의 엔트로피를 계산함
-UDI는 네 엔트로피의 평균으로 산출되며 0.5에서 1.0 사이로 제한됨
+calculate_udi 함수에서 UDI는 네 엔트로피의 평균으로 산출되며 0.5에서 1.0 사이로 제한됨
 Firebase에 저장된 결과는 앨범 다양성 분석 및 향후 응용에 활용될 수 있음
 '''
 
@@ -95,11 +95,7 @@ def is_valid_track(track):
 def normalize_values(values):
     max_value = max(values) if values else 0
     return [value / max_value if max_value > 0 else 0 for value in values]
-def combine_metrics():
-    sv_data = sv()
-    apv_data = apv()
-    rv_data = rv()
-
+def combine_metrics(sv_data, apv_data, rv_data):
     melon_albums = sv_data.get('albums', [])
     spotify_albums = apv_data.get('albums', [])
     sales_data = rv_data.get('sales_data', [])
@@ -287,17 +283,7 @@ def calculate_normalized_entropy(values):
     H_normalized = H / H_max if H_max > 0 else 0.0
     return H_normalized
 
-from Valuation.firebase.firebase_handler import save_record, check_record
-DATA_TARGET='UDI'
-
-def udi():
-    load_data = check_record(DATA_TARGET, DATA_TARGET, 'combined_metrics')
-    if load_data:
-        print(f'{DATA_TARGET} Loaded')
-        return load_data.get(DATA_TARGET)
-    
-    combined_metrics = combine_metrics()
-    
+def calculate_udi(combined_metrics):
     udi = {}
     for metrics in combined_metrics:
         album_id = metrics.get('id', '')
@@ -315,10 +301,24 @@ def udi():
         UDI = max(min(UDI, 1.0), 0.5)
 
         udi[album_id] = UDI
+    return udi
+
+from Valuation.firebase.firebase_handler import save_record, check_record
+from Valuation.utils.stage_graph import stage
+DATA_TARGET='UDI'
+
+@stage(DATA_TARGET)
+def udi():
+    load_data = check_record(DATA_TARGET, DATA_TARGET, 'combined_metrics')
+    if load_data:
+        print(f'{DATA_TARGET} Loaded')
+        return load_data.get(DATA_TARGET)
+    
+    combined_metrics = combine_metrics(sv(), apv(), rv())
 
     result = {
         'combined_metrics': combined_metrics,
-        'udi': udi
+        'udi': calculate_udi(combined_metrics)
     }
 
 
@@ -18,8 +18,10 @@ PFV_WEIGHT=float(Weights.PFV.PFV_WEIGHT)
 
 from Valuation.MNV.MOV.PFV.AV.AV_main import av
 from Valuation.firebase.firebase_handler import save_record, check_record
+from Valuation.utils.stage_graph import stage
 DATA_TARGET='PFV'
 
+@stage(DATA_TARGET)
 def pfv():
     load_data = check_record(DATA_TARGET, DATA_TARGET, 'av_a')
     if load_data:
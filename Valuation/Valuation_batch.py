@@ -0,0 +1,103 @@
+##### Valuation/Valuation_batch.py #####
+'''
+Valuation_batch.py는 여러 아티스트(레이블 로스터)를 한 프로세스에서 동시에 평가하는 배치 실행기임
+valuate_many 함수는 Artist 목록을 받아 제한된 스레드 풀(VALUATION_BATCH_WORKERS)에서 아티스트별 실행 범위를 열고 STAGE_GRAPH를 실행함
+각 아티스트 실행은 독립된 ValuationRun을 사용하므로 스테이지 결과와 Firestore 캐시가 섞이지 않음
+환율, 국가별 GDP, 플랫폼 사용자 수처럼 아티스트와 무관한 데이터는 SharedStore를 통해 배치 전체에서 한 번만 불러옴
+한 아티스트의 실패는 다른 아티스트의 실행을 중단시키지 않으며 결과 보고서에 오류로 기록됨
+아티스트별 소요 시간, 계산된 스테이지 수, 처리량(stages/s), 최대 RSS와 배치 전체 처리량(artists/h)을 로그로 남김
+VALUATION_MEMORY_LIMIT_MB를 지정하면 RSS가 상한을 넘는 동안 새 아티스트와 스테이지의 시작을 미뤄 작은 서버에서도 배치를 실행할 수 있음
+명령행 실행: python -m Valuation.Valuation_batch artists.json (ARTIST_ID 등 환경변수 이름 또는 Artist 속성 이름을 키로 갖는 객체 배열)
+'''
+
+import contextvars
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Optional
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from utils.logger import setup_logger
+from utils.memory import MemoryLimitExceeded, wait_for_memory, watch
+from Valuation.utils.artist import Artist
+from Valuation.utils.stage_graph import SharedStore, valuation_run
+from Valuation.MNV.MOV.MOV_graph import STAGE_GRAPH
+logger = setup_logger(__name__)
+
+BATCH_WORKERS = int(os.getenv('VALUATION_BATCH_WORKERS', '2'))
+
+def valuate_artist(artist: Artist, targets: Iterable[str] = ('MOV',), shared: Optional[SharedStore] = None) -> Dict:
+    """
+    한 아티스트의 targets 스테이지를 실행하고 결과와 처리량 정보를 반환한다.
+    """
+    started = time.perf_counter()
+    report = {'artist_id': artist.artist_id, 'artist_name': artist.name_kor}
+    try:
+        # 메모리 상한을 넘은 상태면 다른 아티스트의 스테이지가 끝나 메모리가 줄어들 때까지 시작을 미룸
+        wait_for_memory(artist.artist_id)
+    except MemoryLimitExceeded as e:
+        logger.error(f"Valuation skipped for '{artist.artist_id}': {e}")
+        return {**report, 'error': str(e), 'stages': 0, 'elapsed': time.perf_counter() - started, 'stages_per_sec': 0.0}
+
+    with watch(artist.artist_id, waitable=False) as memory, valuation_run(STAGE_GRAPH, artist, shared) as run:
+        try:
+            report['result'] = STAGE_GRAPH.run(targets)
+        except Exception as e:
+            logger.error(f"Valuation failed for '{artist.artist_id}': {e}")
+            report['error'] = str(e)
+        report['stages'] = len(run.results)
+    report['peak_rss_mb'] = memory.to_dict()['peak_rss_mb']
+
+    report['elapsed'] = time.perf_counter() - started
+    report['stages_per_sec'] = report['stages'] / report['elapsed'] if report['elapsed'] else 0.0
+    logger.info(f"[{artist.artist_id}] {report['stages']} stages in {report['elapsed']:.1f}s ({report['stages_per_sec']:.2f} stages/s), peak RSS {report['peak_rss_mb']:.0f} MB")
+    return report
+
+def valuate_many(artists: Iterable, targets: Iterable[str] = ('MOV',), max_workers: Optional[int] = None) -> Dict[str, Dict]:
+    """
+    여러 아티스트를 스레드 풀에서 동시에 평가한다. artists에는 Artist 또는 dict를 넣을 수 있다.
+    반환값: {artist_id: valuate_artist 보고서}
+    """
+    artists = [a if isinstance(a, Artist) else Artist.from_dict(a) for a in artists]
+    targets = list(targets)
+    max_workers = max_workers or BATCH_WORKERS
+    shared = SharedStore()
+
+    started = time.perf_counter()
+    reports = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        # 풀 스레드가 재사용되어도 이전 아티스트의 실행 범위가 남지 않도록 빈 컨텍스트에서 실행
+        futures = {
+            pool.submit(contextvars.Context().run, valuate_artist, artist, targets, shared): artist
+            for artist in artists
+        }
+        for future in as_completed(futures):
+            report = future.result()
+            reports[report['artist_id']] = report
+
+    elapsed = time.perf_counter() - started
+    failed = [artist_id for artist_id, report in reports.items() if 'error' in report]
+    throughput = len(reports) / elapsed * 3600 if elapsed else 0.0
+    logger.info(f"Batch: {len(reports)} artists in {elapsed:.1f}s ({throughput:.1f} artists/h), {len(failed)} failed")
+    logger.info(f"Shared data: {shared.stats['hits']} hits / {shared.stats['misses']} misses")
+    return reports
+
+def load_artists(path: str) -> List[Artist]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return [Artist.from_dict(item) for item in json.load(f)]
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print('Usage: python -m Valuation.Valuation_batch artists.json [max_workers]')
+        sys.exit(1)
+
+    artists = load_artists(sys.argv[1])
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    reports = valuate_many(artists, max_workers=max_workers)
+    for artist_id, report in reports.items():
+        status = report.get('error') or f"MOV {sum(row.get('MOV_t', 0) for row in report['result']['MOV']):,.0f}"
+        print(f"{artist_id} : {status} ({report['elapsed']:.1f}s)")
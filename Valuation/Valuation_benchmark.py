@@ -0,0 +1,511 @@
+##### Valuation/Valuation_benchmark.py #####
+'''
+Valuation_benchmark.py는 밸류에이션 스테이지 그래프 전체와 각 스테이지를 기록된 데이터로 반복 실행하여 성능 회귀를 찾는 벤치마크임
+벤치마크 입력은 VALUATION_BENCH_DIR(기본값 benchmarks) 디렉터리에 둠
+- profiles.json: 프로파일 이름(small, medium, large)별 아티스트 객체 (Valuation_batch.py의 입력과 같은 형식)
+- storage.sqlite3: 스테이지가 읽는 입력 문서(albums, songs 등) 스냅샷. valuation 컬렉션(스테이지 결과)은 포함하지 않음
+- cassettes/: 외부 HTTP 응답 카세트 (utils/cassette.py)
+- baseline.json: 비교 기준 결과
+run 모드는 매 반복마다 스냅샷으로 채운 메모리 저장소(BenchmarkStorage)와 카세트 재생(replay)으로 네트워크 없이 실행함
+- graph: 저장된 결과가 없는 상태에서 --target(기본값 MOV)과 모든 선행 스테이지를 계산함
+- stages: graph 실행이 남긴 결과를 선행 스테이지 결과로 채운 뒤 스테이지 하나만 다시 계산함
+- 지표: 벽시계/CPU 시간(초), 최대 RSS(MB), HTTP 호출 수, 저장소 읽기/쓰기 수. 시간과 메모리는 반복 측정의 중앙값을 사용함
+- 결과는 benchmarks/results/<코드 버전>-<시각>.json에 저장하고 baseline.json과 비교하여 회귀를 표시하며, 회귀가 있으면 종료 코드 1을 반환함
+- 시간과 메모리는 VALUATION_BENCH_TOLERANCE(기본값 0.2, 20%)와 최소 변화량(VALUATION_BENCH_MIN_SECONDS, VALUATION_BENCH_MIN_MB)을 함께 넘을 때, 호출 수는 늘어나면 회귀로 판단함
+record 모드는 실제 저장소와 외부 API로 graph를 한 번 실행하여 카세트와 입력 문서 스냅샷을 만듦 (결과는 실제 저장소에 쓰지 않음)
+micro 모드는 합성 카탈로그(utils/synthetic.py)로 계산 함수(MICRO_CASES)만 호출하여 입력 크기에 따른 실행 시간을 측정함
+- 각 함수는 한 항목(앨범 수, 영상 수, 공연 수 등)만 MICRO_LADDERS의 크기로 늘리고 나머지는 --preset 크기로 고정함
+- 입력 준비와 출력(print)은 측정에서 제외하며, 한 크기의 중앙값이 --max-seconds를 넘으면 더 큰 크기는 건너뜀
+- 항목당 시간과 log-log 기울기(scaling 지수, 1이면 선형)를 출력하고 benchmarks/results/micro-<코드 버전>-<시각>.json에 저장함
+명령행 실행: python -m Valuation.Valuation_benchmark [run|record] [--profiles small,medium] [--stages all|none|SV,RV] [--repeat 3] [--save-baseline]
+명령행 실행: python -m Valuation.Valuation_benchmark micro [--cases calculate_cev,calculate_mrv] [--preset small] [--max-seconds 30]
+'''
+
+import argparse
+import contextlib
+import copy
+import json
+import math
+import os
+import statistics
+import sys
+import time
+from typing import Dict, Iterable, List, Optional
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from utils.logger import setup_logger
+from utils.cassette import install_cassette
+from utils.memory import watch
+from utils.profiling import code_version
+from Firebase.storage import MemoryStorage, SQLiteStorage, Storage, create_storage, set_storage
+from Firebase.usage import document_size, record_usage
+from Valuation.utils.artist import Artist
+from Valuation.utils.synthetic import SyntheticCatalog
+from Valuation.utils.stage_graph import SharedStore, valuation_run
+from Valuation.MNV.MOV.MOV_graph import STAGE_GRAPH
+logger = setup_logger(__name__)
+
+BENCH_DIR = os.getenv('VALUATION_BENCH_DIR', 'benchmarks')
+BENCH_REPEAT = int(os.getenv('VALUATION_BENCH_REPEAT', '3'))
+BENCH_TOLERANCE = float(os.getenv('VALUATION_BENCH_TOLERANCE', '0.2'))
+# 이보다 작은 변화는 측정 잡음으로 보고 회귀로 판단하지 않음
+BENCH_MIN_SECONDS = float(os.getenv('VALUATION_BENCH_MIN_SECONDS', '0.05'))
+BENCH_MIN_MB = float(os.getenv('VALUATION_BENCH_MIN_MB', '10'))
+
+PROFILES = ('small', 'medium', 'large')
+# (지표, 종류). time/memory는 중앙값과 허용 오차로, count는 늘어났는지로 비교함
+METRICS = [
+    ('wall_s', 'time'),
+    ('cpu_s', 'time'),
+    ('peak_rss_mb', 'memory'),
+    ('http_calls', 'count'),
+    ('storage_reads', 'count'),
+    ('storage_writes', 'count'),
+]
+
+# 한 크기의 측정이 이 시간(초)을 넘으면 같은 함수의 더 큰 크기는 건너뜀
+MICRO_MAX_SECONDS = float(os.getenv('VALUATION_BENCH_MICRO_MAX_SECONDS', '30'))
+MICRO_LADDERS = {
+    'albums': [10, 30, 100, 300, 1000],
+    'years': [2, 5, 10, 20],
+    'videos': [500, 2000, 10000, 50000],
+    'concerts': [10, 50, 200, 1000],
+    'broadcasts': [10, 50, 200, 1000],
+}
+
+class BenchmarkStorage(MemoryStorage):
+    """
+    작업 수를 Firestore와 같은 기준(Firebase/usage.py)으로 기록하는 메모리 저장소.
+    """
+    def load(self, docs: Iterable) -> 'BenchmarkStorage':
+        with self._lock:
+            self._write(list(docs))
+        return self
+
+    def dump(self) -> List:
+        # 작업 수에 포함되지 않도록 get을 거치지 않고 복사함
+        with self._lock:
+            return copy.deepcopy(list(self._docs.items()))
+
+    def get(self, path, field_paths=None):
+        data = super().get(path, field_paths)
+        record_usage('reads', path, size=document_size(data))
+        return data
+
+    def set(self, path, data, merge=False):
+        super().set(path, data, merge)
+        record_usage('writes', path, size=document_size(data))
+
+    def batch_set(self, writes, timeout=None):
+        writes = list(writes)
+        super().batch_set(writes, timeout)
+        for path, data in writes:
+            record_usage('writes', path, size=document_size(data))
+
+    def stream(self, collection_path, filters=None):
+        empty = True
+        for doc_id, data in super().stream(collection_path, filters):
+            empty = False
+            record_usage('reads', collection_path, size=document_size(data))
+            yield doc_id, data
+        if empty:
+            record_usage('reads', collection_path)
+
+class RecordingStorage(Storage):
+    """
+    record 모드 저장소. 입력 문서는 backend에서 읽어 snapshot에도 저장하고, 쓰기와 valuation 문서는 메모리(overlay)에서만 처리한다.
+    """
+    def __init__(self, backend: Storage, snapshot: SQLiteStorage):
+        self.backend = backend
+        self.snapshot = snapshot
+        # 읽기/쓰기 수는 backend에서 기록되므로 overlay는 기록하지 않는 MemoryStorage를 사용
+        self.overlay = MemoryStorage()
+
+    @staticmethod
+    def _local(path: str) -> bool:
+        # 스테이지 결과는 벤치마크에서 다시 계산하므로 기록하지 않음
+        return path.split('/', 1)[0] == 'valuation'
+
+    def get(self, path, field_paths=None):
+        data = self.overlay.get(path, field_paths)
+        if data is not None or self._local(path):
+            return data
+        data = self.backend.get(path)
+        if data is None:
+            return None
+        self.snapshot.set(path, data)
+        return self.snapshot.get(path, field_paths)
+
+    def set(self, path, data, merge=False):
+        self.overlay.set(path, data, merge)
+
+    def batch_set(self, writes, timeout=None):
+        self.overlay.batch_set(writes, timeout)
+
+    def stream(self, collection_path, filters=None):
+        docs = {}
+        if not self._local(collection_path):
+            docs = dict(self.backend.stream(collection_path, filters))
+            self.snapshot.batch_set([(f'{collection_path}/{doc_id}', data) for doc_id, data in docs.items()])
+        docs.update(self.overlay.stream(collection_path, filters))
+        yield from docs.items()
+
+def load_profiles(path: Optional[str] = None) -> Dict[str, Artist]:
+    path = path or os.path.join(BENCH_DIR, 'profiles.json')
+    with open(path, 'r', encoding='utf-8') as f:
+        return {name: Artist.from_dict(data) for name, data in json.load(f).items()}
+
+def load_snapshot(path: Optional[str] = None) -> List:
+    """
+    입력 문서 스냅샷의 (경로, 데이터) 목록. 파일이 없으면 빈 목록을 반환한다.
+    """
+    path = path or os.path.join(BENCH_DIR, 'storage.sqlite3')
+    if not os.path.exists(path):
+        logger.warning(f"No storage snapshot at {path}; stages start from an empty storage")
+        return []
+    snapshot = SQLiteStorage(path)
+    try:
+        return [(p, data) for p, data in snapshot.documents() if not RecordingStorage._local(p)]
+    finally:
+        snapshot.close()
+
+def _stage_metrics(s) -> Dict:
+    return {
+        'wall_s': s.duration,
+        'cpu_s': s.cpu,
+        'peak_rss_mb': s.args.get('peak_rss_mb', 0),
+        'http_calls': s.counters['http_calls'],
+        'storage_reads': s.counters['firestore_reads'],
+        'storage_writes': s.counters['firestore_writes'],
+        'status': s.args.get('status', ''),
+    }
+
+def run_graph(artist: Artist, docs: List, targets: Iterable[str] = ('MOV',), storage: Optional[Storage] = None) -> Dict:
+    """
+    저장된 결과가 없는 저장소에서 targets를 계산한다.
+    반환값: {'metrics': 전체 지표, 'stages': {스테이지: 지표}, 'results', 'output_hashes', 'docs': 실행 후 저장소 문서}
+    """
+    storage = storage or BenchmarkStorage().load(docs)
+    previous = set_storage(storage)
+    try:
+        started, cpu_started = time.perf_counter(), time.process_time()
+        with watch(f'benchmark:{artist.artist_id}', waitable=False) as memory, valuation_run(STAGE_GRAPH, artist, SharedStore()) as run:
+            # 이전 실행의 저널을 이어받지 않도록 함
+            run.journaled = False
+            STAGE_GRAPH.run(targets)
+        metrics = {
+            'wall_s': time.perf_counter() - started,
+            'cpu_s': time.process_time() - cpu_started,
+            'peak_rss_mb': memory.to_dict()['peak_rss_mb'],
+            'http_calls': run.trace.counters['http_calls'],
+            'storage_reads': run.trace.counters['firestore_reads'],
+            'storage_writes': run.trace.counters['firestore_writes'],
+        }
+    finally:
+        set_storage(previous)
+    return {
+        'metrics': metrics,
+        'stages': {s.name: _stage_metrics(s) for s in run.trace.stage_spans()},
+        'results': run.results,
+        'output_hashes': run.output_hashes,
+        'docs': storage.dump() if isinstance(storage, BenchmarkStorage) else [],
+    }
+
+def run_stage_alone(artist: Artist, name: str, graph_run: Dict) -> Dict:
+    """
+    graph 실행의 결과와 저장소 문서를 선행 스테이지 결과로 사용하여 name 스테이지만 다시 계산한다.
+    """
+    storage = BenchmarkStorage().load(graph_run['docs'])
+    previous = set_storage(storage)
+    try:
+        with valuation_run(STAGE_GRAPH, artist, SharedStore()) as run:
+            run.journaled = False
+            run.force.add(name)
+            for other, result in graph_run['results'].items():
+                if other != name:
+                    run.results[other] = copy.deepcopy(result)
+                    run.output_hashes[other] = graph_run['output_hashes'][other]
+            STAGE_GRAPH.stage_func(name)()
+    finally:
+        set_storage(previous)
+    spans = [s for s in run.trace.stage_spans() if s.name == name]
+    return _stage_metrics(spans[0])
+
+def _median(samples: List[Dict]) -> Dict:
+    summary = {}
+    for metric, kind in METRICS:
+        values = [sample[metric] for sample in samples]
+        # 호출 수는 반복마다 같아야 하므로 최대값으로 변동을 드러냄
+        summary[metric] = max(values) if kind == 'count' else round(statistics.median(values), 4)
+    return summary
+
+def benchmark_profile(artist: Artist, docs: List, targets: List[str], stages: List[str], repeat: int = BENCH_REPEAT) -> Dict:
+    """
+    한 프로파일의 graph와 stages를 repeat번 측정한 중앙값. 첫 graph 실행은 import와 프로세스 캐시를 채우는 예열로 보고 제외한다.
+    """
+    logger.info(f"Benchmarking {artist!r}: graph {targets} x{repeat}, {len(stages)} stages x{repeat}")
+    graph_run = run_graph(artist, docs, targets)
+    graph_samples = [run_graph(artist, docs, targets)['metrics'] for _ in range(repeat)]
+    report = {'graph': _median(graph_samples), 'stages': {}}
+    for name in stages:
+        if name not in graph_run['results']:
+            logger.warning(f"Stage '{name}' is not part of {targets}; skipped")
+            continue
+        report['stages'][name] = _median([run_stage_alone(artist, name, graph_run) for _ in range(repeat)])
+    return report
+
+def _regression(kind: str, current: float, base: float, tolerance: float) -> bool:
+    if kind == 'count':
+        return current > base
+    floor = BENCH_MIN_SECONDS if kind == 'time' else BENCH_MIN_MB
+    return current > base * (1 + tolerance) and current - base > floor
+
+def compare(results: Dict, baseline: Dict, tolerance: float = BENCH_TOLERANCE) -> List[Dict]:
+    """
+    baseline에 같은 (프로파일, 범위, 지표)가 있는 항목만 비교하여 회귀 목록을 반환한다.
+    """
+    regressions = []
+    for profile, report in results['profiles'].items():
+        base_report = baseline.get('profiles', {}).get(profile)
+        if base_report is None:
+            continue
+        scopes = [('graph', report['graph'], base_report.get('graph'))]
+        scopes += [(name, m, base_report.get('stages', {}).get(name)) for name, m in report['stages'].items()]
+        for scope, current, base in scopes:
+            if base is None:
+                continue
+            for metric, kind in METRICS:
+                if metric in base and _regression(kind, current[metric], base[metric], tolerance):
+                    regressions.append({'profile': profile, 'scope': scope, 'metric': metric, 'current': current[metric], 'baseline': base[metric]})
+    return regressions
+
+def _change(current: float, base: Optional[float]) -> str:
+    if base is None:
+        return ''
+    if not base:
+        return 'new' if current else ''
+    return f'{(current - base) / base:+.0%}'
+
+def format_results(results: Dict, baseline: Optional[Dict] = None, regressions: Iterable[Dict] = ()) -> str:
+    flagged = {(r['profile'], r['scope'], r['metric']) for r in regressions}
+    lines = []
+    for profile, report in results['profiles'].items():
+        base_report = (baseline or {}).get('profiles', {}).get(profile, {})
+        lines.append(f"[{profile}] {report['artist_id']}")
+        lines.append(f"{'scope':<15} " + ' '.join(f'{metric:>20}' for metric, _ in METRICS))
+        rows = [('graph', report['graph'], base_report.get('graph', {}))]
+        rows += [(name, m, base_report.get('stages', {}).get(name, {})) for name, m in report['stages'].items()]
+        for scope, current, base in rows:
+            cells = []
+            for metric, _ in METRICS:
+                mark = '!' if (profile, scope, metric) in flagged else ' '
+                cells.append(f"{current[metric]:>10.4g} {_change(current[metric], base.get(metric)):>8}{mark}")
+            lines.append(f"{scope:<15} " + ' '.join(cells))
+        lines.append('')
+    for r in regressions:
+        lines.append(f"REGRESSION {r['profile']}/{r['scope']} {r['metric']}: {r['baseline']:g} -> {r['current']:g}")
+    return '\n'.join(lines).rstrip()
+
+def run_benchmarks(profiles: Dict[str, Artist], targets: List[str], stages: List[str], repeat: int = BENCH_REPEAT) -> Dict:
+    install_cassette('replay', os.path.join(BENCH_DIR, 'cassettes'))
+    docs = load_snapshot()
+    results = {'version': code_version(), 'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'targets': targets, 'repeat': repeat, 'profiles': {}}
+    for profile, artist in profiles.items():
+        report = benchmark_profile(artist, docs, targets, stages, repeat)
+        results['profiles'][profile] = {'artist_id': artist.artist_id, **report}
+    return results
+
+def record_fixtures(profiles: Dict[str, Artist], targets: List[str]) -> None:
+    """
+    실제 저장소와 외부 API로 graph를 한 번씩 실행하여 카세트와 입력 문서 스냅샷을 기록한다.
+    """
+    install_cassette('record', os.path.join(BENCH_DIR, 'cassettes'))
+    os.makedirs(BENCH_DIR, exist_ok=True)
+    snapshot = SQLiteStorage(os.path.join(BENCH_DIR, 'storage.sqlite3'))
+    try:
+        for profile, artist in profiles.items():
+            logger.info(f"Recording fixtures for {profile} ({artist!r})")
+            run_graph(artist, [], targets, storage=RecordingStorage(create_storage(), snapshot))
+    finally:
+        snapshot.close()
+
+def _timeline(catalog: SyntheticCatalog):
+    import pandas as pd
+    dates = [item['date'] for item in catalog.fv_t()['sub_data']]
+    timeline_df = pd.DataFrame({'date': pd.date_range(start=min(dates), end=max(dates), freq='ME', tz='UTC')})
+    return timeline_df.set_index('date'), max(dates)
+
+def _micro_cases() -> Dict:
+    """
+    {이름: (크기 항목, 입력 준비 함수(catalog) -> 인자 튜플, 계산 함수)}.
+    스테이지 모듈은 import 비용이 크므로 micro 모드에서만 불러온다.
+    """
+    from Valuation.MNV.MOV.PFV.AV.UDI.UDI_main import combine_metrics, calculate_udi
+    from Valuation.MNV.MOV.PFV.AV.AV_main import calculate_av
+    from Valuation.MNV.MOV.PCV.MDS.MDS_main import calculate_aif_t, calculate_mds
+    from Valuation.MNV.MOV.PCV.CEV.CEV_main import calculate_cev, prepare_av, prepare_fv
+    from Valuation.MNV.MOV.MRV.MRV_main import calculate_mrv
+    from Valuation.MNV.MOV.MOV_main import PFVFunc, PCVFunc
+
+    def combined(c):
+        return combine_metrics(c.sv(), c.apv(), c.rv())
+
+    def av_inputs(c):
+        combined_metrics = combined(c)
+        return combined_metrics, calculate_udi(combined_metrics)
+
+    def aif_t(c):
+        import pandas as pd
+        albums = [{**m, 'release_date': pd.to_datetime(m['release_date'])} for m in c.av()['metrics']]
+        return albums, c.end, max(m['av'] for m in albums)
+
+    def pfv(c):
+        timeline_df, end_date = _timeline(c)
+        return timeline_df, {'av_a': c.av()['metrics']}, end_date
+
+    def mcv(c):
+        return _timeline(c)[0], c.mcv_twitter(), c.mcv_youtube(), c.mcv_instagram()
+
+    return {
+        'combine_metrics': ('albums', lambda c: (c.sv(), c.apv(), c.rv()), combine_metrics),
+        'calculate_udi': ('albums', lambda c: (combined(c),), calculate_udi),
+        'calculate_av': ('albums', av_inputs, calculate_av),
+        'integrate_pfv_data': ('albums', pfv, PFVFunc.integrate_pfv_data),
+        'calculate_aif_t': ('albums', aif_t, calculate_aif_t),
+        'calculate_mds': ('years', lambda c: (c.fv_t(), c.er()['er'], c.av()), calculate_mds),
+        'integrate_mcv_events': ('videos', mcv, PCVFunc.integrate_mcv_events),
+        'calculate_cev': ('concerts', lambda c: (c.concerts(), prepare_fv(c.fv_t()), prepare_av(c.av()), c.er()['er']), calculate_cev),
+        'calculate_mrv': ('broadcasts', lambda c: (c.broadcasts(), c.fv_t(), c.av()['metrics'], c.er()['er']), calculate_mrv),
+    }
+
+def _scaling_exponent(points: List[Dict]) -> Optional[float]:
+    """
+    (크기, 시간)의 log-log 최소제곱 기울기. 1이면 선형, 2면 제곱으로 늘어남.
+    """
+    points = [p for p in points if p['seconds'] > 0]
+    if len(points) < 2:
+        return None
+    xs = [math.log(p['n']) for p in points]
+    ys = [math.log(p['seconds']) for p in points]
+    x_mean, y_mean = statistics.mean(xs), statistics.mean(ys)
+    denominator = sum((x - x_mean) ** 2 for x in xs)
+    if not denominator:
+        return None
+    return round(sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys)) / denominator, 2)
+
+def time_call(func, args, repeat: int = BENCH_REPEAT) -> float:
+    """
+    func(*args)를 repeat번 실행한 벽시계 시간의 중앙값. 함수가 입력을 수정하므로 매번 복사한 인자를 사용하고, 복사와 print 출력은 측정하지 않는다.
+    """
+    samples = []
+    with open(os.devnull, 'w') as devnull:
+        for _ in range(repeat):
+            call_args = copy.deepcopy(args)
+            with contextlib.redirect_stdout(devnull):
+                started = time.perf_counter()
+                func(*call_args)
+                samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+def run_micro(cases: Optional[List[str]] = None, preset: str = 'small', seed: int = 0, repeat: int = BENCH_REPEAT, max_seconds: float = MICRO_MAX_SECONDS, ladders: Optional[Dict] = None) -> Dict:
+    available = _micro_cases()
+    ladders = ladders or MICRO_LADDERS
+    cases = cases or list(available)
+    unknown = [name for name in cases if name not in available]
+    if unknown:
+        raise ValueError(f"Unknown micro cases {unknown}; expected some of {list(available)}")
+
+    results = {'version': code_version(), 'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'preset': preset, 'seed': seed, 'repeat': repeat, 'cases': {}}
+    for name in cases:
+        key, setup, func = available[name]
+        points, skipped = [], []
+        for n in ladders[key]:
+            if points and points[-1]['seconds'] > max_seconds:
+                skipped.append(n)
+                continue
+            args = setup(SyntheticCatalog(preset, seed=seed, **{key: n}))
+            seconds = time_call(func, args, repeat)
+            points.append({'n': n, 'seconds': round(seconds, 6), 'us_per_item': round(seconds / n * 1e6, 3)})
+            logger.info(f"{name} {key}={n}: {seconds:.4f}s")
+        if skipped:
+            logger.warning(f"{name}: skipped {key}={skipped} after exceeding {max_seconds}s")
+        results['cases'][name] = {'key': key, 'points': points, 'skipped': skipped, 'exponent': _scaling_exponent(points)}
+    return results
+
+def format_micro(results: Dict) -> str:
+    lines = [f"{'case':<22} {'size':>14} {'seconds':>12} {'us/item':>12}"]
+    for name, case in results['cases'].items():
+        for point in case['points']:
+            lines.append(f"{name:<22} {case['key'] + '=' + str(point['n']):>14} {point['seconds']:>12.4f} {point['us_per_item']:>12.1f}")
+        for n in case['skipped']:
+            lines.append(f"{name:<22} {case['key'] + '=' + str(n):>14} {'skipped':>12}")
+        exponent = case['exponent']
+        lines.append(f"{name:<22} {'scaling':>14} {'n^' + str(exponent) if exponent is not None else '-':>12}")
+    return '\n'.join(lines)
+
+def _write_json(path: str, data: Dict) -> str:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    return path
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Valuation benchmark')
+    parser.add_argument('mode', nargs='?', choices=['run', 'record', 'micro'], default='run')
+    parser.add_argument('--profiles', default=','.join(PROFILES), help='comma-separated profile names (default: small,medium,large)')
+    parser.add_argument('--target', default='MOV', help='graph target (default: MOV)')
+    parser.add_argument('--stages', default='all', help="stages to benchmark alone: 'all', 'none' or comma-separated names")
+    parser.add_argument('--repeat', type=int, default=BENCH_REPEAT)
+    parser.add_argument('--baseline', default=os.path.join(BENCH_DIR, 'baseline.json'))
+    parser.add_argument('--save-baseline', action='store_true', help='store this run as the new baseline')
+    parser.add_argument('--cases', default='', help='micro: comma-separated compute functions (default: all)')
+    parser.add_argument('--preset', default='small', help='micro: synthetic catalog size for the dimensions not being scaled')
+    parser.add_argument('--seed', type=int, default=0, help='micro: synthetic catalog seed')
+    parser.add_argument('--max-seconds', type=float, default=MICRO_MAX_SECONDS, help='micro: skip larger sizes once a size takes longer than this')
+    args = parser.parse_args()
+
+    if args.mode == 'micro':
+        cases = [name.strip() for name in args.cases.split(',') if name.strip()]
+        results = run_micro(cases, args.preset, args.seed, args.repeat, args.max_seconds)
+        print(format_micro(results))
+        path = _write_json(os.path.join(BENCH_DIR, 'results', f"micro-{results['version']}-{time.strftime('%Y%m%d-%H%M%S')}.json"), results)
+        print(f"Results saved to {path}")
+        sys.exit(0)
+
+    available = load_profiles()
+    names = [name.strip() for name in args.profiles.split(',') if name.strip()]
+    missing = [name for name in names if name not in available]
+    if missing:
+        print(f"Unknown profiles {missing}; {BENCH_DIR}/profiles.json has {sorted(available)}")
+        sys.exit(2)
+    profiles = {name: available[name] for name in names}
+    targets = [args.target]
+
+    if args.mode == 'record':
+        record_fixtures(profiles, targets)
+        sys.exit(0)
+
+    if args.stages == 'all':
+        stages = STAGE_GRAPH.order(targets)
+    elif args.stages == 'none':
+        stages = []
+    else:
+        stages = [name.strip() for name in args.stages.split(',') if name.strip()]
+
+    results = run_benchmarks(profiles, targets, stages, args.repeat)
+    path = _write_json(os.path.join(BENCH_DIR, 'results', f"{results['version']}-{time.strftime('%Y%m%d-%H%M%S')}.json"), results)
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    regressions = compare(results, baseline) if baseline else []
+    print(format_results(results, baseline, regressions))
+    print(f"Results saved to {path}")
+    if args.save_baseline:
+        print(f"Baseline saved to {_write_json(args.baseline, results)}")
+    sys.exit(1 if regressions else 0)
@@ -368,6 +368,46 @@ MCV_t : 미디어/콘텐츠/소셜미디어 가치
 MDS_t : 굿즈/MD 가치
 MRV_t : 방송/드라마/영화/상표권 가치
 '''
-from Valuation.MNV.MOV.MOV_main import mov
-result_mov = mov()
-print(result_mov)
\ No newline at end of file
+
+#실행 계획 : plan 모드
+'''
+python -m Valuation.Valuation_main plan 은 스테이지를 실행하지 않고 각 스테이지가 저장된 결과로 제공될지, 다시 계산될지를 출력함
+다시 계산되는 스테이지의 예상 HTTP 요청 수, API 쿼터(YouTube, SerpAPI, Spotify 등), 소요 시간을 함께 출력함
+--artists artists.json 을 지정하면 배치 입력(Valuation_batch.py와 같은 형식)의 모든 아티스트 계획과 합계를 출력함
+--target 으로 MOV 대신 특정 스테이지(예: PCV)까지의 계획만 확인할 수 있음
+'''
+
+#프로파일링 : --profile
+'''
+python -m Valuation.Valuation_main run --profile PCV,MDS 는 지정한 스테이지(all이면 모든 스테이지)를 샘플링 프로파일러로 측정함
+프로파일은 profiles/<artist_id>/<스테이지>-<커밋>-<시각>.speedscope.json 으로 저장되어 https://www.speedscope.app 에서 열 수 있음
+VALUATION_PROFILE 환경변수로도 같은 설정을 할 수 있으며, VALUATION_PROFILE_FORMAT=collapsed 이면 flamegraph 입력 형식으로 저장함
+'''
+import argparse
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Valuation pipeline')
+    parser.add_argument('mode', nargs='?', choices=['run', 'plan'], default='run')
+    parser.add_argument('--target', default='MOV', help='stage to run or plan (default: MOV)')
+    parser.add_argument('--artists', help='plan: JSON file with a list of artists (default: environment artist)')
+    parser.add_argument('--profile', help="run: stages to profile, comma-separated or 'all' (default: VALUATION_PROFILE)")
+    args = parser.parse_args()
+
+    if args.profile is not None:
+        from utils.profiling import set_profile
+        set_profile(args.profile)
+
+    if args.mode == 'plan':
+        from Valuation.utils.planner import plan, plan_many, format_plan, format_plans
+        if args.artists:
+            from Valuation.Valuation_batch import load_artists
+            print(format_plans(plan_many(load_artists(args.artists), [args.target])))
+        else:
+            print(format_plan(plan([args.target])))
+    elif args.target == 'MOV':
+        from Valuation.MNV.MOV.MOV_main import mov
+        result_mov = mov()
+        print(result_mov)
+    else:
+        from Valuation.MNV.MOV.MOV_graph import run_stage
+        print(run_stage(args.target))
\ No newline at end of file
@@ -1,10 +1,5 @@
 from typing import List, Dict, Optional
 
-import firebase_admin
-from firebase_admin import credentials, firestore
-from firebase_admin.firestore import WriteBatch
-from google.api_core.exceptions import DeadlineExceeded
-from google.cloud.firestore_v1 import Client as FirestoreClient
 from GoogleSheets.sheets import get_or_create_spreadsheet, write_data
 
 from dotenv import load_dotenv
@@ -15,6 +10,10 @@ import logging
 from collections import OrderedDict
 import asyncio
 from utils.logger import setup_logger
+from utils.tracing import annotate, count
+from Firebase.storage import get_storage, auto_id, SERVER_TIMESTAMP, LocalStorage
+from Valuation.utils.stage_graph import current_run, content_hash, stage_ttl, revalidate
+from Valuation.utils.artist import current_artist
 logger = setup_logger(__name__)
 
 from datetime import datetime, timezone, timedelta
@@ -23,69 +22,128 @@ from datetime import datetime, timezone, timedelta
 load_dotenv()
 
 # 환경 변수에서 설정 가져오기
-FIRESTORE_SERVICE_ACCOUNT_FILE = os.getenv('SERVICE_ACCOUNT_FILE', 'Firebase/firebase.json')
-ARTIST_ID = os.getenv("ARTIST_ID")
-ARTIST_NAME_KOR = os.getenv("ARTIST_NAME_KOR")
-ARTIST_NAME_ENG = os.getenv("ARTIST_NAME_ENG")
-MELON_ID = os.getenv("MELON_ID")
 SPREADSHEET_FOLDER_ID = os.getenv("PIPELINE_FOLDER_ID")
 
-# Firestore 클라이언트 초기화
-if not firebase_admin._apps:
-    try:
-        cred = credentials.Certificate(FIRESTORE_SERVICE_ACCOUNT_FILE)
-        firebase_admin.initialize_app(cred)
-    except Exception as e:
-        raise
+# 저장소(Firestore/memory/sqlite)는 STORAGE_BACKEND 설정에 따라 처음 사용할 때 생성됨 (Firebase/storage.py)
+
+def _run_cached(key, loader):
+    """
+    밸류에이션 실행 범위 안에서는 같은 문서/서브컬렉션을 한 번만 읽는다.
+    실행 범위 밖에서는 매번 저장소에서 읽는다.
+    """
+    run = current_run()
+    if run is None:
+        return loader()
+    return run.cached(key, loader)
 
-db: FirestoreClient = firestore.client()
+def cache_stats() -> Dict[str, int]:
+    run = current_run()
+    if run is None:
+        return {'hits': 0, 'misses': 0}
+    return {'hits': run.cache_stats['hits'], 'misses': run.cache_stats['misses']}
+
+def _field_key(doc_id: str, field_name: str) -> tuple:
+    return ('valuation', doc_id, 'fields', field_name)
+
+def _sub_collection_key(doc_id: str, sub_collection: str) -> tuple:
+    return ('valuation', doc_id, 'collections', sub_collection)
+
+def invalidate_record(field_name: Optional[str] = None, sub_collection: Optional[str] = None) -> None:
+    """
+    실행 범위 캐시에서 valuation 문서의 스테이지 필드(또는 서브컬렉션)를 제거한다.
+    인자가 없으면 문서 전체 캐시를 제거한다.
+    """
+    run = current_run()
+    if run is None:
+        return
+    doc_id = current_artist().artist_id
+    if field_name:
+        run.invalidate(_field_key(doc_id, field_name))
+    if sub_collection:
+        run.invalidate(_sub_collection_key(doc_id, sub_collection))
+    if not field_name and not sub_collection:
+        run.invalidate(('valuation', doc_id))
+
+def record_timestamp(record: Dict, target: str):
+    """
+    스테이지별 저장 시각(timestamps.<target>)을 반환한다. 이전 형식 문서는 문서 timestamp를 사용한다.
+    """
+    timestamps = record.get('timestamps') or {}
+    return timestamps.get(target) or record.get('timestamp')
 
 def save_data(collection_name, data, doc_id):
-    doc_ref = db.collection(collection_name).document(doc_id)
-    doc_ref.set(data)
+    get_storage().set(f'{collection_name}/{doc_id}', data)
 
 def save_record(field_name, data, sub_collection: Optional[str] = None, subcollection_field: Optional[str] = None):
+    """
+    valuation/{artist_id} 문서에서 field_name 필드만 갱신한다.
+    문서 전체를 다시 읽고 쓰지 않으므로 저장 비용은 해당 스테이지 데이터 크기에만 비례하며,
+    다른 스테이지를 동시에 저장하는 작업과 충돌하지 않는다.
+    """
     collection_name = 'valuation'
-    doc_id = ARTIST_ID
+    artist = current_artist()
+    doc_id = artist.artist_id
 
-    prev_data = load_record()
-    if not prev_data:
-        prev_data = {'id': doc_id}
-
-    # sub_collection 모드일 경우 subcollection_field의 데이터를 분리
+    # sub_collection 모드일 경우 subcollection_field의 데이터를 분리 (호출부의 결과 dict는 유지)
+    original_data = data
     subcollection_items = []
-    if sub_collection and subcollection_field and subcollection_field in data:
+    if sub_collection and subcollection_field and isinstance(data, dict) and subcollection_field in data:
+        data = dict(data)
         subcollection_items = data.pop(subcollection_field, [])
 
-    prev_data[field_name] = data
-    prev_data['artist_name'] = ARTIST_NAME_KOR
-    prev_data['artist_name_eng'] = ARTIST_NAME_ENG
-    prev_data['artist_melon_id'] = MELON_ID
+    fields = {
+        'id': doc_id,
+        field_name: data,
+        'artist_name': artist.name_kor,
+        'artist_name_eng': artist.name_eng,
+        'artist_melon_id': artist.melon_id,
+        'timestamp': SERVER_TIMESTAMP,
+        'timestamps': {field_name: SERVER_TIMESTAMP},
+    }
+    # merge에 필드 경로를 지정하면 해당 경로만 교체되고 나머지 스테이지 필드는 그대로 유지됨
+    merge_fields = ['id', field_name, 'artist_name', 'artist_name_eng', 'artist_melon_id', 'timestamp', f'timestamps.{field_name}']
+
+    # 입력 지문과 출력 해시를 함께 저장하여 다음 실행에서 입력이 같으면 재계산하지 않음 (출력 해시는 서브컬렉션 분리 전 기준)
+    run = current_run()
+    fingerprint = run.fingerprints.get(field_name) if run is not None else None
+    if fingerprint:
+        output_hash = content_hash(original_data)
+        fields['fingerprints'] = {field_name: fingerprint}
+        fields['output_hashes'] = {field_name: output_hash}
+        merge_fields += [f'fingerprints.{field_name}', f'output_hashes.{field_name}']
+        run.output_hashes[field_name] = output_hash
 
+    storage = get_storage()
+    doc_path = f'{collection_name}/{doc_id}'
     try:
-        prev_data['timestamp'] = firestore.SERVER_TIMESTAMP
-        doc_ref = db.collection(collection_name).document(doc_id)
-        doc_ref.set(prev_data)
+        storage.set(doc_path, fields, merge=merge_fields)
     except Exception as e:
-        logger.error(f"Error saving single record to Firestore: {e}")
+        invalidate_record(field_name)
+        logger.error(f"Error saving single record to storage: {e}")
         raise
-    
+
+    # 실행 범위 캐시에 저장된 내용을 반영 (SERVER_TIMESTAMP는 현재 시각으로 대체)
+    if run is not None:
+        now = datetime.now(timezone.utc)
+        run.store(_field_key(doc_id, field_name), {**fields, 'timestamp': now, 'timestamps': {field_name: now}})
+        run.invalidate((collection_name, doc_id))
+
     # 서브컬렉션에 대한 처리는 subcollection_items가 존재할 때만 수행
     logger.info(f'Sub Collection Items: {subcollection_items}')
     if sub_collection and subcollection_items:
-        subcollection_ref = doc_ref.collection(sub_collection)
-        batch = db.batch()
+        writes = []
         for item in subcollection_items:
             sub_doc_id = item.get('id')
-            if not sub_doc_id:
-                sub_doc_ref = subcollection_ref.document()
-            else:
-                sub_doc_ref = subcollection_ref.document(str(sub_doc_id))
-            batch.set(sub_doc_ref, item)
+            writes.append((f'{doc_path}/{sub_collection}/{sub_doc_id or auto_id()}', item))
 
         try:
-            batch.commit()
-            logger.info(f"Subcollection '{sub_collection}' with {len(subcollection_items)} items saved to Firestore.")
+            storage.batch_set(writes)
+            invalidate_record(sub_collection=sub_collection)
+            logger.info(f"Subcollection '{sub_collection}' with {len(subcollection_items)} items saved to storage.")
+
+            # 로컬 저장소(memory/sqlite) 실행은 자격 증명 없이 동작해야 하므로 Google Sheets 내보내기를 생략
+            if isinstance(storage, LocalStorage):
+                return
 
             def extract_all_keys(items):
                 keys = set()
@@ -111,7 +169,7 @@ def save_record(field_name, data, sub_collection: Optional[str] = None, subcolle
                 return list(row.values())
             
             all_keys = extract_all_keys(subcollection_items)
-            spreadsheet = get_or_create_spreadsheet(SPREADSHEET_FOLDER_ID, ARTIST_NAME_KOR)
+            spreadsheet = get_or_create_spreadsheet(SPREADSHEET_FOLDER_ID, artist.name_kor)
             
             try:
                 worksheet = spreadsheet.worksheet(sub_collection)
@@ -130,76 +188,124 @@ def save_record(field_name, data, sub_collection: Optional[str] = None, subcolle
             logger.info(f"Subcollection '{sub_collection}' data saved to Google Sheets.")
 
         except Exception as e:
-            logger.error(f"Error saving subcollection '{sub_collection}' to Firestore or Google Sheets: {e}")
+            logger.error(f"Error saving subcollection '{sub_collection}' to storage or Google Sheets: {e}")
             raise
     
 def load_record(target: Optional[str] = None, sub_collection: Optional[str] = None, field_name: Optional[str] = None) -> Optional[Dict]:
     """
     메인 컬렉션에서 문서를 로드하고, sub_collection과 field_name이 지정된 경우 해당 서브컬렉션도 로드하여 field_name 키로 결과 dict에 넣는다.
+    target이 지정되면 문서 전체가 아니라 target 필드와 저장 시각, 지문 필드만 읽는다.
     """
     collection_name = 'valuation'
-    doc_id = ARTIST_ID
+    doc_id = current_artist().artist_id
 
-    try:
-        doc_ref = db.collection(collection_name).document(doc_id)
-        doc = doc_ref.get()
-        if doc.exists:
-            record = doc.to_dict()
-            record['id'] = doc.id
+    storage = get_storage()
+    doc_path = f'{collection_name}/{doc_id}'
+
+    def load_document():
+        if target:
+            record = storage.get(doc_path, field_paths=[target, 'timestamp', f'timestamps.{target}', f'fingerprints.{target}', f'output_hashes.{target}'])
+        else:
+            record = storage.get(doc_path)
+        if record is None:
+            return None
+        record['id'] = doc_id
+        return record
 
+    def load_sub_collection():
+        sub_data = []
+        for _, item in storage.stream(f'{doc_path}/{sub_collection}'):
+            # 필요 시 item에 추가 가공 로직 가능
+            sub_data.append(item)
+        return sub_data
+
+    try:
+        key = _field_key(doc_id, target) if target else (collection_name, doc_id)
+        record = _run_cached(key, load_document)
+        if record:
             # sub_collection과 field_name이 지정된 경우 서브컬렉션도 로드한다.
             if target and sub_collection and field_name:
-                sub_col_ref = doc_ref.collection(sub_collection)
-                sub_docs = sub_col_ref.stream()
-                sub_data = []
-                for d in sub_docs:
-                    item = d.to_dict()
-                    # 필요 시 item에 추가 가공 로직 가능
-                    sub_data.append(item)
-                record[target][field_name] = sub_data
+                record[target][field_name] = _run_cached(_sub_collection_key(doc_id, sub_collection), load_sub_collection)
 
             return record
         else:
             return None
     except Exception as e:
-        print(f"Error loading document '{doc_id}' from Firestore collection '{collection_name}': {e}")
+        print(f"Error loading document '{doc_id}' from storage collection '{collection_name}': {e}")
         return None
     
 def load_with_filter(collection_name: str, filters: Optional[List[tuple]] = None) -> Optional[Dict]:
     try:
-        collection_ref = db.collection(collection_name)
-        
-        if filters:
-            query = collection_ref
-            for field, op, value in filters:
-                query = query.where(field, op, value)
-            docs = query.stream()
-        else:
-            docs = collection_ref.stream()
-        
         data = []
-        for doc in docs:
-            record = doc.to_dict()
-            record['id'] = doc.id
+        for doc_id, record in get_storage().stream(collection_name, filters):
+            record['id'] = doc_id
             data.append(record)
         return data
     except Exception as e:
         return []
     
+def record_status(target: str, record: Optional[Dict], run=None) -> str:
+    """
+    저장된 target 기록의 상태를 반환한다.
+    'missing': 기록 없음, 'changed': 입력 지문이 다름, 'stale': 입력은 같고 TTL만 지남, 'fresh': 재사용 가능
+    """
+    if not record or not record.get(target):
+        return 'missing'
+
+    fingerprint = run.fingerprints.get(target) if run is not None else None
+    if fingerprint and (record.get('fingerprints') or {}).get(target) != fingerprint:
+        return 'changed'
+    if fingerprint and target not in run.external:
+        return 'fresh'
+
+    graph = run.graph if run is not None else None
+    expires = datetime.now(timezone.utc) - stage_ttl(target, graph)
+    if record_timestamp(record, target) > expires:
+        return 'fresh'
+    return 'stale'
+
 def check_record(target: str, sub_collection: Optional[str] = None, field_name: Optional[str] = None) -> Optional[Dict]:
     """
-    target 필드가 존재하고 timestamp가 어제보다 최신일 경우 데이터를 반환.
+    target 필드가 존재하고 신선한 경우 데이터를 반환.
+    실행 범위에 target의 입력 지문이 있으면 저장된 지문과 같을 때만 재사용한다.
+    지문이 없거나 external 스테이지인 경우 target의 저장 시각이 스테이지 TTL(stage_ttl) 이내여야 한다.
+    stale-while-revalidate 모드에서는 TTL만 지난 결과를 그대로 반환하고 백그라운드 갱신을 예약한다.
+    TTL만 지난 결과는 실행 범위에 보관하여, 다시 계산하다 쿼터 예산을 넘으면 대신 사용한다.
     sub_collection과 field_name이 지정된 경우 해당 서브컬렉션도 읽어 field_name 키로 데이터에 추가.
     """
-    collection_name = 'valuation'
-    doc_id = ARTIST_ID
-
-    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
-    yesterday = today - timedelta(days=1)
+    run = current_run()
+    if run is not None and target in run.force:
+        return None
 
     # sub_collection과 field_name이 있을 경우 load_record에 전달
     prev_data = load_record(target=target, sub_collection=sub_collection, field_name=field_name)
-    if prev_data and prev_data.get(target) and prev_data.get('timestamp') > yesterday:
-        return prev_data
-    else:
-        return None
\ No newline at end of file
+    status = record_status(target, prev_data, run)
+    if status in ('missing', 'changed'):
+        annotate('record', status)
+        count('record_misses')
+        return None
+
+    def use(record):
+        stored_hash = (record.get('output_hashes') or {}).get(target)
+        if run is not None and stored_hash:
+            run.output_hashes[target] = stored_hash
+        return record
+
+    if status == 'fresh':
+        annotate('record', 'hit')
+        count('record_hits')
+        return use(prev_data)
+
+    # 입력은 같고 유효 기간만 지난 결과: 마지막 값을 반환하고 백그라운드에서 갱신
+    graph = run.graph if run is not None else None
+    if run is not None and run.stale_while_revalidate and graph is not None and target in graph.stages:
+        revalidate(target, run)
+        annotate('record', 'stale')
+        count('record_hits')
+        return use(prev_data)
+    if run is not None:
+        # 다시 계산하다 쿼터 예산을 넘으면 stage 데코레이터가 이 결과를 대신 사용함
+        run.expired[target] = prev_data
+    annotate('record', 'expired')
+    count('record_misses')
+    return None
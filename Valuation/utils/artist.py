@@ -0,0 +1,90 @@
+##### Valuation/utils/artist.py #####
+'''
+artist.py는 밸류에이션 대상 아티스트의 식별 정보를 하나의 Artist 객체로 묶음
+ARTIST_ENV는 Artist 속성과 기존 환경변수 이름(ARTIST_ID, MELON_ID, SPOTIFY_ID 등)의 대응표임
+Artist.from_env는 기존과 같이 환경변수에서, Artist.from_dict는 배치 입력(JSON 등)에서 아티스트를 생성함
+from_dict는 속성 이름(artist_id)과 환경변수 이름(ARTIST_ID) 두 형식의 키를 모두 허용함
+current_artist 함수는 현재 실행 범위(ValuationRun)에 지정된 아티스트를 반환하며, 없으면 환경변수 값을 사용함
+스테이지 모듈은 import 시점이 아니라 호출 시점에 current_artist를 읽으므로 한 프로세스에서 여러 아티스트를 동시에 평가할 수 있음
+'''
+
+import os
+from typing import Dict, List, Optional
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from Valuation.utils.stage_graph import current_run
+
+ARTIST_ENV = {
+    'artist_id': 'ARTIST_ID',
+    'name_kor': 'ARTIST_NAME_KOR',
+    'name_eng': 'ARTIST_NAME_ENG',
+    'melon_id': 'MELON_ID',
+    'melon_ids': 'MELON_IDS',
+    'spotify_id': 'SPOTIFY_ID',
+    'youtube_channel_id': 'YOUTUBE_CHANNEL_ID',
+    'twitter_account': 'TWITTER_ACCOUNT',
+    'instagram_account': 'INSTAGRAM_ACCOUNT',
+    'circlechart_search_start_year': 'CIRCLECHART_SEARCH_START_YEAR',
+    'circlechart_search_artist_name': 'CIRCLECHART_SEARCH_ARTIST_NAME',
+    'naver_concert_tab': 'NAVER_CONCERT_TAB',
+    'naver_broadcast_tab_names': 'NAVER_BROADCAST_TAB_NAMES',
+    'naver_broadcast_tab_urls': 'NAVER_BROADCAST_TAB_URLS',
+}
+
+class Artist:
+    """
+    밸류에이션 대상 아티스트. 속성 이름은 ARTIST_ENV의 키와 같다.
+    """
+    def __init__(self, artist_id: str, **fields):
+        if not artist_id:
+            raise ValueError("Artist requires 'artist_id'")
+        unknown = set(fields) - set(ARTIST_ENV)
+        if unknown:
+            raise ValueError(f"Unknown artist fields: {sorted(unknown)}")
+
+        self.artist_id = artist_id
+        for attr in ARTIST_ENV:
+            if attr != 'artist_id':
+                setattr(self, attr, fields.get(attr))
+
+    @classmethod
+    def from_env(cls) -> 'Artist':
+        return cls(**{attr: os.getenv(env) for attr, env in ARTIST_ENV.items()})
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Artist':
+        env_to_attr = {env: attr for attr, env in ARTIST_ENV.items()}
+        fields = {env_to_attr.get(key, key): value for key, value in data.items()}
+        return cls(**fields)
+
+    def to_dict(self) -> Dict[str, Optional[str]]:
+        return {attr: getattr(self, attr) for attr in ARTIST_ENV}
+
+    @property
+    def melon_id_list(self) -> List[str]:
+        """
+        MELON_IDS('||' 구분)가 있으면 그 목록을, 없으면 MELON_ID 하나를 반환한다.
+        """
+        if self.melon_ids:
+            return self.melon_ids.split('||')
+        return [self.melon_id]
+
+    @property
+    def broadcast_tabs(self) -> List[Dict[str, str]]:
+        names = (self.naver_broadcast_tab_names or '').split('|')
+        urls = (self.naver_broadcast_tab_urls or '').split('|')
+        return [{"name": name, "url": url} for name, url in zip(names, urls)]
+
+    def __repr__(self):
+        return f"Artist({self.artist_id!r}, {self.name_kor!r})"
+
+def current_artist() -> Artist:
+    """
+    현재 실행 범위의 아티스트. 실행 범위 밖이거나 아티스트가 지정되지 않았으면 환경변수에서 읽는다.
+    """
+    run = current_run()
+    if run is not None and run.artist is not None:
+        return run.artist
+    return Artist.from_env()
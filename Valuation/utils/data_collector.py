@@ -5,7 +5,7 @@ Melon 웹사이트에서 아티스트 상세 정보를 수집하여 Firebase에
 HTTP GET 요청을 requests 모듈로 전송하여 아티스트 페이지의 HTML을 획득함
 BeautifulSoup을 활용하여 HTML 문서를 파싱하고 주요 요소를 추출함
 정규표현식으로 데뷔곡, 그룹 멤버 등 세부 데이터의 식별자를 추출함
-환경변수를 통해 아티스트 관련 식별자 및 정보를 동적으로 불러옴
+current_artist로 실행 대상 아티스트의 식별자 및 정보를 불러옴
 추가 API 호출로 JSON 응답을 받아 팬 수 데이터를 보완함
 수집된 데이터를 save_data와 save_record 함수를 통해 Firebase에 저장함
 pandas와 numpy를 포함한 라이브러리로 데이터 후처리 및 분석 확장 가능함
@@ -27,6 +27,7 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from Valuation.firebase.firebase_handler import save_data, check_record, save_record
+from Valuation.utils.artist import current_artist
 DATA_TARGET='artist'
 
 def get_artist_data():
@@ -35,10 +36,7 @@ def get_artist_data():
         print(f'{DATA_TARGET} Loaded')
         return load_data.get(DATA_TARGET)
     
-    ARTIST_ID = os.getenv('ARTIST_ID')
-    ARTIST_NAME_KOR = os.getenv('ARTIST_NAME_KOR')
-    ARTIST_NAME_ENG = os.getenv('ARTIST_NAME_ENG')
-    MELON_ARTIST_ID = os.getenv('MELON_ID')
+    MELON_ARTIST_ID = current_artist().melon_id
 
     artist_id = MELON_ARTIST_ID
     artist_url = f'https://www.melon.com/artist/detail.htm'
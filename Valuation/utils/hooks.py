@@ -0,0 +1,19 @@
+##### Valuation/utils/hooks.py #####
+'''
+hooks.py는 외부 HTTP 호출을 감싸는 훅을 한 곳에서 설치함
+install_hooks()는 HTTP 계측(utils/http_metrics.py), 쿼터 원장(quota.py), VALUATION_HTTP_MODE 카세트(utils/cassette.py)를 차례로 설치함
+import 시점에는 설치하지 않으며, 진입점(stage_graph.valuation_run, main.py, 단독 실행하는 수집 함수)이 실행을 시작할 때 호출함
+각 훅은 프로세스에서 한 번만 적용되므로 여러 번 호출해도 됨
+'''
+
+from utils.http_metrics import install_http_hooks
+from utils.cassette import install_cassette
+from Valuation.utils.quota import install_quota_accounting
+
+def install_hooks() -> None:
+    """
+    HTTP 계측, 쿼터 원장, 카세트(VALUATION_HTTP_MODE가 off가 아닐 때)를 설치한다.
+    """
+    install_http_hooks()
+    install_quota_accounting()
+    install_cassette()
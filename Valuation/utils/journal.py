@@ -0,0 +1,176 @@
+##### Valuation/utils/journal.py #####
+'''
+journal.py는 긴 밸류에이션 실행을 중단된 지점부터 이어서 실행하기 위한 실행 저널을 제공함
+RunJournal은 아티스트별 디렉터리(VALUATION_JOURNAL_DIR/<artist_id>)에 완료된 스테이지 출력과 수집 중인 배치 항목을 파일로 기록함
+stage 데코레이터는 스테이지가 끝날 때마다 출력과 입력 지문을 저널에 기록하고, 다시 실행할 때 지문이 같은 기록이 있으면 스테이지를 건너뜀
+checkpointed 함수는 연도별 CircleChart 조회, 상세 페이지 크롤링처럼 항목 단위로 반복하는 수집을 항목마다 기록하여 재실행 시 이미 수집한 항목을 건너뜀
+실행이 예외 없이 끝나면 저널을 삭제하고, 실패하거나 중단된 경우에만 다음 실행을 위해 남김
+VALUATION_JOURNAL_MAX_AGE_HOURS(기본값 24시간)보다 오래된 저널은 사용하지 않고 삭제함
+VALUATION_JOURNAL=0이면 저널을 사용하지 않음
+'''
+
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from utils.logger import setup_logger
+from Valuation.utils.stage_graph import current_run, content_hash
+logger = setup_logger(__name__)
+
+JOURNAL_ENABLED = os.getenv('VALUATION_JOURNAL', '1') == '1'
+JOURNAL_DIR = os.getenv('VALUATION_JOURNAL_DIR', '.valuation_journal')
+JOURNAL_MAX_AGE_HOURS = float(os.getenv('VALUATION_JOURNAL_MAX_AGE_HOURS', '24'))
+
+_MISSING = object()
+
+def _file_name(key: str) -> str:
+    return re.sub(r'[^\w.-]', '_', key)
+
+def _encode(entry: Dict) -> Optional[str]:
+    # JSON으로 그대로 복원되지 않는 값(datetime, DataFrame 등)은 기록하지 않고 다음 실행에서 다시 계산함
+    try:
+        return json.dumps(entry, ensure_ascii=False, allow_nan=True)
+    except (TypeError, ValueError):
+        return None
+
+class RunJournal:
+    """
+    한 아티스트의 실행 저널.
+    stages/<스테이지>.json: {'fingerprint', 'output_hash', 'result'}
+    batches/<키>.jsonl: 수집한 항목마다 {'item': 항목 키, 'result': 결과} 한 줄
+    """
+    def __init__(self, artist_id: str, directory: str = JOURNAL_DIR, max_age_hours: float = JOURNAL_MAX_AGE_HOURS):
+        self.path = os.path.join(directory, _file_name(artist_id))
+        self.stats = Counter()
+        self._lock = threading.Lock()
+
+        if os.path.isdir(self.path) and time.time() - self._modified() > max_age_hours * 3600:
+            logger.info(f"Discarding journal older than {max_age_hours}h: {self.path}")
+            self.clear()
+        elif os.path.isdir(self.path):
+            logger.info(f"Resuming from journal: {self.path}")
+
+    def _modified(self) -> float:
+        latest = os.path.getmtime(self.path)
+        for root, _, files in os.walk(self.path):
+            for name in files:
+                latest = max(latest, os.path.getmtime(os.path.join(root, name)))
+        return latest
+
+    def _stage_path(self, name: str) -> str:
+        return os.path.join(self.path, 'stages', f'{_file_name(name)}.json')
+
+    def _batch_path(self, key: str) -> str:
+        return os.path.join(self.path, 'batches', f'{_file_name(key)}.jsonl')
+
+    def load_stage(self, name: str, fingerprint: Optional[str]) -> Optional[Tuple[object, str]]:
+        """
+        지문이 같은 스테이지 기록이 있으면 (결과, 출력 해시)를 반환한다.
+        """
+        try:
+            with open(self._stage_path(name), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get('fingerprint') != fingerprint:
+            return None
+        self.stats['stages'] += 1
+        return entry['result'], entry['output_hash']
+
+    def save_stage(self, name: str, fingerprint: Optional[str], result, output_hash: str) -> None:
+        encoded = _encode({'fingerprint': fingerprint, 'output_hash': output_hash, 'result': result})
+        if encoded is None:
+            return
+        path = self._stage_path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 기록 중 중단되어도 이전 기록이 깨지지 않도록 임시 파일에 쓴 뒤 교체
+        tmp_path = f'{path}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(encoded)
+        os.replace(tmp_path, path)
+
+    def load_batch(self, key: str) -> Dict[str, object]:
+        results = {}
+        try:
+            with open(self._batch_path(key), 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # 기록 도중 중단된 마지막 줄
+                        continue
+                    results[entry['item']] = entry['result']
+        except OSError:
+            pass
+        return results
+
+    def append_batch(self, key: str, item: str, result) -> None:
+        line = _encode({'item': item, 'result': result})
+        if line is None:
+            return
+        path = self._batch_path(key)
+        with self._lock:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+
+    def clear(self) -> None:
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def close(self, failed: bool) -> None:
+        """
+        실행이 끝날 때 이어서 진행한 항목 수를 기록하고, 실행이 실패하지 않았으면 저널을 삭제한다.
+        """
+        if self.stats:
+            logger.info(f"Journal: {self.stats['stages']} stages / {self.stats['items']} batch items resumed")
+        if not failed:
+            self.clear()
+
+def run_journal(run=None) -> Optional[RunJournal]:
+    """
+    현재 실행 범위의 저널. 실행 범위 밖이거나 저널을 사용하지 않는 실행이면 None을 반환한다.
+    """
+    run = run if run is not None else current_run()
+    if run is None or not run.journaled or not JOURNAL_ENABLED:
+        return None
+    with run.stage_lock(('journal',)):
+        if run.journal is None:
+            from Valuation.utils.artist import current_artist
+            run.journal = RunJournal(current_artist().artist_id)
+    return run.journal
+
+def checkpointed(key: str, items: Iterable, collect: Callable, item_key: Callable = content_hash) -> List:
+    """
+    items의 각 항목에 대해 collect(item)을 호출하여 결과 목록을 반환한다.
+    결과는 항목마다 저널에 기록되며, 중단 후 다시 실행하면 이미 기록된 항목은 collect를 호출하지 않는다.
+    key는 아티스트 안에서 수집 작업을 구분하는 이름이고, item_key(item)은 항목을 구분하는 문자열이다.
+    collect가 None을 반환한 항목은 기록하지 않으므로 다음 실행에서 다시 수집한다.
+    """
+    journal = run_journal()
+    if journal is None:
+        return [collect(item) for item in items]
+
+    done = journal.load_batch(key)
+    results = []
+    for item in items:
+        k = item_key(item)
+        result = done.get(k, _MISSING)
+        if result is _MISSING:
+            result = collect(item)
+            if result is not None:
+                journal.append_batch(key, k, result)
+                done[k] = result
+        else:
+            journal.stats['items'] += 1
+        results.append(result)
+    return results
@@ -0,0 +1,141 @@
+##### Valuation/utils/planner.py #####
+'''
+planner.py는 밸류에이션을 실행하지 않고 실행 계획과 예상 비용을 계산하는 plan 모드를 제공함
+plan 함수는 스테이지 그래프를 위상 정렬 순서로 따라가며 저장된 결과의 입력 지문과 TTL을 check_record와 같은 규칙으로 확인함
+각 스테이지는 cached(저장된 결과 사용), revalidate(stale-while-revalidate 백그라운드 갱신), recompute(다시 계산) 중 하나로 분류됨
+선행 스테이지가 다시 계산되면 출력이 바뀔 수 있으므로 하위 스테이지도 recompute(upstream)로 분류함
+다시 계산하는 스테이지는 STAGE_COSTS(MOV_graph.py)로 외부 요청 수, API 쿼터 단위, 소요 시간을 추정함
+예상 실행 시간은 병렬 실행을 고려한 임계 경로(critical path) 기준으로도 함께 계산함
+Firestore 문서는 스테이지 필드 단위로만 읽으며, 외부 API와 스크래핑은 호출하지 않음
+'''
+
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+from Valuation.utils.stage_graph import StageGraph, content_hash, valuation_run
+
+REASONS = {
+    'missing': 'no stored result',
+    'changed': 'inputs changed',
+    'stale': 'expired',
+}
+
+def estimate_cost(name: str, costs: Dict, artist) -> Dict:
+    """
+    name 스테이지를 다시 계산할 때의 예상 비용 {'http', 'quota', 'seconds'}.
+    """
+    cost = costs.get(name, {})
+    items = cost.get('items', 0)
+    if callable(items):
+        items = items(artist)
+    per_item = cost.get('per_item', {})
+
+    quota = Counter(cost.get('quota', {}))
+    for api, units in per_item.get('quota', {}).items():
+        quota[api] += units * items
+    return {
+        'http': cost.get('http', 0) + per_item.get('http', 0) * items,
+        'quota': dict(quota),
+        'seconds': cost.get('seconds', 0) + per_item.get('seconds', 0) * items,
+    }
+
+def plan(targets: Iterable[str] = ('MOV',), graph: Optional[StageGraph] = None, artist=None, costs: Optional[Dict] = None) -> Dict:
+    """
+    targets를 실행할 때 각 스테이지가 캐시에서 제공되는지, 다시 계산되는지와 예상 비용을 반환한다.
+    """
+    from Valuation.firebase.firebase_handler import load_record, record_status
+    from Valuation.utils.artist import current_artist
+    if graph is None or costs is None:
+        from Valuation.MNV.MOV.MOV_graph import STAGE_GRAPH, STAGE_COSTS
+        graph = graph or STAGE_GRAPH
+        costs = costs if costs is not None else STAGE_COSTS
+
+    stages = []
+    statuses = {}
+    finish = {}
+    with valuation_run(graph, artist) as run:
+        artist = current_artist()
+        for name in graph.order(targets):
+            deps = graph.deps(name)
+            if any(statuses[dep] == 'recompute' for dep in deps):
+                status, reason = 'recompute', 'upstream'
+            else:
+                run.fingerprints[name] = graph.fingerprint(name, run)
+                if graph.options(name).get('external'):
+                    run.external.add(name)
+                record = load_record(target=name)
+                result = record_status(name, record, run)
+                if result == 'fresh':
+                    status, reason = 'cached', ''
+                elif result == 'stale' and run.stale_while_revalidate:
+                    status, reason = 'revalidate', 'expired'
+                else:
+                    status, reason = 'recompute', REASONS[result]
+                if status != 'recompute':
+                    # 하위 스테이지의 지문 계산에 저장된 출력 해시를 사용 (stage 데코레이터와 같은 방식)
+                    stored_hash = (record.get('output_hashes') or {}).get(name)
+                    run.output_hashes[name] = stored_hash or content_hash(record.get(name))
+            statuses[name] = status
+
+            cost = estimate_cost(name, costs, artist) if status != 'cached' else {'http': 0, 'quota': {}, 'seconds': 0}
+            # 백그라운드 갱신은 요청과 쿼터는 쓰지만 실행 시간(임계 경로)에는 포함되지 않음
+            seconds = cost['seconds'] if status == 'recompute' else 0
+            finish[name] = max((finish[dep] for dep in deps), default=0) + seconds
+            stages.append({'stage': name, 'status': status, 'reason': reason, **cost})
+
+    quota = Counter()
+    for entry in stages:
+        quota.update(entry['quota'])
+    return {
+        'artist_id': artist.artist_id,
+        'artist_name': artist.name_kor,
+        'stages': stages,
+        'recompute': [entry['stage'] for entry in stages if entry['status'] == 'recompute'],
+        'http': sum(entry['http'] for entry in stages),
+        'quota': dict(quota),
+        'seconds': sum(entry['seconds'] for entry in stages if entry['status'] == 'recompute'),
+        'critical_path_seconds': max(finish.values(), default=0),
+    }
+
+def plan_many(artists: Iterable, targets: Iterable[str] = ('MOV',)) -> Dict:
+    """
+    여러 아티스트의 plan 결과와 합계를 반환한다. artists에는 Artist 또는 dict를 넣을 수 있다.
+    """
+    from Valuation.utils.artist import Artist
+    plans = [plan(targets, artist=a if isinstance(a, Artist) else Artist.from_dict(a)) for a in artists]
+    quota = Counter()
+    for p in plans:
+        quota.update(p['quota'])
+    return {
+        'plans': plans,
+        'http': sum(p['http'] for p in plans),
+        'quota': dict(quota),
+        'seconds': sum(p['seconds'] for p in plans),
+        'critical_path_seconds': sum(p['critical_path_seconds'] for p in plans),
+    }
+
+def _format_quota(quota: Dict) -> str:
+    return ', '.join(f'{api} {units:g}' for api, units in sorted(quota.items())) or '-'
+
+def format_plan(report: Dict) -> str:
+    lines = [f"Plan for {report['artist_id']} ({report['artist_name']})"]
+    lines.append(f"{'stage':<15} {'status':<11} {'reason':<17} {'http':>6} {'seconds':>8}  quota")
+    for entry in report['stages']:
+        lines.append(
+            f"{entry['stage']:<15} {entry['status']:<11} {entry['reason']:<17} "
+            f"{entry['http']:>6g} {entry['seconds']:>8.0f}  {_format_quota(entry['quota'])}"
+        )
+    lines.append(
+        f"{len(report['recompute'])} stages to recompute, ~{report['http']:g} HTTP requests, "
+        f"quota: {_format_quota(report['quota'])}, "
+        f"~{report['seconds']:.0f}s sequential / ~{report['critical_path_seconds']:.0f}s critical path"
+    )
+    return '\n'.join(lines)
+
+def format_plans(summary: Dict) -> str:
+    lines: List[str] = [format_plan(p) for p in summary['plans']]
+    lines.append(
+        f"Total for {len(summary['plans'])} artists: ~{summary['http']:g} HTTP requests, "
+        f"quota: {_format_quota(summary['quota'])}, ~{summary['critical_path_seconds']:.0f}s wall time (one artist at a time)"
+    )
+    return '\n\n'.join(lines)
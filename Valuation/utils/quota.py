@@ -0,0 +1,253 @@
+##### Valuation/utils/quota.py #####
+'''
+quota.py는 외부 API 쿼터 사용량을 API와 아티스트별로 기록하고 예산을 적용하는 쿼터 원장을 제공함
+install_quota_accounting()은 HTTP 훅(utils/http_metrics.py)에 등록되어 요청을 보내기 전에 URL로 API와 쿼터 단위를 판단하고 원장에 기록함
+- YouTube Data API: search 100단위, channels/playlistItems/videos/commentThreads 등 1단위 (일일 쿼터는 태평양 시간 자정에 초기화됨)
+- SerpAPI: 검색 1회당 1단위, Twitter API v2와 Spotify Web API: 요청 1회당 1단위
+원장은 QUOTA_LEDGER_PATH(기본값 .quota_ledger.sqlite3) SQLite 파일에 (API, 날짜, 아티스트)별로 누적되어 여러 실행과 프로세스에서 공유됨
+QUOTA_BUDGETS(API 전체)와 QUOTA_ARTIST_BUDGETS(아티스트별)는 'youtube=10000/day,serpapi=100/month' 형식으로 예산을 지정함
+- 기본값은 둘 다 비어 있어 사용량만 기록하며, 예산은 운영자가 계정의 요금제/쿼터에 맞춰 지정한 API에만 적용됨
+요청이 예산을 넘으면 요청을 보내지 않고 QuotaExceeded를 던지며, 호출부는 allows/remaining으로 미리 확인하여 수집을 줄일 수 있음
+stage 데코레이터는 스테이지가 QuotaExceeded로 실패하면 유효 기간이 지난 저장 결과를 대신 사용함
+QUOTA_ENFORCE=0이면 사용량만 기록하고 예산은 적용하지 않음
+VALUATION_HTTP_MODE=replay로 카세트를 재생하는 동안에는 쿼터를 기록하지 않음
+'''
+
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+from zoneinfo import ZoneInfo
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from utils.logger import setup_logger
+from utils.tracing import count
+from utils.http_metrics import add_request_hook
+from utils.cassette import replaying
+logger = setup_logger(__name__)
+
+QUOTA_LEDGER_PATH = os.getenv('QUOTA_LEDGER_PATH', '.quota_ledger.sqlite3')
+QUOTA_BUDGETS = os.getenv('QUOTA_BUDGETS', '')
+QUOTA_ARTIST_BUDGETS = os.getenv('QUOTA_ARTIST_BUDGETS', '')
+QUOTA_ENFORCE = os.getenv('QUOTA_ENFORCE', '1') == '1'
+
+# API별 쿼터 초기화 기준 시간대 (기본값 UTC)
+RESET_TIMEZONES = {'youtube': 'America/Los_Angeles'}
+
+# (호스트, 경로 접두사, API, 단위). 위에서부터 처음 일치하는 규칙을 사용함
+RULES = [
+    ('www.googleapis.com', '/youtube/v3/search', 'youtube', 100),
+    ('www.googleapis.com', '/youtube/v3/', 'youtube', 1),
+    ('youtube.googleapis.com', '/youtube/v3/search', 'youtube', 100),
+    ('youtube.googleapis.com', '/youtube/v3/', 'youtube', 1),
+    ('serpapi.com', '/search', 'serpapi', 1),
+    ('api.twitter.com', '/2/', 'twitter', 1),
+    ('api.x.com', '/2/', 'twitter', 1),
+    ('api.spotify.com', '/', 'spotify', 1),
+]
+
+class QuotaExceeded(Exception):
+    def __init__(self, api: str, units: float, used: float, budget: float, period: str, artist_id: Optional[str] = None):
+        self.api = api
+        self.units = units
+        self.used = used
+        self.budget = budget
+        self.period = period
+        self.artist_id = artist_id
+        scope = f" for artist {artist_id}" if artist_id else ''
+        super().__init__(f"{api} quota budget exceeded{scope}: {used:g} + {units:g} > {budget:g} per {period}")
+
+def parse_budgets(spec: str) -> Dict[str, Tuple[float, str]]:
+    """
+    'youtube=10000/day,serpapi=100/month' 형식을 {API: (예산, 'day' 또는 'month')}로 바꾼다.
+    """
+    budgets = {}
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        try:
+            api, value = item.split('=')
+            limit, period = value.split('/') if '/' in value else (value, 'day')
+            if period not in ('day', 'month'):
+                raise ValueError(period)
+            budgets[api.strip()] = (float(limit), period.strip())
+        except ValueError:
+            raise ValueError(f"Invalid quota budget: {item!r} (expected '<api>=<units>/<day|month>')")
+    return budgets
+
+BUDGETS = parse_budgets(QUOTA_BUDGETS)
+ARTIST_BUDGETS = parse_budgets(QUOTA_ARTIST_BUDGETS)
+
+def quota_for_request(url: str) -> Optional[Tuple[str, float]]:
+    """
+    요청 URL의 (API, 쿼터 단위). 쿼터가 없는 요청이면 None을 반환한다.
+    """
+    parts = urlsplit(url)
+    for host, prefix, api, units in RULES:
+        if parts.hostname == host and parts.path.startswith(prefix):
+            return api, units
+    return None
+
+def _today(api: str) -> str:
+    tz = ZoneInfo(RESET_TIMEZONES[api]) if api in RESET_TIMEZONES else timezone.utc
+    return datetime.now(tz).strftime('%Y-%m-%d')
+
+def _period_filter(api: str, period: str) -> str:
+    # 일별 기록을 LIKE 패턴으로 묶어 일/월 예산에 사용
+    today = _today(api)
+    return today if period == 'day' else f'{today[:7]}-%'
+
+class QuotaLedger:
+    """
+    (API, 날짜, 아티스트)별 쿼터 사용량 SQLite 원장. 예산 확인과 기록은 한 트랜잭션에서 처리하여 여러 프로세스가 함께 써도 예산을 넘지 않는다.
+    """
+    def __init__(self, path: str = QUOTA_LEDGER_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS spend ('
+            'api TEXT NOT NULL, day TEXT NOT NULL, artist_id TEXT NOT NULL, units REAL NOT NULL, '
+            'PRIMARY KEY (api, day, artist_id))'
+        )
+        self._conn.commit()
+
+    def _used(self, api: str, period: str, artist_id: Optional[str] = None) -> float:
+        query = 'SELECT COALESCE(SUM(units), 0) FROM spend WHERE api = ? AND day LIKE ?'
+        params = [api, _period_filter(api, period)]
+        if artist_id is not None:
+            query += ' AND artist_id = ?'
+            params.append(artist_id)
+        return self._conn.execute(query, params).fetchone()[0]
+
+    def used(self, api: str, period: str = 'day', artist_id: Optional[str] = None) -> float:
+        with self._lock:
+            return self._used(api, period, artist_id)
+
+    def remaining(self, api: str, artist_id: Optional[str] = None,
+                  budgets: Dict = BUDGETS, artist_budgets: Dict = ARTIST_BUDGETS) -> Optional[float]:
+        """
+        API 전체 예산과 아티스트 예산 중 남은 단위가 작은 값. 예산이 없으면 None을 반환한다.
+        """
+        left = []
+        with self._lock:
+            if api in budgets:
+                limit, period = budgets[api]
+                left.append(limit - self._used(api, period))
+            if api in artist_budgets and artist_id is not None:
+                limit, period = artist_budgets[api]
+                left.append(limit - self._used(api, period, artist_id))
+        return max(0.0, min(left)) if left else None
+
+    def spend(self, api: str, units: float, artist_id: str, enforce: bool = True,
+              budgets: Dict = BUDGETS, artist_budgets: Dict = ARTIST_BUDGETS) -> None:
+        """
+        units를 기록한다. enforce이고 예산을 넘게 되면 기록하지 않고 QuotaExceeded를 던진다.
+        """
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                if enforce:
+                    if api in budgets:
+                        limit, period = budgets[api]
+                        used = self._used(api, period)
+                        if used + units > limit:
+                            raise QuotaExceeded(api, units, used, limit, period)
+                    if api in artist_budgets:
+                        limit, period = artist_budgets[api]
+                        used = self._used(api, period, artist_id)
+                        if used + units > limit:
+                            raise QuotaExceeded(api, units, used, limit, period, artist_id)
+                self._conn.execute(
+                    'INSERT INTO spend (api, day, artist_id, units) VALUES (?, ?, ?, ?) '
+                    'ON CONFLICT (api, day, artist_id) DO UPDATE SET units = units + excluded.units',
+                    (api, _today(api), artist_id, units),
+                )
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+
+    def usage(self) -> List[Dict]:
+        """
+        예산이 있거나 이번 달 사용 기록이 있는 API별 현재 기간 사용량.
+        """
+        with self._lock:
+            apis = [row[0] for row in self._conn.execute('SELECT DISTINCT api FROM spend')]
+            rows = []
+            for api in sorted(set(apis) | set(BUDGETS)):
+                limit, period = BUDGETS.get(api, (None, 'day'))
+                rows.append({'api': api, 'period': period, 'used': self._used(api, period), 'budget': limit})
+        return rows
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+_ledger: Optional[QuotaLedger] = None
+_ledger_lock = threading.Lock()
+
+def get_ledger() -> QuotaLedger:
+    global _ledger
+    with _ledger_lock:
+        if _ledger is None:
+            _ledger = QuotaLedger()
+        return _ledger
+
+def _artist_id() -> str:
+    from Valuation.utils.artist import current_artist
+    try:
+        return current_artist().artist_id
+    except ValueError:
+        return '-'
+
+def charge(api: str, units: float = 1) -> None:
+    """
+    현재 아티스트의 api 사용량에 units를 기록한다. 예산을 넘게 되면 QuotaExceeded를 던진다.
+    """
+    get_ledger().spend(api, units, _artist_id(), enforce=QUOTA_ENFORCE)
+    count(f'quota_{api}', units)
+
+def remaining(api: str) -> Optional[float]:
+    """
+    현재 아티스트가 api에 더 쓸 수 있는 단위. 예산이 없으면 None을 반환한다.
+    """
+    return get_ledger().remaining(api, _artist_id())
+
+def allows(api: str, units: float = 1) -> bool:
+    if not QUOTA_ENFORCE:
+        return True
+    left = remaining(api)
+    return left is None or left >= units
+
+def _charge_request(method: str, url: str) -> None:
+    # 카세트 재생(replay) 중에는 실제 API를 호출하지 않으므로 기록하지 않음
+    if replaying():
+        return
+    quota = quota_for_request(url)
+    if quota is not None:
+        charge(*quota)
+
+def install_quota_accounting() -> None:
+    """
+    HTTP 훅에 쿼터 기록을 등록한다. 여러 번 호출해도 한 번만 등록된다.
+    """
+    add_request_hook(_charge_request)
+
+def format_usage(spent: Dict[str, float]) -> str:
+    """
+    이번 실행에서 쓴 단위(spent)와 원장의 현재 기간 사용량/예산을 한 줄씩 표시한다.
+    """
+    lines = []
+    for row in get_ledger().usage():
+        if row['api'] not in spent and row['budget'] is None:
+            continue
+        budget = f"/{row['budget']:g}" if row['budget'] is not None else ''
+        lines.append(f"{row['api']:<10} {spent.get(row['api'], 0):>8g} this run, {row['used']:g}{budget} this {row['period']}")
+    return '\n'.join(lines)
@@ -0,0 +1,70 @@
+##### Valuation/utils/run_report.py #####
+'''
+run_report.py는 밸류에이션 실행(stage_graph.valuation_run)이 끝날 때 실행 보고서를 로그와 파일로 남김
+VALUATION_TRACE에 경로를 지정하면 Chrome trace JSON을 저장하고 스테이지별 요약(벽시계/CPU 시간, Firestore 읽기/쓰기, HTTP 호출, 최대 RSS)과 임계 경로를 로그로 남김
+실행 범위 캐시 hit/miss, 컬렉션/스테이지별 Firestore 사용량과 월간 예상 비용, 스테이지별 메모리, 쿼터 사용량, 업스트림 호스트별 HTTP 요약을 로그로 남김
+VALUATION_HTTP_METRICS에 경로를 지정하면 HTTP 집계를 Prometheus 텍스트 형식으로도 저장함
+'''
+
+import os
+import time
+from typing import List
+
+from utils.logger import setup_logger
+from utils.memory import format_memory
+from utils.http_metrics import HTTP_METRICS
+from Valuation.utils.quota import format_usage
+logger = setup_logger(__name__)
+
+# 실행 trace(Chrome trace JSON) 저장 경로. {artist_id}, {time}을 포함할 수 있음. 비어 있으면 저장하지 않음
+TRACE_PATH = os.getenv('VALUATION_TRACE', '')
+# 호스트별 HTTP 집계(Prometheus 텍스트 형식) 저장 경로. 비어 있으면 저장하지 않음
+HTTP_METRICS_PATH = os.getenv('VALUATION_HTTP_METRICS', '')
+
+def critical_path(run) -> List[str]:
+    """
+    기록된 스테이지 구간 중 가장 늦게 끝난 스테이지부터, 가장 늦게 끝난 선행 스테이지를 따라간 경로를 반환한다.
+    """
+    ends = {s.name: s.end for s in run.trace.stage_spans() if s.end is not None}
+    if not ends:
+        return []
+    path = [max(ends, key=ends.get)]
+    while run.graph is not None and path[-1] in run.graph.stages:
+        deps = [dep for dep in run.graph.deps(path[-1]) if dep in ends]
+        if not deps:
+            break
+        path.append(max(deps, key=ends.get))
+    return list(reversed(path))
+
+def _export_trace(run) -> None:
+    path = run.trace.export(TRACE_PATH.format(artist_id=run.artist_id(), time=time.strftime('%Y%m%d-%H%M%S')))
+
+    logger.info(f"{'stage':<15} {'status':<9} {'wall_s':>8} {'cpu_s':>8} {'fs_r':>6} {'fs_w':>6} {'http':>6} {'rss_mb':>7}")
+    for s in sorted(run.trace.stage_spans(), key=lambda s: s.start):
+        logger.info(
+            f"{s.name:<15} {s.args.get('status', ''):<9} {s.duration:>8.2f} {s.cpu:>8.2f} "
+            f"{s.counters['firestore_reads']:>6} {s.counters['firestore_writes']:>6} {s.counters['http_calls']:>6} "
+            f"{s.args.get('peak_rss_mb', 0):>7.0f}"
+        )
+    logger.info(f"Critical path: {' → '.join(critical_path(run))}")
+    logger.info(f"Trace saved to {path}")
+
+def report_run(run) -> None:
+    """
+    끝난 실행(ValuationRun)의 trace, 캐시, Firestore, 메모리, 쿼터, HTTP 보고서를 남긴다.
+    """
+    if TRACE_PATH:
+        _export_trace(run)
+    if run.cache_stats:
+        logger.info(f"Record cache: {run.cache_stats['hits']} hits / {run.cache_stats['misses']} misses")
+    if run.firestore:
+        logger.info(f"Firestore usage:\n{run.firestore.report()}")
+    if run.memory:
+        logger.info(f"Memory by stage:\n{format_memory(run.memory)}")
+    spent = {key[len('quota_'):]: units for key, units in run.trace.counters.items() if key.startswith('quota_')}
+    if spent:
+        logger.info(f"Quota:\n{format_usage(spent)}")
+    if run.http:
+        logger.info(f"HTTP by host:\n{run.http.summary()}")
+    if HTTP_METRICS_PATH:
+        HTTP_METRICS.write_prometheus(HTTP_METRICS_PATH)
@@ -0,0 +1,448 @@
+##### Valuation/utils/stage_graph.py #####
+'''
+stage_graph.py는 밸류에이션 스테이지 간 의존성 그래프와 실행기를 제공함
+StageGraph는 스테이지 이름, 스테이지 함수 경로('모듈:함수'), 선행 스테이지 목록을 선언적으로 보관하며 스테이지 함수는 실행 시점에 importlib로 불러옴
+run 함수는 선행 스테이지가 끝난 노드부터 스레드 풀에 제출하여 독립 브랜치를 동시에 실행함
+ValuationRun은 contextvars로 관리되는 한 번의 실행 범위로, 대상 아티스트와 스테이지 결과, 실행 범위 캐시를 보관하며 여러 아티스트 실행이 SharedStore를 공유할 수 있음
+stage 데코레이터는 실행 범위 안에서 같은 스테이지를 한 번만 계산하여 복사본을 반환하고, 완료된 출력을 실행 저널(journal.py)에 기록함
+StageGraph.fingerprint(아티스트 정보, 사용하는 Weights/Variables 값, 선행 스테이지 출력 해시)가 저장된 지문과 같으면 재계산하지 않으며, external 스테이지는 TTL(VALUATION_TTL_<스테이지>, ttl 옵션, VALUATION_TTL_HOURS)도 적용함
+VALUATION_STALE_WHILE_REVALIDATE=1이면 TTL이 지난 결과를 즉시 반환하고 백그라운드에서 갱신함
+각 스테이지는 trace 구간, 메모리 기록(VALUATION_MEMORY_LIMIT_MB), 프로파일(VALUATION_PROFILE)로 감싸지며, QuotaExceeded로 실패하면 유효 기간이 지난 저장 결과를 사용함
+실행 범위를 열 때 HTTP 훅(hooks.py)을 설치하고, 실행이 끝나면 run_report.py가 실행 보고서를 남김
+'''
+
+import contextvars
+import copy
+import functools
+import hashlib
+import importlib
+import json
+import os
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import contextmanager, nullcontext
+from datetime import timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from utils.logger import setup_logger
+from utils.tracing import Trace, tracing, span, count
+from utils.profiling import profile_enabled, profiled
+from utils.memory import wait_for_memory, watch
+from utils.http_metrics import HttpMetrics, collecting
+from Firebase.usage import FirestoreUsage, tracking
+from Valuation.utils.quota import QuotaExceeded
+from Valuation.utils.hooks import install_hooks
+from Valuation.utils.run_report import report_run
+logger = setup_logger(__name__)
+
+MAX_WORKERS = int(os.getenv('VALUATION_MAX_WORKERS', '4'))
+DEFAULT_TTL_HOURS = float(os.getenv('VALUATION_TTL_HOURS', '24'))
+STALE_WHILE_REVALIDATE = os.getenv('VALUATION_STALE_WHILE_REVALIDATE', '0') == '1'
+REFRESH_WORKERS = int(os.getenv('VALUATION_REFRESH_WORKERS', '2'))
+
+_current_run = contextvars.ContextVar('valuation_run', default=None)
+
+def content_hash(value) -> str:
+    """
+    JSON으로 직렬화한 값의 sha256 해시. dict 키 순서와 무관하며, 직렬화할 수 없는 값(datetime 등)은 문자열로 바꾼다.
+    """
+    encoded = json.dumps(value, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+class SharedStore:
+    """
+    아티스트와 무관한 데이터를 여러 실행(배치의 각 아티스트)이 함께 쓰는 저장소.
+    """
+    def __init__(self):
+        self.data: Dict[tuple, object] = {}
+        self.stats = Counter()
+        self._locks: Dict[tuple, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def cached(self, key: tuple, loader: Callable):
+        """
+        key에 해당하는 값을 반환한다. 없으면 loader()로 한 번만 불러온다.
+        loader가 예외를 던지거나 None을 반환하면 저장하지 않아 다음 호출에서 다시 시도한다.
+        """
+        with self._lock:
+            key_lock = self._locks.setdefault(key, threading.Lock())
+        with key_lock:
+            hit = key in self.data
+            if hit:
+                value = self.data[key]
+            else:
+                value = loader()
+                if value is not None:
+                    self.data[key] = value
+            with self._lock:
+                self.stats['hits' if hit else 'misses'] += 1
+            return copy.deepcopy(value)
+
+class ValuationRun:
+    """
+    한 번의 밸류에이션 실행 범위. 대상 아티스트, 스테이지 결과, 실행 범위 캐시와 잠금을 보관한다.
+    """
+    def __init__(self, graph: Optional['StageGraph'] = None, artist=None, shared: Optional[SharedStore] = None):
+        self.graph = graph
+        self.artist = artist
+        self.shared = shared if shared is not None else SharedStore()
+        self.results: Dict[str, object] = {}
+        self.cache: Dict[tuple, object] = {}
+        self.cache_stats = Counter()
+        # 스테이지별 입력 지문과 출력 해시. 지문이 있는 스테이지는 check_record가 지문으로 신선도를 판단함
+        self.fingerprints: Dict[str, str] = {}
+        self.output_hashes: Dict[str, str] = {}
+        self.external: Set[str] = set()
+        # stale-while-revalidate 여부와 저장된 결과를 무시하고 다시 계산할 스테이지(백그라운드 갱신용)
+        self.stale_while_revalidate = STALE_WHILE_REVALIDATE
+        self.force: Set[str] = set()
+        # 실행 저널(Valuation/utils/journal.py). 처음 사용할 때 생성되며, 실행이 실패하면 다음 실행을 위해 남김
+        self.journal = None
+        self.journaled = True
+        self.failed = False
+        # 스테이지별 시간, 캐시, Firestore/HTTP 호출 기록 (utils/tracing.py)
+        self.trace = Trace('valuation')
+        # 이 실행의 업스트림 호스트별 HTTP 호출 집계 (utils/http_metrics.py)
+        self.http = HttpMetrics()
+        # 이 실행의 컬렉션/스테이지별 Firestore 읽기/쓰기와 비용 추정 (Firebase/usage.py)
+        self.firestore = FirestoreUsage()
+        # 유효 기간이 지나 다시 계산하는 스테이지의 저장 결과 (쿼터 예산 초과 시 대신 사용)
+        self.expired: Dict[str, Dict] = {}
+        # 스테이지별 RSS(시작/최대/끝)와 상위 할당 위치 (utils/memory.py)
+        self.memory: Dict[str, Dict] = {}
+        self._stage_locks: Dict[object, threading.RLock] = {}
+        self._lock = threading.Lock()
+
+    def artist_id(self) -> str:
+        from Valuation.utils.artist import current_artist
+        return self.artist.artist_id if self.artist is not None else current_artist().artist_id
+
+    def stage_lock(self, name) -> threading.RLock:
+        with self._lock:
+            if name not in self._stage_locks:
+                self._stage_locks[name] = threading.RLock()
+            return self._stage_locks[name]
+
+    def cached(self, key: tuple, loader: Callable):
+        """
+        key에 해당하는 값을 실행 범위 캐시에서 반환한다. 없으면 loader()로 한 번만 불러온다.
+        loader가 예외를 던지면 캐시하지 않는다.
+        """
+        with self.stage_lock(('cache',) + key):
+            hit = key in self.cache
+            if not hit:
+                self.cache[key] = loader()
+            with self._lock:
+                self.cache_stats['hits' if hit else 'misses'] += 1
+            count('run_cache_hits' if hit else 'run_cache_misses')
+            return copy.deepcopy(self.cache[key])
+
+    def store(self, key: tuple, value) -> None:
+        with self.stage_lock(('cache',) + key):
+            self.cache[key] = copy.deepcopy(value)
+
+    def invalidate(self, key: tuple) -> None:
+        with self.stage_lock(('cache',) + key):
+            self.cache.pop(key, None)
+
+def current_run() -> Optional[ValuationRun]:
+    return _current_run.get()
+
+def shared(key: tuple, loader: Callable):
+    """
+    아티스트와 무관한 데이터를 실행(배치) 공유 저장소에서 읽는다. 실행 범위 밖에서는 loader()를 그대로 호출한다.
+    """
+    run = _current_run.get()
+    if run is None:
+        return loader()
+    return run.shared.cached(key, loader)
+
+def stage_ttl(name: str, graph: Optional['StageGraph'] = None) -> timedelta:
+    """
+    스테이지 결과의 유효 기간. VALUATION_TTL_<NAME> 환경변수, 그래프의 ttl 옵션, 기본값 순으로 적용한다.
+    """
+    hours = os.getenv(f'VALUATION_TTL_{name.upper()}')
+    if hours is None and graph is not None and name in graph.stages:
+        hours = graph.options(name).get('ttl')
+    return timedelta(hours=float(hours if hours is not None else DEFAULT_TTL_HOURS))
+
+_refresh_pool: Optional[ThreadPoolExecutor] = None
+_refresh_futures: Dict[tuple, object] = {}
+_refresh_lock = threading.Lock()
+
+def revalidate(name: str, run: ValuationRun) -> bool:
+    """
+    name 스테이지를 백그라운드에서 다시 계산하도록 예약한다. 같은 아티스트/스테이지가 이미 갱신 중이면 예약하지 않는다.
+    """
+    global _refresh_pool
+    from Valuation.utils.artist import current_artist
+    artist = run.artist
+    key = (current_artist().artist_id, name)
+
+    with _refresh_lock:
+        if key in _refresh_futures:
+            return False
+        if _refresh_pool is None:
+            _refresh_pool = ThreadPoolExecutor(max_workers=REFRESH_WORKERS, thread_name_prefix='revalidate')
+        # 새 실행 범위에서 갱신하므로 현재 실행의 컨텍스트를 물려주지 않음
+        future = _refresh_pool.submit(contextvars.Context().run, _refresh_stage, name, run.graph, artist, run.shared)
+        _refresh_futures[key] = future
+
+    def done(_):
+        with _refresh_lock:
+            _refresh_futures.pop(key, None)
+    future.add_done_callback(done)
+    logger.info(f"Stage '{name}' is stale, serving last result and refreshing in background")
+    return True
+
+def _refresh_stage(name: str, graph: 'StageGraph', artist, shared: SharedStore) -> None:
+    try:
+        with valuation_run(graph, artist, shared) as run:
+            run.stale_while_revalidate = False
+            run.journaled = False
+            run.force.add(name)
+            graph.stage_func(name)()
+        logger.info(f"Stage '{name}' refreshed in background")
+    except Exception as e:
+        logger.error(f"Background refresh of stage '{name}' failed: {e}")
+
+def wait_for_refresh(timeout: Optional[float] = None) -> None:
+    """
+    진행 중인 백그라운드 갱신이 끝날 때까지 기다린다.
+    """
+    with _refresh_lock:
+        futures = list(_refresh_futures.values())
+    wait(futures, timeout=timeout)
+
+@contextmanager
+def valuation_run(graph: Optional['StageGraph'] = None, artist=None, shared: Optional[SharedStore] = None):
+    """
+    실행 범위를 연다. 이미 열린 실행이 있으면 그 실행을 그대로 사용한다.
+    artist를 지정하지 않으면 스테이지는 환경변수의 아티스트를 사용한다.
+    """
+    run = _current_run.get()
+    if run is not None:
+        if artist is not None and run.artist is not None and artist.artist_id != run.artist.artist_id:
+            raise RuntimeError(f"Valuation run for '{run.artist.artist_id}' is already active")
+        if run.graph is None and graph is not None:
+            run.graph = graph
+        if run.artist is None and artist is not None:
+            run.artist = artist
+        yield run
+        return
+
+    run = ValuationRun(graph, artist, shared)
+    token = _current_run.set(run)
+    install_hooks()
+    try:
+        with tracing(run.trace), collecting(run.http), tracking(run.firestore):
+            yield run
+    except BaseException:
+        run.failed = True
+        raise
+    finally:
+        _current_run.reset(token)
+        # 실패하거나 중단된 실행의 저널만 남겨 다음 실행이 이어서 진행하도록 함
+        if run.journal is not None:
+            run.journal.close(run.failed)
+        report_run(run)
+
+def stage(name: str):
+    """
+    스테이지 함수 데코레이터. 실행 범위 안에서 같은 스테이지는 한 번만 계산된다.
+    인자를 넘겨 호출한 경우(예: er_youtube(max_results=10))는 메모하지 않는다.
+    """
+    def decorator(func: Callable):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            run = _current_run.get()
+            if run is None:
+                with valuation_run():
+                    return wrapper(*args, **kwargs)
+            if args or kwargs:
+                return func(*args, **kwargs)
+
+            with run.stage_lock(name):
+                if name not in run.results:
+                    if run.graph is not None and name in run.graph.stages:
+                        run.graph.prepare(name, run)
+                    from Valuation.utils.journal import run_journal
+                    journal = run_journal(run)
+                    fingerprint = run.fingerprints.get(name)
+                    # 이전 실행이 중단되기 전에 끝낸 스테이지는 저널의 출력을 그대로 사용
+                    entry = journal.load_stage(name, fingerprint) if journal is not None and name not in run.force else None
+                    if entry is not None:
+                        run.results[name], run.output_hashes[name] = entry
+                        print(f'{name} Resumed')
+                    else:
+                        fallback = False
+                        try:
+                            # VALUATION_MEMORY_LIMIT_MB를 넘으면 다른 스테이지가 끝날 때까지 기다린 뒤 시작
+                            wait_for_memory(name)
+                            # VALUATION_PROFILE로 지정한 스테이지는 샘플링 프로파일을 아티스트별로 저장
+                            profile = profiled(name, run.artist_id()) if profile_enabled(name) else nullcontext()
+                            with span(name, 'stage') as s, profile, watch(name) as memory:
+                                try:
+                                    run.results[name] = func()
+                                except QuotaExceeded as e:
+                                    # 쿼터 예산을 넘으면 유효 기간이 지난 저장 결과로 대신함
+                                    if name not in run.expired:
+                                        raise
+                                    logger.warning(f"Stage '{name}': {e}; using expired stored result")
+                                    record = run.expired[name]
+                                    run.results[name] = record.get(name)
+                                    stored_hash = (record.get('output_hashes') or {}).get(name)
+                                    if stored_hash:
+                                        run.output_hashes[name] = stored_hash
+                                    fallback = True
+                                if s is not None:
+                                    # check_record가 기록한 저장 결과 사용 여부(hit/stale)로 상태를 표시
+                                    s.args['status'] = 'fallback' if fallback else 'loaded' if s.args.get('record') in ('hit', 'stale') else 'computed'
+                            run.memory[name] = memory.to_dict()
+                            if s is not None:
+                                s.args['peak_rss_mb'] = run.memory[name]['peak_rss_mb']
+                        except BaseException:
+                            run.failed = True
+                            raise
+                        # save_record/check_record가 저장된 출력 해시를 기록하지 않은 경우(저장하지 않는 스테이지 등)
+                        if name not in run.output_hashes:
+                            run.output_hashes[name] = content_hash(run.results[name])
+                        # 대체한 결과는 저널에 남기지 않아 다음 실행에서 다시 수집함
+                        if journal is not None and not fallback:
+                            journal.save_stage(name, fingerprint, run.results[name], run.output_hashes[name])
+            # 호출부에서 결과를 가공하는 스테이지가 많으므로 복사본을 넘긴다
+            return copy.deepcopy(run.results[name])
+
+        wrapper.stage_name = name
+        return wrapper
+    return decorator
+
+class StageGraph:
+    """
+    스테이지 의존성 그래프.
+    stages: {스테이지 이름: ('모듈 경로:함수 이름', [선행 스테이지 이름, ...], {옵션})}
+    옵션(생략 가능)
+      params: 지문에 포함할 설정 값 경로 목록. 'Weights.PCV.CEV_WEIGHT'처럼 weights 모듈 기준이거나 '모듈 경로:속성' 형식
+      external: True이면 외부 데이터나 현재 시각에 의존하므로 지문과 함께 일 단위 신선도 규칙을 적용
+    """
+    def __init__(self, stages: Dict[str, tuple]):
+        self.stages = stages
+        for name, (_, deps, *_) in stages.items():
+            for dep in deps:
+                if dep not in stages:
+                    raise ValueError(f"Stage '{name}' depends on unknown stage '{dep}'")
+        self._funcs: Dict[str, Callable] = {}
+
+    def names(self) -> List[str]:
+        return list(self.stages.keys())
+
+    def deps(self, name: str) -> List[str]:
+        if name not in self.stages:
+            raise KeyError(f"Unknown stage '{name}'")
+        return list(self.stages[name][1])
+
+    def options(self, name: str) -> Dict:
+        node = self.stages[name]
+        return node[2] if len(node) > 2 else {}
+
+    def param_values(self, name: str) -> Dict[str, object]:
+        values = {}
+        for path in self.options(name).get('params', []):
+            module_path, attr_path = path.split(':') if ':' in path else ('Valuation.utils.weights', path)
+            value = importlib.import_module(module_path)
+            for attr in attr_path.split('.'):
+                value = getattr(value, attr)
+            values[path] = value
+        return values
+
+    def fingerprint(self, name: str, run: ValuationRun) -> str:
+        """
+        name 스테이지의 입력 지문. 선행 스테이지의 출력 해시가 run에 기록되어 있어야 한다.
+        """
+        from Valuation.utils.artist import current_artist
+        return content_hash({
+            'stage': name,
+            'func': self.stages[name][0],
+            'artist': current_artist().to_dict(),
+            'params': self.param_values(name),
+            'inputs': {dep: run.output_hashes.get(dep) for dep in self.deps(name)},
+        })
+
+    def prepare(self, name: str, run: ValuationRun) -> None:
+        """
+        선행 스테이지를 먼저 확정하고(실행 범위에 메모된 결과 사용) name 스테이지의 지문을 기록한다.
+        """
+        for dep in self.deps(name):
+            self.stage_func(dep)()
+        run.fingerprints[name] = self.fingerprint(name, run)
+        if self.options(name).get('external'):
+            run.external.add(name)
+
+    def dependencies(self, name: str) -> List[str]:
+        """
+        name 스테이지와 모든 선행 스테이지를 실행 가능한 순서(위상 정렬)로 반환한다.
+        """
+        return self.order([name])
+
+    def order(self, targets: Iterable[str]) -> List[str]:
+        ordered = []
+        visiting = set()
+
+        def visit(name):
+            if name in ordered:
+                return
+            if name in visiting:
+                raise ValueError(f"Cycle detected at stage '{name}'")
+            visiting.add(name)
+            for dep in self.deps(name):
+                visit(dep)
+            visiting.discard(name)
+            ordered.append(name)
+
+        for target in targets:
+            visit(target)
+        return ordered
+
+    def stage_func(self, name: str) -> Callable:
+        if name not in self._funcs:
+            func_path = self.stages[name][0]
+            module_path, func_name = func_path.split(':')
+            module = importlib.import_module(module_path)
+            self._funcs[name] = getattr(module, func_name)
+        return self._funcs[name]
+
+    def run(self, targets: Iterable[str], max_workers: Optional[int] = None) -> Dict[str, object]:
+        """
+        targets와 그 선행 스테이지를 실행한다. 각 노드는 실행 범위당 한 번만 계산되며,
+        선행 스테이지가 모두 끝난 노드는 스레드 풀에서 동시에 실행된다.
+        """
+        targets = list(targets)
+        nodes = self.order(targets)
+        max_workers = max_workers or MAX_WORKERS
+
+        with valuation_run(self) as run:
+            done = {name for name in nodes if name in run.results}
+            futures = {}
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                while len(done) < len(nodes):
+                    for name in nodes:
+                        if name in done or name in futures:
+                            continue
+                        if all(dep in done for dep in self.deps(name)):
+                            func = self.stage_func(name)
+                            ctx = contextvars.copy_context()
+                            futures[name] = pool.submit(ctx.run, func)
+
+                    finished, _ = wait(futures.values(), return_when=FIRST_COMPLETED)
+                    for name, future in list(futures.items()):
+                        if future in finished:
+                            future.result()
+                            done.add(name)
+                            del futures[name]
+                            logger.info(f"Stage '{name}' resolved ({len(done)}/{len(nodes)})")
+
+            return {name: copy.deepcopy(run.results.get(name)) for name in targets}
+
+    def run_stage(self, name: str, max_workers: Optional[int] = None):
+        return self.run([name], max_workers)[name]
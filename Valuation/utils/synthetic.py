@@ -0,0 +1,230 @@
+##### Valuation/utils/synthetic.py #####
+'''
+synthetic.py는 계산 함수의 규모별 성능 측정을 위해 스테이지 결과와 같은 형식의 합성 카탈로그 데이터를 생성함
+SyntheticCatalog는 seed로 고정한 난수로 앨범, 곡, 스트리밍, 판매, 영상, 트윗, 게시물, 공연, 방송 데이터를 만들어 같은 입력을 반복 생성함
+크기는 SIZES 프리셋(small, medium, large, label)에 항목별 값을 덮어써서 지정하며, label 프리셋은 앨범 1,000장, 영상 50,000개, 20년 이력임
+- sv, apv, rv: SV/APV/RV 스테이지 결과 형식 (UDI combine_metrics 입력). Melon과 Spotify 앨범은 같은 발매일로 매핑되며 일부 트랙은 Inst. 등 필터 대상 제목을 가짐
+- fv_t: 이력 기간의 월말 FV_t 시계열, av: AV 스테이지 결과 형식의 앨범 메트릭
+- mcv_twitter, mcv_youtube, mcv_instagram: MCV 스테이지 결과 형식의 트윗, 영상, 게시물
+- concerts, broadcasts: CEV/MRV 수집 단계 형식의 공연(일부는 수익 누락)과 방송 이벤트
+모든 이벤트와 앨범 발매일은 이력 시작일 이후이며, 이력 첫 달에 첫 앨범이 발매되어 CEV/MRV의 최신 앨범/FV 조회가 항상 성공함
+'''
+
+import calendar
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+SIZES = {
+    'small': {'albums': 10, 'tracks': 10, 'videos': 200, 'tweets': 200, 'posts': 100, 'concerts': 10, 'broadcasts': 10, 'years': 3},
+    'medium': {'albums': 50, 'tracks': 12, 'videos': 2000, 'tweets': 2000, 'posts': 1000, 'concerts': 50, 'broadcasts': 50, 'years': 8},
+    'large': {'albums': 200, 'tracks': 12, 'videos': 10000, 'tweets': 10000, 'posts': 5000, 'concerts': 200, 'broadcasts': 200, 'years': 12},
+    'label': {'albums': 1000, 'tracks': 12, 'videos': 50000, 'tweets': 20000, 'posts': 20000, 'concerts': 1000, 'broadcasts': 1000, 'years': 20},
+}
+
+FILTERED_SUFFIXES = ['(Inst.)', '(Intro)', '(Remix)', '(Interlude)']
+BROADCAST_CATEGORIES = ['드라마', '예능', '음악방송', '기타']
+
+def catalog_size(preset: str = 'small', **overrides) -> Dict:
+    """
+    preset 크기에 overrides(albums=1000 등)를 덮어쓴 크기 사전.
+    """
+    if preset not in SIZES:
+        raise ValueError(f"Unknown size preset '{preset}'; expected one of {sorted(SIZES)}")
+    unknown = set(overrides) - set(SIZES[preset])
+    if unknown:
+        raise ValueError(f"Unknown size keys {sorted(unknown)}")
+    return {**SIZES[preset], **{key: int(value) for key, value in overrides.items()}}
+
+def month_end(dt: datetime) -> datetime:
+    return dt.replace(day=calendar.monthrange(dt.year, dt.month)[1], hour=0, minute=0, second=0, microsecond=0)
+
+class SyntheticCatalog:
+    """
+    한 아티스트의 합성 카탈로그. 같은 seed, 크기, end_date면 항상 같은 데이터를 생성한다.
+    end_date를 지정하지 않으면 이번 달 말일을 이력의 끝으로 사용한다.
+    """
+    def __init__(self, preset: str = 'small', seed: int = 0, end_date: Optional[datetime] = None, **overrides):
+        self.size = catalog_size(preset, **overrides)
+        self.seed = seed
+        self.end = month_end(end_date or datetime.now())
+        self.start = month_end(self.end - timedelta(days=365 * self.size['years'])).replace(day=1)
+        self._albums = None
+
+    def __repr__(self):
+        return f"<SyntheticCatalog seed={self.seed} {self.size}>"
+
+    def _rng(self, name: str) -> random.Random:
+        # 데이터 종류별로 난수열을 분리하여 한 항목의 크기를 바꿔도 다른 데이터가 바뀌지 않게 함
+        return random.Random(f'{self.seed}:{name}')
+
+    def _dates(self, name: str, count: int, first: Optional[datetime] = None, last: Optional[datetime] = None) -> List[datetime]:
+        rng = self._rng(name)
+        first = first or self.start + timedelta(days=31)
+        span = max(((last or self.end) - first).days, 1)
+        return sorted(first + timedelta(days=rng.randrange(span)) for _ in range(count))
+
+    def albums(self) -> List[Dict]:
+        """
+        앨범 기본 정보 {'index', 'release_date', 'title', 'tracks': [{'name', 'streams', 'listeners', 'likes', 'popularity'}], 'popularity'}.
+        """
+        if self._albums is not None:
+            return self._albums
+        rng = self._rng('albums')
+        # PFVFunc.distribute_rv_over_time은 발매 후 2개월 이상의 이력이 필요하므로 마지막 두 달에는 발매하지 않음
+        dates = [self.start] + self._dates('album_dates', self.size['albums'] - 1, last=self.end - timedelta(days=62)) if self.size['albums'] else []
+        albums = []
+        for i, release_date in enumerate(dates):
+            scale = rng.lognormvariate(0, 1.2)
+            tracks = []
+            for k in range(self.size['tracks']):
+                name = f'Song {i}-{k}'
+                if rng.random() < 0.1:
+                    name = f'{name} {rng.choice(FILTERED_SUFFIXES)}'
+                streams = int(rng.paretovariate(1.5) * 100000 * scale)
+                tracks.append({
+                    'name': name,
+                    'streams': streams,
+                    'listeners': int(streams * rng.uniform(0.05, 0.3)),
+                    'likes': int(streams * rng.uniform(0.001, 0.02)),
+                    'popularity': rng.randint(0, 100),
+                })
+            albums.append({
+                'index': i,
+                'release_date': release_date,
+                'title': f'Album {i}',
+                'tracks': tracks,
+                'popularity': rng.randint(10, 100),
+                'sales': int(rng.paretovariate(1.3) * 5000 * scale),
+            })
+        self._albums = albums
+        return albums
+
+    def sv(self) -> Dict:
+        return {'albums': [{
+            'album_id': f'ml{album["index"]}',
+            'release_date': album['release_date'].strftime('%Y.%m.%d'),
+            'album_title': album['title'],
+            'img_url': f'https://example.com/{album["index"]}.jpg',
+            'tracks': [{
+                'track_name': track['name'],
+                'melon_streams': track['streams'],
+                'melon_listeners': track['listeners'],
+                'melon_likes': track['likes'],
+            } for track in album['tracks']],
+        } for album in self.albums()]}
+
+    def apv(self) -> Dict:
+        return {'albums': [{
+            'album_id': f'sp{album["index"]}',
+            'release_date': album['release_date'].strftime('%Y-%m-%d'),
+            'album_title': album['title'],
+            'popularity': album['popularity'],
+            'tracks': [{'track_name': track['name'], 'popularity': track['popularity']} for track in album['tracks']],
+        } for album in self.albums()]}
+
+    def rv(self) -> Dict:
+        """
+        앨범마다 발매 다음 달의 판매 기록 하나 (combine_metrics가 발매 후 110일 안의 판매를 앨범에 연결함).
+        """
+        sales_data = []
+        for album in self.albums():
+            sold = month_end(album['release_date']) + timedelta(days=1)
+            revenue = album['sales'] * 23000
+            sales_data.append({
+                'total_sales_year': str(sold.year),
+                'total_sales_month': str(sold.month),
+                'total_sales': album['sales'],
+                'discounted_revenue': revenue * 0.9,
+                'discounted_LAP': 23000 * 0.9,
+            })
+        return {'sales_data': sales_data}
+
+    def months(self) -> List[datetime]:
+        months, current = [], month_end(self.start)
+        while current <= self.end:
+            months.append(current)
+            current = month_end(current + timedelta(days=1))
+        return months
+
+    def fv_t(self) -> Dict:
+        rng = self._rng('fv_t')
+        sub_data, level = [], 1e9
+        for date in self.months():
+            level *= rng.uniform(0.95, 1.06)
+            ratio = rng.uniform(0, 100)
+            sub_data.append({
+                'date': date.strftime('%Y-%m-%d'),
+                'trends_ratio': ratio,
+                'trends_ratio_exponential': 1.0003 ** ratio,
+                'FV_t': level,
+            })
+        return {'collected_time': self.end.strftime('%Y-%m-%d'), 'sub_data': sub_data}
+
+    def av(self) -> Dict:
+        """
+        AV 스테이지 결과 형식 {'metrics': [...], 'av'}. 값은 스트림과 판매량에서 단순 비례로 만든다.
+        """
+        metrics = []
+        for album in self.albums():
+            sv = sum(track['streams'] for track in album['tracks']) * 6 * 0.5
+            apv = sum(track['popularity'] for track in album['tracks']) * album['popularity'] * 0.1
+            rv = album['sales'] * 23000 * 0.9 * 0.5
+            metrics.append({
+                'spotify_album_id': f'sp{album["index"]}',
+                'melon_album_id': f'ml{album["index"]}',
+                'album_title': album['title'],
+                'release_date': album['release_date'],
+                'rv': rv,
+                'sv': sv,
+                'apv': apv,
+                'av': rv + sv + apv,
+            })
+        return {'metrics': metrics, 'av': sum(m['av'] for m in metrics)}
+
+    def mcv_youtube(self) -> Dict:
+        rng = self._rng('videos')
+        return {'details': [{
+            'id': f'video{i}',
+            'publishedAt': date.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'MCV': rng.paretovariate(1.2) * 1000,
+        } for i, date in enumerate(self._dates('video_dates', self.size['videos']))]}
+
+    def mcv_twitter(self) -> Dict:
+        rng = self._rng('tweets')
+        return {'tweets': [{
+            'id': f'tweet{i}',
+            'created_at': date.strftime('%Y-%m-%dT%H:%M:%S.000Z'),
+            'mcv': rng.paretovariate(1.5) * 0.5,
+        } for i, date in enumerate(self._dates('tweet_dates', self.size['tweets']))]}
+
+    def mcv_instagram(self) -> Dict:
+        rng = self._rng('posts')
+        return {'posts': [{
+            'id': f'post{i}',
+            'date': date.strftime('%Y-%m-%dT%H:%M:%S'),
+            'mcv': rng.paretovariate(1.5) * 100,
+        } for i, date in enumerate(self._dates('post_dates', self.size['posts']))]}
+
+    def concerts(self) -> List[Dict]:
+        """
+        공연 이벤트. 30%는 수익이 '0'인 누락 이벤트로 CEV 추정 경로를 거친다.
+        """
+        rng = self._rng('concerts')
+        return [{
+            'title': f'Concert {i}',
+            'start_period': date.strftime('%Y.%m.%d'),
+            'revenue': '0' if rng.random() < 0.3 else str(int(rng.paretovariate(1.5) * 1e8)),
+        } for i, date in enumerate(self._dates('concert_dates', self.size['concerts']))]
+
+    def broadcasts(self) -> List[Dict]:
+        rng = self._rng('broadcasts')
+        return [{
+            'title': f'Broadcast {i}',
+            'category': rng.choice(BROADCAST_CATEGORIES),
+            'start_period': date.strftime('%Y.%m.%d'),
+            'frequency': rng.randint(1, 16),
+        } for i, date in enumerate(self._dates('broadcast_dates', self.size['broadcasts']))]
+
+    def er(self) -> Dict:
+        return {'er': self._rng('er').uniform(0.01, 0.1)}
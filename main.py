@@ -12,6 +12,7 @@ from rapidfuzz import process, fuzz
 from Firebase.firestore_handler import save_to_firestore, load_data_from_sheets_and_save_to_firestore, _load_data
 from GoogleSheets.sheets import get_or_create_spreadsheet, write_data, read_data
 from utils.logger import setup_logger
+from Valuation.utils.hooks import install_hooks
 
 from Macro.market_growth import get_market_data_from_sheets, interpret_market_data
 
@@ -336,5 +337,7 @@ async def main():
     await load_performance_data_from_sheet_and_save_to_firestore()
 
 if __name__ == '__main__':
+    # HTTP 계측, 쿼터 원장 설치. VALUATION_HTTP_MODE=record|replay|auto이면 수집 응답을 카세트로 기록/재생
+    install_hooks()
     #get_naver_broadcast_data_and_save_to_googlesheet()
     asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,71 @@
+# tests/test_cassette.py
+'''
+utils/cassette.py의 httplib2(googleapiclient) 전송 계층 기록/재생 테스트
+httplib2가 설치되지 않은 환경에서도 실행되도록 Http._conn_request만 가진 최소 httplib2 모듈을 sys.modules에 넣어 사용함
+'''
+
+import sys
+import types
+from http.client import HTTPSConnection
+
+import pytest
+
+from utils import cassette
+
+class _Response(dict):
+    def __init__(self, info):
+        super().__init__(info)
+        self.status = int(info.get('status', 200))
+        self.reason = info.get('reason', 'OK')
+
+def _fake_httplib2(calls):
+    module = types.ModuleType('httplib2')
+
+    class Http:
+        def _conn_request(self, conn, request_uri, method, body, headers):
+            calls.append((conn.host, request_uri, method))
+            return _Response({'status': '200', 'content-type': 'application/json'}), b'{"items": [1]}'
+
+    module.Http = Http
+    module.Response = _Response
+    module.ServerNotFoundError = type('ServerNotFoundError', (Exception,), {})
+    return module
+
+@pytest.fixture
+def httplib2(monkeypatch):
+    calls = []
+    module = _fake_httplib2(calls)
+    monkeypatch.setitem(sys.modules, 'httplib2', module)
+    return module, calls
+
+def _request(module):
+    conn = HTTPSConnection('www.googleapis.com', 443)
+    return module.Http()._conn_request(conn, '/youtube/v3/videos?id=abc&key=SECRET', 'GET', None, {})
+
+def test_httplib2_record_then_replay(httplib2, tmp_path):
+    module, calls = httplib2
+    original = module.Http._conn_request
+
+    cassette._install_httplib2(cassette.Recorder('record', cassette.CassetteStore(str(tmp_path), overwrite=True)))
+    response, content = _request(module)
+    assert response.status == 200
+    assert content == b'{"items": [1]}'
+    assert len(calls) == 1
+    recorded = list(tmp_path.rglob('*.json'))
+    assert len(recorded) == 1
+    assert 'SECRET' not in recorded[0].read_text(encoding='utf-8')
+
+    module.Http._conn_request = original
+    cassette._install_httplib2(cassette.Recorder('replay', cassette.CassetteStore(str(tmp_path))))
+    response, content = _request(module)
+    assert response.status == 200
+    assert response['content-type'] == 'application/json'
+    assert content == b'{"items": [1]}'
+    assert len(calls) == 1
+
+def test_httplib2_replay_miss_raises_server_not_found(httplib2, tmp_path):
+    module, calls = httplib2
+    cassette._install_httplib2(cassette.Recorder('replay', cassette.CassetteStore(str(tmp_path))))
+    with pytest.raises(module.ServerNotFoundError):
+        _request(module)
+    assert calls == []
@@ -0,0 +1,149 @@
+# tests/test_mov_main.py
+'''
+Valuation/MNV/MOV/MOV_main.py 타임라인 통합 함수의 회귀 테스트
+기대값은 벡터화 이전의 이벤트별 반복문 구현으로 같은 입력을 계산한 값이며, WEIGHT 설정과 무관하도록 가중치를 나눈 값으로 비교함
+'''
+
+import pandas as pd
+import pytest
+
+from Valuation.MNV.MOV.MOV_main import WEIGHT, MRVFunc, PCVFunc, PFVFunc
+
+def _timeline(start='2023-01-31', end='2024-06-30'):
+    return pd.DataFrame(index=pd.DatetimeIndex(pd.date_range(start, end, freq='ME', tz='UTC'), name='date'))
+
+def _unweighted(timeline_df, column, key):
+    return list(timeline_df[column] / WEIGHT[key])
+
+# 트위터는 -05:00 시간대(UTC로 바꾸면 다음 달이 되는 날짜 포함), 유튜브는 UTC(Z), 인스타그램은 naive 날짜 뒤에 시간대가 있는 날짜가 섞인 경우
+MCV_TWITTER = {'tweets': [
+    {'created_at': '2023-02-10T12:00:00-05:00', 'mcv': 1000},
+    {'created_at': '2023-03-31T23:30:00-05:00', 'mcv': '250.5'},
+    {'created_at': 'not a date', 'mcv': 999},
+    {'created_at': '2023-06-01T00:00:00-05:00', 'mcv': None},
+    {'created_at': None, 'mcv': 7},
+]}
+MCV_YOUTUBE = {'details': [
+    {'publishedAt': '2022-06-15T08:00:00Z', 'MCV': 4000.0},
+    {'publishedAt': '2023-07-20T15:00:00Z', 'MCV': 1200.0},
+    {'publishedAt': '2024-06-30T23:00:00Z', 'MCV': 300.0},
+    {'publishedAt': '2024-08-01T00:00:00Z', 'MCV': 5000.0},
+]}
+MCV_INSTAGRAM = {'posts': [
+    {'date': '2023-05-05 10:00:00', 'mcv': 80},
+    {'date': '2023-08-31 23:59:00', 'mcv': 30},
+    # 첫 날짜 형식(naive)으로 일괄 파싱되어 NaT가 되므로 반영되지 않음
+    {'date': '2023-05-05T10:00:00+09:00', 'mcv': 20},
+]}
+
+def test_integrate_mcv_events_matches_per_event_loop():
+    timeline_df = PCVFunc.integrate_mcv_events(_timeline(), MCV_TWITTER, MCV_YOUTUBE, MCV_INSTAGRAM)
+
+    assert _unweighted(timeline_df, 'mcv_twitter', '트위터') == pytest.approx([
+        0.0, 0.0, 0.0, 1.6666666667, 3.7508333333, 5.835, 7.9191666667, 10.0033333333, 12.0875,
+        11.005, 8.12925, 4.003, 0.62625, 0.0, 0.0, 0.0, 0.0, 0.0,
+    ], abs=1e-9)
+    assert _unweighted(timeline_df, 'mcv_youtube', '유튜브') == pytest.approx([
+        0.0, 6.6666666667, 13.3333333333, 20.0, 26.6666666667, 33.3333333333, 40.0, 34.0, 26.0,
+        14.0, 6.0, 8.0, 10.0, 12.0, 10.2, 7.2, 3.0, 0.0,
+    ], abs=1e-9)
+    assert _unweighted(timeline_df, 'mcv_instagram', '인스타그램') == pytest.approx([
+        0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.1333333333, 0.2666666667, 0.4,
+        0.5833333333, 0.7666666667, 0.95, 0.88, 0.73, 0.5, 0.255, 0.18, 0.075,
+    ], abs=1e-9)
+    assert list(timeline_df['mcv_t']) == pytest.approx(list(timeline_df['mcv_twitter'] + timeline_df['mcv_youtube']))
+
+def test_integrate_mcv_events_without_events():
+    timeline_df = PCVFunc.integrate_mcv_events(_timeline(), {}, {'details': []}, {'posts': [{'date': None, 'mcv': 5}]})
+    for column in ['mcv_twitter', 'mcv_youtube', 'mcv_instagram', 'mcv_t']:
+        assert (timeline_df[column] == 0).all()
+
+# 날짜 없음(영향 개월 수 계산의 최대값에는 포함됨), 파싱 불가, 시간대 혼합, 타임라인 이전/이후 이벤트
+CEV_EVENTS = [
+    {'start_period': '2023-03-15', 'cer': 100.0},
+    {'start_period': '2023-06-30T22:00:00-05:00', 'cer': 40.0},
+    {'start_period': '2023-09-01T03:00:00+09:00', 'cer': 10.0},
+    {'start_period': None, 'cer': 500.0},
+    {'start_period': 'not a date', 'cer': 60.0},
+    {'start_period': '2022-11-20', 'cer': 80.0},
+    {'start_period': '2024-05-10', 'cer': 25.0},
+    {'start_period': '2025-01-10', 'cer': 70.0},
+]
+MRV_EVENTS = [
+    {'start_period': '2023-01-05T10:00:00Z', 'BF_event': 3.0},
+    {'start_period': '2023-12-24', 'BF_event': 1.5},
+    {'start_period': 'unknown', 'BF_event': 2.0},
+    {'BF_event': 9.0},
+    {'start_period': '2024-06-30T23:00:00-02:00', 'BF_event': 6.0},
+]
+
+def test_integrate_cev_events_matches_per_event_loop():
+    timeline_df = PCVFunc.integrate_cev_events(_timeline(), CEV_EVENTS)
+    assert _unweighted(timeline_df, 'cev_t', '공연') == pytest.approx([
+        80.0, 72.3869934429, 165.4984602462, 90.4837418036, 81.8730753078, 74.0818220682, 40.0, 36.1934967214, 10.0,
+        9.0483741804, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 25.0, 22.6209354509,
+    ], abs=1e-9)
+
+def test_integrate_mrv_events_matches_per_event_loop():
+    timeline_df = MRVFunc.integrate_mrv_events(_timeline(), MRV_EVENTS)
+    assert _unweighted(timeline_df, 'mrv_t', '매니지먼트') == pytest.approx([
+        0.0, 3.0, 2.7145122541, 2.4561922592, 2.222454662, 2.0109601381, 0.0, 0.0, 0.0,
+        0.0, 0.0, 1.5, 1.3572561271, 1.2280961296, 0.0, 0.0, 0.0, 0.0,
+    ], abs=1e-9)
+
+def test_integrate_decaying_events_without_usable_events():
+    assert (PCVFunc.integrate_cev_events(_timeline(), [])['cev_t'] == 0).all()
+    assert (PCVFunc.integrate_cev_events(_timeline(), [{'start_period': '2023-03-15', 'cer': 0}])['cev_t'] == 0).all()
+    assert (MRVFunc.integrate_mrv_events(_timeline(), [{'start_period': None, 'BF_event': 1.0}])['mrv_t'] == 0).all()
+
+# 자정 발매(naive, UTC), 시간대가 있는 자정(UTC로 바꾸면 15시), 발매 시각이 있는 앨범, 타임라인 이전 발매, 12개월 이하 이력, 값이 없는 앨범
+# 발매 시각이 자정이 아닌 앨범은 월말 날짜도 같은 시각이 되어 타임라인(자정)과 맞지 않으므로 합계에 반영되지 않음
+PFV_ALBUMS = [
+    {'release_date': '2023-01-10', 'sv': 1200.0, 'apv': 300.0, 'rv': 500.0},
+    {'release_date': '2023-05-20T00:00:00+09:00', 'sv': 800.0, 'apv': 50.0, 'rv': 90.0},
+    {'release_date': '2023-08-01T00:00:00Z', 'sv': 600.0, 'rv': 200.0},
+    {'release_date': '2023-03-03 18:30:00', 'sv': 400.0, 'apv': 40.0, 'rv': 30.0},
+    {'release_date': '2022-10-15', 'sv': 900.0, 'apv': 100.0, 'rv': 50.0},
+    {'release_date': '2024-03-15', 'rv': 120.0},
+    {'release_date': '2023-11-30', 'sv': 0, 'apv': 0, 'rv': 0},
+]
+PFV_END_DATE = '2024-06-30'
+
+def test_integrate_pfv_data_matches_per_album_loop():
+    timeline_df = PFVFunc.integrate_pfv_data(_timeline(), {'av_a': PFV_ALBUMS}, PFV_END_DATE)
+    assert _unweighted(timeline_df, 'sv_t', '스트리밍') == pytest.approx([
+        116.76871539, 115.81240325, 114.86392311, 113.92321084, 112.9902028, 112.06483592, 111.1470476, 167.05254221, 165.68441571,
+        164.32749389, 162.98168498, 161.64689797, 160.3230426, 159.01002934, 157.70776939, 156.41617468, 155.13515788, 153.86463234,
+    ], abs=1e-7)
+    assert _unweighted(timeline_df, 'apv_t', '인기도') == pytest.approx([
+        22.8949075, 22.70740284, 22.52143381, 22.33698782, 22.15405241, 21.97261521, 21.79266394, 21.61418643, 21.43717062,
+        21.26160453, 21.0874763, 20.91477413, 20.74348637, 20.57360141, 20.40510778, 20.23799408, 20.07224901, 19.90786135,
+    ], abs=1e-7)
+    assert _unweighted(timeline_df, 'rv_t', '음반') == pytest.approx([
+        320.0, 269.0, 218.0, 217.0, 206.0, 195.0, 185.0, 294.48234077, 263.98254628,
+        243.5, 237.85751438, 229.90975442, 222.15, 214.57176294, 279.16877898, 259.935, 240.86458665, 233.95190108,
+    ], abs=1e-7)
+
+def test_build_pfv_matrix_breakdown_matches_per_album_distribution():
+    matrix = PFVFunc.build_pfv_matrix(PFV_ALBUMS, PFV_END_DATE, breakdown=True)
+    for column in ['sv_t', 'apv_t', 'rv_t']:
+        albums = matrix['albums'][column]
+        assert list(albums.index) == list(range(len(PFV_ALBUMS)))
+        assert list(albums.sum(axis=0)) == pytest.approx(list(matrix[column].reindex(albums.columns).fillna(0.0)))
+
+    for row, album in enumerate(PFV_ALBUMS):
+        release_date = pd.to_datetime(album['release_date'])
+        expected = {}
+        for column, key in [('sv_t', 'sv'), ('apv_t', 'apv')]:
+            if album.get(key, 0) > 0:
+                expected[column] = PFVFunc.distribute_value_over_time(album[key], release_date, PFV_END_DATE, key_str=column).set_index('date')[column]
+        if album.get('rv', 0) > 0:
+            expected['rv_t'] = PFVFunc.distribute_rv_over_time(album['rv'], release_date, PFV_END_DATE).set_index('date')['rv_t']
+
+        for column in ['sv_t', 'apv_t', 'rv_t']:
+            allocation = matrix['albums'][column].loc[row]
+            if column not in expected:
+                assert (allocation == 0).all()
+                continue
+            assert list(allocation.reindex(expected[column].index)) == pytest.approx(list(expected[column]))
+            assert allocation.drop(expected[column].index).abs().sum() == 0
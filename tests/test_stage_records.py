@@ -0,0 +1,191 @@
+# tests/test_stage_records.py
+'''
+스테이지 결과 재사용 규칙(StageGraph.fingerprint, firebase_handler.record_status/check_record) 테스트
+저장소는 MemoryStorage(STORAGE_BACKEND=memory와 같은 구현)를 사용하므로 자격 증명 없이 실행됨
+테스트 그래프 A → B → C와 외부 데이터를 수집하는 E의 스테이지 함수와 params 값은 이 모듈에 선언함
+'''
+
+import types
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from Firebase.storage import MemoryStorage, set_storage
+from Valuation.firebase.firebase_handler import check_record, load_record, record_status, save_record
+from Valuation.utils.artist import Artist
+from Valuation.utils.quota import QuotaExceeded
+from Valuation.utils.stage_graph import StageGraph, stage, valuation_run, wait_for_refresh
+
+ARTIST = Artist('test-artist')
+PARAMS = types.SimpleNamespace(a=1, label='first', b=10, fetched=100, quota_exceeded=False)
+COMPUTED = []
+
+def _stage_body(name, compute):
+    record = check_record(name)
+    if record:
+        return record[name]
+    COMPUTED.append(name)
+    result = compute()
+    save_record(name, result)
+    return result
+
+@stage('A')
+def stage_a():
+    # label은 지문에는 포함되지만 출력에는 영향을 주지 않음
+    return _stage_body('A', lambda: {'value': PARAMS.a})
+
+@stage('B')
+def stage_b():
+    return _stage_body('B', lambda: {'value': stage_a()['value'] * PARAMS.b})
+
+@stage('C')
+def stage_c():
+    return _stage_body('C', lambda: {'value': stage_b()['value'] + 1})
+
+@stage('E')
+def stage_e():
+    def fetch():
+        # 외부 API 수집을 흉내 냄. fetched는 지문에 포함되지 않는 외부 데이터 값임
+        if PARAMS.quota_exceeded:
+            raise QuotaExceeded('serpapi', 1, 100, 100, 'month')
+        return {'value': PARAMS.fetched}
+    return _stage_body('E', fetch)
+
+GRAPH = StageGraph({
+    'A': (f'{__name__}:stage_a', [], {'params': [f'{__name__}:PARAMS.a', f'{__name__}:PARAMS.label']}),
+    'B': (f'{__name__}:stage_b', ['A'], {'params': [f'{__name__}:PARAMS.b']}),
+    'C': (f'{__name__}:stage_c', ['B']),
+    'E': (f'{__name__}:stage_e', [], {'external': True, 'ttl': 1}),
+})
+
+@pytest.fixture(autouse=True)
+def storage(monkeypatch):
+    monkeypatch.setattr(PARAMS, 'a', 1)
+    monkeypatch.setattr(PARAMS, 'label', 'first')
+    monkeypatch.setattr(PARAMS, 'b', 10)
+    monkeypatch.setattr(PARAMS, 'fetched', 100)
+    monkeypatch.setattr(PARAMS, 'quota_exceeded', False)
+    COMPUTED.clear()
+    store = MemoryStorage()
+    previous = set_storage(store)
+    yield store
+    set_storage(previous)
+
+def _run(targets=('C',), stale_while_revalidate=False):
+    """
+    새 실행 범위에서 targets를 실행하고 이번 실행에서 계산한 스테이지 목록을 반환한다 (저널 사용 안 함).
+    """
+    COMPUTED.clear()
+    with valuation_run(GRAPH, ARTIST) as run:
+        run.journaled = False
+        run.stale_while_revalidate = stale_while_revalidate
+        results = GRAPH.run(list(targets), max_workers=1)
+    return results, list(COMPUTED), run
+
+def _age(storage, target, hours):
+    """
+    저장된 target 결과의 저장 시각(timestamps.<target>)을 hours 시간 전으로 바꾼다.
+    """
+    saved_at = datetime.now(timezone.utc) - timedelta(hours=hours)
+    storage.set(f'valuation/{ARTIST.artist_id}', {'timestamps': {target: saved_at}}, merge=[f'timestamps.{target}'])
+
+def test_unchanged_inputs_reuse_stored_results():
+    results, computed, _ = _run()
+    assert computed == ['A', 'B', 'C']
+    assert results['C'] == {'value': 11}
+
+    results, computed, _ = _run()
+    assert computed == []
+    assert results['C'] == {'value': 11}
+
+def test_params_change_recomputes_stage_and_downstream_only():
+    _run()
+    PARAMS.b = 20
+    results, computed, _ = _run()
+    assert computed == ['B', 'C']
+    assert results['C'] == {'value': 21}
+
+def test_upstream_output_change_propagates_down():
+    _run()
+    PARAMS.a = 2
+    results, computed, _ = _run()
+    assert computed == ['A', 'B', 'C']
+    assert results['C'] == {'value': 21}
+
+def test_recomputed_stage_with_same_output_keeps_downstream():
+    _, _, first = _run()
+    PARAMS.label = 'second'
+    _, computed, run = _run()
+    # A는 지문이 바뀌어 다시 계산하지만 출력 해시가 같으므로 B, C의 지문은 그대로임
+    assert computed == ['A']
+    assert run.fingerprints['A'] != first.fingerprints['A']
+    assert run.output_hashes['A'] == first.output_hashes['A']
+    assert {name: run.fingerprints[name] for name in 'BC'} == {name: first.fingerprints[name] for name in 'BC'}
+
+def test_record_status_compares_fingerprints():
+    with valuation_run(GRAPH, ARTIST) as run:
+        run.fingerprints['B'] = 'current'
+        assert record_status('B', None, run) == 'missing'
+        assert record_status('B', {'B': {}}, run) == 'missing'
+        assert record_status('B', {'B': {'value': 1}}, run) == 'changed'
+        assert record_status('B', {'B': {'value': 1}, 'fingerprints': {'B': 'previous'}}, run) == 'changed'
+        assert record_status('B', {'B': {'value': 1}, 'fingerprints': {'B': 'current'}}, run) == 'fresh'
+
+def test_record_status_applies_ttl_to_external_stages(storage):
+    _run(['E'])
+    with valuation_run(GRAPH, ARTIST) as run:
+        GRAPH.prepare('E', run)
+        assert record_status('E', load_record('E'), run) == 'fresh'
+    _age(storage, 'E', 2)
+    with valuation_run(GRAPH, ARTIST) as run:
+        GRAPH.prepare('E', run)
+        assert record_status('E', load_record('E'), run) == 'stale'
+
+def test_external_stage_within_ttl_is_reused(storage):
+    _run(['E'])
+    PARAMS.fetched = 200
+    _age(storage, 'E', 0.5)
+    results, computed, run = _run(['E'])
+    assert computed == []
+    assert results['E'] == {'value': 100}
+    assert run.expired == {}
+
+def test_stale_external_stage_is_recomputed(storage):
+    _run(['E'])
+    PARAMS.fetched = 200
+    _age(storage, 'E', 2)
+    results, computed, run = _run(['E'])
+    assert computed == ['E']
+    assert results['E'] == {'value': 200}
+    # 다시 계산하기 전의 저장 결과는 쿼터 초과 대비용으로 실행 범위에 남음
+    assert run.expired['E']['E'] == {'value': 100}
+
+def test_stale_while_revalidate_serves_last_result_and_refreshes(storage):
+    _run(['E'])
+    PARAMS.fetched = 200
+    _age(storage, 'E', 2)
+    results, _, run = _run(['E'], stale_while_revalidate=True)
+    # 백그라운드 갱신은 이 실행이 끝나기 전에 끝날 수 있으므로 반환값으로 마지막 결과 사용 여부를 확인함
+    assert results['E'] == {'value': 100}
+    assert run.expired == {}
+
+    wait_for_refresh(timeout=10)
+    assert COMPUTED == ['E']
+    assert storage.get(f'valuation/{ARTIST.artist_id}', field_paths=['E'])['E'] == {'value': 200}
+    results, computed, _ = _run(['E'])
+    assert computed == []
+    assert results['E'] == {'value': 200}
+
+def test_quota_exceeded_falls_back_to_expired_result(storage):
+    _run(['E'])
+    _age(storage, 'E', 2)
+    PARAMS.quota_exceeded = True
+    results, computed, run = _run(['E'])
+    assert computed == ['E']
+    assert results['E'] == {'value': 100}
+    assert run.output_hashes['E'] == run.expired['E']['output_hashes']['E']
+
+def test_quota_exceeded_without_stored_result_raises():
+    PARAMS.quota_exceeded = True
+    with pytest.raises(QuotaExceeded):
+        _run(['E'])
@@ -0,0 +1,127 @@
+# tests/test_storage.py
+'''
+Firebase/storage.py의 로컬 저장소(MemoryStorage, SQLiteStorage)가 Firestore와 같은 의미로 동작하는지 확인하는 테스트
+- set의 merge: False는 문서 교체, True는 중첩 맵까지 병합, 필드 경로 목록은 지정한 필드만 교체
+- get의 field_paths는 지정한 필드만 중첩 구조 그대로 반환하며 없는 필드는 생략함
+- SERVER_TIMESTAMP는 저장 시점의 UTC 시각이 되고, 필터는 필드가 없거나 비교할 수 없는 문서를 제외함
+'''
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from Firebase.storage import SERVER_TIMESTAMP, MemoryStorage, SQLiteStorage
+
+DOC = 'valuation/artist-1'
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def storage(request, tmp_path):
+    if request.param == 'memory':
+        yield MemoryStorage()
+        return
+    store = SQLiteStorage(str(tmp_path / 'storage.sqlite3'))
+    yield store
+    store.close()
+
+def test_set_without_merge_replaces_document(storage):
+    storage.set(DOC, {'a': 1, 'b': {'c': 2}})
+    storage.set(DOC, {'b': {'d': 3}})
+    assert storage.get(DOC) == {'b': {'d': 3}}
+    assert storage.get('valuation/missing') is None
+
+def test_set_merge_true_merges_nested_maps(storage):
+    storage.set(DOC, {'a': 1, 'b': {'c': 2, 'd': 3}})
+    storage.set(DOC, {'b': {'d': 4, 'e': 5}, 'f': [1, 2]}, merge=True)
+    assert storage.get(DOC) == {'a': 1, 'b': {'c': 2, 'd': 4, 'e': 5}, 'f': [1, 2]}
+
+def test_set_merge_field_paths_replaces_only_listed_fields(storage):
+    storage.set(DOC, {'a': {'old': 1}, 'b': 2, 'timestamps': {'x': 'old', 'y': 'kept'}})
+    storage.set(
+        DOC,
+        {'a': {'new': 1}, 'b': 'ignored', 'timestamps': {'x': 'new', 'z': 'ignored'}},
+        merge=['a', 'timestamps.x'],
+    )
+    # 'a'는 병합하지 않고 값 전체를 교체하며, 목록에 없는 필드('b', 'timestamps.z')는 쓰지 않음
+    assert storage.get(DOC) == {'a': {'new': 1}, 'b': 2, 'timestamps': {'x': 'new', 'y': 'kept'}}
+
+def test_set_merge_field_paths_creates_missing_document(storage):
+    storage.set(DOC, {'timestamps': {'x': 1}, 'other': 2}, merge=['timestamps.x'])
+    assert storage.get(DOC) == {'timestamps': {'x': 1}}
+
+def test_get_field_paths_returns_only_listed_fields(storage):
+    storage.set(DOC, {'SV': {'sv_t': 1.5}, 'RV': {'rv_t': 2}, 'timestamps': {'SV': 'a', 'RV': 'b'}, 'timestamp': 't'})
+    assert storage.get(DOC, field_paths=['SV', 'timestamp', 'timestamps.SV', 'fingerprints.SV']) == {
+        'SV': {'sv_t': 1.5},
+        'timestamp': 't',
+        'timestamps': {'SV': 'a'},
+    }
+    assert storage.get(DOC, field_paths=['missing']) == {}
+    assert storage.get('valuation/missing', field_paths=['SV']) is None
+
+def test_server_timestamp_resolves_to_utc_write_time(storage):
+    before = datetime.now(timezone.utc)
+    storage.set(DOC, {'timestamp': SERVER_TIMESTAMP, 'timestamps': {'SV': SERVER_TIMESTAMP}, 'SV': 1}, merge=['SV', 'timestamps.SV'])
+    storage.set(DOC, {'timestamp': SERVER_TIMESTAMP}, merge=True)
+    after = datetime.now(timezone.utc)
+
+    record = storage.get(DOC)
+    for value in [record['timestamp'], record['timestamps']['SV']]:
+        assert isinstance(value, datetime)
+        assert value.tzinfo is not None
+        assert before <= value <= after
+    assert record['timestamp'] >= record['timestamps']['SV']
+
+def test_batch_set_resolves_server_timestamp(storage):
+    storage.batch_set([(f'albums/{i}', {'i': i, 'updated': SERVER_TIMESTAMP}) for i in range(3)])
+    docs = dict(storage.stream('albums'))
+    assert sorted(docs) == ['0', '1', '2']
+    assert all(isinstance(doc['updated'], datetime) for doc in docs.values())
+
+def test_stream_filters_like_firestore(storage):
+    storage.set('songs/a', {'artist': 'x', 'plays': 10, 'tags': ['kpop', 'ost'], 'meta': {'year': 2023}})
+    storage.set('songs/b', {'artist': 'x', 'plays': 'n/a', 'tags': ['ost']})
+    storage.set('songs/c', {'artist': 'y', 'plays': 30, 'meta': {'year': 2024}})
+    # 서브컬렉션 문서는 상위 컬렉션 조회에 포함되지 않음
+    storage.set('songs/a/charts/1', {'artist': 'x', 'plays': 99})
+
+    def ids(filters=None):
+        return sorted(doc_id for doc_id, _ in storage.stream('songs', filters))
+
+    assert ids() == ['a', 'b', 'c']
+    assert ids([('artist', '==', 'x')]) == ['a', 'b']
+    # 값의 형식이 달라 비교할 수 없거나 필드가 없는 문서는 제외됨
+    assert ids([('plays', '>=', 10)]) == ['a', 'c']
+    assert ids([('meta.year', '<', 2024)]) == ['a']
+    assert ids([('meta.year', '!=', 2023)]) == ['c']
+    assert ids([('artist', 'in', ['y', 'z'])]) == ['c']
+    assert ids([('tags', 'array-contains', 'ost')]) == ['a', 'b']
+    assert ids([('tags', 'array-contains-any', ['kpop', 'rock'])]) == ['a']
+    assert ids([('artist', '==', 'x'), ('plays', '>', 5)]) == ['a']
+    assert ids([('missing', 'not-in', ['x'])]) == []
+
+def test_documents_lists_sub_collections_by_prefix(storage):
+    storage.set('valuation/a', {'v': 1})
+    storage.set('valuation/a/history/1', {'v': 2})
+    storage.set('songs/a', {'v': 3})
+    assert sorted(path for path, _ in storage.documents('valuation/')) == ['valuation/a', 'valuation/a/history/1']
+
+def test_returned_documents_are_copies(storage):
+    storage.set(DOC, {'a': {'b': 1}})
+    storage.get(DOC)['a']['b'] = 2
+    for _, data in storage.stream('valuation'):
+        data['a']['b'] = 3
+    assert storage.get(DOC) == {'a': {'b': 1}}
+
+def test_sqlite_storage_persists_datetimes(tmp_path):
+    path = str(tmp_path / 'storage.sqlite3')
+    saved_at = datetime(2024, 6, 30, 12, 0, tzinfo=timezone(timedelta(hours=9)))
+    store = SQLiteStorage(path)
+    store.set(DOC, {'timestamps': {'SV': saved_at}, 'name': '아티스트'})
+    store.close()
+
+    store = SQLiteStorage(path)
+    try:
+        assert store.get(DOC) == {'timestamps': {'SV': saved_at}, 'name': '아티스트'}
+        assert store.get(DOC)['timestamps']['SV'].utcoffset() == timedelta(hours=9)
+    finally:
+        store.close()
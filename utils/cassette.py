@@ -0,0 +1,310 @@
+# utils/cassette.py
+'''
+cassette.py는 외부 HTTP 응답을 로컬 카세트 저장소에 기록하고 재생하여 네트워크 없이 같은 결과로 실행하기 위한 도구임
+VALUATION_HTTP_MODE로 동작을 선택함
+- off(기본값): 아무것도 하지 않음
+- record: 실제로 요청하고 응답을 카세트에 기록함 (이전에 기록한 같은 요청의 카세트는 덮어씀)
+- replay: 카세트의 응답만 사용하며, 기록이 없는 요청은 각 클라이언트의 연결 오류로 실패함
+- auto: 기록이 있으면 재생하고, 없으면 요청하여 기록함
+install_cassette()는 전송 계층을 감싸므로 HTTP 계측(http_metrics.py)과 쿼터 원장은 재생된 호출도 그대로 집계함
+- requests.adapters.HTTPAdapter.send: requests, spotipy, tweepy, instaloader, serpapi
+- httpx.HTTPTransport.handle_request / AsyncHTTPTransport.handle_async_request: httpx
+- httplib2.Http._conn_request: googleapiclient
+카세트는 VALUATION_CASSETTE_DIR/<호스트>/<키>.json에 저장되며, 키는 정규화한 요청(메서드, URL, 정렬한 쿼리, 본문 해시)의 해시임
+- API 키, 토큰 등 REDACTED_PARAMS 쿼리 값은 키와 파일에서 제외함
+- 같은 요청의 응답이 여러 번 기록되면 재생할 때 기록된 순서대로 돌려주고, 마지막 응답을 반복함
+VALUATION_HTTP_REPLAY_LATENCY: 재생 시 지연 시간. recorded(기록된 응답 시간) 또는 밀리초 값 (기본값 0)
+'''
+
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from utils.logger import setup_logger
+logger = setup_logger(__name__)
+
+HTTP_MODE = os.getenv('VALUATION_HTTP_MODE', 'off')
+CASSETTE_DIR = os.getenv('VALUATION_CASSETTE_DIR', 'cassettes')
+REPLAY_LATENCY = os.getenv('VALUATION_HTTP_REPLAY_LATENCY', '0')
+
+REDACTED_PARAMS = {'key', 'api_key', 'apikey', 'access_token', 'token', 'client_id', 'client_secret', 'serp_api_key'}
+# 재생할 응답 본문은 이미 디코딩된 값이므로 전송 관련 헤더는 기록하지 않음
+DROPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection', 'set-cookie'}
+
+MODES = ('off', 'record', 'replay', 'auto')
+
+class CassetteMiss(Exception):
+    pass
+
+def normalize(method: str, url: str, body=None) -> Tuple[str, Dict]:
+    """
+    요청을 카세트 키와 기록용 요청 정보로 바꾼다. 쿼리는 정렬하고 비밀 값은 제외하며, JSON 본문은 키를 정렬하여 해시한다.
+    """
+    parts = urlsplit(url)
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k.lower() not in REDACTED_PARAMS)
+    clean_url = urlunsplit((parts.scheme, parts.netloc.lower(), parts.path or '/', urlencode(query), ''))
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    if body and not isinstance(body, bytes):
+        # 파일/스트림 본문은 해시하지 않음
+        body = None
+    if body:
+        try:
+            body = json.dumps(json.loads(body), sort_keys=True, ensure_ascii=False).encode('utf-8')
+        except ValueError:
+            pass
+    body_hash = hashlib.sha256(body).hexdigest()[:16] if body else ''
+    key = hashlib.sha256(f'{method.upper()} {clean_url} {body_hash}'.encode('utf-8')).hexdigest()[:24]
+    return key, {'method': method.upper(), 'url': clean_url, 'body_sha256': body_hash}
+
+class CassetteStore:
+    """
+    키별 응답 목록을 파일로 보관하는 카세트 저장소. 한 프로세스 안에서 키마다 재생 위치를 기억한다.
+    overwrite이면 이전 실행에서 기록한 카세트를 이번 실행의 첫 응답으로 덮어쓴다(record 모드).
+    """
+    def __init__(self, directory: str = CASSETTE_DIR, overwrite: bool = False):
+        self.directory = directory
+        self.overwrite = overwrite
+        self._written = set()
+        self._lock = threading.Lock()
+        self._positions: Dict[str, int] = defaultdict(int)
+        self._cache: Dict[str, Dict] = {}
+
+    def _path(self, host: str, key: str) -> str:
+        return os.path.join(self.directory, host.replace(':', '_') or '_', f'{key}.json')
+
+    def _load(self, path: str) -> Optional[Dict]:
+        if path not in self._cache:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self._cache[path] = json.load(f)
+            except (OSError, ValueError):
+                return None
+        return self._cache[path]
+
+    def next(self, host: str, key: str) -> Optional[Dict]:
+        """
+        기록된 다음 응답. 기록이 없으면 None을 반환한다.
+        """
+        path = self._path(host, key)
+        with self._lock:
+            cassette = self._load(path)
+            if not cassette or not cassette['responses']:
+                return None
+            position = self._positions[path]
+            self._positions[path] = position + 1
+            responses = cassette['responses']
+            return responses[min(position, len(responses) - 1)]
+
+    def written(self, host: str, key: str) -> bool:
+        """
+        이번 실행에서 기록한 키인지 여부. auto 모드는 기록을 시작한 요청을 계속 실제로 보낸다.
+        """
+        with self._lock:
+            return self._path(host, key) in self._written
+
+    def append(self, host: str, key: str, request: Dict, response: Dict) -> None:
+        path = self._path(host, key)
+        with self._lock:
+            cassette = None if self.overwrite and path not in self._written else self._load(path)
+            cassette = cassette or {'request': request, 'responses': []}
+            self._written.add(path)
+            cassette['responses'].append(response)
+            self._cache[path] = cassette
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f'{path}.{threading.get_ident()}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(cassette, f, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, path)
+
+def encode_response(status: int, reason: str, headers, body: bytes, elapsed: float) -> Dict:
+    kept = [(k, v) for k, v in headers.items() if k.lower() not in DROPPED_HEADERS]
+    try:
+        text, body_b64 = body.decode('utf-8'), None
+    except UnicodeDecodeError:
+        text, body_b64 = None, base64.b64encode(body).decode('ascii')
+    return {
+        'status': status,
+        'reason': reason or '',
+        'headers': kept,
+        'text': text,
+        'body_b64': body_b64,
+        'elapsed': round(elapsed, 4),
+        'recorded_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+    }
+
+def response_body(response: Dict) -> bytes:
+    if response.get('body_b64') is not None:
+        return base64.b64decode(response['body_b64'])
+    return (response.get('text') or '').encode('utf-8')
+
+def _simulate_latency(response: Dict) -> None:
+    if REPLAY_LATENCY in ('', '0'):
+        return
+    seconds = response.get('elapsed', 0) if REPLAY_LATENCY == 'recorded' else float(REPLAY_LATENCY) / 1000
+    if seconds > 0:
+        time.sleep(seconds)
+
+class Recorder:
+    """
+    클라이언트별 전송 함수가 사용하는 기록/재생 공통 처리.
+    """
+    def __init__(self, mode: str, store: CassetteStore):
+        self.mode = mode
+        self.store = store
+
+    def lookup(self, method: str, url: str, body) -> Tuple[str, str, Dict, Optional[Dict]]:
+        """
+        (호스트, 키, 요청 정보, 재생할 응답)을 반환한다. replay 모드에서 기록이 없으면 CassetteMiss를 던진다.
+        """
+        key, request = normalize(method, url, body)
+        host = urlsplit(url).netloc.lower()
+        replay = self.mode == 'replay' or (self.mode == 'auto' and not self.store.written(host, key))
+        response = self.store.next(host, key) if replay else None
+        if response is None and self.mode == 'replay':
+            raise CassetteMiss(f"No cassette for {request['method']} {request['url']} (key {key})")
+        if response is not None:
+            _simulate_latency(response)
+        return host, key, request, response
+
+    def record(self, host: str, key: str, request: Dict, status: int, reason: str, headers, body: bytes, elapsed: float) -> None:
+        self.store.append(host, key, request, encode_response(status, reason, headers, body, elapsed))
+
+_recorder: Optional[Recorder] = None
+_install_lock = threading.Lock()
+
+def replaying() -> bool:
+    """
+    모든 응답을 카세트에서 재생하는 중인지 여부 (replay 모드).
+    """
+    return _recorder is not None and _recorder.mode == 'replay'
+
+def install_cassette(mode: str = HTTP_MODE, directory: str = CASSETTE_DIR) -> None:
+    """
+    mode가 off가 아니면 설치된 HTTP 클라이언트의 전송 계층을 감싼다. 처음 호출할 때만 적용된다.
+    """
+    global _recorder
+    if mode not in MODES:
+        raise ValueError(f"Invalid VALUATION_HTTP_MODE: {mode!r} (expected one of {', '.join(MODES)})")
+    with _install_lock:
+        if mode == 'off' or _recorder is not None:
+            return
+        _recorder = Recorder(mode, CassetteStore(directory, overwrite=mode == 'record'))
+        _install_requests(_recorder)
+        _install_httpx(_recorder)
+        _install_httplib2(_recorder)
+        logger.info(f"HTTP {mode} mode with cassettes in {directory}")
+
+def _install_requests(recorder: Recorder) -> None:
+    try:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from requests.structures import CaseInsensitiveDict
+        from requests.utils import get_encoding_from_headers
+    except ImportError:
+        return
+    original_send = HTTPAdapter.send
+
+    def send(adapter, request, *args, **kwargs):
+        try:
+            host, key, info, cached = recorder.lookup(request.method, request.url, request.body)
+        except CassetteMiss as e:
+            raise requests.exceptions.ConnectionError(str(e), request=request)
+        if cached is None:
+            start = time.perf_counter()
+            response = original_send(adapter, request, *args, **kwargs)
+            # 본문을 읽어 두면 stream=True 호출도 기록된 내용(_content)을 순회함
+            body = response.content
+            recorder.record(host, key, info, response.status_code, response.reason, response.headers, body, time.perf_counter() - start)
+            return response
+
+        response = requests.Response()
+        response.status_code = cached['status']
+        response.reason = cached['reason']
+        response.headers = CaseInsensitiveDict(cached['headers'])
+        response._content = response_body(cached)
+        response._content_consumed = True
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = adapter
+        return response
+
+    HTTPAdapter.send = send
+
+def _install_httpx(recorder: Recorder) -> None:
+    try:
+        import httpx
+    except ImportError:
+        return
+    original_handle = httpx.HTTPTransport.handle_request
+    original_async_handle = httpx.AsyncHTTPTransport.handle_async_request
+
+    def replayed(request, cached):
+        return httpx.Response(cached['status'], headers=cached['headers'], content=response_body(cached), request=request)
+
+    def handle_request(transport, request):
+        body = request.read()
+        try:
+            host, key, info, cached = recorder.lookup(request.method, str(request.url), body)
+        except CassetteMiss as e:
+            raise httpx.ConnectError(str(e), request=request)
+        if cached is not None:
+            return replayed(request, cached)
+        start = time.perf_counter()
+        response = original_handle(transport, request)
+        content = response.read()
+        recorder.record(host, key, info, response.status_code, response.reason_phrase, response.headers, content, time.perf_counter() - start)
+        # 디코딩한 본문으로 다시 만들어 클라이언트가 한 번 더 디코딩하지 않도록 함
+        return httpx.Response(response.status_code, headers=[(k, v) for k, v in response.headers.items() if k.lower() not in DROPPED_HEADERS], content=content, request=request)
+
+    async def handle_async_request(transport, request):
+        body = await request.aread()
+        try:
+            host, key, info, cached = recorder.lookup(request.method, str(request.url), body)
+        except CassetteMiss as e:
+            raise httpx.ConnectError(str(e), request=request)
+        if cached is not None:
+            return replayed(request, cached)
+        start = time.perf_counter()
+        response = await original_async_handle(transport, request)
+        content = await response.aread()
+        recorder.record(host, key, info, response.status_code, response.reason_phrase, response.headers, content, time.perf_counter() - start)
+        return httpx.Response(response.status_code, headers=[(k, v) for k, v in response.headers.items() if k.lower() not in DROPPED_HEADERS], content=content, request=request)
+
+    httpx.HTTPTransport.handle_request = handle_request
+    httpx.AsyncHTTPTransport.handle_async_request = handle_async_request
+
+def _install_httplib2(recorder: Recorder) -> None:
+    try:
+        import httplib2
+        from http.client import HTTPSConnection
+    except ImportError:
+        return
+    original_conn_request = httplib2.Http._conn_request
+
+    def conn_request(http_obj, conn, request_uri, method, body, headers):
+        scheme = 'https' if isinstance(conn, HTTPSConnection) else 'http'
+        url = f'{scheme}://{conn.host}:{conn.port}{request_uri}'
+        try:
+            host, key, info, cached = recorder.lookup(method, url, body)
+        except CassetteMiss as e:
+            raise httplib2.ServerNotFoundError(str(e))
+        if cached is not None:
+            info = {k.lower(): v for k, v in cached['headers']}
+            info['status'] = str(cached['status'])
+            response = httplib2.Response(info)
+            response.reason = cached['reason']
+            return response, response_body(cached)
+        start = time.perf_counter()
+        response, content = original_conn_request(http_obj, conn, request_uri, method, body, headers)
+        recorder.record(host, key, info, response.status, response.reason, {k: v for k, v in response.items() if k != 'status'}, content, time.perf_counter() - start)
+        return response, content
+
+    httplib2.Http._conn_request = conn_request
@@ -0,0 +1,317 @@
+# utils/http_metrics.py
+'''
+http_metrics.py는 외부 HTTP 호출을 업스트림 호스트별로 집계하는 계측 도구임
+install_http_hooks()는 requests.Session.send(spotipy, tweepy, instaloader, serpapi 포함), httpx.Client/AsyncClient.send, httplib2.Http.request(googleapiclient)를 감싸 모든 호출을 기록함
+호스트별로 요청 수, 응답 코드/예외별 횟수, 지연 시간 히스토그램, 요청/응답 바이트, 재시도 횟수를 집계함
+재시도는 urllib3 Retry 이력과, 실패한 같은 요청(메서드+URL)을 RETRY_WINDOW초 안에 다시 보낸 경우로 판단함
+호출은 전역 HTTP_METRICS와 collecting()으로 지정한 현재 컨텍스트의 HttpMetrics(실행 단위)에 함께 기록되며, Trace가 있으면 'http' 구간으로도 기록됨
+add_request_hook()으로 등록한 함수는 요청을 보내기 전에 (메서드, URL)로 호출되며, 예외를 던지면 요청을 보내지 않음 (쿼터 원장 등)
+summary()는 총 지연 시간이 큰 호스트 순서의 표를, to_prometheus()는 Prometheus 텍스트 형식을 반환함
+'''
+
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from utils.tracing import span, count
+
+# 지연 시간 히스토그램 구간 상한(초)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+# 실패한 요청을 이 시간(초) 안에 다시 보내면 재시도로 집계
+RETRY_WINDOW = float(os.getenv('HTTP_RETRY_WINDOW', '60'))
+
+class HostMetrics:
+    __slots__ = ('requests', 'codes', 'buckets', 'seconds', 'max_seconds', 'sent', 'received', 'retries')
+
+    def __init__(self):
+        self.requests = 0
+        self.codes = Counter()
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.sent = 0
+        self.received = 0
+        self.retries = 0
+
+    @property
+    def errors(self) -> int:
+        return sum(n for code, n in self.codes.items() if not _ok(code))
+
+    def quantile(self, q: float) -> float:
+        """
+        히스토그램 구간 상한 기준의 q 분위 지연 시간. 마지막 구간이면 최대값을 반환한다.
+        """
+        rank = q * self.requests
+        seen = 0
+        for bound, n in zip(LATENCY_BUCKETS, self.buckets):
+            seen += n
+            if seen >= rank and n:
+                return min(bound, self.max_seconds)
+        return self.max_seconds
+
+class HttpMetrics:
+    """
+    호스트별 HTTP 호출 집계.
+    """
+    def __init__(self):
+        self.hosts: Dict[str, HostMetrics] = defaultdict(HostMetrics)
+        self._lock = threading.Lock()
+
+    def record(self, host: str, code: str, seconds: float, sent: int = 0, received: int = 0, retries: int = 0) -> None:
+        with self._lock:
+            m = self.hosts[host]
+            m.requests += 1
+            m.codes[code] += 1
+            m.buckets[_bucket(seconds)] += 1
+            m.seconds += seconds
+            m.max_seconds = max(m.max_seconds, seconds)
+            m.sent += sent
+            m.received += received
+            m.retries += retries
+
+    def __bool__(self) -> bool:
+        return bool(self.hosts)
+
+    def snapshot(self) -> Dict[str, HostMetrics]:
+        with self._lock:
+            return dict(self.hosts)
+
+    def summary(self) -> str:
+        hosts = sorted(self.snapshot().items(), key=lambda item: item[1].seconds, reverse=True)
+        lines = [f"{'host':<32} {'reqs':>6} {'errors':>6} {'retries':>7} {'total_s':>8} {'mean_s':>7} {'p95_s':>6} {'max_s':>6} {'recv_kb':>8}  codes"]
+        for host, m in hosts:
+            codes = ', '.join(f'{code}×{n}' for code, n in sorted(m.codes.items()))
+            lines.append(
+                f"{host[:32]:<32} {m.requests:>6} {m.errors:>6} {m.retries:>7} {m.seconds:>8.2f} "
+                f"{m.seconds / m.requests:>7.2f} {m.quantile(0.95):>6.2f} {m.max_seconds:>6.2f} {m.received / 1024:>8.1f}  {codes}"
+            )
+        return '\n'.join(lines)
+
+    def to_prometheus(self, prefix: str = 'valuation_http') -> str:
+        hosts = sorted(self.snapshot().items())
+        lines = [
+            f'# HELP {prefix}_requests_total HTTP requests by upstream host and response code (or exception name).',
+            f'# TYPE {prefix}_requests_total counter',
+        ]
+        for host, m in hosts:
+            for code, n in sorted(m.codes.items()):
+                lines.append(f'{prefix}_requests_total{{host="{_label(host)}",code="{_label(code)}"}} {n}')
+
+        lines += [
+            f'# HELP {prefix}_request_duration_seconds HTTP request latency by upstream host.',
+            f'# TYPE {prefix}_request_duration_seconds histogram',
+        ]
+        for host, m in hosts:
+            cumulative = 0
+            for bound, n in zip(LATENCY_BUCKETS, m.buckets):
+                cumulative += n
+                lines.append(f'{prefix}_request_duration_seconds_bucket{{host="{_label(host)}",le="{bound}"}} {cumulative}')
+            lines.append(f'{prefix}_request_duration_seconds_bucket{{host="{_label(host)}",le="+Inf"}} {m.requests}')
+            lines.append(f'{prefix}_request_duration_seconds_sum{{host="{_label(host)}"}} {m.seconds:.6f}')
+            lines.append(f'{prefix}_request_duration_seconds_count{{host="{_label(host)}"}} {m.requests}')
+
+        for name, attr, help_text in (
+            ('request_bytes_total', 'sent', 'HTTP request body bytes by upstream host.'),
+            ('response_bytes_total', 'received', 'HTTP response body bytes by upstream host.'),
+            ('retries_total', 'retries', 'HTTP retries by upstream host.'),
+        ):
+            lines += [f'# HELP {prefix}_{name} {help_text}', f'# TYPE {prefix}_{name} counter']
+            for host, m in hosts:
+                lines.append(f'{prefix}_{name}{{host="{_label(host)}"}} {getattr(m, attr)}')
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path: str) -> str:
+        """
+        Prometheus 텍스트 형식으로 path에 저장한다 (node_exporter textfile collector에서 읽을 수 있도록 원자적으로 교체).
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+        return path
+
+def _ok(code: str) -> bool:
+    return code.isdigit() and int(code) < 400
+
+def _bucket(seconds: float) -> int:
+    for i, bound in enumerate(LATENCY_BUCKETS):
+        if seconds <= bound:
+            return i
+    return len(LATENCY_BUCKETS)
+
+def _label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+# 프로세스 전체 누적 집계 (Prometheus 출력용)
+HTTP_METRICS = HttpMetrics()
+_metrics: ContextVar[Optional[HttpMetrics]] = ContextVar('http_metrics', default=None)
+
+@contextmanager
+def collecting(metrics: Optional[HttpMetrics] = None):
+    """
+    metrics(기본값: 새 HttpMetrics)를 현재 컨텍스트에 지정하여 이 범위의 HTTP 호출을 따로 집계한다.
+    """
+    metrics = metrics if metrics is not None else HttpMetrics()
+    token = _metrics.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _metrics.reset(token)
+
+_failed: Dict[Tuple[str, str], float] = {}
+_failed_lock = threading.Lock()
+
+class _Call:
+    __slots__ = ('status', 'received', 'retries')
+
+    def __init__(self):
+        self.status = None
+        self.received = 0
+        self.retries = 0
+
+@contextmanager
+def observe(method: str, url: str, sent: int = 0):
+    """
+    HTTP 호출 한 번을 기록한다. 호출한 쪽은 넘겨받은 객체에 status, received, retries를 채운다.
+    """
+    host = urlsplit(url).netloc or url
+    key = (method, url)
+    call = _Call()
+    code = None
+    start = time.perf_counter()
+    with span(f'{method} {host}', 'http', url=url.split('?')[0]) as s:
+        count('http_calls')
+        try:
+            yield call
+            code = str(call.status)
+        except Exception as e:
+            code = type(e).__name__
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            now = time.time()
+            with _failed_lock:
+                failed_at = _failed.pop(key, None)
+                if code is not None and not _ok(code):
+                    _failed[key] = now
+            retries = call.retries + (failed_at is not None and now - failed_at < RETRY_WINDOW)
+            if s is not None:
+                s.args['status'] = code
+            if code is not None:
+                if retries:
+                    count('http_retries', retries)
+                HTTP_METRICS.record(host, code, seconds, sent, call.received, retries)
+                metrics = _metrics.get()
+                if metrics is not None:
+                    metrics.record(host, code, seconds, sent, call.received, retries)
+
+def _length(headers) -> int:
+    try:
+        return int(headers.get('Content-Length') or 0)
+    except (TypeError, ValueError):
+        return 0
+
+def _body_length(body) -> int:
+    return len(body) if isinstance(body, (bytes, str)) else 0
+
+_installed = False
+_install_lock = threading.Lock()
+
+_request_hooks: List[Callable[[str, str], None]] = []
+
+def add_request_hook(hook: Callable[[str, str], None]) -> None:
+    """
+    요청을 보내기 전에 hook(method, url)을 호출하도록 등록한다. 같은 함수는 한 번만 등록된다.
+    """
+    with _install_lock:
+        if hook not in _request_hooks:
+            _request_hooks.append(hook)
+
+def _before_send(method: str, url: str) -> None:
+    for hook in list(_request_hooks):
+        hook(method, url)
+
+def install_http_hooks() -> None:
+    """
+    설치된 HTTP 클라이언트(requests, httpx, httplib2)의 전송 함수를 감싼다. 여러 번 호출해도 한 번만 적용된다.
+    """
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        _install_requests()
+        _install_httpx()
+        _install_httplib2()
+        _installed = True
+
+def _install_requests() -> None:
+    try:
+        import requests
+    except ImportError:
+        return
+    original_send = requests.Session.send
+
+    def send(session, request, **kwargs):
+        _before_send(request.method, request.url)
+        with observe(request.method, request.url, _body_length(request.body)) as call:
+            response = original_send(session, request, **kwargs)
+            call.status = response.status_code
+            # stream=False이면 send 안에서 본문을 이미 읽음
+            call.received = _length(response.headers) if kwargs.get('stream') else len(response.content or b'')
+            history = getattr(getattr(response.raw, 'retries', None), 'history', None)
+            call.retries = len(history) if history else 0
+            return response
+
+    requests.Session.send = send
+
+def _install_httpx() -> None:
+    try:
+        import httpx
+    except ImportError:
+        return
+    original_send = httpx.Client.send
+    original_async_send = httpx.AsyncClient.send
+
+    def send(client, request, **kwargs):
+        _before_send(request.method, str(request.url))
+        with observe(request.method, str(request.url), _length(request.headers)) as call:
+            response = original_send(client, request, **kwargs)
+            call.status = response.status_code
+            call.received = response.num_bytes_downloaded if not kwargs.get('stream') else _length(response.headers)
+            return response
+
+    async def async_send(client, request, **kwargs):
+        _before_send(request.method, str(request.url))
+        with observe(request.method, str(request.url), _length(request.headers)) as call:
+            response = await original_async_send(client, request, **kwargs)
+            call.status = response.status_code
+            call.received = response.num_bytes_downloaded if not kwargs.get('stream') else _length(response.headers)
+            return response
+
+    httpx.Client.send = send
+    httpx.AsyncClient.send = async_send
+
+def _install_httplib2() -> None:
+    try:
+        import httplib2
+    except ImportError:
+        return
+    original_request = httplib2.Http.request
+
+    def request(http, uri, method='GET', body=None, *args, **kwargs):
+        _before_send(method, uri)
+        with observe(method, uri, _body_length(body)) as call:
+            response, content = original_request(http, uri, method, body, *args, **kwargs)
+            call.status = response.status
+            call.received = len(content or b'')
+            return response, content
+
+    httplib2.Http.request = request
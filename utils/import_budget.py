@@ -0,0 +1,184 @@
+# utils/import_budget.py
+'''
+import_budget.py는 모듈 import 시간을 측정하여 예산(VALUATION_IMPORT_BUDGET 초, 기본값 2)을 넘는 모듈과 가장 느린 import를 보고하는 도구임
+각 모듈은 새 Python 프로세스에서 python -X importtime으로 import하므로 다른 모듈이 이미 불러온 의존성의 영향을 받지 않음
+- 총 시간: 대상 모듈 import에 걸린 벽시계 시간. --repeat 회 측정 중 가장 빠른 값을 사용함 (디스크 캐시 등 잡음 제거)
+- 느린 import: importtime의 self 시간 기준 상위 모듈과, 최상위 패키지(tensorflow, matplotlib 등)별 self 시간 합계
+- heavy: HEAVY_MODULES 중 import 시점에 불러온 패키지. 스테이지가 실제로 사용하는 함수 안에서 불러오도록 옮길 후보임
+- 부작용: import 중 네트워크 연결(socket.connect)을 시도하면 차단하고 연결 대상을 기록함 (클라이언트 생성, 데이터 다운로드 등)
+대상 모듈을 지정하지 않으면 Valuation 패키지에서 @stage를 선언한 모든 스테이지 모듈과 DEFAULT_MODULES를 측정함
+예산 초과, import 실패, import 중 네트워크 연결이 있으면 종료 코드 1을 반환함
+명령행 실행: python -m utils.import_budget [모듈 ...] [--budget 2] [--top 15] [--repeat 3]
+'''
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+IMPORT_BUDGET = float(os.getenv('VALUATION_IMPORT_BUDGET', '2'))
+IMPORT_TOP = 15
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MODULES = ['Valuation.MNV.MOV.MOV_graph', 'Prediction.performance']
+HEAVY_MODULES = {
+    'tensorflow', 'keras', 'torch', 'transformers', 'xgboost', 'sklearn', 'scipy', 'statsmodels',
+    'matplotlib', 'plotly', 'selenium', 'webdriver_manager', 'spotipy', 'tweepy', 'instaloader',
+    'konlpy', 'nltk', 'openpyxl', 'gspread', 'googleapiclient', 'firebase_admin', 'openai',
+}
+
+_MARKER = '-- import budget start --'
+# 대상 모듈을 import하는 프로세스에서 실행되는 코드. 결과는 stdout 마지막 줄에 JSON으로 출력함
+_PROBE = f'''
+import json, socket, sys, time
+connections = []
+def _blocked(self, address, *args):
+    connections.append(repr(address))
+    raise OSError('network access during import')
+socket.socket.connect = _blocked
+socket.socket.connect_ex = _blocked
+sys.stderr.write({_MARKER!r} + '\\n')
+sys.stderr.flush()
+error = None
+started = time.perf_counter()
+try:
+    __import__(sys.argv[1])
+except BaseException as e:
+    error = type(e).__name__ + ': ' + str(e)
+seconds = time.perf_counter() - started
+sys.stdout.flush()
+print(json.dumps({{'seconds': seconds, 'error': error, 'connections': connections, 'modules': sorted({{name.split('.')[0] for name in sys.modules}})}}))
+'''
+
+_IMPORTTIME = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+def discover_stage_modules(package: str = 'Valuation') -> List[str]:
+    """
+    package 안에서 @stage(...)를 선언한 모듈 이름 목록. 모듈을 import하지 않고 소스 텍스트로 찾는다.
+    """
+    modules = []
+    for directory, dirnames, filenames in os.walk(os.path.join(ROOT, package)):
+        dirnames[:] = sorted(d for d in dirnames if d != '__pycache__')
+        for filename in sorted(filenames):
+            if not filename.endswith('.py'):
+                continue
+            path = os.path.join(directory, filename)
+            with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                if not re.search(r'^@stage\(', f.read(), re.M):
+                    continue
+            modules.append(os.path.relpath(path, ROOT)[:-3].replace(os.sep, '.'))
+    return modules
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """
+    python -X importtime 출력(_MARKER 이후)을 [{'name', 'self_s', 'cumulative_s', 'depth'}] 목록으로 변환한다.
+    """
+    imports, started = [], False
+    for line in stderr.splitlines():
+        if line == _MARKER:
+            started = True
+            continue
+        match = _IMPORTTIME.match(line) if started else None
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            imports.append({'name': name, 'self_s': int(self_us) / 1e6, 'cumulative_s': int(cumulative_us) / 1e6, 'depth': (len(indent) - 1) // 2})
+    return imports
+
+def _run_probe(module: str, python: str) -> Dict:
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [ROOT, env.get('PYTHONPATH')]))
+    process = subprocess.run([python, '-X', 'importtime', '-c', _PROBE, module], cwd=ROOT, env=env, capture_output=True, text=True)
+    lines = process.stdout.strip().splitlines()
+    try:
+        result = json.loads(lines[-1])
+    except (IndexError, ValueError):
+        tail = process.stderr.strip().splitlines()[-1:] or [f'exit code {process.returncode}']
+        result = {'seconds': 0.0, 'error': tail[0], 'connections': [], 'modules': []}
+    result['imports'] = parse_importtime(process.stderr)
+    return result
+
+def measure(module: str, repeat: int = 1, python: str = sys.executable) -> Dict:
+    """
+    새 프로세스에서 module을 import한 결과 {'module', 'seconds', 'error', 'connections', 'heavy', 'imports'}. repeat회 중 가장 빠른 측정을 사용한다.
+    """
+    runs = [_run_probe(module, python) for _ in range(max(repeat, 1))]
+    best = min(runs, key=lambda run: run['seconds'])
+    return {
+        'module': module,
+        'seconds': round(best['seconds'], 4),
+        'error': best['error'],
+        'connections': best['connections'],
+        'heavy': sorted(HEAVY_MODULES & set(best['modules'])),
+        'imports': best['imports'],
+    }
+
+def slowest_imports(results: Iterable[Dict], top: int = IMPORT_TOP) -> List[Dict]:
+    """
+    모든 측정에서 self 시간이 큰 import. 같은 모듈은 여러 대상에서 import되므로 가장 큰 값 하나만 사용한다.
+    """
+    slowest = {}
+    for result in results:
+        for entry in result['imports']:
+            if entry['self_s'] > slowest.get(entry['name'], {}).get('self_s', -1):
+                slowest[entry['name']] = {'name': entry['name'], 'self_s': entry['self_s'], 'module': result['module']}
+    return sorted(slowest.values(), key=lambda entry: -entry['self_s'])[:top]
+
+def package_costs(result: Dict) -> Dict[str, float]:
+    """
+    최상위 패키지별 self 시간 합계 (예: tensorflow 하위 모듈 전체).
+    """
+    costs = defaultdict(float)
+    for entry in result['imports']:
+        costs[entry['name'].split('.')[0]] += entry['self_s']
+    return dict(sorted(costs.items(), key=lambda item: -item[1]))
+
+def over_budget(result: Dict, budget: float = IMPORT_BUDGET) -> List[str]:
+    problems = []
+    if result['error']:
+        problems.append(f"import failed ({result['error']})")
+    if result['seconds'] > budget:
+        problems.append(f"{result['seconds']:.2f}s > {budget:g}s budget")
+    if result['connections']:
+        problems.append(f"network access during import {result['connections']}")
+    return problems
+
+def format_report(results: List[Dict], budget: float = IMPORT_BUDGET, top: int = IMPORT_TOP) -> str:
+    width = max([len(result['module']) for result in results] + [6])
+    lines = [f"{'module':<{width}} {'seconds':>8}  top packages / heavy"]
+    for result in sorted(results, key=lambda result: -result['seconds']):
+        mark = '!' if over_budget(result, budget) else ' '
+        packages = ', '.join(f'{name} {seconds:.2f}s' for name, seconds in list(package_costs(result).items())[:3])
+        heavy = f" | heavy: {', '.join(result['heavy'])}" if result['heavy'] else ''
+        lines.append(f"{result['module']:<{width}} {result['seconds']:>7.2f}{mark}  {packages}{heavy}")
+    lines.append('')
+    lines.append(f'Slowest imports (self time, top {top})')
+    for entry in slowest_imports(results, top):
+        lines.append(f"  {entry['self_s']:>7.3f}s  {entry['name']}  (via {entry['module']})")
+    for result in results:
+        for problem in over_budget(result, budget):
+            lines.append(f"OVER BUDGET {result['module']}: {problem}")
+    return '\n'.join(lines)
+
+def check_imports(modules: Optional[List[str]] = None, budget: float = IMPORT_BUDGET, repeat: int = 1) -> List[Dict]:
+    modules = modules or discover_stage_modules() + DEFAULT_MODULES
+    return [measure(module, repeat) for module in modules]
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Import-time budget check')
+    parser.add_argument('modules', nargs='*', help='modules to import (default: every stage module and DEFAULT_MODULES)')
+    parser.add_argument('--budget', type=float, default=IMPORT_BUDGET, help='seconds allowed per module')
+    parser.add_argument('--top', type=int, default=IMPORT_TOP, help='number of slowest imports to list')
+    parser.add_argument('--repeat', type=int, default=1, help='measure each module this many times and keep the fastest')
+    parser.add_argument('--json', dest='json_path', help='also write the measurements to this file')
+    args = parser.parse_args()
+
+    results = check_imports(args.modules, args.budget, args.repeat)
+    print(format_report(results, args.budget, args.top))
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump({'budget': args.budget, 'results': results}, f, ensure_ascii=False, indent=2)
+    sys.exit(1 if any(over_budget(result, args.budget) for result in results) else 0)
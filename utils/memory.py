@@ -0,0 +1,207 @@
+# utils/memory.py
+'''
+memory.py는 구간별 최대 메모리(RSS)와 할당 위치를 기록하고 프로세스 메모리 상한을 적용하는 도구임
+watch(name)은 구간이 실행되는 동안 모니터 스레드가 VALUATION_MEMORY_SAMPLE_MS(기본값 100ms)마다 측정한 RSS의 최대값을 기록함
+- RSS는 프로세스 전체 값이므로 동시에 실행되는 구간의 메모리가 함께 포함됨 (증가량 delta로 구간의 기여를 가늠함)
+- VALUATION_TRACEMALLOC=N(저장할 프레임 수)이면 구간 시작과 RSS 최대 시점의 tracemalloc 스냅샷을 비교하여 상위 할당 위치를 기록함 (느려지므로 필요할 때만 사용)
+VALUATION_MEMORY_LIMIT_MB를 지정하면 wait_for_memory가 새 구간(스테이지, 배치의 아티스트)을 시작하기 전에 RSS를 확인함
+- 상한을 넘으면 gc 후 실행 중인 다른 구간이 끝나 메모리가 줄어들 때까지 기다리고, 실행 중인 구간이 없거나 시간이 초과되면 MemoryLimitExceeded를 던짐
+- 바깥 구간(스레드 풀 작업에 전달된 컨텍스트 포함)은 새 구간이 끝나야 끝나므로 기다리지 않음
+RSS는 Linux의 /proc/self/statm에서 읽으며, 다른 OS에서는 프로세스 최대 RSS(ru_maxrss)를 사용함
+'''
+
+import contextvars
+import gc
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from utils.logger import setup_logger
+logger = setup_logger(__name__)
+
+MEMORY_LIMIT_MB = float(os.getenv('VALUATION_MEMORY_LIMIT_MB', '0'))
+MEMORY_WAIT_SECONDS = float(os.getenv('VALUATION_MEMORY_WAIT_SECONDS', '300'))
+SAMPLE_INTERVAL = float(os.getenv('VALUATION_MEMORY_SAMPLE_MS', '100')) / 1000
+TRACEMALLOC_FRAMES = int(os.getenv('VALUATION_TRACEMALLOC', '0'))
+TOP_ALLOCATIONS = 5
+
+MB = 1024 * 1024
+
+# 현재 컨텍스트를 감싸는 구간들. 스레드 풀 작업도 copy_context로 호출한 쪽의 구간을 물려받음
+_enclosing = contextvars.ContextVar('memory_watches', default=())
+
+class MemoryLimitExceeded(MemoryError):
+    pass
+
+def rss_bytes() -> int:
+    """
+    현재 프로세스의 RSS(바이트).
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS는 바이트, Linux는 KB 단위
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+class Watch:
+    __slots__ = ('name', 'thread_id', 'waitable', 'start_rss', 'peak_rss', 'end_rss', 'allocations', '_snapshot', '_peak_snapshot', '_snapshot_rss')
+
+    def __init__(self, name: str, waitable: bool = True):
+        self.name = name
+        self.thread_id = threading.get_ident()
+        self.waitable = waitable
+        self.start_rss = rss_bytes()
+        self.peak_rss = self.start_rss
+        self.end_rss = None
+        self.allocations: List[Dict] = []
+        self._snapshot = None
+        self._peak_snapshot = None
+        self._snapshot_rss = self.start_rss
+
+    def to_dict(self) -> Dict:
+        return {
+            'start_rss_mb': round(self.start_rss / MB, 1),
+            'peak_rss_mb': round(self.peak_rss / MB, 1),
+            'end_rss_mb': round((self.end_rss or self.peak_rss) / MB, 1),
+            'delta_mb': round((self.peak_rss - self.start_rss) / MB, 1),
+            'allocations': self.allocations,
+        }
+
+class MemoryMonitor:
+    """
+    실행 중인 구간(Watch)들의 최대 RSS를 갱신하는 모니터 스레드. 구간이 있을 때만 측정한다.
+    """
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.watches: List[Watch] = []
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, watch: Watch) -> None:
+        with self._lock:
+            self.watches.append(watch)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='memory-monitor', daemon=True)
+                self._thread.start()
+            self._changed.notify_all()
+
+    def remove(self, watch: Watch) -> None:
+        with self._lock:
+            self.watches.remove(watch)
+            self._changed.notify_all()
+
+    def others(self) -> int:
+        """
+        wait_for_memory가 끝나기를 기다릴 수 있는, 다른 스레드에서 실행 중인 구간 수.
+        현재 스레드나 컨텍스트의 바깥 구간(그래프를 다시 실행하는 MOV 스테이지 등)과 waitable=False 구간(하위 작업이 끝나야 끝나는 배치의 아티스트 구간 등)은 제외한다.
+        """
+        thread_id = threading.get_ident()
+        enclosing = _enclosing.get()
+        with self._lock:
+            return sum(1 for w in self.watches if w.waitable and w.thread_id != thread_id and not any(w is outer for outer in enclosing))
+
+    def wait_for_change(self, timeout: float) -> None:
+        with self._lock:
+            self._changed.wait(timeout)
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                while not self.watches:
+                    self._changed.wait()
+                watches = list(self.watches)
+            rss = rss_bytes()
+            snapshot = None
+            for watch in watches:
+                if rss > watch.peak_rss:
+                    watch.peak_rss = rss
+                    # RSS가 5% 이상 늘 때마다 최대 시점의 할당 상태를 다시 기록
+                    if watch._snapshot is not None and rss > watch._snapshot_rss * 1.05 and tracemalloc.is_tracing():
+                        snapshot = snapshot or tracemalloc.take_snapshot()
+                        watch._peak_snapshot = snapshot
+                        watch._snapshot_rss = rss
+            time.sleep(self.interval)
+
+MONITOR = MemoryMonitor()
+
+_SNAPSHOT_FILTERS = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+
+def _top_allocations(before, after, limit: int = TOP_ALLOCATIONS) -> List[Dict]:
+    before = before.filter_traces(_SNAPSHOT_FILTERS)
+    after = after.filter_traces(_SNAPSHOT_FILTERS)
+    # 64KB 미만의 변화는 스레드/로깅 등 잡음이므로 제외
+    stats = [stat for stat in after.compare_to(before, 'lineno') if stat.size_diff >= 64 * 1024][:limit]
+    return [
+        {
+            'site': f'{stat.traceback[0].filename}:{stat.traceback[0].lineno}',
+            'size_mb': round(stat.size_diff / MB, 2),
+            'count': stat.count_diff,
+        }
+        for stat in stats
+    ]
+
+@contextmanager
+def watch(name: str, waitable: bool = True):
+    """
+    구간 동안의 RSS(시작, 최대, 끝)와 tracemalloc 상위 할당 위치(사용 시)를 기록한 Watch를 넘긴다.
+    """
+    if TRACEMALLOC_FRAMES and not tracemalloc.is_tracing():
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+    w = Watch(name, waitable)
+    if tracemalloc.is_tracing():
+        w._snapshot = tracemalloc.take_snapshot()
+    MONITOR.add(w)
+    token = _enclosing.set(_enclosing.get() + (w,))
+    try:
+        yield w
+    finally:
+        _enclosing.reset(token)
+        w.end_rss = rss_bytes()
+        w.peak_rss = max(w.peak_rss, w.end_rss)
+        MONITOR.remove(w)
+        if w._snapshot is not None and tracemalloc.is_tracing():
+            w.allocations = _top_allocations(w._snapshot, w._peak_snapshot or tracemalloc.take_snapshot())
+        w._snapshot = w._peak_snapshot = None
+
+def wait_for_memory(name: str, limit_mb: float = MEMORY_LIMIT_MB, timeout: float = MEMORY_WAIT_SECONDS) -> None:
+    """
+    RSS가 limit_mb를 넘으면 다른 구간이 끝나 메모리가 줄어들 때까지 기다린다.
+    실행 중인 다른 구간이 없거나 timeout이 지나도 줄지 않으면 MemoryLimitExceeded를 던진다.
+    """
+    if not limit_mb:
+        return
+    limit = limit_mb * MB
+    if rss_bytes() <= limit:
+        return
+    gc.collect()
+    deadline = time.monotonic() + timeout
+    logged = False
+    while rss_bytes() > limit:
+        if not MONITOR.others() or time.monotonic() > deadline:
+            raise MemoryLimitExceeded(f"'{name}' not started: RSS {rss_bytes() / MB:.0f} MB exceeds VALUATION_MEMORY_LIMIT_MB={limit_mb:g}")
+        if not logged:
+            logger.warning(f"RSS {rss_bytes() / MB:.0f} MB exceeds {limit_mb:g} MB, '{name}' waiting for running work to finish")
+            logged = True
+        MONITOR.wait_for_change(1.0)
+        gc.collect()
+
+def format_memory(records: Dict[str, Dict], top: int = 5) -> str:
+    """
+    구간별 기록({이름: Watch.to_dict()})을 최대 RSS 순으로 요약한다.
+    """
+    ranked = sorted(records.items(), key=lambda item: item[1]['peak_rss_mb'], reverse=True)
+    lines = [f"{'stage':<15} {'peak_mb':>8} {'delta_mb':>9} {'end_mb':>8}"]
+    for name, r in ranked:
+        lines.append(f"{name:<15} {r['peak_rss_mb']:>8.1f} {r['delta_mb']:>+9.1f} {r['end_rss_mb']:>8.1f}")
+    for name, r in ranked[:top]:
+        for a in r['allocations']:
+            lines.append(f"  {name}: +{a['size_mb']:.2f} MB ({a['count']:+d} blocks) at {a['site']}")
+    return '\n'.join(lines)
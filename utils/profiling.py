@@ -0,0 +1,188 @@
+# utils/profiling.py
+'''
+profiling.py는 코드 구간을 샘플링 프로파일러로 측정하여 speedscope 또는 flamegraph(collapsed stack) 파일로 저장하는 도구임
+Sampler는 별도 스레드에서 PROFILE_INTERVAL(ms)마다 측정 대상 스레드의 호출 스택을 수집하므로 코드 수정이나 외부 패키지가 필요하지 않음
+profiled(name, group)은 구간을 측정하여 PROFILE_DIR/<group>/<name>-<버전>-<시각>.<형식> 파일로 저장하고 self 시간이 큰 함수를 로그로 남김
+- 버전은 VALUATION_VERSION 또는 git 커밋 해시로, 버전별 파일을 남겨 비교할 수 있음
+- 같은 스레드에서 이미 측정 중이면 바깥 구간의 프로파일에 포함되며 따로 저장하지 않음
+VALUATION_PROFILE(all 또는 쉼표로 구분한 스테이지 이름)로 측정할 스테이지를 지정하며, set_profile로 실행 중에 바꿀 수 있음
+VALUATION_PROFILE_FORMAT: speedscope(기본값, https://www.speedscope.app) 또는 collapsed(flamegraph.pl, inferno 입력 형식)
+'''
+
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Optional, Set, Tuple
+
+from utils.logger import setup_logger
+logger = setup_logger(__name__)
+
+PROFILE_DIR = os.getenv('VALUATION_PROFILE_DIR', 'profiles')
+PROFILE_INTERVAL = float(os.getenv('VALUATION_PROFILE_INTERVAL', '5'))
+PROFILE_FORMAT = os.getenv('VALUATION_PROFILE_FORMAT', 'speedscope')
+
+_profile_targets: Set[str] = set()
+_profiling_threads: Set[int] = set()
+_lock = threading.Lock()
+_version: Optional[str] = None
+
+Frame = Tuple[str, str, int]
+
+def set_profile(spec: Optional[str]) -> None:
+    """
+    측정할 구간 이름을 지정한다. 'all'이면 모든 구간, 빈 값이면 측정하지 않는다.
+    """
+    with _lock:
+        _profile_targets.clear()
+        _profile_targets.update(name.strip() for name in (spec or '').split(',') if name.strip())
+
+def profile_enabled(name: str) -> bool:
+    return 'all' in _profile_targets or name in _profile_targets
+
+set_profile(os.getenv('VALUATION_PROFILE', ''))
+
+class Sampler:
+    """
+    thread_id 스레드의 호출 스택을 interval(초)마다 수집한다. samples는 {(루트 → 리프 프레임, ...): 시간(초)}.
+    GIL 경합으로 샘플 간격이 늘어날 수 있으므로 각 샘플에는 직전 샘플 이후 실제 경과 시간을 더한다.
+    """
+    def __init__(self, thread_id: int, interval: float = PROFILE_INTERVAL / 1000):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self.count = 0
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f'sampler-{thread_id}', daemon=True)
+
+    def _run(self) -> None:
+        last = self._start
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            now = time.perf_counter()
+            elapsed, last = now - last, now
+            # 측정이 끝나는 중(stop에서 대기 중)인 스택은 제외
+            if self._stop.is_set():
+                break
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((getattr(code, 'co_qualname', code.co_name), code.co_filename, code.co_firstlineno))
+                frame = frame.f_back
+            if stack:
+                self.samples[tuple(reversed(stack))] += elapsed
+                self.count += 1
+
+    def start(self) -> 'Sampler':
+        self._start = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def stop(self) -> 'Sampler':
+        self._stop.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self._start
+        return self
+
+    def self_times(self) -> Counter:
+        """
+        함수별 self 시간(초). 스택의 가장 안쪽 프레임에 샘플 시간을 더한다.
+        """
+        times = Counter()
+        for stack, seconds in self.samples.items():
+            times[stack[-1]] += seconds
+        return times
+
+    def to_speedscope(self, name: str) -> Dict:
+        frames: Dict[Frame, int] = {}
+        samples, weights = [], []
+        for stack, seconds in self.samples.items():
+            samples.append([frames.setdefault(frame, len(frames)) for frame in stack])
+            weights.append(seconds)
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'name': name,
+            'exporter': 'utils/profiling.py',
+            'shared': {'frames': [{'name': f[0], 'file': f[1], 'line': f[2]} for f in frames]},
+            'profiles': [{
+                'type': 'sampled',
+                'name': name,
+                'unit': 'seconds',
+                'startValue': 0,
+                'endValue': sum(weights),
+                'samples': samples,
+                'weights': weights,
+            }],
+        }
+
+    def to_collapsed(self) -> str:
+        # flamegraph 입력은 정수 값이므로 밀리초 단위로 기록
+        lines = []
+        for stack, seconds in sorted(self.samples.items()):
+            lines.append(';'.join(f'{f[0]} ({os.path.basename(f[1])}:{f[2]})' for f in stack) + f' {max(1, round(seconds * 1000))}')
+        return '\n'.join(lines) + '\n'
+
+def code_version() -> str:
+    """
+    프로파일 파일 이름에 넣을 코드 버전. VALUATION_VERSION, git 커밋 해시, 'unknown' 순으로 사용한다.
+    """
+    global _version
+    if _version is None:
+        _version = os.getenv('VALUATION_VERSION', '')
+        if not _version:
+            try:
+                _version = subprocess.run(
+                    ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, timeout=5,
+                    cwd=os.path.dirname(os.path.abspath(__file__)),
+                ).stdout.strip()
+            except (OSError, subprocess.SubprocessError):
+                pass
+        _version = _version or 'unknown'
+    return _version
+
+def _file_name(value: str) -> str:
+    return re.sub(r'[^\w.-]', '_', value)
+
+def save_profile(sampler: Sampler, name: str, group: str = '', directory: str = PROFILE_DIR, fmt: str = PROFILE_FORMAT) -> str:
+    directory = os.path.join(directory, _file_name(group)) if group else directory
+    os.makedirs(directory, exist_ok=True)
+    stem = f"{_file_name(name)}-{code_version()}-{time.strftime('%Y%m%d-%H%M%S')}"
+    if fmt == 'collapsed':
+        path = os.path.join(directory, f'{stem}.collapsed.txt')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(sampler.to_collapsed())
+    else:
+        path = os.path.join(directory, f'{stem}.speedscope.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(sampler.to_speedscope(f'{group}/{name}' if group else name), f, ensure_ascii=False)
+    return path
+
+@contextmanager
+def profiled(name: str, group: str = '', top: int = 5):
+    """
+    구간을 샘플링 프로파일러로 측정하여 저장한다. 같은 스레드에서 이미 측정 중이면 아무것도 하지 않는다.
+    """
+    thread_id = threading.get_ident()
+    with _lock:
+        nested = thread_id in _profiling_threads
+        _profiling_threads.add(thread_id)
+    if nested:
+        yield None
+        return
+
+    sampler = Sampler(thread_id).start()
+    try:
+        yield sampler
+    finally:
+        sampler.stop()
+        with _lock:
+            _profiling_threads.discard(thread_id)
+        path = save_profile(sampler, name, group)
+        hot = ', '.join(f'{frame[0]} {seconds:.2f}s' for frame, seconds in sampler.self_times().most_common(top))
+        logger.info(f"Profile of '{name}' ({sampler.duration:.2f}s, {sampler.count} samples) saved to {path}; self time: {hot}")
@@ -0,0 +1,162 @@
+# utils/tracing.py
+'''
+tracing.py는 실행 중 구간(span)의 시간과 I/O를 기록하고 Chrome trace 형식으로 내보내는 계측 도구임
+Trace는 한 번의 실행에서 끝난 구간을 모으며, tracing()으로 현재 컨텍스트에 지정함 (스레드 풀 작업에도 contextvars로 전달됨)
+span()은 구간의 벽시계 시간, 스레드 CPU 시간, 예외, 인자를 기록하며 구간은 중첩될 수 있음
+count()는 현재 구간과 모든 상위 구간의 카운터(캐시 hit/miss, Firestore 읽기/쓰기, HTTP 호출 등)를 증가시킴
+HTTP 호출은 utils/http_metrics.py의 install_http_hooks()가 'http' 하위 구간으로 기록함
+Trace.export는 chrome://tracing 또는 https://ui.perfetto.dev 에서 열 수 있는 JSON 파일을 저장함
+Trace가 지정되지 않은 컨텍스트에서는 span과 count가 아무것도 기록하지 않음
+'''
+
+import json
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+_trace: ContextVar[Optional['Trace']] = ContextVar('trace', default=None)
+_span: ContextVar[Optional['Span']] = ContextVar('span', default=None)
+_count_lock = threading.Lock()
+
+class Span:
+    __slots__ = ('name', 'cat', 'start', 'end', 'cpu', 'tid', 'thread_name', 'args', 'counters', 'parent')
+
+    def __init__(self, name: str, cat: str, args: Dict, parent: Optional['Span']):
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.parent = parent
+        self.counters = Counter()
+        self.start = time.perf_counter()
+        self.end = None
+        self.cpu = 0.0
+        thread = threading.current_thread()
+        self.tid = thread.ident
+        self.thread_name = thread.name
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+class Trace:
+    """
+    한 번의 실행에서 기록된 구간 모음.
+    """
+    def __init__(self, name: str = 'trace'):
+        self.name = name
+        self.origin = time.perf_counter()
+        self.spans: List[Span] = []
+        self.counters = Counter()
+        self._lock = threading.Lock()
+
+    def add(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def stage_spans(self, cat: str = 'stage') -> List[Span]:
+        with self._lock:
+            return [s for s in self.spans if s.cat == cat]
+
+    def to_chrome(self) -> Dict:
+        events = []
+        threads = {}
+        with self._lock:
+            spans = list(self.spans)
+        for s in spans:
+            threads[s.tid] = s.thread_name
+            events.append({
+                'name': s.name,
+                'cat': s.cat,
+                'ph': 'X',
+                'ts': (s.start - self.origin) * 1e6,
+                'dur': s.duration * 1e6,
+                'pid': os.getpid(),
+                'tid': s.tid,
+                'args': {**s.args, 'cpu_ms': round(s.cpu * 1000, 3), **s.counters},
+            })
+        for tid, thread_name in threads.items():
+            events.append({'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': tid, 'args': {'name': thread_name}})
+        events.append({'name': 'process_name', 'ph': 'M', 'pid': os.getpid(), 'args': {'name': self.name}})
+        return {'traceEvents': events, 'displayTimeUnit': 'ms', 'otherData': dict(self.counters)}
+
+    def export(self, path: str) -> str:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_chrome(), f, ensure_ascii=False, default=str)
+        return path
+
+def current_trace() -> Optional[Trace]:
+    return _trace.get()
+
+@contextmanager
+def tracing(trace: Optional[Trace] = None):
+    """
+    trace(기본값: 새 Trace)를 현재 컨텍스트에 지정한다.
+    """
+    trace = trace if trace is not None else Trace()
+    token = _trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _trace.reset(token)
+
+@contextmanager
+def span(name: str, cat: str = 'function', **args):
+    """
+    name 구간의 시간과 카운터를 기록한다. Trace가 없으면 None을 넘기고 아무것도 기록하지 않는다.
+    """
+    trace = _trace.get()
+    if trace is None:
+        yield None
+        return
+
+    s = Span(name, cat, args, _span.get())
+    token = _span.set(s)
+    cpu_start = time.thread_time()
+    try:
+        yield s
+    except BaseException as e:
+        s.args['error'] = repr(e)
+        raise
+    finally:
+        s.cpu = time.thread_time() - cpu_start
+        s.end = time.perf_counter()
+        _span.reset(token)
+        trace.add(s)
+
+def count(name: str, n: int = 1) -> None:
+    """
+    현재 구간과 상위 구간, 그리고 Trace 전체의 name 카운터를 n만큼 증가시킨다.
+    """
+    trace = _trace.get()
+    if trace is None:
+        return
+    with _count_lock:
+        trace.counters[name] += n
+        s = _span.get()
+        while s is not None:
+            s.counters[name] += n
+            s = s.parent
+
+def current_span(cat: Optional[str] = None) -> Optional[Span]:
+    """
+    현재 구간(cat을 지정하면 cat이 같은 가장 안쪽 상위 구간)을 반환한다.
+    """
+    s = _span.get() if _trace.get() is not None else None
+    while s is not None and cat is not None and s.cat != cat:
+        s = s.parent
+    return s
+
+def annotate(key: str, value) -> None:
+    """
+    현재 구간의 인자에 key=value를 기록한다.
+    """
+    s = _span.get()
+    if s is not None and _trace.get() is not None:
+        s.args[key] = value